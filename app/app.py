@@ -2,12 +2,26 @@
 # メインアプリケーションエントリーポイント
 
 import asyncio
+import contextvars
+import itertools
 import time
-from typing import Optional, Callable, Union, Any, Tuple
+from collections import deque
+from typing import TYPE_CHECKING, Optional, Callable, Union, Any, Tuple
 from enum import Enum
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta, date, time as datetime_time
 
+from app import metrics
+
+
+if TYPE_CHECKING:
+    from app.durable_queue import DurableEventJournal
+    from app.loop_monitor import LoopMonitor
+
+
+# 論理チャンネル名一覧
+CHANNEL_NAMES = ("command-center", "creation", "development", "lounge")
+
 
 def get_channel_name_from_id(channel_id: str) -> str:
     """Discord チャンネルIDを論理チャンネル名にマッピング
@@ -70,9 +84,8 @@ def select_typing_bot(channel_name: str, text: str) -> str:
     return channel_bot_preference.get(channel_name, "spectra")
 
 
-async def on_user(channel: str, text: str, user_id: str) -> None:
-    """ユーザーメッセージ受信ハンドラ"""
-    # Fail-Fast: 必須パラメータ検証
+def _validate_user_message(channel: str, text: str, user_id: str) -> None:
+    """ユーザーメッセージの必須パラメータ検証（Fail-Fast）"""
     if not channel:
         raise ValueError("Channel ID cannot be empty")
     if not text:
@@ -80,17 +93,75 @@ async def on_user(channel: str, text: str, user_id: str) -> None:
     if not user_id:
         raise ValueError("User ID cannot be empty")
 
-    from app import store, discord
+
+# 受信時Typingタスクの参照保持（完了前のGC防止）
+_ingress_typing_tasks: set = set()
+
+
+def _on_ingress_typing_done(task: asyncio.Task) -> None:
+    """受信時Typingの完了処理（失敗は記録のみ・応答処理はキュー側で継続）"""
+    _ingress_typing_tasks.discard(task)
+    if task.cancelled() or task.exception() is None:
+        return
+    from app import logger
+
+    logger.log_err("user_msg", "system", "user", "ingress_typing", "typing", str(task.exception()))
+
+
+async def enqueue_user_message(channel: str, text: str, user_id: str) -> None:
+    """ゲートウェイ受信ハンドラ（中優先度でEventQueueへ投入）
+
+    受信時点で即時Typingをバックグラウンド送信し、Redis・LLM・送信の処理は
+    EventQueue経由で直列実行します。ゲートウェイのイベント処理はブロックしません。
+    USER_BURST_WINDOW_SECONDS有効時は窓内の連投をまとめて1回だけ応答します。
+    """
+    _validate_user_message(channel, text, user_id)
+
+    # 連投統合有効時: 窓内の後続メッセージは先頭メッセージの応答にまとめる
+    coalescing = user_burst_coalescer.window > 0
+    if coalescing and not user_burst_coalescer.add(channel, text, user_id):
+        return
+
+    from app import discord
+
+    # 即時Typing表示（体感速度向上・受信時点で送信）
+    typing_bot = select_typing_bot(get_channel_name_from_id(channel), text)
+    task = asyncio.create_task(discord.typing(typing_bot, channel))
+    _ingress_typing_tasks.add(task)
+    task.add_done_callback(_on_ingress_typing_done)
+
+    if coalescing:
+        return  # 窓の終了時にon_user_burstとして投入
+    await dispatch_event(
+        get_channel_name_from_id(channel), EventPriority.USER, on_user, channel, text, user_id,
+        typing_sent=True,
+    )
+
+
+async def on_user(channel: str, text: str, user_id: str, typing_sent: bool = False) -> None:
+    """ユーザーメッセージ受信ハンドラ
+
+    Args:
+        channel: Discord チャンネル ID
+        text: メッセージ本文
+        user_id: 送信ユーザー ID
+        typing_sent: 受信時点で即時Typing送信済み（enqueue_user_message経由）
+    """
+    # Fail-Fast: 必須パラメータ検証
+    _validate_user_message(channel, text, user_id)
+
+    from app import discord
     
     # チャンネルIDを論理チャンネル名にマッピング
     channel_name = get_channel_name_from_id(channel)
     
     # 即時Typing表示（体感速度向上）
-    typing_bot = select_typing_bot(channel_name, text)
-    await discord.typing(typing_bot, channel)
+    if not typing_sent:
+        typing_bot = select_typing_bot(channel_name, text)
+        await discord.typing(typing_bot, channel)
     
-    # ユーザーメッセージをRedisに格納
-    store.append("user", channel_name, text)
+    # ユーザーメッセージをRedisに格納（永続イベントの再実行では追記しない）
+    append_event_record("user", channel_name, text, "user")
     
     # 共通シーケンスで応答（選定Bot名義・Typing→Send→Redis追記）
     payload_summary = text[:80]  # 80文字以内に切り詰め
@@ -104,6 +175,125 @@ async def on_user(channel: str, text: str, user_id: str) -> None:
     )
 
 
+async def on_user_burst(channel: str, texts: Tuple[str, ...], user_id: str) -> None:
+    """連投ユーザーメッセージのまとめ応答ハンドラ（中優先度・受信時Typing送信済み）
+
+    窓内の全メッセージを受信順にRedisへ格納し、LLM生成・応答は1回のみ行います。
+
+    Args:
+        channel: Discord チャンネル ID
+        texts: 窓内に受信したメッセージ本文（受信順）
+        user_id: 最後の送信ユーザー ID
+    """
+    # Fail-Fast: 必須パラメータ検証
+    if not texts:
+        raise ValueError("Message burst cannot be empty")
+    for text in texts:
+        _validate_user_message(channel, text, user_id)
+
+    channel_name = get_channel_name_from_id(channel)
+    for index, text in enumerate(texts):
+        append_event_record("user", channel_name, text, f"user:{index}")
+
+    payload_summary = "\n".join(texts)[:80]
+    await common_sequence(
+        event_type="user_msg",
+        channel=channel_name,
+        actor="user",
+        payload_summary=payload_summary,
+        llm_kind="reply",
+        llm_channel=channel
+    )
+
+
+class UserBurstCoalescer:
+    """チャンネル別のユーザー連投統合（USER_BURST_WINDOW_SECONDS）
+
+    チャンネルで最初のメッセージを受信してからwindow秒間に届いたメッセージをまとめ、
+    窓の終了時に1件のon_user_burstイベントとしてEventQueueへ投入します。
+    窓終了時の投入が失敗した場合はFail-Fast原則で停止します（まとめたメッセージを黙って失わない）。
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self._bursts: dict[str, list[str]] = {}
+        self._user_ids: dict[str, str] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+        self._tasks: set[asyncio.Task] = set()  # 実行中の窓終了タスク（完了まで参照を保持）
+
+    def pending(self, channel: str) -> Tuple[str, ...]:
+        """チャンネルの窓内で待機中のメッセージ"""
+        return tuple(self._bursts.get(channel, ()))
+
+    def add(self, channel: str, text: str, user_id: str) -> bool:
+        """メッセージを追加
+
+        Returns:
+            bool: 新しい窓を開始した場合True（既存の窓へ追加した場合False）
+        """
+        self._user_ids[channel] = user_id
+        burst = self._bursts.get(channel)
+        if burst is not None:
+            burst.append(text)
+            return False
+        self._bursts[channel] = [text]
+        task = asyncio.create_task(self._flush_after(channel))
+        self._timers[channel] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._on_flush_done)
+        return True
+
+    async def _flush_after(self, channel: str) -> None:
+        await asyncio.sleep(self.window)
+        await self.flush(channel)
+
+    def _on_flush_done(self, task: asyncio.Task) -> None:
+        """窓終了タスクの完了処理（投入失敗はlog_err後にSystemExit）"""
+        self._tasks.discard(task)
+        if task.cancelled() or task.exception() is None:
+            return
+        from app import logger
+
+        logger.log_err("user_msg", "system", "user", "user_burst_flush", "plan", str(task.exception()))
+        import sys
+        sys.exit(1)
+
+    async def close(self) -> None:
+        """待機中の窓を破棄し、窓終了タスクを停止して完了を待つ（終了時）"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._bursts.clear()
+        self._user_ids.clear()
+        self._timers.clear()
+
+    async def flush(self, channel: str) -> None:
+        """窓を閉じてまとめたメッセージをUSER優先度で投入"""
+        texts = self._bursts.pop(channel, None)
+        user_id = self._user_ids.pop(channel, "")
+        timer = self._timers.pop(channel, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        if not texts:
+            return
+        await dispatch_event(
+            get_channel_name_from_id(channel), EventPriority.USER, on_user_burst,
+            channel, tuple(texts), user_id,
+        )
+
+
+def _create_user_burst_coalescer() -> UserBurstCoalescer:
+    """settingsの連投統合窓でUserBurstCoalescerを生成"""
+    from app import settings
+
+    return UserBurstCoalescer(settings.settings.queue.user_burst_window_seconds)
+
+
+# グローバル連投統合（窓0で無効）
+user_burst_coalescer = _create_user_burst_coalescer()
+
+
 async def on_slash(
     channel: Optional[str] = None, content: Optional[str] = None
 ) -> None:
@@ -112,6 +302,45 @@ async def on_slash(
     await execute_slash_command(channel, content)
 
 
+async def on_slash_interaction(
+    channel: Optional[str],
+    content: Optional[str],
+    application_id: str,
+    interaction_token: str,
+) -> None:
+    """deferした/taskの処理と応答編集（イベントキューから実行・永続化対象）
+
+    Raises:
+        ValueError: 応答編集がトークン失効以外の理由で失敗した場合（Fail-Fast）
+    """
+    from app import discord
+
+    await on_slash(channel=channel, content=content)
+    await discord.edit_interaction_response(application_id, interaction_token, "受け付けました")
+
+
+# 混雑（受け入れ上限・待機期限切れ）で/taskを実行しなかった場合の応答
+SLASH_DROPPED_MESSAGE = "混雑のため受け付けできませんでした。時間をおいて再度お試しください"
+
+
+async def notify_slash_dropped(
+    channel: Optional[str],
+    content: Optional[str],
+    application_id: str,
+    interaction_token: str,
+) -> None:
+    """実行されなかった/taskのdefer応答を不受理に編集（on_slash_interactionと同じ引数）
+
+    応答できなくても他のイベント処理は継続するため、編集失敗は記録のみとします。
+    """
+    from app import discord, logger
+
+    try:
+        await discord.edit_interaction_response(application_id, interaction_token, SLASH_DROPPED_MESSAGE)
+    except ValueError as e:
+        logger.log_err("slash", "command-center", "spectra", "slash_dropped_notify", "slash", str(e))
+
+
 async def on_tick() -> None:
     """自発発言処理ハンドラ（低優先度）"""
     from app import state
@@ -120,6 +349,9 @@ async def on_tick() -> None:
     active_channel = state.get_active_channel()
     channel_id = get_channel_id_from_name(active_channel)
     payload_summary = f"auto_tick:{active_channel}"
+
+    # 先行生成済みで文脈・active_channelが不変ならLLM呼び出しを省略
+    prepared = speculative_tick_generator.take(active_channel)
     
     await common_sequence(
         event_type="auto_tick",
@@ -127,7 +359,8 @@ async def on_tick() -> None:
         actor="system",
         payload_summary=payload_summary,
         llm_kind="auto",
-        llm_channel=channel_id
+        llm_channel=channel_id,
+        prepared_result=prepared
     )
 
 
@@ -140,6 +373,9 @@ async def on_report_0600() -> None:
     1. common_sequence経由でSpectra固定・500字以内の日報をcommand-centerに投稿
     2. 投稿成功後にRedis全文脈をリセット
     3. システム状態をACTIVEモード・command-centerアクティブに設定
+
+    PROCESS_ROLE=gatewayの場合は1-3をworkerへ投入します（ステート遷移は投稿後に
+    workerで行い、次の投入時にgatewayへ取り込まれます）。
     
     Features:
         - Spectra固定投稿（Bot選択なし）
@@ -155,42 +391,72 @@ async def on_report_0600() -> None:
         このハンドラはTask 11-1のDailyReportSchedulerから呼び出されます。
         エラー時はFail-Fast原則により、後続のリセット処理は実行されません。
     """
-    from app import store, state, settings, logger
-    
     try:
-        # Stage 1: 日報生成・投稿（common_sequenceでSpectra固定・command-center）
-        # Fail-Fast: common_sequenceでのエラーは例外として伝播し、後続処理は実行しない
-        await common_sequence(
-            event_type="report",
-            channel="command-center",
-            actor="spectra",
-            payload_summary="daily_report_0600",
-            llm_kind="report",
-            llm_channel=settings.settings.discord.chan_command_center
-        )
-        
-        # Stage 2: 全文脈リセット（日報送信成功後のみ実行）
-        # Fail-Fast: store.reset()でのエラーはSystemExitで即座停止
-        store.reset()
-        
-        # Stage 3: 状態更新（mode=ACTIVE・active_channel=command-center）
-        # Fail-Fast: state操作でのエラーは例外として伝播
-        from app.state import Mode
-        state.update_mode(Mode.ACTIVE)
-        state.set_active_channel("command-center")
-        
+        if remote_journals is None:
+            await _post_daily_report()
+        # gateway: 生成・投稿・リセット・ステート遷移はworkerへ投入
+        elif not await dispatch_event("command-center", EventPriority.SLASH, on_report_worker):
+            raise ValueError("Daily report was not accepted by the worker queue")
+
     except Exception as e:
-        # Fail-Fast: 日報関連エラーは全てerror_stage='report'で記録後SystemExit
-        logger.log_err(
-            event_type="report",
-            channel="command-center", 
-            actor="spectra",
-            payload_summary="daily_report_0600",
-            error_stage="report",
-            error_detail=str(e)
-        )
-        import sys
-        sys.exit(1)
+        _fail_daily_report(e)
+
+
+async def on_report_worker() -> None:
+    """worker側の日報処理（PROCESS_ROLE=gatewayのon_report_0600から投入）
+
+    日報生成・投稿・全文脈リセット後にステートを遷移します（遷移後のステートは
+    RemoteEventWorkerが記録し、gatewayが次の投入時に取り込みます）。
+
+    Raises:
+        SystemExit: 日報生成・投稿・リセット・ステート遷移でエラーが発生した場合（Fail-Fast）
+    """
+    try:
+        await _post_daily_report()
+    except Exception as e:
+        _fail_daily_report(e)
+
+
+async def _post_daily_report() -> None:
+    """日報の生成・投稿・全文脈リセットとステート遷移（on_report_0600のStage 1-3）"""
+    from app import state, store, settings
+    from app.state import Mode
+
+    # Stage 1: 日報生成・投稿（common_sequenceでSpectra固定・command-center）
+    # Fail-Fast: common_sequenceでのエラーは例外として伝播し、後続処理は実行しない
+    await common_sequence(
+        event_type="report",
+        channel="command-center",
+        actor="spectra",
+        payload_summary="daily_report_0600",
+        llm_kind="report",
+        llm_channel=settings.settings.discord.chan_command_center
+    )
+
+    # Stage 2: 全文脈リセット（日報送信成功後のみ実行）
+    # Fail-Fast: store.reset()でのエラーはSystemExitで即座停止
+    store.reset()
+
+    # Stage 3: 状態更新（mode=ACTIVE・active_channel=command-center）
+    # Fail-Fast: state操作でのエラーは例外として伝播
+    state.update_mode(Mode.ACTIVE)
+    state.set_active_channel("command-center")
+
+
+def _fail_daily_report(error: Exception) -> None:
+    """日報関連エラーを error_stage='report' で記録してSystemExit（Fail-Fast）"""
+    from app import logger
+
+    logger.log_err(
+        event_type="report",
+        channel="command-center",
+        actor="spectra",
+        payload_summary="daily_report_0600",
+        error_stage="report",
+        error_detail=str(error)
+    )
+    import sys
+    sys.exit(1)
 
 
 # 7-1: 優先度制御の基本構造（Slash→User→Tick）
@@ -207,16 +473,19 @@ class EventItem:
     """イベントアイテム定義
     
     優先度キューで使用するイベント情報を格納します。
-    優先度での比較をサポートし、同じ優先度の場合は安定ソートを提供します。
+    優先度での比較をサポートし、同じ優先度の場合は投入順（FIFO）を保証します。
     """
 
     priority: EventPriority
     handler: Callable[..., Any]
     args: Tuple[Any, ...]
     kwargs: dict[str, Any]
+    seq: int = 0  # キュー内の単調増加な投入番号
+    enqueued_at: float = 0.0  # 投入時刻（time.monotonic）
+    durable_id: Optional[str] = None  # 永続ジャーナル上のイベントID（QUEUE_DURABLE）
     
     def __lt__(self, other: 'EventItem') -> bool:
-        """優先度での比較（同じ優先度の場合はオブジェクトIDで比較）
+        """優先度での比較（同じ優先度の場合は投入番号で比較）
         
         Args:
             other: 比較対象のEventItem
@@ -225,95 +494,984 @@ class EventItem:
             bool: 自身が他方より高優先度（小さい値）の場合True
             
         Note:
-            同じ優先度の場合はオブジェクトIDで比較し、安定的な順序を保証します。
+            同じ優先度の場合は投入番号で比較し、投入順（FIFO）を保証します。
         """
         if not isinstance(other, EventItem):
             return NotImplemented
         if self.priority != other.priority:
             return self.priority.value < other.priority.value
-        # 同じ優先度の場合はオブジェクトIDで比較（安定的な順序保証）
-        return id(self) < id(other)
+        return self.seq < other.seq
+
+
+def _percentile(values: list, q: float) -> float:
+    """最近傍法によるパーセンタイル（空の場合は0.0）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class EventQueueMetrics:
+    """EventQueueの優先度別計測（キュー深さ・待ち時間・処理時間）
+
+    待ち時間は投入からハンドラ開始まで、処理時間はハンドラ実行時間です。
+    直近window件の秒数を保持します。
+    """
+
+    def __init__(self, window: int = 500) -> None:
+        self.window = window
+        self.depth: dict[EventPriority, int] = {p: 0 for p in EventPriority}
+        self.enqueued: dict[EventPriority, int] = {p: 0 for p in EventPriority}
+        self.processed: dict[EventPriority, int] = {p: 0 for p in EventPriority}
+        self.rejected: dict[EventPriority, int] = {p: 0 for p in EventPriority}  # 上限超過で不受理
+        self.coalesced: dict[EventPriority, int] = {p: 0 for p in EventPriority}  # 待機中の同一イベントへ統合
+        self.expired: dict[EventPriority, int] = {p: 0 for p in EventPriority}  # 期限切れで破棄
+        self.preempted: dict[EventPriority, int] = {p: 0 for p in EventPriority}  # 高優先度到着で中断
+        self.wait: dict[EventPriority, deque] = {p: deque(maxlen=window) for p in EventPriority}
+        self.service: dict[EventPriority, deque] = {p: deque(maxlen=window) for p in EventPriority}
+
+    def record_enqueue(self, priority: EventPriority) -> None:
+        """投入を記録"""
+        self.depth[priority] += 1
+        self.enqueued[priority] += 1
+
+    def record_start(self, priority: EventPriority, wait_seconds: float) -> None:
+        """取り出し（処理開始）を記録"""
+        self.depth[priority] -= 1
+        self.wait[priority].append(wait_seconds)
+        metrics.EVENT_WAIT_SECONDS.labels(priority.name.lower()).observe(wait_seconds)
+
+    def record_expired(self, priority: EventPriority) -> None:
+        """期限切れによる破棄（取り出し時）を記録"""
+        self.depth[priority] -= 1
+        self.expired[priority] += 1
+
+    def record_done(self, priority: EventPriority, service_seconds: float) -> None:
+        """処理完了を記録"""
+        self.processed[priority] += 1
+        self.service[priority].append(service_seconds)
+        metrics.EVENT_SERVICE_SECONDS.labels(priority.name.lower()).observe(service_seconds)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """優先度別の集計（キーは優先度名の小文字）"""
+        result: dict[str, dict[str, Any]] = {}
+        for priority in EventPriority:
+            wait = list(self.wait[priority])
+            service = list(self.service[priority])
+            result[priority.name.lower()] = {
+                "depth": self.depth[priority],
+                "enqueued": self.enqueued[priority],
+                "processed": self.processed[priority],
+                "rejected": self.rejected[priority],
+                "coalesced": self.coalesced[priority],
+                "expired": self.expired[priority],
+                "preempted": self.preempted[priority],
+                "wait_p50": _percentile(wait, 0.5),
+                "wait_p95": _percentile(wait, 0.95),
+                "wait_max": max(wait, default=0.0),
+                "service_p50": _percentile(service, 0.5),
+                "service_p95": _percentile(service, 0.95),
+                "service_max": max(service, default=0.0),
+            }
+        return result
+
+
+@dataclass
+class RunningEvent:
+    """実行中イベント（中断可能な優先度のみ追跡）"""
+
+    item: EventItem
+    task: Optional[asyncio.Task] = None
+    preemptible: bool = True  # 送信段階に入るとFalse
+    preempted: bool = False
+
+
+# 実行中イベント（ハンドラのタスクコンテキストから参照）
+_running_event: contextvars.ContextVar[Optional[RunningEvent]] = contextvars.ContextVar(
+    "running_event", default=None
+)
+
+
+# 実行中の永続イベントの識別子（"名前空間:イベントID"・再実行時の重複追記防止キー）
+_durable_event_key: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "durable_event_key", default=None
+)
+
+
+def append_event_record(agent: str, channel: str, text: str, suffix: str) -> None:
+    """イベント処理中のRedis追記（永続イベントは再実行時に追記済みなら省略）
+
+    Args:
+        suffix: イベント内で追記を区別する名前（同一イベントで複数回追記する場合に変える）
+    """
+    from app import store
+
+    key = _durable_event_key.get()
+    if key is None:
+        store.append(agent, channel, text)
+    else:
+        store.append_once(f"{key}:{suffix}", agent, channel, text)
+
+
+def enter_non_preemptible_stage() -> None:
+    """以降の処理を中断不可にする（Discord送信段階の開始時に呼ぶ）
+
+    EventQueueから実行中の中断可能イベント内でのみ有効で、それ以外では何もしません。
+    """
+    running = _running_event.get()
+    if running is not None:
+        running.preemptible = False
 
 
 class EventQueue:
     """イベント優先度制御キュー（直列処理）
     
     Slash（最高）→ User（中）→ Tick（低）の優先度でイベントを管理し、
-    直列処理を保証する非同期キューシステムです。
+    単一ワーカーで直列処理を保証する非同期キューシステムです。
     
     Features:
-        - 優先度付きキューによる順序制御
-        - 直列実行保証（同時実行なし）
+        - 優先度付きキューによる順序制御（同一優先度は投入順）
+        - 直列実行保証（単一ワーカー・同時実行なし）
+        - キュー取得でブロックするイベント駆動ワーカー（ポーリングなし）
+        - 受け入れ制御（優先度別の待機上限・同一イベント統合・待機期限）
+        - 低優先度処理の中断（高優先度到着時に送信段階前なら中断・再投入）
+        - 任意のRedis永続化（登録ハンドラのイベントを再起動後に再開）
+        - 優先度別のキュー深さ・待ち時間・処理時間の計測
         - Fail-Fast原則（エラー時即中断）
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_depth: Optional[dict[EventPriority, int]] = None,
+        deadlines: Optional[dict[EventPriority, float]] = None,
+        coalesce: Tuple[EventPriority, ...] = (EventPriority.TICK,),
+        preempt: Tuple[EventPriority, ...] = (),
+        requeue_preempted: bool = True,
+        journal: Optional["DurableEventJournal"] = None,
+        durable_handlers: Optional[dict[str, Callable[..., Any]]] = None,
+        drop_notifiers: Optional[dict[Callable[..., Any], Callable[..., Any]]] = None,
+    ) -> None:
         """EventQueue初期化
         
         内部的にasyncio.PriorityQueueを使用し、
-        処理中フラグで直列実行を制御します。
+        単調増加の投入番号で同一優先度内の順序を決定します。
+
+        Args:
+            max_depth: 優先度別の待機上限（未指定・0は無制限）
+            deadlines: 優先度別の待機期限秒（未指定・0は期限なし）
+            coalesce: 待機中の同一イベント（同一ハンドラ・引数）を統合する優先度
+            preempt: 実行中に高優先度イベントが到着したら中断する優先度
+            requeue_preempted: 中断したイベントを再投入する（Falseで破棄）
+            journal: 永続ジャーナル（指定時はdurable_handlersのイベントをRedisへ記録）
+            durable_handlers: 永続化するハンドラ（登録名 → ハンドラ）
+            drop_notifiers: 待機期限切れで破棄した時の通知（ハンドラ → 同じ引数で呼ぶ通知関数）
         """
         self._queue: asyncio.PriorityQueue[Tuple[int, EventItem]] = asyncio.PriorityQueue()
+        self._seq = itertools.count()
         self._processing: bool = False
+        self._worker_running: bool = False
+        self._max_depth = dict(max_depth or {})
+        self._deadlines = dict(deadlines or {})
+        self._coalesce = frozenset(coalesce)
+        self._pending: dict[Tuple[Any, ...], EventItem] = {}  # 統合対象の待機中イベント
+        self._preempt = frozenset(preempt)
+        self._requeue_preempted = requeue_preempted
+        self._running: Optional[RunningEvent] = None
+        self._journal = journal
+        self._durable_handlers = dict(durable_handlers or {})
+        self._durable_names = {handler: name for name, handler in self._durable_handlers.items()}
+        self._drop_notifiers = dict(drop_notifiers or {})
+        # ハンドラ実行のラッパー（チャンネル別ワーカーのSlash排他制御など）
+        self.run_guard: Optional[Callable[..., Any]] = None
+        self.metrics = EventQueueMetrics()
+
+    @staticmethod
+    def _coalesce_key(item: EventItem) -> Optional[Tuple[Any, ...]]:
+        """統合判定キー（引数がハッシュ不可の場合は統合しない）"""
+        key = (item.priority, item.handler, item.args, tuple(sorted(item.kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    async def enqueue(
+        self, priority: EventPriority, handler: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> bool:
+        """イベントをキューに追加
+        
+        Args:
+            priority: イベント優先度（EventPriority）
+            handler: 実行するハンドラー関数
+            *args: ハンドラーに渡す位置引数
+            **kwargs: ハンドラーに渡すキーワード引数
+
+        Returns:
+            bool: 新規に受け入れた場合True（待機中イベントへ統合・上限超過で不受理の場合False）
+            
+        Raises:
+            ValueError: handlerがcallableでない場合
+        """
+        # Fail-Fast: パラメータ検証
+        if not callable(handler):
+            raise ValueError("Handler must be callable")
+
+        now = time.monotonic()
+        item = EventItem(priority, handler, args, kwargs, next(self._seq), now)
+
+        key = self._coalesce_key(item) if priority in self._coalesce else None
+        if key is not None:
+            pending = self._pending.get(key)
+            if pending is not None:
+                # 同一イベントが待機中: 順序・投入時刻とも最初のイベントを維持（待機期限は最初の投入から数える）
+                self.metrics.coalesced[priority] += 1
+                return False
+
+        max_depth = self._max_depth.get(priority, 0)
+        if max_depth and self.metrics.depth[priority] >= max_depth:
+            self.metrics.rejected[priority] += 1
+            from app import logger
+
+            logger.log_ok("queue", "system", "system", f"rejected:{priority.name.lower()}:depth={max_depth}")
+            return False
+
+        durable_name = self._durable_names.get(handler) if self._journal is not None else None
+        if durable_name is not None:
+            item.durable_id = self._journal.put(priority.value, durable_name, args, kwargs)
+        if key is not None:
+            self._pending[key] = item
+        self.metrics.record_enqueue(priority)
+        self._queue.put_nowait((priority.value, item))
+        self._preempt_running(priority)
+        return True
+
+    async def restore(self) -> int:
+        """永続ジャーナルから未完了イベントを復元（起動時・ワーカー開始前に呼ぶ）
+
+        Returns:
+            int: 復元したイベント数
+        """
+        if self._journal is None:
+            return 0
+        restored = 0
+        now_wall = time.time()
+        now = time.monotonic()
+        for event in self._journal.recover():
+            handler = self._durable_handlers.get(event.handler)
+            if handler is None:
+                from app import logger
+
+                logger.log_err(
+                    "queue", "system", "system", f"durable_restore:{event.handler}",
+                    "memory", f"Unknown durable handler: {event.handler}",
+                )
+                self._journal.complete(event.event_id)
+                continue
+            priority = EventPriority(event.priority)
+            waited = max(0.0, now_wall - event.enqueued_at)
+            item = EventItem(
+                priority, handler, event.args, event.kwargs, next(self._seq), now - waited,
+                durable_id=event.event_id,
+            )
+            self.metrics.record_enqueue(priority)
+            self._queue.put_nowait((priority.value, item))
+            restored += 1
+        return restored
+
+    def _complete_durable(self, item: EventItem) -> None:
+        """永続イベントの完了（破棄を含む）を記録"""
+        if self._journal is not None and item.durable_id is not None:
+            self._journal.complete(item.durable_id)
+
+    def _preempt_running(self, priority: EventPriority) -> None:
+        """実行中の低優先度イベントを中断（送信段階に入っていない場合のみ）"""
+        running = self._running
+        if (
+            running is None
+            or running.preempted
+            or not running.preemptible
+            or priority.value >= running.item.priority.value
+        ):
+            return
+        running.preempted = True
+        running.task.cancel()
+
+    def _requeue(self, item: EventItem) -> None:
+        """中断したイベントを再投入（投入番号・待機期限の起点は維持）"""
+        if self._journal is not None and item.durable_id is not None:
+            self._journal.release(item.durable_id)
+        key = self._coalesce_key(item) if item.priority in self._coalesce else None
+        if key is not None:
+            if key in self._pending:
+                self.metrics.coalesced[item.priority] += 1
+                return
+            self._pending[key] = item
+        self.metrics.depth[item.priority] += 1
+        self._queue.put_nowait((item.priority.value, item))
+
+    def _invoke(self, item: EventItem) -> Any:
+        """ハンドラ呼び出し（run_guard指定時はラップして実行）"""
+        if self.run_guard is None:
+            return item.handler(*item.args, **item.kwargs)
+        return self.run_guard(item.handler, *item.args, **item.kwargs)
+
+    async def _run_handler(self, item: EventItem) -> bool:
+        """ハンドラ実行（中断可能な優先度はタスク化して中断を受け付ける）
+
+        Returns:
+            bool: 完了した場合True、高優先度イベントにより中断された場合False
+        """
+        if item.priority not in self._preempt:
+            await self._invoke(item)
+            return True
+
+        running = RunningEvent(item)
+        token = _running_event.set(running)
+        try:
+            running.task = asyncio.ensure_future(self._invoke(item))
+        finally:
+            _running_event.reset(token)
+        self._running = running
+        try:
+            await running.task
+            return True
+        except asyncio.CancelledError:
+            if not running.preempted or not running.task.cancelled():
+                raise
+            return False
+        finally:
+            self._running = None
+
+    def _is_expired(self, item: EventItem, now: float) -> bool:
+        """待機期限切れの判定"""
+        deadline = self._deadlines.get(item.priority, 0)
+        return bool(deadline) and now - item.enqueued_at > deadline
+
+    async def process_events(self) -> None:
+        """キュー内イベントを順次処理（直列実行・Fail-Fast）
+        
+        キュー取得でブロックしながら、優先度順・投入順にイベントを直列実行します。
+        ワーカーは1つのみ起動可能で、エラー時はFail-Fast原則で即座に中断します。
+        
+        Raises:
+            ValueError: イベント処理中にエラーが発生した場合、またはワーカーの重複起動時
+        """
+        if self._worker_running:
+            raise ValueError("EventQueue worker is already running")
+        self._worker_running = True
+        try:
+            while True:
+                priority_value, item = await self._queue.get()
+                self._pending.pop(self._coalesce_key(item), None)
+                started = time.monotonic()
+                if self._is_expired(item, started):
+                    # 期限切れ: 実行せず破棄（古い自発発言の連続実行を防止）
+                    self.metrics.record_expired(item.priority)
+                    self._complete_durable(item)
+                    self._queue.task_done()
+                    from app import logger
+
+                    logger.log_ok(
+                        "queue", "system", "system",
+                        f"expired:{item.priority.name.lower()}:waited={started - item.enqueued_at:.1f}s",
+                    )
+                    notifier = self._drop_notifiers.get(item.handler)
+                    if notifier is not None:
+                        await notifier(*item.args, **item.kwargs)
+                    continue
+                if (
+                    self._journal is not None
+                    and item.durable_id is not None
+                    and not self._journal.claim(item.durable_id)
+                ):
+                    # 他プロセスで完了済み: 重複実行しない
+                    self.metrics.depth[item.priority] -= 1
+                    self._queue.task_done()
+                    continue
+                self.metrics.record_start(item.priority, started - item.enqueued_at)
+                self._processing = True
+                durable_key = (
+                    f"{self._journal.namespace}:{item.durable_id}" if item.durable_id is not None else None
+                )
+                key_token = _durable_event_key.set(durable_key)
+                try:
+                    # Fail-Fast: 直列実行で例外時は即中断
+                    completed = await self._run_handler(item)
+                except Exception as e:
+                    # Fail-Fast原則: 例外を再送出して処理中断
+                    raise ValueError(f"Event processing failed: {e}") from e
+                finally:
+                    _durable_event_key.reset(key_token)
+                    self._processing = False
+                    self._queue.task_done()
+                if not completed:
+                    # 高優先度イベント到着で中断: 再投入または破棄
+                    self.metrics.preempted[item.priority] += 1
+                    action = "requeued" if self._requeue_preempted else "dropped"
+                    if self._requeue_preempted:
+                        self._requeue(item)
+                    else:
+                        self._complete_durable(item)
+                    from app import logger
+
+                    logger.log_ok("queue", "system", "system", f"preempted:{item.priority.name.lower()}:{action}")
+                    continue
+                self._complete_durable(item)
+                self.metrics.record_done(item.priority, time.monotonic() - started)
+        finally:
+            self._worker_running = False
+
+    @property
+    def is_processing(self) -> bool:
+        """処理中状態の確認"""
+        return self._processing
+
+    @property
+    def is_idle(self) -> bool:
+        """アイドル状態（処理中でなく待機イベントも無い）の確認"""
+        return not self._processing and self._queue.empty()
+
+    def depth(self, priority: Optional[EventPriority] = None) -> int:
+        """待機イベント数（priority指定時はその優先度のみ）"""
+        if priority is None:
+            return self._queue.qsize()
+        return self.metrics.depth[priority]
+
+
+def _durable_handlers() -> dict[str, Callable[..., Any]]:
+    """永続化対象のハンドラ（引数がJSONで表現でき、再起動後に再実行できるもの）"""
+    return {
+        "on_user": on_user,
+        "on_user_burst": on_user_burst,
+        "on_slash": on_slash,
+        "on_slash_interaction": on_slash_interaction,
+    }
+
+
+def _drop_notifiers() -> dict[Callable[..., Any], Callable[..., Any]]:
+    """待機期限切れで破棄したイベントの通知（応答待ちの利用者がいるもの）"""
+    return {on_slash_interaction: notify_slash_dropped}
+
+
+def _queue_deadlines() -> dict[EventPriority, float]:
+    """settingsの優先度別待機期限"""
+    from app import settings
+
+    queue_config = settings.settings.queue
+    return {
+        EventPriority.SLASH: queue_config.deadline_slash_seconds,
+        EventPriority.USER: queue_config.deadline_user_seconds,
+        EventPriority.TICK: queue_config.deadline_tick_seconds,
+    }
+
+
+def _queue_max_depth() -> dict[EventPriority, int]:
+    """settingsの優先度別待機上限"""
+    from app import settings
+
+    queue_config = settings.settings.queue
+    return {
+        EventPriority.SLASH: queue_config.max_depth_slash,
+        EventPriority.USER: queue_config.max_depth_user,
+        EventPriority.TICK: queue_config.max_depth_tick,
+    }
+
+
+def _create_event_queue(name: str = "main") -> EventQueue:
+    """settingsの受け入れ制御設定でEventQueueを生成
+
+    Args:
+        name: キュー名（QUEUE_DURABLE有効時のRedisキー名前空間）
+    """
+    from app import settings
+
+    queue_config = settings.settings.queue
+    journal = None
+    if queue_config.durable:
+        from app.durable_queue import DurableEventJournal
+
+        journal = DurableEventJournal(
+            namespace=name,
+            visibility_timeout=queue_config.visibility_timeout_seconds,
+            max_attempts=queue_config.max_attempts,
+        )
+    return EventQueue(
+        max_depth=_queue_max_depth(),
+        deadlines=_queue_deadlines(),
+        preempt=(EventPriority.TICK,) if queue_config.tick_preemption != "off" else (),
+        requeue_preempted=queue_config.tick_preemption == "requeue",
+        journal=journal,
+        durable_handlers=_durable_handlers(),
+        drop_notifiers=_drop_notifiers(),
+    )
+
+
+# グローバルイベントキュー
+event_queue = _create_event_queue()
+
+
+# チャンネル別ワーカーの区画（未登録チャンネルはunknownへ集約）
+CHANNEL_PARTITIONS = CHANNEL_NAMES + ("unknown",)
+
+
+class ChannelEventQueues:
+    """論理チャンネル別ワーカーによるイベント実行（QUEUE_CHANNEL_WORKERS）
+
+    論理チャンネル毎に1つのEventQueue（直列ワーカー）を持ち、チャンネル内の順序を
+    保ったまま異なるチャンネルのイベントを並行処理します。Slashコマンドは専用キューで
+    直列実行し、全チャンネルに対して最優先（到着時に実行中Tickを中断し、実行中は
+    他チャンネルの新規処理開始を待機）とします。
+    Redisへの文脈追記は単一イベントループ上の同期呼び出しのため追記順に直列化されます。
+    """
+
+    def __init__(self, queue_factory: Callable[[str], EventQueue] = lambda name: EventQueue()) -> None:
+        self.slash_queue = queue_factory("slash")
+        self.slash_queue.run_guard = self._run_exclusive
+        self.queues: dict[str, EventQueue] = {}
+        for name in CHANNEL_PARTITIONS:
+            queue = queue_factory(name)
+            queue.run_guard = self._run_shared
+            self.queues[name] = queue
+        self._condition = asyncio.Condition()
+        self._running = 0  # 実行中のチャンネルイベント数
+        self._slash_waiting = 0
+        self._slash_active = False
+
+    async def enqueue(
+        self,
+        channel_name: str,
+        priority: EventPriority,
+        handler: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> bool:
+        """イベントを論理チャンネルのキューに追加（SLASHは全チャンネル共通の専用キュー）
+
+        Raises:
+            ValueError: 未知のチャンネル名、またはhandlerがcallableでない場合
+        """
+        if channel_name not in self.queues:
+            raise ValueError(f"Unknown channel partition: {channel_name}")
+        if not callable(handler):
+            raise ValueError("Handler must be callable")
+
+        if priority is EventPriority.SLASH:
+            admitted = await self.slash_queue.enqueue(priority, handler, *args, **kwargs)
+            if admitted:
+                # 全チャンネルの実行中Tickを中断（送信段階前のもののみ）
+                for queue in self.queues.values():
+                    queue._preempt_running(priority)
+            return admitted
+        return await self.queues[channel_name].enqueue(priority, handler, *args, **kwargs)
+
+    async def _run_shared(self, handler: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """チャンネルイベント実行（Slash待機・実行中は開始を待つ）"""
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: not self._slash_active and self._slash_waiting == 0
+            )
+            self._running += 1
+        try:
+            await handler(*args, **kwargs)
+        finally:
+            async with self._condition:
+                self._running -= 1
+                self._condition.notify_all()
+
+    async def _run_exclusive(self, handler: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """Slashイベント実行（実行中のチャンネルイベント完了を待って単独実行）"""
+        async with self._condition:
+            self._slash_waiting += 1
+            try:
+                await self._condition.wait_for(lambda: self._running == 0)
+            finally:
+                self._slash_waiting -= 1
+            self._slash_active = True
+        try:
+            await handler(*args, **kwargs)
+        finally:
+            async with self._condition:
+                self._slash_active = False
+                self._condition.notify_all()
+
+    async def process_events(self) -> None:
+        """全ワーカーを起動（いずれかのFail-Fast停止で全体を停止）
+
+        Raises:
+            ValueError: いずれかのワーカーでイベント処理が失敗した場合
+        """
+        workers = [asyncio.create_task(self.slash_queue.process_events())]
+        workers += [asyncio.create_task(queue.process_events()) for queue in self.queues.values()]
+        try:
+            done, _ = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def restore(self) -> int:
+        """全キューの永続イベントを復元"""
+        restored = await self.slash_queue.restore()
+        for queue in self.queues.values():
+            restored += await queue.restore()
+        return restored
+
+    @property
+    def is_idle(self) -> bool:
+        """全ワーカーがアイドル状態か"""
+        return self.slash_queue.is_idle and all(queue.is_idle for queue in self.queues.values())
+
+
+def _create_channel_event_queues() -> Optional[ChannelEventQueues]:
+    """QUEUE_CHANNEL_WORKERS有効時のみチャンネル別ワーカーを生成"""
+    from app import settings
+
+    if not settings.settings.queue.channel_workers:
+        return None
+    return ChannelEventQueues(_create_event_queue)
+
+
+# チャンネル別ワーカー（無効時はNoneで単一のevent_queueを使用）
+channel_event_queues = _create_channel_event_queues()
+
+
+# gateway/worker間のRedisキュー区画（Slash専用＋論理チャンネル別）
+REMOTE_PARTITIONS = ("slash",) + CHANNEL_PARTITIONS
+
+
+def _remote_handlers() -> dict[str, Callable[..., Any]]:
+    """gatewayからworkerへ受け渡すハンドラ（永続化対象に自発発言・日報を加えたもの）"""
+    return {**_durable_handlers(), "on_tick": on_tick, "on_report_worker": on_report_worker}
+
+
+def _create_remote_journals() -> Optional[dict[str, "DurableEventJournal"]]:
+    """PROCESS_ROLEがgateway/workerの場合のみ区画別のRedisキューを生成"""
+    from app import settings
+
+    queue_config = settings.settings.queue
+    if queue_config.process_role == "all":
+        return None
+    from app.durable_queue import DurableEventJournal
+
+    return {
+        name: DurableEventJournal(
+            namespace=f"remote:{name}",
+            visibility_timeout=queue_config.visibility_timeout_seconds,
+            max_attempts=queue_config.max_attempts,
+        )
+        for name in REMOTE_PARTITIONS
+    }
+
+
+# gateway/worker間のRedisキュー（PROCESS_ROLE=allではNoneでプロセス内キューを使用）
+remote_journals = _create_remote_journals()
+
+
+# gateway側の受け入れ制御の計測（不受理・統合件数）
+remote_publish_metrics = EventQueueMetrics()
+
+# workerで変更されたステートの記録先区画
+REMOTE_STATE_PARTITION = "slash"
+
+# gatewayが取り込んだworkerステートの版
+_remote_state_version = 0
+
+
+async def _sync_remote_state() -> int:
+    """workerで変更されたステートのうち未取り込みのものをgatewayへ取り込む
+
+    Returns:
+        int: 取り込み済みの版（投入するイベントへ添付し、workerでの巻き戻りを防ぐ）
+
+    Raises:
+        ValueError: Redis操作の失敗時、または不正なステートの場合
+    """
+    from app import state
+
+    global _remote_state_version
+    journal = remote_journals[REMOTE_STATE_PARTITION]
+    record = await asyncio.get_running_loop().run_in_executor(None, journal.load_state)
+    if record is not None and record[0] > _remote_state_version:
+        state.import_state(record[1])
+        _remote_state_version = record[0]
+    return _remote_state_version
+
+
+async def publish_remote_event(
+    channel_name: str, priority: EventPriority, handler: Callable[..., Any], *args: Any, **kwargs: Any
+) -> bool:
+    """イベントをRedisキューへ投入（workerで実行・投入時のステートを添付）
+
+    プロセス内キューと同じ受け入れ制御（優先度別の待機上限・待機中Tickの統合）を
+    区画の待機中イベントで判定します。Redis操作は既定executorで実行します。
+
+    Returns:
+        bool: 受け入れた場合True（待機中イベントへ統合・上限超過で不受理の場合False）
+
+    Raises:
+        ValueError: 未知のチャンネル名、受け渡し対象外のハンドラ、またはRedis操作の失敗時
+    """
+    from app import logger, state
+
+    partition = "slash" if priority is EventPriority.SLASH else channel_name
+    if partition not in remote_journals:
+        raise ValueError(f"Unknown channel partition: {channel_name}")
+    name = next((key for key, value in _remote_handlers().items() if value is handler), None)
+    if name is None:
+        raise ValueError(f"Handler cannot be dispatched to workers: {getattr(handler, '__name__', handler)}")
+    journal = remote_journals[partition]
+    max_depth = _queue_max_depth().get(priority, 0)
+    state_version = await _sync_remote_state()
+    # ステートはイベントループ上で取得
+    meta = {"state": state.export_state(), "state_version": state_version}
+
+    def _admit() -> str:
+        # プロセス内キューと同じくTickのみ同一イベントを統合
+        if priority is EventPriority.TICK and any(
+            event.handler == name and event.args == args and event.kwargs == kwargs
+            for event in journal.pending_events(priority.value)
+        ):
+            return "coalesced"
+        if max_depth and journal.pending_count(priority.value) >= max_depth:
+            return "rejected"
+        journal.put(priority.value, name, args, kwargs, meta=meta)
+        return "accepted"
+
+    outcome = await asyncio.get_running_loop().run_in_executor(None, _admit)
+    if outcome == "coalesced":
+        remote_publish_metrics.coalesced[priority] += 1
+    elif outcome == "rejected":
+        remote_publish_metrics.rejected[priority] += 1
+        logger.log_ok("queue", "system", "system", f"rejected:{priority.name.lower()}:depth={max_depth}")
+    return outcome == "accepted"
+
+
+class RemoteEventWorker:
+    """Redisキューのイベント実行（PROCESS_ROLE=worker）
+
+    区画（Slash専用・論理チャンネル別）毎に取り出しループを持ち、区画の実行権（リース）を
+    保持している間だけ取り出して実行します。worker数を増やしても区画内は投入順に1件ずつ
+    実行され、異なる区画は複数プロセス・ホストへ分散されます。
+    実行前にイベントへ添付されたgatewayのステートを復元します（より新しいもののみ）。
+    ハンドラがステートを変更した場合（日報後の遷移等）は版付きで記録し、gatewayへ返します。
+    Redis操作はexecutorで実行し、空の区画は新規投入の通知をブロッキングで待機します。
+    """
+
+    def __init__(
+        self,
+        journals: dict[str, "DurableEventJournal"],
+        handlers: dict[str, Callable[..., Any]],
+        deadlines: Optional[dict[EventPriority, float]] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: float = 0.5,
+        drop_notifiers: Optional[dict[Callable[..., Any], Callable[..., Any]]] = None,
+    ) -> None:
+        """RemoteEventWorker初期化
+
+        Args:
+            journals: 区画名 → Redisキュー
+            handlers: 登録名 → ハンドラ
+            deadlines: 優先度別の待機期限秒（未指定・0は期限なし）
+            worker_id: リース保持者名（未指定時はホスト名:PID）
+            poll_interval: 待機イベントが無い区画で通知を待つ最長秒数（経過後に再確認）
+            drop_notifiers: 待機期限切れで破棄した時の通知（ハンドラ → 同じ引数で呼ぶ通知関数）
+        """
+        import os
+        import socket
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._journals = dict(journals)
+        self._handlers = dict(handlers)
+        self._deadlines = dict(deadlines or {})
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._poll_interval = poll_interval
+        self._drop_notifiers = dict(drop_notifiers or {})
+        self._state_enqueued_at = 0.0  # 復元済みステートの投入時刻
+        self._state_version = 0  # workerで記録したステートの版（これより古い版のgatewayステートは無視）
+        self.metrics = EventQueueMetrics()
+        # 通知待機（BLPOP）専用スレッド（区画毎に1本・既定executorを占有しない）
+        self._wait_executor = ThreadPoolExecutor(
+            max_workers=max(1, len(self._journals)), thread_name_prefix="queue-wait"
+        )
+
+    @staticmethod
+    async def _redis(fn: Callable[..., Any], *args: Any) -> Any:
+        """同期Redis操作を既定executorで実行（イベントループを止めない）"""
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    def _restore_state(self, event: Any) -> None:
+        """イベント投入時のステートを復元（復元済みより古いもの・worker側の変更を取り込む前のものは無視）"""
+        from app import state
+
+        snapshot = event.meta.get("state")
+        if snapshot is None or event.enqueued_at < self._state_enqueued_at:
+            return
+        if event.meta.get("state_version", 0) < self._state_version:
+            return
+        state.import_state(snapshot)
+        self._state_enqueued_at = event.enqueued_at
+
+    async def run_once(self, partition: str) -> bool:
+        """区画から1件取り出して実行
+
+        ハンドラが失敗した場合は実行権を保持したままにし、可視性期限まで区画内の
+        後続イベントを取り出さない（再実行まで順序を維持する）。
+
+        Returns:
+            bool: イベントを取り出した場合True（期限切れによる破棄を含む）
 
-    async def enqueue(
-        self, priority: EventPriority, handler: Callable[..., Any], *args: Any, **kwargs: Any
-    ) -> None:
-        """イベントをキューに追加
-        
-        Args:
-            priority: イベント優先度（EventPriority）
-            handler: 実行するハンドラー関数
-            *args: ハンドラーに渡す位置引数
-            **kwargs: ハンドラーに渡すキーワード引数
-            
         Raises:
-            ValueError: handlerがcallableでない場合
+            ValueError: ハンドラ実行が失敗した場合（Fail-Fast）
         """
-        # Fail-Fast: パラメータ検証
-        if not callable(handler):
-            raise ValueError("Handler must be callable")
+        from app import logger, state
+
+        journal = self._journals[partition]
+        if not await self._redis(journal.acquire_lease, self.worker_id):
+            return False
+        event = await self._redis(journal.claim_next)
+        if event is None:
+            await self._redis(journal.release_lease, self.worker_id)
+            return False
 
-        item = EventItem(priority, handler, args, kwargs)
-        await self._queue.put((priority.value, item))
+        priority = EventPriority(event.priority)
+        waited = max(0.0, time.time() - event.enqueued_at)
+        self.metrics.record_enqueue(priority)
+        deadline = self._deadlines.get(priority, 0)
+        handler = self._handlers.get(event.handler)
+        if deadline and waited > deadline:
+            # 期限切れ: 実行せず破棄（古い自発発言の連続実行を防止）
+            self.metrics.record_expired(priority)
+            await self._redis(journal.complete, event.event_id)
+            await self._redis(journal.release_lease, self.worker_id)
+            logger.log_ok("queue", "system", "system", f"expired:{priority.name.lower()}:waited={waited:.1f}s")
+            notifier = self._drop_notifiers.get(handler)
+            if notifier is not None:
+                await notifier(*event.args, **event.kwargs)
+            return True
+        if handler is None:
+            self.metrics.record_expired(priority)
+            await self._redis(journal.complete, event.event_id)
+            await self._redis(journal.release_lease, self.worker_id)
+            logger.log_err(
+                "queue", "system", "system", f"remote_dispatch:{event.handler}",
+                "memory", f"Unknown remote handler: {event.handler}",
+            )
+            return True
+
+        self._restore_state(event)
+        restored = state.export_state()
+        self.metrics.record_start(priority, waited)
+        started = time.monotonic()
+        heartbeat = asyncio.create_task(self._heartbeat(journal, event.event_id))
+        key_token = _durable_event_key.set(f"{journal.namespace}:{event.event_id}")
+        try:
+            await handler(*event.args, **event.kwargs)
+        except Exception as e:
+            # Fail-Fast原則: 例外を再送出して処理中断
+            raise ValueError(f"Event processing failed: {e}") from e
+        finally:
+            _durable_event_key.reset(key_token)
+            heartbeat.cancel()
+        updated = state.export_state()
+        if updated != restored:
+            # ハンドラによるステート変更をgatewayへ返す
+            self._state_version = await self._redis(
+                self._journals[REMOTE_STATE_PARTITION].publish_state, updated
+            )
+        await self._redis(journal.complete, event.event_id)
+        await self._redis(journal.release_lease, self.worker_id)
+        self.metrics.record_done(priority, time.monotonic() - started)
+        return True
+
+    async def _heartbeat(self, journal: "DurableEventJournal", event_id: str) -> None:
+        """実行中は可視性期限の1/3毎に実行権・可視性期限を延長（長時間のハンドラを他workerが再実行しない）"""
+        from app import logger
+
+        interval = journal.visibility_timeout / 3
+        while True:
+            await asyncio.sleep(interval)
+            if not await self._redis(journal.renew_lease, self.worker_id, event_id):
+                logger.log_err(
+                    "queue", "system", "system", f"lease_lost:{journal.namespace}",
+                    "memory", f"worker {self.worker_id} lost the lease while running event {event_id}",
+                )
+                return
+
+    async def _run_partition(self, partition: str) -> None:
+        """区画の取り出しループ（空の場合は新規投入の通知を最長poll_interval待機）"""
+        journal = self._journals[partition]
+        loop = asyncio.get_running_loop()
+        while True:
+            if not await self.run_once(partition):
+                await loop.run_in_executor(
+                    self._wait_executor, journal.wait_for_event, self._poll_interval
+                )
 
     async def process_events(self) -> None:
-        """キュー内イベントを順次処理（直列実行・Fail-Fast）
-        
-        無限ループでキューからイベントを取得し、優先度順に直列実行します。
-        処理中は他のイベントをブロックし、エラー時はFail-Fast原則で即座に中断します。
-        
+        """全区画の取り出しループを起動（いずれかのFail-Fast停止で全体を停止）
+
         Raises:
-            ValueError: イベント処理中にエラーが発生した場合
+            ValueError: いずれかの区画でイベント処理が失敗した場合
         """
-        while True:
-            try:
-                if self._processing:
-                    await asyncio.sleep(0.01)  # 処理中は短時間待機
-                    continue
+        workers = [asyncio.create_task(self._run_partition(name)) for name in self._journals]
+        try:
+            done, _ = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
-                priority_value, item = await self._queue.get()
-                self._processing = True
 
-                # Fail-Fast: 直列実行で例外時は即中断
-                await item.handler(*item.args, **item.kwargs)
+def _create_remote_event_worker() -> Optional[RemoteEventWorker]:
+    """PROCESS_ROLE=workerの場合のみRedisキューのイベント実行を生成"""
+    from app import settings
 
-                self._queue.task_done()
-                self._processing = False
+    if settings.settings.queue.process_role != "worker":
+        return None
+    return RemoteEventWorker(
+        remote_journals,
+        _remote_handlers(),
+        deadlines=_queue_deadlines(),
+        poll_interval=settings.settings.queue.worker_poll_seconds,
+        drop_notifiers=_drop_notifiers(),
+    )
 
-            except Exception as e:
-                self._processing = False
-                # Fail-Fast原則: 例外を再送出して処理中断
-                raise ValueError(f"Event processing failed: {e}") from e
 
-    @property
-    def is_processing(self) -> bool:
-        """処理中状態の確認"""
-        return self._processing
+# Redisキューのイベント実行（PROCESS_ROLE=worker以外はNone）
+remote_event_worker = _create_remote_event_worker()
 
 
-# グローバルイベントキュー
-event_queue = EventQueue()
+async def dispatch_event(
+    channel_name: str, priority: EventPriority, handler: Callable[..., Any], *args: Any, **kwargs: Any
+) -> bool:
+    """イベント投入（QUEUE_CHANNEL_WORKERS有効時は論理チャンネル別ワーカーへ、
+    PROCESS_ROLEがgateway/workerの場合はRedisキュー経由でworkerへ）
+
+    Returns:
+        bool: 受け入れた場合True（統合・上限超過で不受理の場合False）
+    """
+    if remote_journals is not None:
+        return await publish_remote_event(channel_name, priority, handler, *args, **kwargs)
+    if channel_event_queues is not None:
+        accepted = await channel_event_queues.enqueue(channel_name, priority, handler, *args, **kwargs)
+    else:
+        accepted = await event_queue.enqueue(priority, handler, *args, **kwargs)
+    if accepted:
+        # 実行系が使用中になるため先行生成を中断（レート枠・文脈を実イベントに譲る）
+        speculative_tick_generator.cancel_inflight()
+    return accepted
+
+
+def event_pipeline_is_idle() -> bool:
+    """イベント実行系全体がアイドル状態か"""
+    if channel_event_queues is not None:
+        return channel_event_queues.is_idle
+    return event_queue.is_idle
 
 
 class TickScheduler:
@@ -373,8 +1531,19 @@ class TickScheduler:
         probability = self.get_tick_probability()
         return random.random() < probability
 
+    def has_llm_headroom(self) -> bool:
+        """LLMレート枠に自発発言分の余裕があるか（ユーザー応答用の枠を温存）"""
+        from app import supervisor
+
+        return supervisor.rate_limiter.has_headroom("auto")
+
     async def _enqueue_tick_event(self):
-        """EventQueueにtickイベントを追加"""
+        """EventQueueにtickイベントを追加（チャンネル別ワーカー・worker分離時はactive_channelへ）"""
+        if channel_event_queues is not None or remote_journals is not None:
+            from app import state
+
+            await dispatch_event(state.get_active_channel(), EventPriority.TICK, on_tick)
+            return
         await event_queue.enqueue(EventPriority.TICK, on_tick)
 
     async def start(self):
@@ -404,8 +1573,13 @@ class TickScheduler:
                 if elapsed >= max_runtime:
                     break
             
-            # 確率判定
-            if self.should_execute_tick():
+            # 確率判定（レート枠不足時はスキップしてユーザー応答用の枠を温存）
+            if not self.should_execute_tick():
+                metrics.TICKS_TOTAL.labels("skipped_probability").inc()
+            elif not self.has_llm_headroom():
+                metrics.TICKS_TOTAL.labels("skipped_headroom").inc()
+            else:
+                metrics.TICKS_TOTAL.labels("enqueued").inc()
                 await self._enqueue_tick_event()
             
             # 次のtickまで待機
@@ -420,9 +1594,173 @@ class TickScheduler:
 tick_scheduler = TickScheduler()
 
 
+@dataclass
+class PreparedTick:
+    """先行生成済みの自発発言"""
+
+    key: Tuple[str, int, str]  # (active_channel, 文脈バージョン, タスク内容)
+    result: dict[str, str]
+    created_at: float
+
+
+class SpeculativeTickGenerator:
+    """アイドル時の自発発言先行生成（TICK_SPECULATIVE）
+
+    EventQueueがアイドルの間に、active_channel向けの次のautoメッセージを
+    現在の文脈バージョンに対して先行生成します。tick発火時に文脈・active_channel・
+    タスクが生成時から変わっていなければ即座に投稿し、変わっていれば破棄します。
+
+    Features:
+        - 文脈バージョン（store.context_version）による鮮度判定
+        - tick間隔の2倍を超えた先行生成は破棄（時間帯のずれ防止）
+        - レート枠はautoの予備枠規則で待機なしに確保（ユーザー応答用の枠を温存）
+        - 生成中にイベントが投入された場合は実行中の生成を中断
+    """
+
+    def __init__(self, idle_check_interval: float = 1.0) -> None:
+        self.is_running: bool = False
+        self.idle_check_interval = idle_check_interval
+        self._prepared: Optional[PreparedTick] = None
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _current_key(self, active_channel: str) -> Tuple[str, int, str]:
+        """現在の鮮度判定キー"""
+        from app import store
+
+        return (active_channel, store.context_version(), current_task_content())
+
+    def _max_age(self) -> float:
+        """先行生成の有効期間（秒）"""
+        return tick_scheduler.get_tick_interval() * 2
+
+    def _is_fresh(self, prepared: PreparedTick, key: Tuple[str, int, str]) -> bool:
+        return prepared.key == key and time.monotonic() - prepared.created_at <= self._max_age()
+
+    def take(self, active_channel: str) -> Optional[dict[str, str]]:
+        """tick発火時に先行生成結果を取り出す（不一致時は破棄してNone）"""
+        from app import logger
+
+        prepared, self._prepared = self._prepared, None
+        if prepared is None:
+            return None
+        if self._is_fresh(prepared, self._current_key(active_channel)):
+            self.hits += 1
+            logger.log_ok("auto_tick", active_channel, "system", "speculative_hit")
+            return prepared.result
+        self.misses += 1
+        logger.log_ok("auto_tick", active_channel, "system", "speculative_discarded")
+        return None
+
+    def needs_generation(self) -> bool:
+        """先行生成が必要か（アイドル・未生成または陳腐化・レート枠あり）"""
+        from app import state
+
+        if not event_pipeline_is_idle() or not tick_scheduler.has_llm_headroom():
+            return False
+        prepared = self._prepared
+        return prepared is None or not self._is_fresh(
+            prepared, self._current_key(state.get_active_channel())
+        )
+
+    async def prepare_once(self) -> bool:
+        """次の自発発言を1件先行生成
+
+        Returns:
+            bool: 生成した場合True
+        """
+        from app import state, store, supervisor
+
+        active_channel = state.get_active_channel()
+        # 文脈読み取り前にキーを確定（読み取り中の追記は不一致として破棄される）
+        key = self._current_key(active_channel)
+        records = store.read_all()
+        context = format_context(records)
+        limits, persona, report_config = supervisor.default_prompt_inputs()
+
+        result = await supervisor.generate(
+            kind="auto",
+            channel=get_channel_id_from_name(active_channel),
+            task=key[2],
+            context=context,
+            limits=limits,
+            persona=persona,
+            report_config=report_config,
+            context_records=len(records),
+            wait_for_rate_limit=False,
+        )
+        self._prepared = PreparedTick(key=key, result=result, created_at=time.monotonic())
+        return True
+
+    async def start(self) -> None:
+        """先行生成ループ開始（アイドル監視）
+
+        Raises:
+            RuntimeError: 既に動作中の場合
+        """
+        if self.is_running:
+            raise RuntimeError("SpeculativeTickGenerator is already running")
+
+        from app import logger
+
+        self.is_running = True
+        try:
+            while self.is_running:
+                if self.needs_generation():
+                    try:
+                        await self._run_prepare()
+                    except ValueError as e:
+                        # 先行生成は最適化のため失敗しても継続（tick時に通常生成）
+                        logger.log_err("auto_tick", "system", "system",
+                                       "speculative", "plan", str(e))
+                await asyncio.sleep(self.idle_check_interval)
+        finally:
+            self.cancel_inflight()
+            self.is_running = False
+
+    async def _run_prepare(self) -> None:
+        """先行生成をタスクとして実行し、完了まで実行系のアイドルを監視"""
+        task = asyncio.create_task(self.prepare_once())
+        self._task = task
+        try:
+            while not task.done():
+                await asyncio.wait({task}, timeout=self.idle_check_interval)
+                if not task.done() and not event_pipeline_is_idle():
+                    self.cancel_inflight()
+        finally:
+            if not task.done():
+                task.cancel()
+            self._task = None
+        if not task.cancelled():
+            task.result()
+
+    def cancel_inflight(self) -> None:
+        """実行中の先行生成を中断（イベント投入時・停止時）"""
+        from app import logger
+
+        task = self._task
+        if task is None or task.done():
+            return
+        task.cancel()
+        logger.log_ok("auto_tick", "system", "system", "speculative_cancelled")
+
+    def stop(self) -> None:
+        """先行生成ループ停止"""
+        self.is_running = False
+        self.cancel_inflight()
+
+
+# グローバル先行生成インスタンス
+speculative_tick_generator = SpeculativeTickGenerator()
+
+
 class DailyReportScheduler:
     """日報スケジューラ（11-1：JST 06:00に1日1回のみ実行）
     
+    非推奨: main()はModeTrackingScheduler（期限駆動・日報統合）を使用します。
+    後方互換のため残しています。
+    
     毎日JST 06:00に1回だけ日報を生成する機能を提供します。
     システム起動が06:00後の場合はバックフィル無し（スキップ）で動作し、
     同日内の重複実行を防止する仕組みを持ちます。
@@ -589,7 +1927,8 @@ class ModeTrackingScheduler:
         - 06:00には日報生成を実行
     
     Features:
-        - 1分間隔での時刻監視による正確なモード切り替え
+        - 次の切り替え時刻（state.next_transition）までのみ待機する期限駆動（1日数回の起床）
+        - 壁時計との再同期による時計ずれ補正・遅延起床時の追いつき（トリガー取りこぼし無し）
         - 不要な更新の回避（モードが変更済みの場合はスキップ）
         - 06:00に1日1回のみ日報実行（重複実行防止機能）
         - バックフィル無し（06:00後起動時はスキップ）
@@ -620,17 +1959,21 @@ class ModeTrackingScheduler:
         # 起動時刻を現在のJST時刻で記録（state.get_current_jst_time()を使用）
         from app import state
         self._startup_time: datetime = state.get_current_jst_time()  # JST起動時刻  # JST起動時刻
-        
+        self.wakeups: int = 0  # 待機からの起床回数（再同期を含む）
+
+    # 長時間待機の分割上限（秒）: 壁時計との再同期間隔（時計ずれ・時刻補正への追従）
+    RESYNC_SECONDS = 3600.0
+
     async def start(self) -> None:
-        """スケジューラー開始（監視ループ）
+        """スケジューラー開始（期限駆動ループ）
         
-        1分間隔でモード追従を監視し、時刻に応じたモード更新を行います。
-        すでに動作中の場合はエラーとなります。
+        起動時に現在時刻でモード追従・日報判定を行った後、次の切り替え時刻まで待機し、
+        起床毎に現在時刻からモードを更新します。すでに動作中の場合はエラーとなります。
         
         Monitoring Process:
-            1. _monitoring_iteration()を1分間隔で実行
-            2. モード更新チェック（必要時のみstate更新）
-            3. 06:00時の日報実行チェック
+            1. _monitoring_iteration()を起動時に1回実行
+            2. state.next_transition()で次の切り替え時刻を算出し、_sleep_until()で待機
+            3. _on_transition()でモード更新（遅延起床時は現在のモードへ追いつき）・日報実行
             
         Raises:
             RuntimeError: 既にスケジューラが動作中の場合
@@ -645,12 +1988,71 @@ class ModeTrackingScheduler:
         self.is_running = True
         
         try:
-            # 1分間隔で監視（モード切り替えタイミング検出のため）
+            from app import state
+
+            # 起動時点のモード反映（PROCESSING_ATの分内の起動はここで日報判定）
+            await self._monitoring_iteration()
             while self.is_running:
-                await self._monitoring_iteration()
-                await asyncio.sleep(60)  # 1分待機
+                # 次の切り替え時刻まで待機（日報の長時間化等で過ぎていれば即時）
+                deadline = state.next_transition(state.get_current_jst_time())
+                await self._sleep_until(deadline)
+                if not self.is_running:
+                    break
+                await self._on_transition(deadline)
         finally:
             self.is_running = False
+
+    async def _sleep_until(self, deadline: datetime) -> None:
+        """指定時刻（JST）まで待機
+
+        asyncio.sleepは単調時計のため、RESYNC_SECONDS毎および起床時に壁時計から残り時間を
+        再計算します（時計ずれ・時刻補正で早く起床した場合は残りを再度待機）。
+        """
+        from app import state
+
+        while self.is_running:
+            remaining = (deadline - state.get_current_jst_time()).total_seconds()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, self.RESYNC_SECONDS))
+            self.wakeups += 1
+
+    async def _on_transition(self, deadline: datetime) -> None:
+        """切り替え時刻到達時の処理
+
+        モードは起床時点の現在時刻から判定します（遅延起床で次の区間に入っていれば
+        そのモードへ追いつく）。日報はPROCESSING_ATの期限で起床した場合、
+        遅延起床でも実行します（分単位一致に依存しない）。
+
+        Args:
+            deadline: 待機していた切り替え時刻
+
+        Raises:
+            Exception: on_report_0600実行でエラーが発生した場合（Fail-Fast）
+        """
+        self.update_mode_from_time()
+        if self._is_report_deadline_due(deadline):
+            await self._execute_daily_report()
+            self._last_report_date = deadline.date().strftime("%Y-%m-%d")
+            # 日報中に次の区間へ入った場合の追従
+            self.update_mode_from_time()
+
+    def _is_report_deadline_due(self, deadline: datetime) -> bool:
+        """切り替え時刻が未実行の日報時刻かどうか判定
+
+        以下の条件をすべて満たす場合のみTrueを返します：
+        1. 期限がPROCESSING_AT（06:00）
+        2. 期限がシステム起動後（バックフィル無し原則）
+        3. 期限の日付でまだ実行されていない（重複実行防止）
+        """
+        from app import settings
+
+        hour, minute = map(int, settings.settings.schedule.processing_at.split(":"))
+        if (deadline.hour, deadline.minute) != (hour, minute):
+            return False
+        if deadline <= self._startup_time:
+            return False
+        return self._last_report_date != deadline.date().strftime("%Y-%m-%d")
     
     def stop(self) -> None:
         """スケジューラー停止
@@ -659,8 +2061,8 @@ class ModeTrackingScheduler:
         
         Implementation:
             - is_runningフラグをFalseに設定
-            - 次回ループチェック時に監視が終了
-            - 現在の_monitoring_iteration()は完了まで継続
+            - 待機中の場合は次回の起床時（最大RESYNC_SECONDS後）に監視が終了
+            - 現在の_on_transition()は完了まで継続
             
         Note:
             このメソッドは同期的で即座に復帰しますが、実際の停止は
@@ -673,7 +2075,7 @@ class ModeTrackingScheduler:
         
         現在時刻からモードを判定し、必要に応じてstate更新を行います。
         06:00の場合は日報実行も行います（13-2追加）。
-        1分間隔の監視ループから呼び出されます。
+        起動時に1回呼び出されます（以降は_on_transition()）。
         
         Processing Steps:
             1. モード更新チェック（update_mode_from_time）
@@ -702,7 +2104,7 @@ class ModeTrackingScheduler:
             - update_mode()内でactive_channelも自動更新される
             
         Note:
-            このメソッドはスケジューラの監視ループから1分間隔で呼び出されます。
+            このメソッドは起動時と各切り替え時刻の到達時に呼び出されます。
         """
         from app import state
         
@@ -795,6 +2197,209 @@ class ModeTrackingScheduler:
 mode_tracking_scheduler = ModeTrackingScheduler()
 
 
+def format_context(context_records: list) -> str:
+    """Redis全文脈をプロンプト用テキストに整形（"agent: text" を改行区切り）"""
+    # Handle both Record objects and dict formats for testing compatibility
+    context_lines = []
+    for r in context_records:
+        if hasattr(r, "agent"):  # Record object
+            context_lines.append(f"{r.agent}: {r.text}")
+        else:  # dict format (for tests)
+            context_lines.append(f"{r['agent']}: {r['text']}")
+    return "\n".join(context_lines)
+
+
+def current_task_content() -> str:
+    """LLMに渡す現在のタスク内容（未設定時は会話継続）"""
+    from app import state
+
+    return state.get_state().task.content or "自然な会話を継続"
+
+
+# 生成中のTyping再送間隔（Discordの表示は約10秒で消えるため、その手前で再送）
+TYPING_KEEPALIVE_SECONDS = 8.0
+
+
+def provisional_typing_bot(llm_kind: str, actor: str) -> str:
+    """speaker確定前に仮のTypingを表示するBot（report・Bot起点はそのBot、他はspectra）"""
+    if llm_kind == "report":
+        return "spectra"
+    return actor if actor in ("spectra", "lynq", "paz") else "spectra"
+
+
+class TypingKeepAlive:
+    """LLM生成中のTyping表示維持（DISCORD_TYPING_PIPELINE）
+
+    イベント取り出し直後に仮のBotでTypingを開始し、生成中はinterval毎に再送します。
+    speaker確定時（ストリーミング時は生成途中）に即座に切り替え、finish()で
+    speakerのTyping送信完了を保証してから停止するため、Typing→Sendの順序は従来通りです。
+    """
+
+    def __init__(self, channel_id: str, interval: float = TYPING_KEEPALIVE_SECONDS) -> None:
+        self.channel_id = channel_id
+        self.interval = interval
+        self._bot: Optional[str] = None
+        self._changed = asyncio.Event()
+        self._typed = asyncio.Event()  # 現在のBotのTyping送信が完了済み
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def bot(self) -> Optional[str]:
+        """現在Typingを表示しているBot"""
+        return self._bot
+
+    def start(self, bot: str) -> None:
+        """仮のBotでTyping維持を開始"""
+        if self._task is not None:
+            raise RuntimeError("TypingKeepAlive is already started")
+        self._bot = bot
+        self._task = asyncio.create_task(self._run())
+
+    def switch(self, bot: str) -> None:
+        """Typing表示Botを切り替え（即座に再送）"""
+        if bot != self._bot:
+            self._bot = bot
+            self._typed.clear()
+            self._changed.set()
+
+    async def _run(self) -> None:
+        from app import discord
+
+        while True:
+            bot = self._bot
+            self._changed.clear()
+            await discord.typing(bot, self.channel_id)
+            if bot == self._bot:
+                self._typed.set()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def finish(self, speaker: str) -> None:
+        """speakerのTyping送信完了を待って停止（Stage 3）
+
+        Raises:
+            Exception: Typing送信で発生したエラー（Fail-Fast）
+        """
+        if self._task is None:
+            raise RuntimeError("TypingKeepAlive is not started")
+        self.switch(speaker)
+        typed = asyncio.ensure_future(self._typed.wait())
+        try:
+            await asyncio.wait({typed, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            typed.cancel()
+        task = self._task
+        if task.done():
+            self._task = None
+            task.result()  # Typing送信エラーを再送出
+            return
+        await self.stop()
+
+    async def stop(self) -> None:
+        """Typing維持を停止（送信途中のTypingは破棄）"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # エラー経路での停止のみ: 元の例外を優先するため送信エラーは握りつぶす
+            pass
+
+
+async def _generate_with_typing(llm_kind: str, llm_channel: str, actor: str) -> dict[str, str]:
+    """common_sequence Stage 1-3: Redis全文読み → LLM生成 → Discord typing
+
+    DISCORD_TYPING_PIPELINE有効時は生成前から仮のTypingを表示・維持し、
+    GEMINI_STREAMING有効時はspeaker確定時点でTypingを切り替えます。
+    """
+    from app import discord, settings, store, supervisor
+
+    keepalive: Optional[TypingKeepAlive] = None
+    if settings.settings.discord.typing_pipeline:
+        keepalive = TypingKeepAlive(llm_channel, settings.settings.discord.typing_keepalive_seconds)
+        keepalive.start(provisional_typing_bot(llm_kind, actor))
+
+    try:
+        # Stage 1: Redis 全文読み
+        context_records = store.read_all()
+        context = format_context(context_records)
+
+        # Stage 2: LLM 生成
+        task_content = current_task_content()
+
+        # settings由来の制限値・ペルソナ・レポート設定（起動後一度だけ構築）
+        limits, persona, report_config = supervisor.default_prompt_inputs()
+
+        if settings.settings.ai_service.streaming:
+            # ストリーミング生成: speaker確定時点でTypingを先行送信（体感速度向上）
+            typing_tasks: dict[str, asyncio.Task] = {}
+
+            def _on_speaker(speaker: str) -> None:
+                if keepalive is not None:
+                    keepalive.switch(speaker)
+                    return
+                typing_tasks[speaker] = asyncio.create_task(
+                    discord.typing(speaker, llm_channel)
+                )
+
+            try:
+                result = await supervisor.generate_stream(
+                    kind=llm_kind,
+                    channel=llm_channel,
+                    task=task_content,
+                    context=context,
+                    limits=limits,
+                    persona=persona,
+                    report_config=report_config,
+                    on_speaker=_on_speaker,
+                    context_records=len(context_records),
+                )
+            except BaseException:
+                # 失敗・中断（Tickの中断によるCancelledErrorを含む）時は先行Typingを止める
+                for pending in typing_tasks.values():
+                    pending.cancel()
+                raise
+
+            # Stage 3: Discord typing（先行送信済みなら完了を待つのみ）
+            early_typing = typing_tasks.get(result["speaker"])
+            if keepalive is not None:
+                await keepalive.finish(result["speaker"])
+            elif early_typing is not None:
+                await early_typing
+            else:
+                await discord.typing(result["speaker"], llm_channel)
+        else:
+            result = await supervisor.generate(
+                kind=llm_kind,
+                channel=llm_channel,
+                task=task_content,
+                context=context,
+                limits=limits,
+                persona=persona,
+                report_config=report_config,
+                context_records=len(context_records),
+            )
+
+            # Stage 3: Discord typing（維持中ならspeakerへ切り替えて送信完了を待つ）
+            if keepalive is not None:
+                await keepalive.finish(result["speaker"])
+            else:
+                await discord.typing(result["speaker"], llm_channel)
+
+        return result
+
+    except BaseException:
+        if keepalive is not None:
+            await keepalive.stop()
+        raise
+
+
 async def common_sequence(
     event_type: str,
     channel: str,
@@ -802,6 +2407,7 @@ async def common_sequence(
     payload_summary: str,
     llm_kind: str,
     llm_channel: str,
+    prepared_result: Optional[dict[str, str]] = None,
 ) -> None:
     """7-2: 共通シーケンス実行（Redis→LLM→Typing→Send→Redis→log_ok）
     
@@ -816,6 +2422,7 @@ async def common_sequence(
         payload_summary: ペイロード要約
         llm_kind: LLM種別（reply|auto|report）
         llm_channel: Discord チャンネル ID
+        prepared_result: 先行生成済みの {speaker, text}（指定時はStage 1-2を省略）
         
     Raises:
         SystemExit: 任意の段階でエラーが発生した場合（Fail-Fast原則）
@@ -826,51 +2433,22 @@ async def common_sequence(
         - typing: Discord typing エラー（Stage 3）
         - send: Discord send エラー（Stage 4）
     """
-    from app import store, supervisor, discord, logger, settings, state
+    from app import discord, logger, store
     from app.error_stages import determine_error_stage
 
     try:
-        # Stage 1: Redis 全文読み
-        context_records = store.read_all()
-        # Handle both Record objects and dict formats for testing compatibility
-        context_lines = []
-        for r in context_records:
-            if hasattr(r, "agent"):  # Record object
-                context_lines.append(f"{r.agent}: {r.text}")
-            else:  # dict format (for tests)
-                context_lines.append(f"{r['agent']}: {r['text']}")
-        context = "\n".join(context_lines)
-
-        # Stage 2: LLM 生成
-        current_state = state.get_state()
-        task_content = current_state.task.content or "自然な会話を継続"
-
-        # settings から制限値を取得
-        limits = {
-            "cc": settings.settings.channel_limits.limit_cc,
-            "cr": settings.settings.channel_limits.limit_cr,
-            "dev": settings.settings.channel_limits.limit_dev,
-            "lo": settings.settings.channel_limits.limit_lo,
-        }
-
-        # ペルソナとレポート設定（基本実装）
-        persona = {"default": "Discord Multi-Agent System"}
-        report_config = {"format": "daily", "max_chars": 500}
-
-        result = await supervisor.generate(
-            kind=llm_kind,
-            channel=llm_channel,
-            task=task_content,
-            context=context,
-            limits=limits,
-            persona=persona,
-            report_config=report_config,
-        )
+        if prepared_result is not None:
+            # 先行生成済み（Stage 1-2 省略・文脈とactive_channelの一致は呼び出し側で確認済み）
+            result = prepared_result
 
-        # Stage 3: Discord typing
-        await discord.typing(result["speaker"], llm_channel)
+            # Stage 3: Discord typing
+            await discord.typing(result["speaker"], llm_channel)
+        else:
+            # Stage 1-3: 文脈読み取り・LLM生成・Discord typing
+            result = await _generate_with_typing(llm_kind, llm_channel, actor)
 
-        # Stage 4: Discord send
+        # Stage 4: Discord send（以降はTick中断の対象外）
+        enter_non_preemptible_stage()
         await discord.send(result["speaker"], llm_channel, result["text"])
 
         # Stage 5: Redis 追記
@@ -928,6 +2506,33 @@ def parse_slash_command(
     return {"channel": channel, "content": content}
 
 
+def _apply_slash_state(channel: Optional[str], content: Optional[str]) -> None:
+    """検証済みSlash引数でステートを更新（task・active_channelを即座上書き）"""
+    from app import state
+
+    state.update_task(content=content, channel=channel)
+    if channel is not None:
+        # 即座上書き
+        state.set_active_channel(channel)
+
+
+async def accept_slash_remote(channel: Optional[str], content: Optional[str]) -> bool:
+    """gateway: Slashのステート更新を即時適用し、決定通知はworkerへ委譲
+
+    以降に投入されるイベント（Tick等）へ更新後のステートを添付するため、
+    gateway側でも検証・ステート更新を行います（worker側の再適用は冪等）。
+
+    Returns:
+        bool: 決定通知をworkerへ投入できた場合True（受け入れ上限で不受理の場合False）
+
+    Raises:
+        ValueError: Slash引数の検証に失敗した場合
+    """
+    parsed = parse_slash_command(channel, content)
+    _apply_slash_state(parsed["channel"], parsed["content"])
+    return await dispatch_event("command-center", EventPriority.SLASH, on_slash, channel, content)
+
+
 async def execute_slash_command(
     channel: Optional[str] = None, content: Optional[str] = None
 ) -> None:
@@ -947,7 +2552,7 @@ async def execute_slash_command(
     Raises:
         SystemExit: エラー時（Fail-Fast）
     """
-    from app import state, store, logger, settings
+    from app import logger, settings
 
     try:
         # 1. バリデーション
@@ -956,10 +2561,7 @@ async def execute_slash_command(
         validated_content = parsed["content"]
 
         # 2. 状態更新
-        state.update_task(content=validated_content, channel=validated_channel)
-        if validated_channel is not None:
-            # 即座上書き
-            state.set_active_channel(validated_channel)
+        _apply_slash_state(validated_channel, validated_content)
 
         # 3. 決定通知用のペイロード作成
         if validated_channel and validated_content:
@@ -973,7 +2575,7 @@ async def execute_slash_command(
 
         # 4. Redis追記（ユーザー入力）
         user_input_summary = f"channel={validated_channel}, content={validated_content}"
-        store.append("user", "command-center", f"/task commit {user_input_summary}")
+        append_event_record("user", "command-center", f"/task commit {user_input_summary}", "task_commit")
 
         # 5. 決定通知（command-centerにSpectra名義）
         await common_sequence(
@@ -1016,9 +2618,61 @@ async def execute_slash_command(
         sys.exit(1)
 
 
+def _create_loop_monitor() -> Optional["LoopMonitor"]:
+    """LOOP_MONITOR有効時のみイベントループ監視を生成"""
+    from app import settings
+
+    logging_config = settings.settings.logging
+    if not logging_config.loop_monitor:
+        return None
+    from app.loop_monitor import LoopMonitor
+
+    return LoopMonitor(
+        lag_interval=logging_config.loop_lag_interval_seconds,
+        slow_callback=logging_config.loop_slow_callback_seconds,
+        summary_interval=logging_config.loop_summary_interval_seconds,
+    )
+
+
+# イベントループ監視（無効時はNone）
+loop_monitor = _create_loop_monitor()
+
+
+def _event_metrics_sources() -> list[EventQueueMetrics]:
+    """本プロセスのイベント実行系の計測（単一キュー・チャンネル別・worker）"""
+    sources = [event_queue.metrics]
+    if channel_event_queues is not None:
+        sources.append(channel_event_queues.slash_queue.metrics)
+        sources.extend(queue.metrics for queue in channel_event_queues.queues.values())
+    if remote_event_worker is not None:
+        sources.append(remote_event_worker.metrics)
+    return sources
+
+
+def _collect_metrics() -> None:
+    """取得時のメトリクス反映（キュー深さ・イベント累計・モード・先行生成の的中数）"""
+    from app import state
+
+    sources = _event_metrics_sources()
+    for priority in EventPriority:
+        label = priority.name.lower()
+        metrics.EVENT_QUEUE_DEPTH.labels(label).set(sum(m.depth[priority] for m in sources))
+        for outcome in ("enqueued", "processed", "rejected", "coalesced", "expired", "preempted"):
+            total = sum(getattr(m, outcome)[priority] for m in sources)
+            metrics.EVENTS_TOTAL.labels(label, outcome).set(total)
+    current_mode = state.get_current_mode()
+    for mode in state.Mode:
+        metrics.MODE.labels(mode.value).set(1 if mode is current_mode else 0)
+    metrics.SPECULATIVE_TICKS_TOTAL.labels("hit").set(speculative_tick_generator.hits)
+    metrics.SPECULATIVE_TICKS_TOTAL.labels("miss").set(speculative_tick_generator.misses)
+
+
+metrics.registry.add_collector(_collect_metrics)
+
+
 async def main() -> None:
     """メインアプリケーション起動 - 全並行タスク統合実行"""
-    from app.discord import start_spectra_client
+    from app.discord import start_spectra_client, get_http_client, close_http_client
     from app.settings import settings
     
     print("🚀 Discord Multi-Agent System 起動開始")
@@ -1026,26 +2680,80 @@ async def main() -> None:
     print(f"⏰ Tick間隔: {settings.tick.interval_sec_dev}秒 (確率: {settings.tick.prob_dev})")
     print(f"⏱️  最大テスト時間: {settings.tick.max_test_minutes}分")
     
-    try:
-        # 全並行タスクを同時起動
-        print("🔄 並行タスク起動中...")
-        await asyncio.gather(
+    # プロンプトテンプレート事前コンパイル（全kind×全チャンネル）
+    from app import supervisor
+    channel_ids = [get_channel_id_from_name(name) for name in CHANNEL_NAMES]
+    template_count = supervisor.warm_prompt_templates(channel_ids)
+    print(f"🧩 プロンプトテンプレート: {template_count}件を事前コンパイル")
+
+    # Discord REST共有クライアント生成（接続プール・keep-alive・任意でHTTP/2）
+    get_http_client()
+    print(f"🔌 Discord REST: 共有クライアント (HTTP/2: {settings.discord.http2})")
+
+    process_role = settings.queue.process_role
+    print(f"🧭 プロセス役割: {process_role}")
+
+    # 永続キュー: 前回停止時の未完了イベントを復元（ワーカー開始前）
+    if settings.queue.durable and process_role == "all":
+        restored = await (channel_event_queues or event_queue).restore()
+        print(f"💾 永続キュー: 未完了イベント{restored}件を復元")
+
+    if process_role == "worker":
+        # worker: Redisキューのイベント実行のみ（Gateway接続・スケジューラなし）
+        print(f"🛠️  worker: {remote_event_worker.worker_id}")
+        tasks = [remote_event_worker.process_events()]
+    elif process_role == "gateway":
+        tasks = [
+            # Discord Gateway受信（イベントはRedisキューへ投入）
+            start_spectra_client(),
+            # 自発発言スケジューラ（Tickイベントをworkerへ投入）
+            tick_scheduler.start(),
+            # モード追従・日報統合スケジューラ（ステートの保持者・日報生成はworkerへ投入）
+            mode_tracking_scheduler.start(),
+        ]
+    else:
+        tasks = [
             # Discord Gateway受信
             start_spectra_client(),
-            # イベント直列実行ループ  
-            event_queue.process_events(),
+            # イベント直列実行ループ（チャンネル別ワーカー時はチャンネル毎に直列）
+            (channel_event_queues or event_queue).process_events(),
             # 自発発言スケジューラ
             tick_scheduler.start(),
             # モード追従・日報統合スケジューラ
             mode_tracking_scheduler.start(),
-            return_exceptions=True
-        )
+        ]
+    if loop_monitor is not None:
+        # イベントループ遅延・長時間占有の監視
+        tasks.append(loop_monitor.start())
+    if settings.tick.speculative and process_role == "all":
+        # アイドル時の自発発言先行生成
+        tasks.append(speculative_tick_generator.start())
+
+    metrics_server = None
+    if settings.logging.metrics_port:
+        # Prometheus形式メトリクスエンドポイント（ローカル）
+        metrics_server = metrics.MetricsServer(metrics.registry)
+        metrics_url = await metrics_server.start(settings.logging.metrics_host, settings.logging.metrics_port)
+        print(f"📈 メトリクス: {metrics_url}")
+
+    try:
+        # 全並行タスクを同時起動
+        print("🔄 並行タスク起動中...")
+        await asyncio.gather(*tasks, return_exceptions=True)
     except Exception as e:
         print(f"❌ システム起動エラー: {e}")
         import sys
         sys.exit(1)
+    finally:
+        await user_burst_coalescer.close()
+        if metrics_server is not None:
+            await metrics_server.stop()
+        await close_http_client()
 
 
 if __name__ == "__main__":
+    from app import runtime
+    from app.settings import settings
+
     print("🎯 アプリケーション開始")
-    asyncio.run(main())
+    runtime.run(main, settings.runtime.event_loop, settings.runtime.executor_max_workers)
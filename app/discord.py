@@ -1,12 +1,245 @@
 # Discord Interface - Discord送受信管理
 # 受信: discord.py / 送信: httpx REST API
 
+import asyncio
+import importlib.util
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
 import discord
 import httpx
+from app import metrics
 from app.settings import settings
+from app.logger import log_err, log_ok
 import app.app as app_module
 
 
+DISCORD_API_BASE = "https://discord.com/api/v10"
+
+# プロセス共有のREST送信クライアント（接続プール・keep-alive）
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """設定に基づく共有クライアント生成
+
+    Raises:
+        ValueError: DISCORD_HTTP2=true で h2 パッケージが無い場合
+    """
+    http2 = settings.discord.http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        raise ValueError("DISCORD_HTTP2 requires the 'h2' package (pip install httpx[http2])")
+
+    timeout_seconds = settings.discord.http_timeout_seconds
+    max_connections = settings.discord.http_max_connections
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(timeout_seconds, connect=min(5.0, timeout_seconds)),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60.0,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """共有REST送信クライアントの取得（初回・イベントループ変更時に生成）
+
+    httpxの接続は生成元イベントループに紐づくため、ループ毎に1つ保持します。
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = _create_http_client()
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """共有REST送信クライアントの終了（シャットダウン時）"""
+    global _http_client, _http_client_loop
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _header(response: httpx.Response, name: str) -> Optional[str]:
+    """レスポンスヘッダ値の取得（文字列以外はNone）"""
+    headers = getattr(response, "headers", None)
+    value = headers.get(name) if headers is not None else None
+    return value if isinstance(value, str) else None
+
+
+def _header_float(response: httpx.Response, name: str) -> Optional[float]:
+    value = _header(response, name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class RateLimitBucket:
+    """Discord REST レート制限バケット（Bot×ルート×チャンネル単位）"""
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: float = 0.0  # monotonic時刻
+    bucket_id: Optional[str] = None  # X-RateLimit-Bucket
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class DiscordRateLimiter:
+    """Discord REST のBot・ルート単位レート制限管理
+
+    X-RateLimit-* ヘッダから残数とリセット時刻を追跡し、残数が尽きたバケットへの
+    リクエストはリセットまで事前に待機させます。429応答ではretry_after（global時は
+    Bot全体）を待って再送します。待機がmax_waitを超える場合はValueErrorとします。
+    """
+
+    def __init__(
+        self,
+        max_wait: float = 30.0,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[Tuple[str, str, str], RateLimitBucket] = {}
+        self._global_reset: Dict[str, float] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bucket(self, bot: str, route: str, major: str) -> RateLimitBucket:
+        """バケット取得（未知なら生成）"""
+        # バケットのロックはイベントループに紐づくため、ループ変更時は状態を破棄
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._buckets.clear()
+            self._global_reset.clear()
+            self._loop = loop
+
+        key = (bot, route, major)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = RateLimitBucket()
+        return bucket
+
+    def _delay(self, bot: str, bucket: RateLimitBucket) -> float:
+        """送信前に必要な待機秒数（global制限・バケット枯渇）"""
+        now = self._clock()
+        delay = max(0.0, self._global_reset.get(bot, 0.0) - now)
+        if bucket.remaining is not None and bucket.remaining <= 0 and bucket.reset_at > now:
+            delay = max(delay, bucket.reset_at - now)
+        return delay
+
+    async def _wait(self, bot: str, route: str, delay: float) -> None:
+        if delay > self.max_wait:
+            raise ValueError(
+                f"Discord rate limit wait too long: {bot} {route} {delay:.2f}s (max {self.max_wait}s)"
+            )
+        await self._sleep(delay)
+        log_ok("discord", "system", bot, f"rate_limit_wait:{route}:{delay:.2f}s")
+
+    def _update(self, bucket: RateLimitBucket, response: httpx.Response) -> None:
+        """X-RateLimit-* ヘッダからバケット状態を更新"""
+        limit = _header_float(response, "X-RateLimit-Limit")
+        remaining = _header_float(response, "X-RateLimit-Remaining")
+        reset_after = _header_float(response, "X-RateLimit-Reset-After")
+        if reset_after is None:
+            reset_epoch = _header_float(response, "X-RateLimit-Reset")
+            if reset_epoch is not None:
+                reset_after = max(0.0, reset_epoch - time.time())
+        if limit is not None:
+            bucket.limit = int(limit)
+        if remaining is not None:
+            bucket.remaining = int(remaining)
+        if reset_after is not None:
+            bucket.reset_at = self._clock() + reset_after
+        bucket.bucket_id = _header(response, "X-RateLimit-Bucket") or bucket.bucket_id
+
+    def _retry_after(self, bot: str, bucket: RateLimitBucket, response: httpx.Response) -> float:
+        """429応答の待機秒数を反映（global時はBot全体を停止）"""
+        retry_after = _header_float(response, "Retry-After")
+        if retry_after is None:
+            retry_after = 1.0
+        is_global = _header(response, "X-RateLimit-Global") is not None
+        try:
+            body = response.json()
+        except Exception:
+            body = None
+        if isinstance(body, dict):
+            if isinstance(body.get("retry_after"), (int, float)):
+                retry_after = float(body["retry_after"])
+            is_global = is_global or body.get("global") is True
+
+        reset_at = self._clock() + retry_after
+        if is_global:
+            self._global_reset[bot] = reset_at
+        else:
+            bucket.remaining = 0
+            bucket.reset_at = max(bucket.reset_at, reset_at)
+        return retry_after
+
+    async def request(
+        self,
+        bot: str,
+        route: str,
+        major: str,
+        send_request: Callable[[], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        """レート制限を考慮したリクエスト実行
+
+        Args:
+            bot: Bot名（トークン単位の制限）
+            route: ルート名（typing|messages など）
+            major: メジャーパラメータ（チャンネルID）
+            send_request: リクエスト送信コルーチン関数
+
+        Returns:
+            httpx.Response: 最終レスポンス（再送上限到達時は429のまま返す）
+
+        Raises:
+            ValueError: 必要な待機がmax_waitを超える場合
+        """
+        bucket = self.bucket(bot, route, major)
+        attempt = 0
+        while True:
+            # 同一バケットの送信を直列化し、残数を楽観的に消費
+            async with bucket.lock:
+                delay = self._delay(bot, bucket)
+                if delay > 0:
+                    await self._wait(bot, route, delay)
+                if bucket.remaining is not None and bucket.remaining > 0:
+                    bucket.remaining -= 1
+
+            started = time.monotonic()
+            response = await send_request()
+            metrics.DISCORD_REQUEST_SECONDS.labels(route, response.status_code).observe(
+                time.monotonic() - started
+            )
+            self._update(bucket, response)
+            if response.status_code != 429 or attempt >= self.max_retries:
+                return response
+
+            attempt += 1
+            metrics.DISCORD_RATE_LIMITED_TOTAL.labels(route).inc()
+            retry_after = self._retry_after(bot, bucket, response)
+            log_ok("discord", "system", bot, f"rate_limited:{route}:retry_after={retry_after:.2f}s")
+
+
+# Bot・ルート単位のDiscord RESTレート制限（プロセス共有）
+rate_limiter = DiscordRateLimiter(
+    max_wait=settings.discord.rate_limit_max_wait_seconds,
+    max_retries=settings.discord.rate_limit_max_retries,
+)
+
+
 class SpectraDiscordClient(discord.Client):
     """Spectra Bot Discord受信専用クライアント"""
 
@@ -56,11 +289,11 @@ class SpectraDiscordClient(discord.Client):
             # 環境に応じてギルド登録（dev）またはグローバル登録（prod）を選択
             if settings.environment.env == "dev":
                 # 開発環境：ギルド登録（即座反映）
-                url = f"https://discord.com/api/v10/applications/{self.user.id}/guilds/{settings.discord.guild_id}/commands"
+                url = f"{DISCORD_API_BASE}/applications/{self.user.id}/guilds/{settings.discord.guild_id}/commands"
                 registration_type = "Guild"
             else:
                 # 本番環境：グローバル登録（遅延反映）
-                url = f"https://discord.com/api/v10/applications/{self.user.id}/commands"
+                url = f"{DISCORD_API_BASE}/applications/{self.user.id}/commands"
                 registration_type = "Global"
             
             headers = {
@@ -68,12 +301,11 @@ class SpectraDiscordClient(discord.Client):
                 "Content-Type": "application/json"
             }
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, headers=headers, json=task_command)
-                if response.status_code in [200, 201]:
-                    print(f"✅ /task スラッシュコマンド登録完了 ({registration_type})")
-                else:
-                    print(f"❌ スラッシュコマンド登録エラー ({registration_type}): {response.status_code} - {response.text}")
+            response = await get_http_client().post(url, headers=headers, json=task_command)
+            if response.status_code in [200, 201]:
+                print(f"✅ /task スラッシュコマンド登録完了 ({registration_type})")
+            else:
+                print(f"❌ スラッシュコマンド登録エラー ({registration_type}): {response.status_code} - {response.text}")
                     
         except Exception as e:
             print(f"❌ スラッシュコマンド登録でエラー: {e}")
@@ -92,8 +324,8 @@ class SpectraDiscordClient(discord.Client):
         if not message.author:
             raise ValueError("Message author is missing")
 
-        # app.pyのon_userに委譲
-        await app_module.on_user(
+        # 軽量なイベントとしてキューへ投入（処理はEventQueueで直列実行）
+        await app_module.enqueue_user_message(
             channel=str(message.channel.id),
             text=message.content,
             user_id=str(message.author.id),
@@ -119,15 +351,87 @@ class SpectraDiscordClient(discord.Client):
                         if isinstance(opt, dict) and "name" in opt and "value" in opt:
                             options[opt["name"]] = opt["value"]
 
-                # app.pyのon_slashに委譲
-                await app_module.on_slash(
-                    channel=options.get("channel"), content=options.get("content")
-                )
+                # 3秒以内の応答期限に備えて即座にdefer（LLM処理時間に依存させない）
+                await interaction.response.defer(ephemeral=True, thinking=True)
+
+                if app_module.remote_journals is not None:
+                    # gateway: ステート更新のみ適用してworkerへ委譲し、投入完了で応答を編集
+                    if await app_module.accept_slash_remote(options.get("channel"), options.get("content")):
+                        await self._edit_accepted_response(interaction)
+                    else:
+                        await self._edit_accepted_response(interaction, app_module.SLASH_DROPPED_MESSAGE)
+                    return
 
-                # 即座にレスポンス（最小実装）
-                await interaction.response.send_message(
-                    "受け付けました", ephemeral=True
+                # Slash処理は最高優先度でイベントキューへ委譲し、完了後に応答を編集
+                # （永続化できるよう応答編集はアプリケーションID・トークンで行う）
+                slash_args = (
+                    options.get("channel"),
+                    options.get("content"),
+                    str(interaction.application_id),
+                    interaction.token,
                 )
+                admitted = await app_module.dispatch_event(
+                    "command-center",
+                    app_module.EventPriority.SLASH,
+                    app_module.on_slash_interaction,
+                    *slash_args,
+                )
+                if not admitted:
+                    # 受け入れ上限で不受理: 応答待ちのままにしない
+                    await app_module.notify_slash_dropped(*slash_args)
+
+    async def _edit_accepted_response(
+        self, interaction: discord.Interaction, content: str = "受け付けました"
+    ) -> None:
+        """deferした応答を受付結果に編集
+
+        Raises:
+            ValueError: フォローアップ編集に失敗した場合（Fail-Fast）
+        """
+        try:
+            await interaction.edit_original_response(content=content)
+        except discord.HTTPException as e:
+            raise ValueError(f"Failed to edit interaction response: {e}") from e
+
+
+async def edit_interaction_response(application_id: str, interaction_token: str, content: str) -> bool:
+    """Discord REST API: deferしたインタラクション応答の編集（Webhook経由・Bot認証不要）
+
+    インタラクションオブジェクトを保持しないため、永続キューから再開したイベントでも
+    編集できます（トークンの有効期限は15分）。
+
+    Returns:
+        bool: 編集した場合True、トークン失効・不明で編集できなかった場合False
+
+    Raises:
+        ValueError: パラメータ不正・その他のAPIエラー・通信エラーの場合
+    """
+    # Fail-Fast: パラメータ検証
+    if not application_id or not interaction_token:
+        raise ValueError("Application ID and interaction token are required")
+    if not content:
+        raise ValueError("Response content cannot be empty")
+
+    url = f"{DISCORD_API_BASE}/webhooks/{application_id}/{interaction_token}/messages/@original"
+    payload = {"content": content}
+
+    try:
+        response = await rate_limiter.request(
+            "spectra", "interactions", application_id,
+            lambda: get_http_client().patch(url, json=payload),
+        )
+    except httpx.RequestError as e:
+        raise ValueError(f"Failed to edit interaction response: {e}") from e
+    if response.status_code == 200:
+        return True
+    if response.status_code in (401, 404):
+        # 15分の有効期限切れ（再起動後の復元等）: 応答先が無いため記録のみ
+        log_err(
+            "slash", "command-center", "spectra", "interaction_expired", "slash",
+            f"{response.status_code} - {response.text[:200]}",
+        )
+        return False
+    raise ValueError(f"Failed to edit interaction response: {response.status_code} - {response.text}")
 
 
 async def start_spectra_client() -> None:
@@ -161,13 +465,15 @@ async def typing(bot: str, channel_id: str) -> int:
         raise ValueError("Channel ID cannot be empty")
 
     token = get_bot_token(bot)
-    url = f"https://discord.com/api/v10/channels/{channel_id}/typing"
+    url = f"{DISCORD_API_BASE}/channels/{channel_id}/typing"
     headers = {"Authorization": f"Bot {token}", "Content-Type": "application/json"}
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers)
-            return response.status_code
+        response = await rate_limiter.request(
+            bot, "typing", channel_id,
+            lambda: get_http_client().post(url, headers=headers),
+        )
+        return response.status_code
     except httpx.RequestError as e:
         raise ValueError(f"Failed to send typing indicator: {e}") from e
 
@@ -185,22 +491,24 @@ async def send(bot: str, channel_id: str, text: str) -> str:
         raise ValueError(f"Message text too long: {len(text)} characters (max 2000)")
 
     token = get_bot_token(bot)
-    url = f"https://discord.com/api/v10/channels/{channel_id}/messages"
+    url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages"
     headers = {"Authorization": f"Bot {token}", "Content-Type": "application/json"}
     payload = {"content": text}
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload)
-            if response.status_code == 200:
-                data = response.json()
-                message_id = data.get("id")
-                if not message_id:
-                    raise ValueError("Discord API returned empty message ID")
-                return message_id
-            else:
-                raise ValueError(
-                    f"Discord API error: {response.status_code} - {response.text}"
-                )
+        response = await rate_limiter.request(
+            bot, "messages", channel_id,
+            lambda: get_http_client().post(url, headers=headers, json=payload),
+        )
+        if response.status_code == 200:
+            data = response.json()
+            message_id = data.get("id")
+            if not message_id:
+                raise ValueError("Discord API returned empty message ID")
+            return message_id
+        else:
+            raise ValueError(
+                f"Discord API error: {response.status_code} - {response.text}"
+            )
     except httpx.RequestError as e:
         raise ValueError(f"Failed to send message: {e}") from e
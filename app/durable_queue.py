@@ -0,0 +1,403 @@
+# Durable Queue - Redis永続イベントジャーナル
+# EventQueueの投入イベントをRedisへ記録し、再起動後に未完了イベントを再開する
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+import redis
+
+from app.logger import log_err, log_ok
+from app.settings import settings
+from app.store import SESSION_ID
+
+
+# 優先度毎のスコア幅（score = priority * PRIORITY_SCALE + seq で優先度→投入順に並ぶ）
+PRIORITY_SCALE = 10**12
+
+# 実行権の比較付き解放（保持者が自身の場合のみ削除: KEYS[1]=lease, ARGV[1]=owner）
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# 実行中イベントの延長（保持者が自身の場合のみ実行権・可視性期限を更新:
+# KEYS[1]=lease, KEYS[2]=inflight, ARGV[1]=owner, ARGV[2]=TTLミリ秒, ARGV[3]=event_id, ARGV[4]=新しい可視性期限）
+RENEW_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+redis.call('ZADD', KEYS[2], 'XX', ARGV[4], ARGV[3])
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class DurableEvent:
+    """Redisに記録されたイベント"""
+
+    event_id: str
+    priority: int
+    handler: str
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    enqueued_at: float  # 投入時刻（epoch秒・プロセスを跨いだ待機期限判定用）
+    attempts: int  # 実行開始回数
+    meta: Dict[str, Any] = field(default_factory=dict)  # 実行時に参照する付帯情報（ステート等）
+
+
+def _redis_connection() -> redis.Redis:
+    return redis.from_url(settings.redis.url, decode_responses=True)
+
+
+class DurableEventJournal:
+    """Redis永続イベントジャーナル（QUEUE_DURABLE）
+
+    待機中イベントを優先度・投入順のsorted set（pending）に、実行中イベントを
+    可視性期限をスコアとするsorted set（inflight）に保持します。
+    完了時はイベント本体を削除し、削除できた最初の1回のみ完了として扱います。
+    実行中のままプロセスが停止したイベントは、再起動時または可視性期限切れで
+    待機中へ戻り、max_attempts回を超えたものはデッドレターへ移します。
+    複数プロセスから取り出す場合はacquire_leaseで名前空間の実行権を取り、順序を保ちます。
+    """
+
+    def __init__(
+        self,
+        namespace: str = "main",
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 3,
+        connection_factory: Callable[[], Any] = _redis_connection,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if visibility_timeout <= 0:
+            raise ValueError(f"visibility_timeout must be positive, got: {visibility_timeout}")
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got: {max_attempts}")
+        self.namespace = namespace
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._connection_factory = connection_factory
+        self._clock = clock
+        self._redis: Optional[Any] = None
+        self._scripts: Dict[str, Any] = {}
+        prefix = f"queue:{SESSION_ID}:{namespace}"
+        self.events_key = f"{prefix}:events"
+        self.pending_key = f"{prefix}:pending"
+        self.inflight_key = f"{prefix}:inflight"
+        self.seq_key = f"{prefix}:seq"
+        self.dead_key = f"{prefix}:dead"
+        self.lease_key = f"{prefix}:lease"
+        self.notify_key = f"{prefix}:notify"  # 新規投入の通知（待機中のconsumerをBLPOPで起こす）
+        self.state_key = f"{prefix}:state"  # workerで変更されたステート（gatewayが取り込む）
+        self.state_version_key = f"{prefix}:state_version"
+
+    @property
+    def redis(self) -> Any:
+        if self._redis is None:
+            self._redis = self._connection_factory()
+        return self._redis
+
+    def _script(self, source: str) -> Any:
+        """Luaスクリプトを登録（接続毎に1回・以降はEVALSHAで実行）"""
+        if source not in self._scripts:
+            self._scripts[source] = self.redis.register_script(source)
+        return self._scripts[source]
+
+    def _call(self, operation: str, fn: Callable[[], Any]) -> Any:
+        """Redis操作（失敗時はValueErrorでFail-Fast）"""
+        try:
+            return fn()
+        except redis.RedisError as e:
+            log_err("queue", "system", "system", f"durable_{operation}", "memory", str(e))
+            raise ValueError(f"Durable queue {operation} failed: {e}") from e
+
+    def _load(self, event_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.redis.hget(self.events_key, event_id)
+        return orjson.loads(raw) if raw is not None else None
+
+    @staticmethod
+    def _to_event(event_id: str, data: Dict[str, Any]) -> DurableEvent:
+        return DurableEvent(
+            event_id=event_id,
+            priority=data["priority"],
+            handler=data["handler"],
+            args=tuple(data["args"]),
+            kwargs=data["kwargs"],
+            enqueued_at=data["enqueued_at"],
+            attempts=data["attempts"],
+            meta=data.get("meta", {}),
+        )
+
+    def put(
+        self,
+        priority: int,
+        handler: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """イベントを記録して待機中に追加
+
+        Args:
+            meta: ハンドラ引数以外の付帯情報（投入時のステート等）
+
+        Returns:
+            str: イベントID
+
+        Raises:
+            ValueError: 引数がJSONへ変換できない場合、またはRedis操作の失敗時
+        """
+        try:
+            body = {
+                "priority": priority,
+                "handler": handler,
+                "args": list(args),
+                "kwargs": kwargs,
+                "enqueued_at": self._clock(),
+                "attempts": 0,
+                "meta": meta or {},
+            }
+            orjson.dumps(body)
+        except TypeError as e:
+            raise ValueError(f"Durable event arguments must be JSON serializable: {e}") from e
+
+        def _put() -> str:
+            seq = int(self.redis.incr(self.seq_key))
+            event_id = str(seq)
+            body["score"] = priority * PRIORITY_SCALE + seq
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.hset(self.events_key, event_id, orjson.dumps(body).decode("utf-8"))
+            pipe.zadd(self.pending_key, {event_id: body["score"]})
+            # 通知は起床の合図のみ（1件に保つ）
+            pipe.rpush(self.notify_key, event_id)
+            pipe.ltrim(self.notify_key, -1, -1)
+            pipe.execute()
+            return event_id
+
+        return self._call("put", _put)
+
+    def publish_state(self, snapshot: Dict[str, Any]) -> int:
+        """workerで変更されたステートを版付きで記録（gatewayが次の投入時に取り込む）
+
+        Returns:
+            int: 記録したステートの版（単調増加）
+
+        Raises:
+            ValueError: Redis操作の失敗時
+        """
+        def _publish() -> int:
+            version = int(self.redis.incr(self.state_version_key))
+            record = {"version": version, "state": snapshot}
+            self.redis.set(self.state_key, orjson.dumps(record).decode("utf-8"))
+            return version
+
+        return self._call("publish_state", _publish)
+
+    def load_state(self) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """記録済みのステートと版（未記録時はNone）"""
+        raw = self._call("load_state", lambda: self.redis.get(self.state_key))
+        if raw is None:
+            return None
+        record = orjson.loads(raw)
+        return int(record["version"]), record["state"]
+
+    def wait_for_event(self, timeout: float) -> bool:
+        """新規投入の通知を待機（ブロッキング・executor上で呼び出す）
+
+        Returns:
+            bool: timeout秒以内に通知があった場合True
+        """
+        return self._call(
+            "wait", lambda: self.redis.blpop([self.notify_key], timeout=timeout) is not None
+        )
+
+    def pending_count(self, priority: int) -> int:
+        """指定優先度の待機中イベント数"""
+        low = priority * PRIORITY_SCALE
+        return int(self._call(
+            "pending_count",
+            lambda: self.redis.zcount(self.pending_key, low, low + PRIORITY_SCALE - 1),
+        ))
+
+    def pending_events(self, priority: int) -> List[DurableEvent]:
+        """指定優先度の待機中イベント（投入順）"""
+        low = priority * PRIORITY_SCALE
+
+        def _pending() -> List[DurableEvent]:
+            events = []
+            for event_id in self.redis.zrangebyscore(self.pending_key, low, low + PRIORITY_SCALE - 1):
+                data = self._load(event_id)
+                if data is not None:
+                    events.append(self._to_event(event_id, data))
+            return events
+
+        return self._call("pending_events", _pending)
+
+    def claim(self, event_id: str) -> bool:
+        """待機中イベントを実行中へ移す（可視性期限を設定・実行回数を加算）
+
+        Returns:
+            bool: 取得できた場合True（完了済み・他コンシューマが取得済みの場合False）
+        """
+
+        def _claim() -> bool:
+            # WATCH/MULTI: 待機中・本体が読み取り後に変わっていればやり直し（取得済みなら実行回数等は変更しない）
+            with self.redis.pipeline(transaction=True) as pipe:
+                while True:
+                    try:
+                        pipe.watch(self.pending_key, self.events_key)
+                        raw = pipe.hget(self.events_key, event_id)
+                        if raw is None or pipe.zscore(self.pending_key, event_id) is None:
+                            pipe.unwatch()
+                            return False
+                        data = orjson.loads(raw)
+                        data["attempts"] += 1
+                        pipe.multi()
+                        pipe.zrem(self.pending_key, event_id)
+                        pipe.zadd(self.inflight_key, {event_id: self._clock() + self.visibility_timeout})
+                        pipe.hset(self.events_key, event_id, orjson.dumps(data).decode("utf-8"))
+                        pipe.execute()
+                        return True
+                    except redis.WatchError:
+                        continue
+
+        return self._call("claim", _claim)
+
+    def claim_next(self) -> Optional[DurableEvent]:
+        """最優先の待機中イベントを取得して実行中へ移す（可視性期限切れは先に回収）"""
+        self.requeue_expired()
+
+        def _next() -> Optional[DurableEvent]:
+            for event_id in self.redis.zrange(self.pending_key, 0, 0):
+                if self.claim(event_id):
+                    data = self._load(event_id)
+                    if data is not None:
+                        return self._to_event(event_id, data)
+            return None
+
+        return self._call("claim_next", _next)
+
+    def release(self, event_id: str) -> None:
+        """実行中イベントを待機中へ戻す（中断による再投入）"""
+
+        def _release() -> None:
+            data = self._load(event_id)
+            if data is None:
+                return
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.zrem(self.inflight_key, event_id)
+            pipe.zadd(self.pending_key, {event_id: data["score"]})
+            pipe.execute()
+
+        self._call("release", _release)
+
+    def complete(self, event_id: str) -> bool:
+        """完了（または意図的な破棄）を記録
+
+        Returns:
+            bool: 初回の完了記録の場合True（既に完了済みならFalse）
+        """
+
+        def _complete() -> bool:
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.hdel(self.events_key, event_id)
+            pipe.zrem(self.pending_key, event_id)
+            pipe.zrem(self.inflight_key, event_id)
+            deleted, _, _ = pipe.execute()
+            return bool(deleted)
+
+        return self._call("complete", _complete)
+
+    def acquire_lease(self, owner: str) -> bool:
+        """名前空間の実行権を取得（複数プロセス間で1つのコンシューマのみが取り出す）
+
+        有効期限は可視性期限と同じで、保持者が停止しても期限後に他プロセスが取得できます。
+        実行が可視性期限より長くなる場合は実行中にrenew_leaseで延長します。
+
+        Returns:
+            bool: 取得できた場合True（他の保持者が有効な場合False）
+        """
+        ttl_ms = int(self.visibility_timeout * 1000)
+        return bool(self._call(
+            "lease", lambda: self.redis.set(self.lease_key, owner, nx=True, px=ttl_ms)
+        ))
+
+    def release_lease(self, owner: str) -> None:
+        """実行権を解放（自身が保持している場合のみ）"""
+
+        self._call(
+            "lease", lambda: self._script(RELEASE_LEASE_SCRIPT)(keys=[self.lease_key], args=[owner])
+        )
+
+    def renew_lease(self, owner: str, event_id: str) -> bool:
+        """実行中イベントの実行権と可視性期限を延長（ハートビート）
+
+        Returns:
+            bool: 延長できた場合True（実行権を失っていた場合False）
+        """
+        ttl_ms = int(self.visibility_timeout * 1000)
+        deadline = self._clock() + self.visibility_timeout
+        return bool(self._call(
+            "lease",
+            lambda: self._script(RENEW_LEASE_SCRIPT)(
+                keys=[self.lease_key, self.inflight_key], args=[owner, ttl_ms, event_id, deadline]
+            ),
+        ))
+
+    def _return_to_pending(self, event_ids: List[str]) -> int:
+        """実行中イベントを待機中へ戻す（実行回数超過はデッドレターへ）"""
+        moved = 0
+        for event_id in event_ids:
+            data = self._load(event_id)
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.zrem(self.inflight_key, event_id)
+            if data is None:
+                pipe.execute()
+                continue
+            if data["attempts"] >= self.max_attempts:
+                pipe.hdel(self.events_key, event_id)
+                pipe.rpush(self.dead_key, orjson.dumps({"id": event_id, **data}).decode("utf-8"))
+                pipe.execute()
+                log_err(
+                    "queue", "system", "system", f"durable_dead_letter:{data['handler']}",
+                    "memory", f"event {event_id} exceeded {self.max_attempts} attempts",
+                )
+                continue
+            pipe.zadd(self.pending_key, {event_id: data["score"]})
+            pipe.execute()
+            moved += 1
+        return moved
+
+    def requeue_expired(self) -> int:
+        """可視性期限切れの実行中イベントを待機中へ戻す
+
+        Returns:
+            int: 待機中へ戻したイベント数
+        """
+
+        def _requeue() -> int:
+            expired = self.redis.zrangebyscore(self.inflight_key, "-inf", self._clock())
+            return self._return_to_pending(list(expired))
+
+        return self._call("requeue_expired", _requeue)
+
+    def recover(self) -> List[DurableEvent]:
+        """再起動時の回収（前プロセスの実行中イベントを待機中へ戻し、待機中を順に返す）"""
+
+        def _recover() -> List[DurableEvent]:
+            inflight = list(self.redis.zrange(self.inflight_key, 0, -1))
+            requeued = self._return_to_pending(inflight)
+            events = []
+            for event_id in self.redis.zrange(self.pending_key, 0, -1):
+                data = self._load(event_id)
+                if data is not None:
+                    events.append(self._to_event(event_id, data))
+            if events or requeued:
+                log_ok("queue", "system", "system", f"durable_recovered:{self.namespace}:{len(events)}")
+            return events
+
+        return self._call("recover", _recover)
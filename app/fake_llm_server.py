@@ -0,0 +1,376 @@
+# Fake LLM Server - Gemini互換のローカルフェイクサーバ
+# 実APIの無料枠を消費せずに、パイプライン全体のスループット・レイテンシを再現可能に計測する
+
+"""Gemini REST API互換の決定的フェイクサーバ
+
+google-genai SDKのbase_url（GEMINI_BASE_URL）をこのサーバに向けることで、
+supervisorの実コード経路（SDK・HTTP・JSON検証）をそのまま通して負荷試験できます。
+
+対応エンドポイント:
+    POST   /v1beta/models/{model}:generateContent
+    POST   /v1beta/models/{model}:streamGenerateContent?alt=sse
+    POST   /v1beta/cachedContents
+    DELETE /v1beta/cachedContents/{id}
+    GET    /fake/stats  （統計取得）
+
+使い方:
+    python -m app.fake_llm_server --port 8765 --latency lognormal --latency-ms 800 \\
+        --error-rate 0.05 --tokens-per-second 80 --seed 1
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from aiohttp import web
+
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal", "exponential")
+ERROR_STATUS_NAMES = {
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    503: "UNAVAILABLE",
+    504: "DEADLINE_EXCEEDED",
+}
+SPEAKERS = ("spectra", "lynq", "paz")
+
+
+@dataclass(frozen=True)
+class FakeLLMConfig:
+    """フェイクサーバの挙動設定
+
+    latency_ms: 最初のトークンまでの待機（分布の平均/中央値）
+    latency_spread_ms: 分布の広がり（uniformは±幅・normalは標準偏差・lognormalはσ×平均）
+    error_rate: エラー応答の確率（error_statusesから一様に選択）
+    malformed_rate: 不正JSON本文を返す確率（応答検証のFail-Fast確認用）
+    tokens_per_second: 出力トークン生成速度（0で即時）
+    """
+
+    latency: str = "constant"
+    latency_ms: float = 200.0
+    latency_spread_ms: float = 0.0
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (429, 503)
+    malformed_rate: float = 0.0
+    tokens_per_second: float = 0.0
+    response_chars: int = 120
+    stream_chunk_tokens: int = 8
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution: {self.latency} "
+                f"(available: {', '.join(LATENCY_DISTRIBUTIONS)})"
+            )
+        if self.latency_ms < 0 or self.latency_spread_ms < 0:
+            raise ValueError("Latency must be non-negative")
+        for name in ("error_rate", "malformed_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0.0 and 1.0")
+        if self.tokens_per_second < 0:
+            raise ValueError("tokens_per_second must be non-negative")
+        if self.response_chars < 1 or self.stream_chunk_tokens < 1:
+            raise ValueError("response_chars and stream_chunk_tokens must be positive")
+        if not self.error_statuses:
+            raise ValueError("error_statuses must not be empty")
+
+
+def count_tokens(text: str) -> int:
+    """概算トークン数（UTF-8バイト数/3。supervisor.estimate_tokensとは独立の簡易近似）"""
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+@dataclass
+class FakeLLMStats:
+    """フェイクサーバの受信統計"""
+
+    requests: int = 0
+    streams: int = 0
+    errors: int = 0
+    malformed: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    caches_created: int = 0
+    caches_deleted: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "streams": self.streams,
+            "errors": self.errors,
+            "malformed": self.malformed,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "caches_created": self.caches_created,
+            "caches_deleted": self.caches_deleted,
+        }
+
+
+@dataclass(frozen=True)
+class _Plan:
+    """1リクエスト分の決定済み挙動（乱数は受信順に消費）"""
+
+    latency: float
+    error_status: Optional[int]
+    malformed: bool
+    speaker: str
+
+
+class FakeLLMServer:
+    """Gemini互換フェイクサーバ
+
+    乱数は単一のseed付きRandomから受信順に消費するため、同一seed・同一リクエスト順で
+    レイテンシ・エラー・応答内容が再現されます。
+
+    Example:
+        async with FakeLLMServer(FakeLLMConfig(latency_ms=50)) as base_url:
+            ...  # GEMINI_BASE_URL=base_url で supervisor.generate を実行
+    """
+
+    def __init__(self, config: Optional[FakeLLMConfig] = None) -> None:
+        self.config = config or FakeLLMConfig()
+        self.stats = FakeLLMStats()
+        self._random = random.Random(self.config.seed)
+        self._cache_seq = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+
+    # --- 挙動決定 ---
+
+    def sample_latency(self) -> float:
+        """設定分布からレイテンシ（秒）を1件サンプル"""
+        cfg, rng = self.config, self._random
+        mean, spread = cfg.latency_ms, cfg.latency_spread_ms
+        if cfg.latency == "constant":
+            value = mean
+        elif cfg.latency == "uniform":
+            value = rng.uniform(mean - spread, mean + spread)
+        elif cfg.latency == "normal":
+            value = rng.gauss(mean, spread)
+        elif cfg.latency == "lognormal":
+            # 中央値=mean、σ=spread/mean の対数正規（裾の重いAPI遅延の近似）
+            sigma = spread / mean if mean > 0 else 0.0
+            value = mean * math.exp(rng.gauss(0.0, sigma)) if mean > 0 else 0.0
+        else:  # exponential
+            value = rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        return max(0.0, value) / 1000.0
+
+    def _plan(self) -> _Plan:
+        cfg, rng = self.config, self._random
+        latency = self.sample_latency()
+        error_status = rng.choice(cfg.error_statuses) if rng.random() < cfg.error_rate else None
+        malformed = rng.random() < cfg.malformed_rate
+        speaker = rng.choice(SPEAKERS)
+        return _Plan(latency, error_status, malformed, speaker)
+
+    def _response_text(self, plan: _Plan) -> str:
+        if plan.malformed:
+            return '{"speaker": "' + plan.speaker + '", "text": '
+        filler = ("フェイク応答です。" * (self.config.response_chars // 9 + 1))[: self.config.response_chars]
+        return json.dumps({"speaker": plan.speaker, "text": filler}, ensure_ascii=False)
+
+    def _token_delay(self, tokens: int) -> float:
+        tps = self.config.tokens_per_second
+        return tokens / tps if tps > 0 else 0.0
+
+    # --- レスポンス整形 ---
+
+    @staticmethod
+    def _prompt_text(body: Dict[str, Any]) -> str:
+        parts = []
+        for content in body.get("contents") or []:
+            for part in content.get("parts") or []:
+                if isinstance(part.get("text"), str):
+                    parts.append(part["text"])
+        return "".join(parts)
+
+    @staticmethod
+    def _candidate(text: str, prompt_tokens: int, output_tokens: int, finished: bool) -> Dict[str, Any]:
+        candidate: Dict[str, Any] = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+        if finished:
+            candidate["finishReason"] = "STOP"
+        return {
+            "candidates": [candidate],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": output_tokens,
+                "totalTokenCount": prompt_tokens + output_tokens,
+            },
+            "modelVersion": "fake-llm",
+        }
+
+    @staticmethod
+    def _error_response(status: int) -> web.Response:
+        return web.json_response(
+            {"error": {
+                "code": status,
+                "message": f"Injected fake error {status}",
+                "status": ERROR_STATUS_NAMES.get(status, "UNKNOWN"),
+            }},
+            status=status,
+        )
+
+    # --- ハンドラ ---
+
+    async def _handle_model(self, request: web.Request) -> web.StreamResponse:
+        action = request.match_info["action"]
+        if action == "generateContent":
+            return await self._generate(request)
+        if action == "streamGenerateContent":
+            return await self._stream(request)
+        raise web.HTTPNotFound(text=f"Unsupported action: {action}")
+
+    async def _begin(self, request: web.Request) -> Tuple[_Plan, int]:
+        body = await request.json()
+        plan = self._plan()
+        prompt_tokens = count_tokens(self._prompt_text(body))
+        self.stats.requests += 1
+        self.stats.prompt_tokens += prompt_tokens
+        self.stats.latencies_ms.append(plan.latency * 1000.0)
+        await asyncio.sleep(plan.latency)
+        if plan.error_status is not None:
+            self.stats.errors += 1
+        elif plan.malformed:
+            self.stats.malformed += 1
+        return plan, prompt_tokens
+
+    async def _generate(self, request: web.Request) -> web.Response:
+        plan, prompt_tokens = await self._begin(request)
+        if plan.error_status is not None:
+            return self._error_response(plan.error_status)
+
+        text = self._response_text(plan)
+        output_tokens = count_tokens(text)
+        await asyncio.sleep(self._token_delay(output_tokens))
+        self.stats.output_tokens += output_tokens
+        return web.json_response(self._candidate(text, prompt_tokens, output_tokens, True))
+
+    async def _stream(self, request: web.Request) -> web.StreamResponse:
+        plan, prompt_tokens = await self._begin(request)
+        if plan.error_status is not None:
+            return self._error_response(plan.error_status)
+        self.stats.streams += 1
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        text = self._response_text(plan)
+        chunk_chars = self.config.stream_chunk_tokens * 3  # count_tokensの逆算（概算）
+        emitted_tokens = 0
+        for start in range(0, len(text), chunk_chars):
+            chunk = text[start:start + chunk_chars]
+            tokens = count_tokens(chunk)
+            await asyncio.sleep(self._token_delay(tokens))
+            emitted_tokens += tokens
+            finished = start + chunk_chars >= len(text)
+            payload = self._candidate(chunk, prompt_tokens, emitted_tokens, finished)
+            await response.write(f"data: {json.dumps(payload, ensure_ascii=False)}\r\n\r\n".encode("utf-8"))
+        self.stats.output_tokens += emitted_tokens
+        await response.write_eof()
+        return response
+
+    async def _create_cache(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self._cache_seq += 1
+        self.stats.caches_created += 1
+        return web.json_response({
+            "name": f"cachedContents/fake-{self._cache_seq}",
+            "model": body.get("model", ""),
+            "displayName": body.get("displayName", ""),
+            "usageMetadata": {"totalTokenCount": count_tokens(json.dumps(body.get("contents", [])))},
+        })
+
+    async def _delete_cache(self, request: web.Request) -> web.Response:
+        self.stats.caches_deleted += 1
+        return web.json_response({})
+
+    async def _get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats.to_dict())
+
+    # --- 起動・停止 ---
+
+    def build_app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/{version}/models/{model:[^/:]+}:{action}", self._handle_model)
+        app.router.add_post("/{version}/cachedContents", self._create_cache)
+        app.router.add_delete("/{version}/cachedContents/{name}", self._delete_cache)
+        app.router.add_get("/fake/stats", self._get_stats)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """サーバ起動（port=0で空きポート）
+
+        Returns:
+            str: GEMINI_BASE_URLに設定するベースURL
+        """
+        if self._runner is not None:
+            raise RuntimeError("FakeLLMServer is already running")
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self.base_url = f"http://{host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """サーバ停止"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> str:
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> Tuple[FakeLLMConfig, str, int]:
+    parser = argparse.ArgumentParser(description="Gemini互換フェイクLLMサーバ")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="constant")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-spread-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-statuses", default="429,503")
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--response-chars", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    config = FakeLLMConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        latency_spread_ms=args.latency_spread_ms,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(s) for s in args.error_statuses.split(",") if s),
+        malformed_rate=args.malformed_rate,
+        tokens_per_second=args.tokens_per_second,
+        response_chars=args.response_chars,
+        seed=args.seed,
+    )
+    return config, args.host, args.port
+
+
+async def _serve(config: FakeLLMConfig, host: str, port: int) -> None:
+    server = FakeLLMServer(config)
+    base_url = await server.start(host, port)
+    print(f"🧪 Fake LLM server: {base_url} ({config})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_serve(*_parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,115 @@
+# LLM Provider - LLM呼び出しの抽象化
+# supervisorの生成処理とSDK/エンドポイントを分離し、プロバイダを差し替え可能にする
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+from google import genai
+from google.genai import types
+
+
+MODEL_NAME = "gemini-2.0-flash-001"
+
+
+class LLMProvider(ABC):
+    """LLMプロバイダの共通インタフェース
+
+    応答オブジェクトはGemini SDKと同じ形（text属性・usage_metadata属性）を返します。
+    supervisor側のプロンプト構築・レート制御・ヘッジ・JSON検証はプロバイダに依存しません。
+    """
+
+    name: str = ""
+
+    @property
+    def caches(self) -> Optional[Any]:
+        """明示キャッシュAPI（client.caches互換）。未対応の場合はNone"""
+        return None
+
+    @abstractmethod
+    async def generate(self, prompt: str, config: types.GenerateContentConfig) -> Any:
+        """単発生成（応答全体を返す）"""
+
+    @abstractmethod
+    async def stream(
+        self, prompt: str, config: types.GenerateContentConfig
+    ) -> AsyncIterator[Any]:
+        """ストリーミング生成（text属性を持つチャンクの非同期イテレータを返す）"""
+
+
+class GeminiProvider(LLMProvider):
+    """google-genai SDKによるGeminiプロバイダ
+
+    base_url指定時は同SDKのままGemini互換エンドポイント（ローカルフェイクサーバ等）へ
+    接続します。単発生成は従来通り同期APIをexecutorで実行します。
+    """
+
+    name = "gemini"
+
+    def __init__(self, api_key: str, base_url: str = "", model: str = MODEL_NAME) -> None:
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY is not configured")
+        http_options = types.HttpOptions(base_url=base_url) if base_url else None
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
+        self.model = model
+
+    @property
+    def caches(self) -> Any:
+        return self.client.caches
+
+    async def generate(self, prompt: str, config: types.GenerateContentConfig) -> Any:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: self.client.models.generate_content(
+                model=self.model,
+                contents=prompt,
+                config=config,
+            ),
+        )
+
+    async def stream(
+        self, prompt: str, config: types.GenerateContentConfig
+    ) -> AsyncIterator[Any]:
+        return await self.client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=prompt,
+            config=config,
+        )
+
+
+ProviderFactory = Callable[[str, str], LLMProvider]
+
+# プロバイダ登録表（名前 → (api_key, base_url) を受け取るファクトリ）
+_providers: Dict[str, ProviderFactory] = {
+    GeminiProvider.name: lambda api_key, base_url: GeminiProvider(api_key, base_url),
+}
+
+
+def register_provider(name: str, factory: ProviderFactory) -> None:
+    """プロバイダの登録（LLM_PROVIDERで選択可能にする）
+
+    Raises:
+        ValueError: 名前が空の場合
+    """
+    if not name:
+        raise ValueError("Provider name is required")
+    _providers[name] = factory
+
+
+def available_providers() -> tuple:
+    """登録済みプロバイダ名一覧"""
+    return tuple(sorted(_providers))
+
+
+def create_provider(name: str, api_key: str, base_url: str = "") -> LLMProvider:
+    """登録名からプロバイダを生成
+
+    Raises:
+        ValueError: 未登録のプロバイダ名の場合
+    """
+    factory = _providers.get(name)
+    if factory is None:
+        raise ValueError(
+            f"Unknown LLM provider: {name} (available: {', '.join(available_providers())})"
+        )
+    return factory(api_key, base_url)
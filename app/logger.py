@@ -1,5 +1,6 @@
 # Logger - JSONL形式ログ出力
 # 一元ログ: ts,event_type,channel,actor,payload_summary,result,error_stage,error_detail
+# （成功ログの任意の詳細は切り詰めない detail キーに記録）
 
 import threading
 from datetime import datetime
@@ -42,7 +43,8 @@ def _write_log_entry(
     payload_summary: str,
     result: str,
     error_stage: Optional[str] = None,
-    error_detail: Optional[str] = None
+    error_detail: Optional[str] = None,
+    detail: Optional[str] = None
 ) -> None:
     """ログエントリをJSONL形式でファイルに書き込み"""
     log_entry = {
@@ -55,6 +57,8 @@ def _write_log_entry(
         "error_stage": error_stage,
         "error_detail": error_detail
     }
+    if detail is not None:
+        log_entry["detail"] = detail
     
     try:
         # ディレクトリの存在確認
@@ -75,7 +79,9 @@ def _write_log_entry(
         print(f"LOGGER ERROR: Failed to write log entry: {e}", file=sys.stderr)
 
 
-def log_ok(event_type: str, channel: str, actor: str, payload_summary: str) -> None:
+def log_ok(
+    event_type: str, channel: str, actor: str, payload_summary: str, detail: Optional[str] = None
+) -> None:
     """成功ログの記録
     
     Args:
@@ -83,13 +89,15 @@ def log_ok(event_type: str, channel: str, actor: str, payload_summary: str) -> N
         channel: チャンネル（command-center|creation|development|lounge）
         actor: アクター（user|spectra|lynq|paz|system）
         payload_summary: ペイロード要約（先頭80字程度）
+        detail: 切り詰めずに記録する詳細（スタック等・指定時のみdetailキーを出力）
     """
     _write_log_entry(
         event_type=event_type,
         channel=channel,
         actor=actor,
         payload_summary=payload_summary,
-        result="ok"
+        result="ok",
+        detail=detail
     )
 
 
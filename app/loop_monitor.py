@@ -0,0 +1,202 @@
+# Loop Monitor - イベントループ健全性監視
+# スケジューリング遅延の計測と、ループを長時間占有した処理のスタック記録
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app import metrics
+from app.logger import log_ok
+
+
+# app配下のフレームを占有元として優先表示する
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@dataclass(frozen=True)
+class SlowCallback:
+    """イベントループを閾値以上占有した処理"""
+
+    duration: float  # ループが応答しなかった秒数
+    stack: Tuple[str, ...]  # 占有中のスタック（内側から・"file:line:func"）
+
+    def summary(self) -> str:
+        """ログ用の要約（占有時間と最内側フレームのみ・payload_summary 80字に収める）"""
+        top = self.stack[0] if self.stack else "-"
+        return f"slow_callback:{self.duration * 1000:.0f}ms:{top}"
+
+    def detail(self) -> str:
+        """ログ用のスタック全体（内側から"<"区切り・detailキーへ切り詰めずに記録）"""
+        return "<".join(self.stack) or "-"
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """最近傍法によるパーセンタイル（空の場合は0.0）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))]
+
+
+class LoopMonitor:
+    """イベントループ健全性監視（LOOP_MONITOR）
+
+    lag_interval毎のsleepの遅れをスケジューリング遅延として計測します。
+    監視スレッドがループへ確認コールバックを投入し、slow_callback秒以内に実行されない場合は
+    ループスレッドのスタックを取得して、ループ再開時に占有時間と共に記録します
+    （同期Redis呼び出し・ファイル書き込み等のブロッキング箇所の特定用）。
+    遅延の集計はsummary_interval毎にlog_okへ書き出します。
+    """
+
+    def __init__(
+        self,
+        lag_interval: float = 0.5,
+        slow_callback: float = 0.1,
+        summary_interval: float = 60.0,
+        window: int = 500,
+        stack_depth: int = 6,
+    ) -> None:
+        if lag_interval <= 0 or slow_callback <= 0 or summary_interval <= 0:
+            raise ValueError("LoopMonitor intervals must be positive")
+        self.lag_interval = lag_interval
+        self.slow_callback = slow_callback
+        self.summary_interval = summary_interval
+        self._stack_depth = stack_depth
+        self._lags: Deque[float] = deque(maxlen=window)
+        self._summary_lags: List[float] = []  # 前回の集計以降の遅延
+        self._slow: Deque[SlowCallback] = deque(maxlen=50)
+        self._summary_slow = 0
+        self.slow_callbacks_total = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._lock = threading.Lock()
+        self._probe_sent_at: Optional[float] = None  # 未実行の確認コールバックの投入時刻
+        self._stall_stack: Optional[Tuple[str, ...]] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def _capture_stack(self) -> Tuple[str, ...]:
+        """ループスレッドの現在のスタック（最内側フレーム＋app配下のフレーム・内側から）"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return ()
+        frames = traceback.extract_stack(frame)
+        selected = [frames[-1]] + [
+            f for f in reversed(frames[:-1]) if f.filename.startswith(_APP_DIR)
+        ]
+        return tuple(
+            f"{os.path.basename(f.filename)}:{f.lineno}:{f.name}"
+            for f in selected[: self._stack_depth]
+        )
+
+    def _watch(self) -> None:
+        """監視スレッド（確認コールバックの投入と、未実行のままのループのスタック取得）"""
+        while not self._stop.wait(self.slow_callback / 2):
+            now = time.monotonic()
+            with self._lock:
+                if self._probe_sent_at is None:
+                    self._probe_sent_at = now
+                    send = True
+                else:
+                    send = False
+                    if self._stall_stack is None and now - self._probe_sent_at >= self.slow_callback:
+                        self._stall_stack = self._capture_stack()
+            if send:
+                try:
+                    self._loop.call_soon_threadsafe(self._on_probe)
+                except RuntimeError:
+                    # ループ終了済み
+                    return
+
+    def _on_probe(self) -> None:
+        """確認コールバック（ループスレッドで実行・応答までの時間を判定）"""
+        now = time.monotonic()
+        with self._lock:
+            if self._probe_sent_at is None:
+                return
+            delay = now - self._probe_sent_at
+            stack = self._stall_stack or ()
+            self._probe_sent_at = None
+            self._stall_stack = None
+        if delay >= self.slow_callback:
+            self.record_slow_callback(SlowCallback(delay, stack))
+
+    def record_lag(self, lag: float) -> None:
+        """スケジューリング遅延を記録"""
+        self._lags.append(lag)
+        self._summary_lags.append(lag)
+        metrics.LOOP_LAG_SECONDS.observe(lag)
+
+    def record_slow_callback(self, entry: SlowCallback) -> None:
+        """長時間占有を記録"""
+        self._slow.append(entry)
+        self._summary_slow += 1
+        self.slow_callbacks_total += 1
+        metrics.LOOP_SLOW_CALLBACKS_TOTAL.inc()
+        log_ok("loop", "system", "system", entry.summary(), detail=entry.detail())
+
+    def log_summary(self) -> None:
+        """前回以降の遅延集計をログへ書き出し"""
+        lags = self._summary_lags
+        log_ok(
+            "loop", "system", "system",
+            f"loop_lag:n={len(lags)}:p50={_percentile(lags, 0.5) * 1000:.1f}ms"
+            f":p99={_percentile(lags, 0.99) * 1000:.1f}ms:max={max(lags, default=0.0) * 1000:.1f}ms"
+            f":slow={self._summary_slow}",
+        )
+        self._summary_lags = []
+        self._summary_slow = 0
+
+    async def _sample_lag(self) -> None:
+        """遅延計測ループ"""
+        last_summary = time.monotonic()
+        while True:
+            expected = time.monotonic() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            now = time.monotonic()
+            self.record_lag(max(0.0, now - expected))
+            if now - last_summary >= self.summary_interval:
+                self.log_summary()
+                last_summary = now
+
+    async def start(self) -> None:
+        """監視開始（キャンセルまで継続）
+
+        Raises:
+            RuntimeError: 既に監視中の場合
+        """
+        if self._watchdog is not None:
+            raise RuntimeError("LoopMonitor is already running")
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        try:
+            await self._sample_lag()
+        finally:
+            self._stop.set()
+            self._watchdog = None
+            with self._lock:
+                self._probe_sent_at = None
+                self._stall_stack = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """直近window件の遅延集計と直近の長時間占有"""
+        lags = list(self._lags)
+        return {
+            "lag_samples": len(lags),
+            "lag_p50": _percentile(lags, 0.5),
+            "lag_p99": _percentile(lags, 0.99),
+            "lag_max": max(lags, default=0.0),
+            "slow_callbacks_total": self.slow_callbacks_total,
+            "slow_callbacks": [
+                {"duration": entry.duration, "stack": list(entry.stack)} for entry in self._slow
+            ],
+        }
@@ -0,0 +1,327 @@
+# Metrics - プロセス内メトリクスとPrometheus形式エンドポイント
+# キュー・LLM・Discord・Redis・ループ健全性を実行中に参照可能にする
+
+"""プロセス内メトリクスレジストリ（Counter・Gauge・Histogram）
+
+計測点では辞書参照と加算のみを行い（ロック・I/Oなし）、テキスト化は取得時に行います。
+キュー深さ・モードなど既存オブジェクトが保持している値は、取得時に呼ばれる
+コレクタ（add_collector）で反映します。
+
+使い方:
+    METRICS_PORT=9464 で起動し、 curl http://127.0.0.1:9464/metrics
+"""
+
+import bisect
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    """サンプル値のテキスト表現"""
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """ラベル値のエスケープ"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """メトリクス共通処理（ラベル値の組毎に子を保持）"""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        if not name:
+            raise ValueError("Metric name is required")
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: Any) -> Any:
+        """ラベル値の組に対応する子メトリクス
+
+        Raises:
+            ValueError: ラベル数が定義と一致しない場合
+        """
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {len(key)} values"
+                )
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _only_child(self) -> Any:
+        if self.labelnames:
+            raise ValueError(f"{self.name} requires labels {self.labelnames}")
+        return self.labels()
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """(サンプル名, ラベル文字列, 値) の一覧"""
+        result = []
+        for key, child in sorted(self._children.items()):
+            labels = _format_labels(self.labelnames, key)
+            result.extend(child.samples(self.name, labels))
+        return result
+
+
+class _Value:
+    """単一値の子メトリクス"""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def samples(self, name: str, labels: str) -> List[Tuple[str, str, float]]:
+        return [(name, labels, self.value)]
+
+
+class Counter(_Metric):
+    """単調増加カウンタ（名前は_totalで終える）
+
+    コレクタで既存の累計値を反映する場合は子のset()を使用します。
+    """
+
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._only_child().inc(amount)
+
+
+class Gauge(_Metric):
+    """増減する現在値"""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def set(self, value: float) -> None:
+        self._only_child().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._only_child().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._only_child().dec(amount)
+
+
+class _HistogramValue:
+    """ヒストグラムの子メトリクス（バケット毎の件数・合計）"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: str) -> List[Tuple[str, str, float]]:
+        prefix = labels[:-1] + "," if labels else "{"
+        result = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            result.append((f"{name}_bucket", f'{prefix}le="{_format_value(bound)}"}}', cumulative))
+        result.append((f"{name}_bucket", f'{prefix}le="+Inf"}}', self.count))
+        result.append((f"{name}_sum", labels, self.sum))
+        result.append((f"{name}_count", labels, self.count))
+        return result
+
+
+class Histogram(_Metric):
+    """累積バケット付きヒストグラム"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+        if not self.buckets:
+            raise ValueError(f"{name} requires at least one finite bucket")
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._only_child().observe(value)
+
+
+class MetricsRegistry:
+    """メトリクスの登録とPrometheusテキスト形式での出力"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """取得時に呼び出すコレクタを登録（重複登録は無視）"""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """全メトリクスをPrometheusテキスト形式で出力（コレクタ実行後）"""
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """GET /metrics を提供するローカルHTTPサーバ（METRICS_PORT）"""
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.registry = registry
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.render().encode("utf-8"),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """サーバ起動（port=0で空きポート）
+
+        Returns:
+            str: メトリクスURL
+        """
+        if self._runner is not None:
+            raise RuntimeError("MetricsServer is already running")
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self.url = f"http://{host}:{bound_port}/metrics"
+        return self.url
+
+    async def stop(self) -> None:
+        """サーバ停止"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+# プロセス共有レジストリと計測項目
+registry = MetricsRegistry()
+
+EVENT_QUEUE_DEPTH = registry.gauge(
+    "bot_event_queue_depth", "Events waiting in the event pipeline", ("priority",))
+EVENTS_TOTAL = registry.counter(
+    "bot_events_total", "Events by priority and admission/processing outcome", ("priority", "outcome"))
+EVENT_WAIT_SECONDS = registry.histogram(
+    "bot_event_wait_seconds", "Time from enqueue to handler start", ("priority",))
+EVENT_SERVICE_SECONDS = registry.histogram(
+    "bot_event_service_seconds", "Handler run time", ("priority",))
+LLM_REQUEST_SECONDS = registry.histogram(
+    "bot_llm_request_seconds", "LLM call latency", ("kind", "result"))
+LLM_PROMPT_TOKENS = registry.histogram(
+    "bot_llm_prompt_tokens_estimated", "Estimated prompt tokens per LLM call", ("kind",),
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000))
+DISCORD_REQUEST_SECONDS = registry.histogram(
+    "bot_discord_request_seconds", "Discord REST request latency", ("route", "status"))
+DISCORD_RATE_LIMITED_TOTAL = registry.counter(
+    "bot_discord_rate_limited_total", "Discord REST 429 responses", ("route",))
+REDIS_COMMAND_SECONDS = registry.histogram(
+    "bot_redis_command_seconds", "Context store Redis command latency", ("command",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0))
+CONTEXT_RECORDS = registry.gauge(
+    "bot_context_records", "Records in the day's context (as last seen by this process)")
+MODE = registry.gauge("bot_mode", "Current system mode (1 for the active mode)", ("mode",))
+TICKS_TOTAL = registry.counter(
+    "bot_ticks_total", "Tick scheduler decisions", ("outcome",))
+SPECULATIVE_TICKS_TOTAL = registry.counter(
+    "bot_speculative_ticks_total", "Pre-generated tick results used or discarded", ("result",))
+LOOP_LAG_SECONDS = registry.histogram(
+    "bot_loop_lag_seconds", "Event loop scheduling lag",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+RUNTIME_INFO = registry.gauge(
+    "bot_runtime_info", "Event loop and default executor chosen at startup", ("loop", "executor_workers"))
+LOOP_SLOW_CALLBACKS_TOTAL = registry.counter(
+    "bot_loop_slow_callbacks_total", "Callbacks that blocked the event loop past the threshold")
@@ -0,0 +1,111 @@
+# Runtime - イベントループ・既定executorの選択
+# 起動時にuvloop（任意）と上限・スレッド名付きの既定executorを設定し、選択結果を記録する
+
+import asyncio
+import importlib.util
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Optional, Tuple
+
+from app import metrics
+from app.logger import log_ok
+
+
+EVENT_LOOPS = ("auto", "uvloop", "asyncio")
+EXECUTOR_THREAD_PREFIX = "bot-blocking"
+
+LoopFactory = Optional[Callable[[], asyncio.AbstractEventLoop]]
+
+
+@dataclass(frozen=True)
+class RuntimeInfo:
+    """起動時に選択したイベントループと既定executor"""
+
+    loop: str  # uvloop|asyncio
+    executor_workers: int
+
+    def summary(self) -> str:
+        return f"runtime:loop={self.loop}:executor={EXECUTOR_THREAD_PREFIX}x{self.executor_workers}"
+
+
+def default_executor_workers() -> int:
+    """既定のexecutorスレッド数（ThreadPoolExecutorの標準値と同じ min(32, CPU数+4)）"""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def select_event_loop(preference: str = "auto") -> Tuple[str, LoopFactory]:
+    """イベントループの選択
+
+    Args:
+        preference: auto（uvloopがあれば使用）|uvloop（必須）|asyncio
+
+    Returns:
+        Tuple[str, LoopFactory]: (ループ名, asyncio.Runnerへ渡すloop_factory)
+
+    Raises:
+        ValueError: 未知の指定、またはuvloop指定でパッケージが無い場合
+    """
+    if preference not in EVENT_LOOPS:
+        raise ValueError(f"Unknown event loop: {preference} (available: {', '.join(EVENT_LOOPS)})")
+    if preference == "asyncio":
+        return "asyncio", None
+    if importlib.util.find_spec("uvloop") is None:
+        if preference == "uvloop":
+            raise ValueError("EVENT_LOOP=uvloop requires the 'uvloop' package (pip install uvloop)")
+        return "asyncio", None
+    import uvloop
+
+    return "uvloop", uvloop.new_event_loop
+
+
+def configure_default_executor(
+    loop: asyncio.AbstractEventLoop, max_workers: int = 0
+) -> ThreadPoolExecutor:
+    """上限・スレッド名付きの既定executorを設定（run_in_executor(None, ...)の実行先）
+
+    Args:
+        loop: 対象のイベントループ
+        max_workers: スレッド数上限（0で default_executor_workers()）
+
+    Raises:
+        ValueError: max_workersが負の場合
+    """
+    if max_workers < 0:
+        raise ValueError(f"max_workers must be non-negative, got: {max_workers}")
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers or default_executor_workers(),
+        thread_name_prefix=EXECUTOR_THREAD_PREFIX,
+    )
+    loop.set_default_executor(executor)
+    return executor
+
+
+def record_runtime(loop_name: str, executor: ThreadPoolExecutor) -> RuntimeInfo:
+    """選択結果をログ・メトリクスへ記録"""
+    info = RuntimeInfo(loop=loop_name, executor_workers=executor._max_workers)
+    log_ok("runtime", "system", "system", info.summary())
+    metrics.RUNTIME_INFO.labels(info.loop, info.executor_workers).set(1)
+    return info
+
+
+def run(
+    main: Callable[[], Coroutine[Any, Any, Any]],
+    preference: str = "auto",
+    executor_workers: int = 0,
+) -> Any:
+    """選択したイベントループでmainを実行（既定executorを設定・選択結果を記録）
+
+    Raises:
+        ValueError: イベントループの選択に失敗した場合
+    """
+    loop_name, loop_factory = select_event_loop(preference)
+
+    async def _main() -> Any:
+        executor = configure_default_executor(asyncio.get_running_loop(), executor_workers)
+        info = record_runtime(loop_name, executor)
+        print(f"⚙️  イベントループ: {info.loop} / executor: {info.executor_workers}スレッド")
+        return await main()
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(_main())
@@ -53,6 +53,42 @@ def get_required_float(key: str) -> float:
         fail_fast(f"Environment variable '{key}' must be a float, got: {value}")
 
 
+def get_optional_env(key: str, default: str) -> str:
+    """任意環境変数の取得（未設定時は既定値）"""
+    value = os.getenv(key)
+    if value is None or value == "":
+        return default
+    return value
+
+
+def get_optional_int(key: str, default: int) -> int:
+    """任意整数環境変数の取得（未設定時は既定値・型変換失敗時は即座終了）"""
+    value = get_optional_env(key, str(default))
+    try:
+        return int(value)
+    except ValueError:
+        fail_fast(f"Environment variable '{key}' must be an integer, got: {value}")
+
+
+def get_optional_float(key: str, default: float) -> float:
+    """任意浮動小数点環境変数の取得（未設定時は既定値・型変換失敗時は即座終了）"""
+    value = get_optional_env(key, str(default))
+    try:
+        return float(value)
+    except ValueError:
+        fail_fast(f"Environment variable '{key}' must be a float, got: {value}")
+
+
+def get_optional_bool(key: str, default: bool) -> bool:
+    """任意真偽値環境変数の取得（未設定時は既定値・不正値は即座終了）"""
+    value = get_optional_env(key, "true" if default else "false").lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    fail_fast(f"Environment variable '{key}' must be a boolean (true/false), got: {value}")
+
+
 def validate_probability(key: str, value: float) -> float:
     """確率値の範囲検証（0.0-1.0）"""
     if not 0.0 <= value <= 1.0:
@@ -60,6 +96,13 @@ def validate_probability(key: str, value: float) -> float:
     return value
 
 
+def validate_non_negative(key: str, value: float) -> float:
+    """非負値の検証（0は無制限・無効の意味で使用）"""
+    if value < 0:
+        fail_fast(f"Environment variable '{key}' must be non-negative, got: {value}")
+    return value
+
+
 def validate_time_format(key: str, value: str) -> str:
     """時刻フォーマット検証（HH:MM）"""
     try:
@@ -92,6 +135,13 @@ class DiscordConfig:
     chan_development: str
     chan_lounge: str
     guild_id: str
+    http2: bool = False  # REST送信でHTTP/2を使用（要: httpx[http2]）
+    http_timeout_seconds: float = 10.0  # REST送信の読み取り/書き込みタイムアウト
+    http_max_connections: int = 20  # 共有クライアントの最大接続数
+    rate_limit_max_wait_seconds: float = 30.0  # レート制限待機の上限（超過時はFail-Fast）
+    rate_limit_max_retries: int = 3  # 429応答時の再送回数
+    typing_pipeline: bool = False  # 生成開始前からTypingを表示・維持
+    typing_keepalive_seconds: float = 8.0  # Typing維持の再送間隔
 
 
 @dataclass(frozen=True)
@@ -105,6 +155,22 @@ class AIServiceConfig:
     """AI サービス設定"""
     gemini_api_key: str
     gemini_timeout_seconds: int
+    streaming: bool = False  # ストリーミング生成（speaker確定時点でTyping）
+    context_cache: bool = False  # 当日文脈プレフィックスの明示キャッシュ
+    cache_min_chars: int = 16000  # キャッシュ作成に必要な最小文脈長
+    cache_refresh_chars: int = 8000  # 未キャッシュ末尾がこれを超えたら再作成
+    cache_ttl_seconds: int = 3600  # キャッシュTTL
+    rpm_limit: int = 0  # 1分あたりリクエスト上限（0で無制限）
+    tpm_limit: int = 0  # 1分あたり推定トークン上限（0で無制限）
+    rate_reserve_ratio: float = 0.2  # 低優先度(auto)が残すべき予備枠の割合
+    hedge_reply: bool = False  # reply生成のヘッジ（遅延時に同一リクエストを追加発行）
+    hedge_percentile: float = 0.95  # ヘッジ発行までの待機に使う直近レイテンシの分位点
+    hedge_min_samples: int = 20  # ヘッジ判定に必要な最小サンプル数
+    llm_provider: str = "gemini"  # LLMプロバイダ名（app.llm_providerの登録名）
+    base_url: str = ""  # APIエンドポイント上書き（ローカルフェイクサーバ等。空で既定）
+    report_chunk_chars: int = 60000  # 日報文脈の分割要約しきい値・チャンク長（0で無効）
+    report_map_concurrency: int = 4  # 分割要約の同時実行数
+    report_deadline_seconds: int = 240  # 分割要約フェーズ全体の締切（最終集約は別途timeout）
 
 
 @dataclass(frozen=True)
@@ -115,6 +181,33 @@ class TickConfig:
     max_test_minutes: int
     interval_sec_prod: int
     prob_prod: float
+    speculative: bool = False  # アイドル時に次の自発発言を先行生成
+
+
+@dataclass(frozen=True)
+class QueueConfig:
+    """イベントキュー受け入れ制御設定（0で無制限・期限なし）"""
+    max_depth_slash: int = 0  # SLASH優先度の待機上限
+    max_depth_user: int = 0  # USER優先度の待機上限
+    max_depth_tick: int = 0  # TICK優先度の待機上限
+    deadline_slash_seconds: float = 0.0  # SLASH待機の期限（超過分は破棄）
+    deadline_user_seconds: float = 0.0  # USER待機の期限
+    deadline_tick_seconds: float = 0.0  # TICK待機の期限
+    tick_preemption: str = "off"  # 高優先度到着時の実行中Tick: off|requeue|drop（既定は中断しない）
+    user_burst_window_seconds: float = 0.0  # チャンネル別ユーザー連投の統合窓（0で無効）
+    channel_workers: bool = False  # 論理チャンネル別ワーカーで並行処理
+    durable: bool = False  # Redis永続キュー（再起動後に未完了イベントを再開）
+    visibility_timeout_seconds: float = 300.0  # 実行中イベントの可視性期限（超過で再実行対象）
+    max_attempts: int = 3  # 永続イベントの最大実行回数（超過はデッドレター）
+    process_role: str = "all"  # プロセス役割: all|gateway（受信・投入のみ）|worker（実行のみ）
+    worker_poll_seconds: float = 0.5  # 空の区画でworkerが新規投入の通知を待つ最長秒数（経過後に再確認）
+
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    """実行環境設定（イベントループ・既定executor）"""
+    event_loop: str = "auto"  # auto（uvloopがあれば使用）|uvloop|asyncio
+    executor_max_workers: int = 0  # 既定executorのスレッド数上限（0で min(32, CPU数+4)）
 
 
 @dataclass(frozen=True)
@@ -138,6 +231,12 @@ class ChannelLimitsConfig:
 class LoggingConfig:
     """ログ設定"""
     log_file: str
+    loop_monitor: bool = True  # イベントループ遅延・長時間コールバックの監視
+    loop_lag_interval_seconds: float = 0.5  # スケジューリング遅延の計測間隔
+    loop_slow_callback_seconds: float = 0.1  # 長時間コールバックとして記録する閾値
+    loop_summary_interval_seconds: float = 60.0  # 遅延集計をログへ書き出す間隔
+    metrics_host: str = "127.0.0.1"  # メトリクスエンドポイントの待ち受けアドレス
+    metrics_port: int = 0  # Prometheus形式メトリクスのポート（0で無効）
 
 
 @dataclass(frozen=True)
@@ -151,6 +250,8 @@ class Settings:
     schedule: ScheduleConfig
     channel_limits: ChannelLimitsConfig
     logging: LoggingConfig
+    queue: QueueConfig = QueueConfig()
+    runtime: RuntimeConfig = RuntimeConfig()
 
 
 def load_settings() -> Settings:
@@ -172,7 +273,14 @@ def load_settings() -> Settings:
         chan_creation=get_required_env("CHAN_CREATION"),
         chan_development=get_required_env("CHAN_DEVELOPMENT"),
         chan_lounge=get_required_env("CHAN_LOUNGE"),
-        guild_id=get_required_env("GUILD_ID")
+        guild_id=get_required_env("GUILD_ID"),
+        http2=get_optional_bool("DISCORD_HTTP2", False),
+        http_timeout_seconds=get_optional_float("DISCORD_HTTP_TIMEOUT_SECONDS", 10.0),
+        http_max_connections=get_optional_int("DISCORD_HTTP_MAX_CONNECTIONS", 20),
+        rate_limit_max_wait_seconds=get_optional_float("DISCORD_RATE_LIMIT_MAX_WAIT_SECONDS", 30.0),
+        rate_limit_max_retries=get_optional_int("DISCORD_RATE_LIMIT_MAX_RETRIES", 3),
+        typing_pipeline=get_optional_bool("DISCORD_TYPING_PIPELINE", False),
+        typing_keepalive_seconds=get_optional_float("DISCORD_TYPING_KEEPALIVE_SECONDS", 8.0)
     )
     
     # Redis設定
@@ -180,10 +288,36 @@ def load_settings() -> Settings:
         url=get_required_env("REDIS_URL")
     )
     
+    # 日報分割要約のチャンク長（中間要約は最大500字のため、複数件を1チャンクに
+    # まとめられる長さでないと集約段で文字数が減らない）
+    report_chunk_chars = get_optional_int("REPORT_CHUNK_CHARS", 60000)
+    if report_chunk_chars != 0 and report_chunk_chars < 4000:
+        fail_fast(f"REPORT_CHUNK_CHARS must be 0 (disabled) or at least 4000, got: {report_chunk_chars}")
+
     # AIサービス設定
     ai_service_config = AIServiceConfig(
         gemini_api_key=get_required_env("GEMINI_API_KEY"),
-        gemini_timeout_seconds=get_required_int("GEMINI_TIMEOUT_SECONDS")
+        gemini_timeout_seconds=get_required_int("GEMINI_TIMEOUT_SECONDS"),
+        streaming=get_optional_bool("GEMINI_STREAMING", False),
+        context_cache=get_optional_bool("GEMINI_CONTEXT_CACHE", False),
+        cache_min_chars=get_optional_int("GEMINI_CACHE_MIN_CHARS", 16000),
+        cache_refresh_chars=get_optional_int("GEMINI_CACHE_REFRESH_CHARS", 8000),
+        cache_ttl_seconds=get_optional_int("GEMINI_CACHE_TTL_SECONDS", 3600),
+        rpm_limit=get_optional_int("GEMINI_RPM_LIMIT", 0),
+        tpm_limit=get_optional_int("GEMINI_TPM_LIMIT", 0),
+        rate_reserve_ratio=validate_probability(
+            "GEMINI_RATE_RESERVE_RATIO", get_optional_float("GEMINI_RATE_RESERVE_RATIO", 0.2)
+        ),
+        hedge_reply=get_optional_bool("GEMINI_HEDGE_REPLY", False),
+        hedge_percentile=validate_probability(
+            "GEMINI_HEDGE_PERCENTILE", get_optional_float("GEMINI_HEDGE_PERCENTILE", 0.95)
+        ),
+        hedge_min_samples=get_optional_int("GEMINI_HEDGE_MIN_SAMPLES", 20),
+        llm_provider=get_optional_env("LLM_PROVIDER", "gemini"),
+        base_url=get_optional_env("GEMINI_BASE_URL", ""),
+        report_chunk_chars=report_chunk_chars,
+        report_map_concurrency=get_optional_int("REPORT_MAP_CONCURRENCY", 4),
+        report_deadline_seconds=get_optional_int("REPORT_DEADLINE_SECONDS", 240)
     )
     
     # Tick設定（確率値の範囲検証付き）
@@ -195,9 +329,54 @@ def load_settings() -> Settings:
         prob_dev=prob_dev,
         max_test_minutes=get_required_int("MAX_TEST_MINUTES"),
         interval_sec_prod=get_required_int("TICK_INTERVAL_SEC_PROD"),
-        prob_prod=prob_prod
+        prob_prod=prob_prod,
+        speculative=get_optional_bool("TICK_SPECULATIVE", False)
+    )
+    
+    # イベントキュー受け入れ制御設定
+    tick_preemption = get_optional_env("QUEUE_TICK_PREEMPTION", "off")
+    if tick_preemption not in ("requeue", "drop", "off"):
+        fail_fast(f"QUEUE_TICK_PREEMPTION must be 'requeue', 'drop' or 'off', got: {tick_preemption}")
+    process_role = get_optional_env("PROCESS_ROLE", "all")
+    if process_role not in ("all", "gateway", "worker"):
+        fail_fast(f"PROCESS_ROLE must be 'all', 'gateway' or 'worker', got: {process_role}")
+    worker_poll_seconds = get_optional_float("QUEUE_WORKER_POLL_SECONDS", 0.5)
+    if worker_poll_seconds <= 0:
+        fail_fast(f"QUEUE_WORKER_POLL_SECONDS must be positive, got: {worker_poll_seconds}")
+    queue_config = QueueConfig(
+        max_depth_slash=validate_non_negative(
+            "QUEUE_MAX_DEPTH_SLASH", get_optional_int("QUEUE_MAX_DEPTH_SLASH", 0)),
+        max_depth_user=validate_non_negative(
+            "QUEUE_MAX_DEPTH_USER", get_optional_int("QUEUE_MAX_DEPTH_USER", 0)),
+        max_depth_tick=validate_non_negative(
+            "QUEUE_MAX_DEPTH_TICK", get_optional_int("QUEUE_MAX_DEPTH_TICK", 0)),
+        deadline_slash_seconds=validate_non_negative(
+            "QUEUE_DEADLINE_SLASH_SECONDS", get_optional_float("QUEUE_DEADLINE_SLASH_SECONDS", 0.0)),
+        deadline_user_seconds=validate_non_negative(
+            "QUEUE_DEADLINE_USER_SECONDS", get_optional_float("QUEUE_DEADLINE_USER_SECONDS", 0.0)),
+        deadline_tick_seconds=validate_non_negative(
+            "QUEUE_DEADLINE_TICK_SECONDS", get_optional_float("QUEUE_DEADLINE_TICK_SECONDS", 0.0)),
+        tick_preemption=tick_preemption,
+        user_burst_window_seconds=validate_non_negative(
+            "USER_BURST_WINDOW_SECONDS", get_optional_float("USER_BURST_WINDOW_SECONDS", 0.0)),
+        channel_workers=get_optional_bool("QUEUE_CHANNEL_WORKERS", False),
+        durable=get_optional_bool("QUEUE_DURABLE", False),
+        visibility_timeout_seconds=get_optional_float("QUEUE_VISIBILITY_TIMEOUT_SECONDS", 300.0),
+        max_attempts=get_optional_int("QUEUE_MAX_ATTEMPTS", 3),
+        process_role=process_role,
+        worker_poll_seconds=worker_poll_seconds
     )
     
+    # 実行環境設定
+    event_loop = get_optional_env("EVENT_LOOP", "auto")
+    if event_loop not in ("auto", "uvloop", "asyncio"):
+        fail_fast(f"EVENT_LOOP must be 'auto', 'uvloop' or 'asyncio', got: {event_loop}")
+    runtime_config = RuntimeConfig(
+        event_loop=event_loop,
+        executor_max_workers=validate_non_negative(
+            "EXECUTOR_MAX_WORKERS", get_optional_int("EXECUTOR_MAX_WORKERS", 0))
+    )
+
     # スケジュール設定（時刻フォーマット検証付き）
     schedule_config = ScheduleConfig(
         standby_start=validate_time_format("STANDBY_START", get_required_env("STANDBY_START")),
@@ -214,8 +393,28 @@ def load_settings() -> Settings:
     )
     
     # ログ設定
+    loop_monitor_intervals = {
+        key: get_optional_float(key, default)
+        for key, default in (
+            ("LOOP_LAG_INTERVAL_SECONDS", 0.5),
+            ("LOOP_SLOW_CALLBACK_SECONDS", 0.1),
+            ("LOOP_SUMMARY_INTERVAL_SECONDS", 60.0),
+        )
+    }
+    for key, value in loop_monitor_intervals.items():
+        if value <= 0:
+            fail_fast(f"{key} must be positive, got: {value}")
+    metrics_port = get_optional_int("METRICS_PORT", 0)
+    if not 0 <= metrics_port <= 65535:
+        fail_fast(f"METRICS_PORT must be between 0 and 65535, got: {metrics_port}")
     logging_config = LoggingConfig(
-        log_file=get_required_env("LOG_FILE")
+        log_file=get_required_env("LOG_FILE"),
+        loop_monitor=get_optional_bool("LOOP_MONITOR", True),
+        loop_lag_interval_seconds=loop_monitor_intervals["LOOP_LAG_INTERVAL_SECONDS"],
+        loop_slow_callback_seconds=loop_monitor_intervals["LOOP_SLOW_CALLBACK_SECONDS"],
+        loop_summary_interval_seconds=loop_monitor_intervals["LOOP_SUMMARY_INTERVAL_SECONDS"],
+        metrics_host=get_optional_env("METRICS_HOST", "127.0.0.1"),
+        metrics_port=metrics_port
     )
     
     # 環境設定
@@ -232,7 +431,9 @@ def load_settings() -> Settings:
         tick=tick_config,
         schedule=schedule_config,
         channel_limits=channel_limits_config,
-        logging=logging_config
+        logging=logging_config,
+        queue=queue_config,
+        runtime=runtime_config
     )
 
 
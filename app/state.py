@@ -2,7 +2,7 @@
 # Mode, Channel, Agent の型定義とステート操作
 
 from dataclasses import dataclass
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from enum import Enum
 from typing import Literal, Optional
 from zoneinfo import ZoneInfo
@@ -79,6 +79,32 @@ def mode_from_time(now_jst: datetime) -> Mode:
     return Mode.STANDBY
 
 
+def next_transition(now_jst: datetime) -> datetime:
+    """次にmode_from_timeの判定が切り替わる時刻を取得
+
+    境界は 00:00（→STANDBY）・PROCESSING_AT（→PROCESSING・日報）・PROCESSING_AT+1分（→ACTIVE）・
+    FREE_START（→FREE）です。
+
+    Args:
+        now_jst: JST タイムゾーンの現在時刻
+
+    Returns:
+        datetime: now_jstより後の最も近い境界時刻（now_jstと同じタイムゾーン）
+    """
+    processing_at = _parse_time_string(settings.schedule.processing_at)
+    free_start = _parse_time_string(settings.schedule.free_start)
+    processing_end = (datetime.combine(now_jst.date(), processing_at) + timedelta(minutes=1)).time()
+    boundaries = (time(0, 0), processing_at, processing_end, free_start)
+
+    # 当日と翌日の境界から選択（翌日00:00は常に未来のため候補は空にならない）
+    return min(
+        candidate
+        for day in (now_jst.date(), now_jst.date() + timedelta(days=1))
+        for boundary in boundaries
+        if (candidate := datetime.combine(day, boundary, tzinfo=now_jst.tzinfo)) > now_jst
+    )
+
+
 def init_active_channel(mode: Mode) -> Channel:
     """モードに応じた初期アクティブチャンネルを決定
     
@@ -169,6 +195,37 @@ def get_task() -> Task:
     return get_state().task
 
 
+def export_state() -> dict:
+    """ステートをJSON化可能な辞書で取得（gateway→workerへのイベント添付用）"""
+    state = get_state()
+    return {
+        "mode": state.mode.value,
+        "active_channel": state.active_channel,
+        "task": {"content": state.task.content, "channel": state.task.channel},
+    }
+
+
+def import_state(data: dict) -> None:
+    """export_state()の辞書でステートを上書き
+
+    Args:
+        data: export_state()が返した辞書
+
+    Raises:
+        ValueError: 不正なモード値、または必須キーが欠けている場合
+    """
+    try:
+        mode = Mode(data["mode"])
+        active_channel = data["active_channel"]
+        task = Task(content=data["task"]["content"], channel=data["task"]["channel"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid state snapshot: {e}") from e
+    state = get_state()
+    state.mode = mode
+    state.active_channel = active_channel
+    state.task = task
+
+
 def get_current_jst_time() -> datetime:
     """現在のJST時間を取得"""
     jst_tz = ZoneInfo("Asia/Tokyo")
@@ -2,14 +2,16 @@
 # 当日全文脈をRedisに一元保存
 
 import sys
+import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Literal
+from typing import Callable, List, Literal
 from zoneinfo import ZoneInfo
 
 import orjson
 import redis
 
+from app import metrics
 from app.logger import log_err, log_ok
 from app.settings import settings
 
@@ -31,6 +33,21 @@ class Record:
 # Redis key constants
 SESSION_ID = "discord_unified"
 REDIS_KEY = f"session:{SESSION_ID}:messages"
+APPLIED_KEY = f"session:{SESSION_ID}:applied"  # append_onceで追記済みのキー（reset()で削除）
+
+# 未追記の場合のみ記録して追記（KEYS[1]=applied, KEYS[2]=messages, ARGV[1]=キー, ARGV[2]=レコード）
+APPEND_ONCE_SCRIPT = """
+if redis.call('SADD', KEYS[1], ARGV[1]) == 0 then
+    return -1
+end
+return redis.call('RPUSH', KEYS[2], ARGV[2])
+"""
+
+# reset()成功後の通知先（文脈キャッシュ無効化など）
+_reset_listeners: List[Callable[[], None]] = []
+
+# 文脈バージョン（本プロセスからのappend/resetで単調増加・先行生成の鮮度判定用）
+_context_version = 0
 
 
 def _get_jst_timestamp() -> str:
@@ -81,7 +98,9 @@ def read_all() -> List[Record]:
         r = _get_redis_connection()
         
         # Redis list から全メッセージを取得（時系列順）
+        started = time.perf_counter()
         messages_json = r.lrange(REDIS_KEY, 0, -1)
+        metrics.REDIS_COMMAND_SECONDS.labels("lrange").observe(time.perf_counter() - started)
         
         records = []
         for msg_json in messages_json:
@@ -99,6 +118,7 @@ def read_all() -> List[Record]:
                 # Skip malformed records but continue processing
                 continue
         
+        metrics.CONTEXT_RECORDS.set(len(records))
         log_ok("store", "system", "system", f"Read {len(records)} messages from Redis")
         return records
         
@@ -111,6 +131,22 @@ def read_all() -> List[Record]:
         sys.exit(1)
 
 
+def _serialize_record(agent: Agent, channel: Channel, text: str) -> str:
+    """追記用のレコードJSON（タイムスタンプは現在のJST）"""
+    record = Record(
+        agent=agent,
+        channel=channel,
+        timestamp=_get_jst_timestamp(),
+        text=text
+    )
+    return orjson.dumps({
+        "agent": record.agent,
+        "channel": record.channel,
+        "timestamp": record.timestamp,
+        "text": record.text
+    }).decode('utf-8')
+
+
 def append(agent: Agent, channel: Channel, text: str) -> None:
     """新しいメッセージの追記
     
@@ -122,24 +158,16 @@ def append(agent: Agent, channel: Channel, text: str) -> None:
     try:
         r = _get_redis_connection()
         
-        # レコード作成
-        record = Record(
-            agent=agent,
-            channel=channel,
-            timestamp=_get_jst_timestamp(),
-            text=text
-        )
-        
-        # JSON にシリアライズ
-        record_json = orjson.dumps({
-            "agent": record.agent,
-            "channel": record.channel,
-            "timestamp": record.timestamp,
-            "text": record.text
-        }).decode('utf-8')
+        # レコード作成・JSON にシリアライズ
+        record_json = _serialize_record(agent, channel, text)
         
         # Redis list に追記（右端＝最新）
-        r.rpush(REDIS_KEY, record_json)
+        started = time.perf_counter()
+        context_length = r.rpush(REDIS_KEY, record_json)
+        metrics.REDIS_COMMAND_SECONDS.labels("rpush").observe(time.perf_counter() - started)
+        if isinstance(context_length, int):
+            metrics.CONTEXT_RECORDS.set(context_length)
+        _bump_context_version()
         
         log_ok("store", channel, agent, f"Appended message: {text[:80]}")
         
@@ -152,15 +180,86 @@ def append(agent: Agent, channel: Channel, text: str) -> None:
         sys.exit(1)
 
 
+def append_once(key: str, agent: Agent, channel: Channel, text: str) -> bool:
+    """キー単位で1回だけ追記（永続イベントの再実行による重複追記を防止）
+
+    キーの記録と追記はLuaスクリプトで不可分に行います（記録のみ残って追記が失われることはない）。
+
+    Args:
+        key: 追記の識別子（永続イベントID＋用途など）
+        agent: エージェント名
+        channel: チャンネル名
+        text: メッセージ内容
+
+    Returns:
+        bool: 追記した場合True（同じキーで追記済みの場合False）
+    """
+    try:
+        r = _get_redis_connection()
+        record_json = _serialize_record(agent, channel, text)
+
+        started = time.perf_counter()
+        context_length = r.register_script(APPEND_ONCE_SCRIPT)(
+            keys=[APPLIED_KEY, REDIS_KEY], args=[key, record_json]
+        )
+        metrics.REDIS_COMMAND_SECONDS.labels("append_once").observe(time.perf_counter() - started)
+        if context_length == -1:
+            log_ok("store", channel, agent, f"Skipped replayed append: {key}")
+            return False
+        metrics.CONTEXT_RECORDS.set(context_length)
+        _bump_context_version()
+
+        log_ok("store", channel, agent, f"Appended message: {text[:80]}")
+        return True
+
+    except SystemExit:
+        # _get_redis_connection already handles the error logging and exit
+        raise
+    except Exception as e:
+        log_err("store", channel, agent, f"Failed to append message: {text[:80]}", "memory", str(e))
+        print(f"FATAL REDIS ERROR: Failed to append message: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def context_version() -> int:
+    """現在の文脈バージョンを取得（append/reset毎に増加）"""
+    return _context_version
+
+
+def _bump_context_version() -> None:
+    """文脈バージョンを進める"""
+    global _context_version
+    _context_version += 1
+
+
+def add_reset_listener(listener: Callable[[], None]) -> None:
+    """reset()成功後に呼び出すリスナーを登録（重複登録は無視）
+
+    Args:
+        listener: 引数なしのコールバック（例外を送出しないこと）
+    """
+    if listener not in _reset_listeners:
+        _reset_listeners.append(listener)
+
+
 def reset() -> None:
     """全メッセージのリセット（日報後の全削除）"""
     try:
         r = _get_redis_connection()
         
         # キーの存在確認と削除
+        started = time.perf_counter()
         deleted_count = r.delete(REDIS_KEY)
+        r.delete(APPLIED_KEY)  # 追記済みキーも当日分のみ保持
+        metrics.REDIS_COMMAND_SECONDS.labels("delete").observe(time.perf_counter() - started)
+        metrics.CONTEXT_RECORDS.set(0)
+        _bump_context_version()
         
         log_ok("store", "system", "system", f"Reset Redis store (deleted {deleted_count} keys)")
+
+        # 全文脈リセットを依存モジュールへ通知
+        for listener in _reset_listeners:
+            listener()
         
     except SystemExit:
         # _get_redis_connection already handles the error logging and exit
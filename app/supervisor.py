@@ -3,26 +3,68 @@
 
 import json
 import asyncio
-from typing import Dict, Any
-from google import genai
+import math
+import string
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
 from google.genai import types
+from app import metrics, store
+from app.llm_provider import MODEL_NAME, LLMProvider, create_provider
+from app.logger import log_err, log_ok
 from app.settings import settings
 
 
-def build_prompt(
+PROMPT_KINDS = ("reply", "auto", "report")
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """(kind, channel) 単位の事前コンパイル済みプロンプト
+
+    検証・チャンネル制限計算・各設定dictのrepr()を含む静的部分を一度だけ構築し、
+    呼び出し毎はtaskとcontextのみをjoinで差し込みます。数百KBに及ぶcontextを
+    中間文字列にコピーしないよう、連結は1回のjoinで行います。
+    """
+
+    kind: str
+    channel: str
+    head: str  # 先頭〜"- Task: "
+    middle: str  # "\n- Context: "
+    tail: str  # Channel Limits以降の静的部分
+    limits: Dict[str, int]
+    persona: Dict[str, str]
+    report_config: Dict[str, Any]
+
+    def matches(
+        self, limits: Dict[str, int], persona: Dict[str, str], report_config: Dict[str, Any]
+    ) -> bool:
+        """コンパイル時と同じ設定値かどうか"""
+        return (
+            limits == self.limits
+            and persona == self.persona
+            and report_config == self.report_config
+        )
+
+    def render(self, task: str, context: str) -> str:
+        """taskとcontextを差し込んだプロンプトを生成"""
+        return "".join((self.head, task, self.middle, context, self.tail))
+
+
+def compile_prompt_template(
     kind: str,
     channel: str,
-    task: str,
-    context: str,
     limits: Dict[str, int],
     persona: Dict[str, str],
     report_config: Dict[str, Any],
-) -> str:
-    """LLMプロンプト構築"""
+) -> PromptTemplate:
+    """プロンプトテンプレートの事前コンパイル（検証は初回のみ）"""
     # Fail-Fast: 必須パラメータ検証
     if not kind:
         raise ValueError("Kind cannot be empty")
-    if kind not in ["reply", "auto", "report"]:
+    if kind not in PROMPT_KINDS:
         raise ValueError(f"Invalid kind: {kind}. Must be reply, auto, or report")
     if not channel:
         raise ValueError("Channel cannot be empty")
@@ -41,14 +83,15 @@ def build_prompt(
         "lounge": limits.get("lo", 30),
     }
 
-    # 基本プロンプト構築
-    prompt = f"""あなたはDiscord Multi-Agent Systemの一部として動作します。
+    # 基本プロンプト構築（Task/Context以外の静的部分）
+    head = f"""あなたはDiscord Multi-Agent Systemの一部として動作します。
 
 **入力情報:**
 - Kind: {kind}
 - Channel: {channel}
-- Task: {task}
-- Context: {context}
+- Task: """
+
+    tail = f"""
 - Channel Limits: {channel_limits}
 - Persona: {persona}
 - Report Config: {report_config}
@@ -64,10 +107,95 @@ def build_prompt(
 現在のチャンネル「{channel}」の制限は{channel_limits.get(channel, 100)}文字です。
 この制限内で完全な応答を提供してください。"""
 
-    return prompt
+    return PromptTemplate(
+        kind=kind,
+        channel=channel,
+        head=head,
+        middle="\n- Context: ",
+        tail=tail,
+        limits=dict(limits),
+        persona=dict(persona),
+        report_config=dict(report_config),
+    )
 
 
-async def generate(
+class PromptTemplateCache:
+    """(kind, channel) 単位のテンプレートキャッシュ
+
+    設定値が変わった場合のみ再コンパイルします（dict比較のみでrepr()は行わない）。
+    """
+
+    def __init__(self) -> None:
+        self._templates: Dict[Tuple[str, str], PromptTemplate] = {}
+
+    def get(
+        self,
+        kind: str,
+        channel: str,
+        limits: Dict[str, int],
+        persona: Dict[str, str],
+        report_config: Dict[str, Any],
+    ) -> PromptTemplate:
+        """テンプレート取得（未コンパイル・設定変更時はコンパイル）"""
+        template = self._templates.get((kind, channel))
+        if template is None or not template.matches(limits, persona, report_config):
+            template = compile_prompt_template(kind, channel, limits, persona, report_config)
+            self._templates[(kind, channel)] = template
+        return template
+
+    def warm(
+        self,
+        channels: Iterable[str],
+        limits: Dict[str, int],
+        persona: Dict[str, str],
+        report_config: Dict[str, Any],
+    ) -> int:
+        """起動時に全kind×channelを事前コンパイル
+
+        Returns:
+            int: キャッシュ済みテンプレート数
+        """
+        for channel in channels:
+            for kind in PROMPT_KINDS:
+                self.get(kind, channel, limits, persona, report_config)
+        return len(self._templates)
+
+    def clear(self) -> None:
+        """キャッシュ全削除"""
+        self._templates.clear()
+
+
+# グローバルテンプレートキャッシュ
+prompt_templates = PromptTemplateCache()
+
+
+@lru_cache(maxsize=1)
+def default_prompt_inputs() -> Tuple[Dict[str, int], Dict[str, str], Dict[str, Any]]:
+    """settings由来の (limits, persona, report_config) を一度だけ構築
+
+    Note:
+        返却値は共有されるため、呼び出し側で変更しないこと。
+    """
+    limits = {
+        "cc": settings.channel_limits.limit_cc,
+        "cr": settings.channel_limits.limit_cr,
+        "dev": settings.channel_limits.limit_dev,
+        "lo": settings.channel_limits.limit_lo,
+    }
+
+    # ペルソナとレポート設定（基本実装）
+    persona = {"default": "Discord Multi-Agent System"}
+    report_config = {"format": "daily", "max_chars": 500}
+    return limits, persona, report_config
+
+
+def warm_prompt_templates(channels: Iterable[str]) -> int:
+    """起動時のテンプレート事前コンパイル（settings由来の設定値を使用）"""
+    limits, persona, report_config = default_prompt_inputs()
+    return prompt_templates.warm(channels, limits, persona, report_config)
+
+
+def build_prompt(
     kind: str,
     channel: str,
     task: str,
@@ -75,55 +203,768 @@ async def generate(
     limits: Dict[str, int],
     persona: Dict[str, str],
     report_config: Dict[str, Any],
-) -> Dict[str, str]:
-    """LLM応答生成（Gemini 2.0 Flash）"""
-    # Fail-Fast: APIキー検証
+) -> str:
+    """LLMプロンプト構築（テンプレートキャッシュ経由）"""
+    template = prompt_templates.get(kind, channel, limits, persona, report_config)
+    return template.render(task, context)
+
+
+# JSON応答スキーマ定義（speakerを先頭に出力させ、ストリーミング時の早期確定を可能にする）
+RESPONSE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "speaker": {"type": "string", "enum": ["spectra", "lynq", "paz"]},
+        "text": {"type": "string"},
+    },
+    "required": ["speaker", "text"],
+    "property_ordering": ["speaker", "text"],
+}
+
+MAX_OUTPUT_TOKENS = 1000
+VALID_SPEAKERS = ("spectra", "lynq", "paz")
+
+# speaker確定通知コールバック（ストリーミング生成用）
+SpeakerCallback = Callable[[str], None]
+
+
+# 明示キャッシュ対象のkind（reportは1日1回のため対象外）
+CACHEABLE_KINDS = ("reply", "auto")
+
+# キャッシュ済みコンテンツのシステム指示（kind/channelに依存しない共通部分）
+CACHE_SYSTEM_INSTRUCTION = """あなたはDiscord Multi-Agent Systemの一部として動作します。
+続く内容は当日の会話文脈の前半です。後続プロンプトの指示と未キャッシュの文脈に従い、
+必ず厳密なJSON形式 {"speaker": "spectra|lynq|paz", "text": "応答内容"} で応答してください。"""
+
+# キャッシュ利用時にプロンプト内の文脈欄へ付与する注記
+CACHED_CONTEXT_NOTE = "（これより前の文脈はキャッシュ済みコンテンツを参照）\n"
+
+
+class ContextCacheManager:
+    """当日文脈プレフィックスの明示キャッシュ管理（Gemini cached content）
+
+    当日文脈はappend-onlyで伸びるため、キャッシュ済みプレフィックスで始まる限り
+    キャッシュを再利用し、未キャッシュの末尾のみを毎回送信します。
+    末尾が閾値を超えた時・TTL満了が近い時・プレフィックスが一致しない時に再作成し、
+    store.reset()時に無効化します。キャッシュAPIはcaches.create/deleteを持つ
+    任意のオブジェクトを受け付けるため、ローカルのフェイクでも検証できます。
+    作成・削除はネットワーク呼び出しのため既定executorで実行し、作成はロックで
+    直列化します（同時呼び出しが各自キャッシュを作成して片方が残るのを防止）。
+    """
+
+    def __init__(
+        self,
+        min_chars: int,
+        refresh_chars: int,
+        ttl_seconds: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_chars = min_chars
+        self.refresh_chars = refresh_chars
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._name: Optional[str] = None
+        self._prefix = ""
+        self._created_at = 0.0
+        self._caches: Any = None  # キャッシュを作成したAPI（削除用）
+        self._lock = asyncio.Lock()
+        self._pending_deletes: set = set()  # invalidate()が投入した削除
+
+    @property
+    def cache_name(self) -> Optional[str]:
+        """現在のキャッシュ名（未作成時はNone）"""
+        return self._name
+
+    @property
+    def cached_chars(self) -> int:
+        """キャッシュ済みプレフィックスの文字数"""
+        return len(self._prefix) if self._name else 0
+
+    def _is_expiring(self) -> bool:
+        """TTL満了が近いかどうか（TTLの9割経過で再作成）"""
+        return self._clock() - self._created_at >= self.ttl_seconds * 0.9
+
+    async def prepare(self, caches: Any, context: str) -> Tuple[Optional[str], str]:
+        """キャッシュを確保し、(キャッシュ名, 未キャッシュ文脈) を返す
+
+        キャッシュを利用しない場合は (None, context) を返します。
+        """
+        async with self._lock:
+            return await self._prepare_locked(caches, context)
+
+    async def _prepare_locked(self, caches: Any, context: str) -> Tuple[Optional[str], str]:
+        if self._name is not None and not self._is_expiring() and context.startswith(self._prefix):
+            tail = context[len(self._prefix):]
+            if len(tail) <= self.refresh_chars:
+                return self._name, tail
+
+        if len(context) < self.min_chars:
+            # 文脈が短い（リセット直後など）場合はキャッシュ不要
+            await self._discard()
+            return None, context
+
+        if not await self._create(caches, context):
+            return None, context
+        return self._name, ""
+
+    async def _create(self, caches: Any, context: str) -> bool:
+        """文脈全体をチェックポイントとしてキャッシュを作成（失敗時は非キャッシュで継続）"""
+        config = types.CreateCachedContentConfig(
+            system_instruction=CACHE_SYSTEM_INSTRUCTION,
+            contents=[context],
+            ttl=f"{self.ttl_seconds}s",
+            display_name="discord_unified_context",
+        )
+        try:
+            loop = asyncio.get_running_loop()
+            cached = await loop.run_in_executor(
+                None, lambda: caches.create(model=MODEL_NAME, config=config)
+            )
+            if not cached or not getattr(cached, "name", None):
+                raise ValueError("Cache API returned no name")
+        except Exception as e:
+            log_err("supervisor", "system", "system", "Context cache create failed", "plan", str(e))
+            await self._discard()
+            return False
+
+        await self._discard()
+        self._name = cached.name
+        self._prefix = context
+        self._created_at = self._clock()
+        self._caches = caches
+        log_ok("supervisor", "system", "system", f"Context cache created: {len(context)}chars")
+        return True
+
+    def _detach(self) -> Tuple[Optional[str], Any]:
+        """現在のキャッシュを未使用状態にし、削除対象の (キャッシュ名, API) を返す"""
+        name, caches = self._name, self._caches
+        self._name = None
+        self._prefix = ""
+        self._caches = None
+        return name, caches
+
+    @staticmethod
+    def _delete(caches: Any, name: str) -> None:
+        """キャッシュ削除（ブロッキング・削除失敗時もTTLで失効するため継続）"""
+        try:
+            caches.delete(name=name)
+        except Exception as e:
+            log_err("supervisor", "system", "system", "Context cache delete failed", "plan", str(e))
+
+    async def _discard(self) -> None:
+        """キャッシュを破棄し、削除完了を待つ（prepare内用）"""
+        name, caches = self._detach()
+        if name is not None and caches is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._delete, caches, name)
+
+    def invalidate(self) -> None:
+        """キャッシュを破棄（store.reset()のリスナー・同期呼び出し用）
+
+        即座に未使用状態とし、削除はイベントループ実行中なら既定executorへ投入します
+        （完了はwait_deletes()で待機可能）。ループ外ではその場で削除します。
+        """
+        name, caches = self._detach()
+        if name is None or caches is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._delete(caches, name)
+            return
+        future = loop.run_in_executor(None, self._delete, caches, name)
+        self._pending_deletes.add(future)
+        future.add_done_callback(self._pending_deletes.discard)
+
+    async def wait_deletes(self) -> None:
+        """invalidate()が投入した削除の完了待ち"""
+        if self._pending_deletes:
+            await asyncio.gather(*self._pending_deletes)
+
+
+# グローバル文脈キャッシュ（日報後のstore.reset()で無効化）
+context_cache = ContextCacheManager(
+    min_chars=settings.ai_service.cache_min_chars,
+    refresh_chars=settings.ai_service.cache_refresh_chars,
+    ttl_seconds=settings.ai_service.cache_ttl_seconds,
+)
+store.add_reset_listener(context_cache.invalidate)
+
+
+def _build_char_class_table() -> bytes:
+    """UTF-8バイト → 文字種クラスの変換表（bytes.translate用）"""
+    table = bytearray(b"s" * 256)  # 空白・制御文字（トークンに数えない）
+    for byte in (string.ascii_letters + string.digits).encode("ascii"):
+        table[byte] = ord("a")  # ASCII英数字
+    for byte in string.punctuation.encode("ascii"):
+        table[byte] = ord("p")  # ASCII記号
+    for byte in range(0x80, 0xC0):
+        table[byte] = ord("c")  # マルチバイト継続バイト（数えない）
+    for byte in range(0xC0, 0x100):
+        table[byte] = ord("o")  # その他の非ASCII文字（全角記号・絵文字等）
+    table[0xE3] = ord("j")  # U+3000-U+3FFF（ひらがな・カタカナ・和文句読点）
+    for byte in range(0xE4, 0xEA):
+        table[byte] = ord("k")  # U+4000-U+9FFF（CJK統合漢字）
+    return bytes(table)
+
+
+_CHAR_CLASS_TABLE = _build_char_class_table()
+
+# 文字種毎の1文字あたり推定トークン数（日英混在の会話文脈向けの概算値）
+TOKENS_PER_ASCII_ALNUM = 0.25  # 英単語は約4文字で1トークン
+TOKENS_PER_ASCII_PUNCT = 1.0
+TOKENS_PER_KANA = 0.6  # ひらがな・カタカナは結合されやすい
+TOKENS_PER_KANJI = 1.0
+TOKENS_PER_OTHER = 1.0
+
+
+def estimate_tokens(text: str) -> int:
+    """文字種ベースのプロンプト推定トークン数（日英混在向け）
+
+    UTF-8バイト列を文字種クラスへ一括変換し、クラス毎の文字数に係数を掛けて
+    合算します。正規表現や文字単位のループを使わないため、数百KBの文脈でも
+    数ミリ秒で推定できます。実測値との比はllm_telemetryで確認できます。
+    """
+    if not text:
+        return 1
+    classes = text.encode("utf-8").translate(_CHAR_CLASS_TABLE)
+    tokens = (
+        classes.count(b"a") * TOKENS_PER_ASCII_ALNUM
+        + classes.count(b"p") * TOKENS_PER_ASCII_PUNCT
+        + classes.count(b"j") * TOKENS_PER_KANA
+        + classes.count(b"k") * TOKENS_PER_KANJI
+        + classes.count(b"o") * TOKENS_PER_OTHER
+    )
+    return int(tokens) + 1
+
+
+def count_context_records(context: str) -> int:
+    """整形済み文脈のレコード数（"agent: text" の行数）"""
+    return context.count("\n") + 1 if context else 0
+
+
+# 低優先度として扱うkind（予備枠を残し、高優先度の待機中は譲る）
+LOW_PRIORITY_KINDS = ("auto",)
+
+
+@dataclass(frozen=True)
+class RateHeadroom:
+    """レート制限の現在の余裕"""
+
+    requests: float  # 残りリクエスト枠
+    tokens: float  # 残り推定トークン枠
+    request_ratio: float  # 残りリクエスト枠の割合（0.0-1.0）
+    token_ratio: float  # 残りトークン枠の割合（0.0-1.0）
+
+
+class _TokenBucket:
+    """1分あたり上限を持つトークンバケット（上限0で無制限）"""
+
+    def __init__(self, per_minute: int, now: float) -> None:
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._updated = now
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def refill(self, now: float) -> None:
+        if self.unlimited:
+            return
+        self.level = min(self.capacity, self.level + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amountを確保できるまでの待機秒数"""
+        if self.unlimited or self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self._rate
+
+    @property
+    def ratio(self) -> float:
+        return 1.0 if self.unlimited else max(self.level, 0.0) / self.capacity
+
+
+class RateLimiter:
+    """Gemini呼び出しのクライアント側レート制御（RPM/推定TPMのトークンバケット）
+
+    無料枠の1分あたりリクエスト数・トークン数の上限に達する前に呼び出しを遅延させ、
+    429エラー（= planエラーでのプロセス終了）を防ぎます。低優先度(auto)の呼び出しは
+    予備枠を残した状態でしか実行されず、高優先度(reply/report)の待機中は後回しになります。
+    """
+
+    def __init__(
+        self,
+        rpm_limit: int,
+        tpm_limit: int,
+        reserve_ratio: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._clock = clock
+        self._sleep = sleep
+        now = clock()
+        self._requests = _TokenBucket(rpm_limit, now)
+        self._tokens = _TokenBucket(tpm_limit, now)
+        self.reserve_ratio = reserve_ratio
+        self._high_priority_waiters = 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._requests.refill(now)
+        self._tokens.refill(now)
+
+    def _required(self, bucket: _TokenBucket, cost: float, low_priority: bool) -> float:
+        """確保が必要な枠（低優先度は予備枠分を上乗せ・上限で頭打ち）"""
+        if low_priority:
+            cost += bucket.capacity * self.reserve_ratio
+        return min(cost, bucket.capacity)
+
+    def _wait_time(self, estimated_tokens: int, low_priority: bool) -> float:
+        return max(
+            self._requests.wait_time(self._required(self._requests, 1, low_priority)),
+            self._tokens.wait_time(self._required(self._tokens, estimated_tokens, low_priority)),
+        )
+
+    def headroom(self) -> RateHeadroom:
+        """現在の残り枠"""
+        self._refill()
+        return RateHeadroom(
+            requests=self._requests.level,
+            tokens=self._tokens.level,
+            request_ratio=self._requests.ratio,
+            token_ratio=self._tokens.ratio,
+        )
+
+    def has_headroom(self, kind: str, estimated_tokens: int = MAX_OUTPUT_TOKENS) -> bool:
+        """待機なしで実行可能かどうか（TickSchedulerのスキップ判定用）"""
+        self._refill()
+        low_priority = kind in LOW_PRIORITY_KINDS
+        if low_priority and self._high_priority_waiters:
+            return False
+        return self._wait_time(estimated_tokens, low_priority) == 0.0
+
+    async def acquire(self, kind: str, estimated_tokens: int) -> float:
+        """枠を確保（不足時は補充まで待機）
+
+        Returns:
+            float: 待機した秒数
+        """
+        low_priority = kind in LOW_PRIORITY_KINDS
+        waited = 0.0
+        if not low_priority:
+            self._high_priority_waiters += 1
+        try:
+            while True:
+                self._refill()
+                delay = self._wait_time(estimated_tokens, low_priority)
+                if low_priority and self._high_priority_waiters:
+                    # 高優先度の待機中は譲る
+                    delay = max(delay, 0.05)
+                if delay <= 0:
+                    break
+                await self._sleep(delay)
+                waited += delay
+        finally:
+            if not low_priority:
+                self._high_priority_waiters -= 1
+
+        self._take(estimated_tokens)
+        return waited
+
+    def try_acquire(self, kind: str, estimated_tokens: int) -> bool:
+        """待機なしで確保できる場合のみ枠を確保（ヘッジ等の任意の追加呼び出し用）
+
+        Returns:
+            bool: 確保した場合True（枠不足時は何も消費せずFalse）
+        """
+        if not self.has_headroom(kind, estimated_tokens):
+            return False
+        self._take(estimated_tokens)
+        return True
+
+    def _take(self, estimated_tokens: int) -> None:
+        """1リクエスト分と推定トークン分を消費"""
+        if not self._requests.unlimited:
+            self._requests.level -= 1
+        if not self._tokens.unlimited:
+            self._tokens.level -= min(estimated_tokens, self._tokens.capacity)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Any) -> None:
+        """実際の使用トークン数で推定値との差分を補正"""
+        if self._tokens.unlimited or not isinstance(actual_tokens, int):
+            return
+        self._tokens.level -= actual_tokens - min(estimated_tokens, self._tokens.capacity)
+
+
+# グローバルレート制御（全Gemini呼び出しで共有）
+rate_limiter = RateLimiter(
+    rpm_limit=settings.ai_service.rpm_limit,
+    tpm_limit=settings.ai_service.tpm_limit,
+    reserve_ratio=settings.ai_service.rate_reserve_ratio,
+)
+
+
+async def _acquire_rate_limit(kind: str, prompt_tokens: int, wait: bool = True) -> int:
+    """呼び出し前のレート枠確保（待機発生時はログ記録）
+
+    Args:
+        prompt_tokens: プロンプトの推定トークン数（estimate_tokens）
+        wait: Falseの場合は待機せず、即時に確保できなければValueError
+
+    Returns:
+        int: 確保した推定トークン数（出力枠込み・使用量補正用）
+    """
+    estimated = prompt_tokens + MAX_OUTPUT_TOKENS
+    if not wait:
+        if not rate_limiter.try_acquire(kind, estimated):
+            raise ValueError(f"Rate limit headroom unavailable: {kind}")
+        return estimated
+    waited = await rate_limiter.acquire(kind, estimated)
+    if waited > 0:
+        log_ok("supervisor", "system", "system", f"rate_limit_wait:{kind}:{waited:.2f}s")
+    return estimated
+
+
+def _usage_tokens(response: Any, field: str) -> Optional[int]:
+    """応答のusage_metadataからトークン数を取得（無ければNone）"""
+    usage = getattr(response, "usage_metadata", None)
+    value = getattr(usage, field, None) if usage is not None else None
+    return value if isinstance(value, int) else None
+
+
+def _usage_total_tokens(response: Any) -> Optional[int]:
+    """応答のusage_metadataから総トークン数を取得（無ければNone）"""
+    return _usage_tokens(response, "total_token_count")
+
+
+@dataclass(frozen=True)
+class CallTelemetry:
+    """LLM呼び出し1回分の計測値"""
+
+    kind: str
+    prompt_chars: int
+    estimated_tokens: int  # プロンプトの推定トークン数（出力枠を除く）
+    context_records: int
+    prompt_tokens: Optional[int]  # usage_metadata.prompt_token_count
+    total_tokens: Optional[int]  # usage_metadata.total_token_count
+    latency: float
+    ok: bool
+
+    def summary(self) -> str:
+        """ログ用の要約（payload_summary 80字以内）"""
+        actual = "-" if self.prompt_tokens is None else self.prompt_tokens
+        status = "" if self.ok else ":err"
+        return (
+            f"llm_call:{self.kind}:{self.prompt_chars}c:est{self.estimated_tokens}"
+            f":act{actual}:ctx{self.context_records}:{self.latency:.2f}s{status}"
+        )
+
+
+class LLMTelemetry:
+    """LLM呼び出しの計測記録（容量計画・文脈バジェット調整用）
+
+    全呼び出しのプロンプト文字数・推定トークン数・文脈レコード数・実使用量を
+    直近window件保持し、各呼び出しをlog_okへ記録します。
+    """
+
+    def __init__(self, window: int = 500) -> None:
+        self._entries: Deque[CallTelemetry] = deque(maxlen=window)
+        self.total_calls = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, entry: CallTelemetry) -> None:
+        """計測値を記録"""
+        self._entries.append(entry)
+        self.total_calls += 1
+        metrics.LLM_REQUEST_SECONDS.labels(entry.kind, "ok" if entry.ok else "error").observe(entry.latency)
+        metrics.LLM_PROMPT_TOKENS.labels(entry.kind).observe(entry.estimated_tokens)
+        log_ok("supervisor", "system", "system", entry.summary())
+
+    def recent(self) -> List[CallTelemetry]:
+        """直近の計測値（古い順）"""
+        return list(self._entries)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """直近window件の集計
+
+        estimate_ratio は 実プロンプトトークン数 / 推定トークン数（1.0で推定が正確）。
+        """
+        entries = list(self._entries)
+        measured = [e for e in entries if e.prompt_tokens is not None]
+        estimated_sum = sum(e.estimated_tokens for e in measured)
+        return {
+            "total_calls": self.total_calls,
+            "calls": len(entries),
+            "errors": sum(1 for e in entries if not e.ok),
+            "prompt_chars_max": max((e.prompt_chars for e in entries), default=0),
+            "estimated_tokens_max": max((e.estimated_tokens for e in entries), default=0),
+            "context_records_max": max((e.context_records for e in entries), default=0),
+            "prompt_tokens_max": max((e.prompt_tokens for e in measured), default=0),
+            "estimate_ratio": (
+                sum(e.prompt_tokens for e in measured) / estimated_sum if estimated_sum else None
+            ),
+        }
+
+
+# 全LLM呼び出しの計測記録
+llm_telemetry = LLMTelemetry()
+
+
+def _generation_config(cached_content: Optional[str] = None) -> types.GenerateContentConfig:
+    """Gemini 生成設定（JSON応答モード）"""
+    return types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=RESPONSE_SCHEMA,
+        max_output_tokens=MAX_OUTPUT_TOKENS,
+        temperature=0.7,
+        cached_content=cached_content,
+    )
+
+
+async def _prepare_request(
+    provider: LLMProvider,
+    kind: str,
+    channel: str,
+    task: str,
+    context: str,
+    limits: Dict[str, int],
+    persona: Dict[str, str],
+    report_config: Dict[str, Any],
+) -> Tuple[str, types.GenerateContentConfig]:
+    """プロンプトと生成設定の構築（明示キャッシュ有効時は未キャッシュ末尾のみ送信）"""
+    cache_name: Optional[str] = None
+    caches = provider.caches
+    if settings.ai_service.context_cache and kind in CACHEABLE_KINDS and caches is not None:
+        cache_name, tail = await context_cache.prepare(caches, context)
+        if cache_name is not None:
+            context = CACHED_CONTEXT_NOTE + tail
+
+    prompt = build_prompt(kind, channel, task, context, limits, persona, report_config)
+    return prompt, _generation_config(cached_content=cache_name)
+
+
+def _create_provider() -> LLMProvider:
+    """設定に基づくLLMプロバイダ生成（LLM_PROVIDER・GEMINI_BASE_URL）"""
+    return create_provider(
+        settings.ai_service.llm_provider,
+        settings.ai_service.gemini_api_key,
+        settings.ai_service.base_url,
+    )
+
+
+def _validate_request(kind: str, channel: str) -> None:
+    """Fail-Fast: APIキー・入力パラメータ検証"""
     if not settings.ai_service.gemini_api_key:
         raise ValueError("GEMINI_API_KEY is not configured")
-
-    # Fail-Fast: 入力パラメータ検証
     if not kind or not channel:
         raise ValueError("Kind and channel are required")
 
-    # プロンプト構築
-    prompt = build_prompt(kind, channel, task, context, limits, persona, report_config)
 
-    # Gemini クライアント初期化
-    client = genai.Client(api_key=settings.ai_service.gemini_api_key)
-
-    # JSON応答スキーマ定義
-    response_schema = {
-        "type": "object",
-        "properties": {
-            "speaker": {"type": "string", "enum": ["spectra", "lynq", "paz"]},
-            "text": {"type": "string"},
-        },
-        "required": ["speaker", "text"],
-    }
+def _parse_result(kind: str, response_text: str) -> Dict[str, str]:
+    """応答JSONの解析と構造検証（kind=reportの特別処理を含む）"""
+    try:
+        result = json.loads(response_text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON parsing failed: {e}") from e
+
+    # Fail-Fast: JSON構造検証
+    if not isinstance(result, dict):
+        raise ValueError("Response is not a JSON object")
+    if "speaker" not in result or "text" not in result:
+        raise ValueError("Response missing required fields: speaker, text")
+    if result["speaker"] not in VALID_SPEAKERS:
+        raise ValueError(f"Invalid speaker: {result['speaker']}")
+    if not isinstance(result["text"], str):
+        raise ValueError("Response text must be a string")
+
+    # 6-2: kind=reportの場合の特別処理
+    if kind == "report":
+        # speaker強制: spectraに固定
+        result["speaker"] = "spectra"
+        # 文字数制限: 500文字以内に切り詰め
+        if len(result["text"]) > 500:
+            result["text"] = result["text"][:500]
+
+    return result
 
+
+class LatencyTracker:
+    """直近のLLM応答レイテンシ記録（ヘッジ発行までの待機時間の算出用）"""
+
+    def __init__(self, window: int = 100) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """レイテンシ（秒）を記録"""
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """分位点（0.0-1.0・nearest-rank）。サンプルが無い場合はNone"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(p * len(ordered)) - 1))
+        return ordered[index]
+
+
+# reply生成のレイテンシ記録（ヘッジ判定用）
+reply_latency = LatencyTracker()
+
+
+async def _call_llm(
+    provider: LLMProvider, prompt: str, config: types.GenerateContentConfig, timeout: float
+) -> Any:
+    """プロバイダの単発生成を実行（タイムアウト付き）"""
+    return await asyncio.wait_for(provider.generate(prompt, config), timeout=timeout)
+
+
+def _hedge_delay(kind: str) -> Optional[float]:
+    """ヘッジ発行までの待機秒数（対象外・サンプル不足時はNone）"""
+    if kind != "reply" or not settings.ai_service.hedge_reply:
+        return None
+    if len(reply_latency) < settings.ai_service.hedge_min_samples:
+        return None
+    return reply_latency.percentile(settings.ai_service.hedge_percentile)
+
+
+# ヘッジ呼び出しの計測kind（元リクエストと区別して呼び出し数・所要時間を記録）
+HEDGE_TELEMETRY_KIND = "reply_hedge"
+
+# ヘッジ採用後も計測のため継続中の元リクエスト（完了まで参照を保持）
+_hedge_primaries: Set["asyncio.Future[Any]"] = set()
+
+
+async def _call_llm_hedge(
+    provider: LLMProvider,
+    prompt: str,
+    config: types.GenerateContentConfig,
+    timeout: float,
+    prompt_tokens: int,
+    context_records: int,
+) -> Any:
+    """ヘッジ呼び出し（キャンセル時も含めreply_hedgeとして計測記録）"""
+    started = time.monotonic()
+    response: Any = None
+    ok = False
     try:
-        # Gemini 2.0 Flash で生成（タイムアウト設定付き）
-        loop = asyncio.get_event_loop()
-
-        # 同期APIを非同期タスクとして実行
-        generate_task = loop.run_in_executor(
-            None,
-            lambda: client.models.generate_content(
-                model="gemini-2.0-flash-001",
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    response_schema=response_schema,
-                    max_output_tokens=1000,
-                    temperature=0.7,
-                ),
-            ),
-        )
+        response = await _call_llm(provider, prompt, config, timeout)
+        ok = True
+        return response
+    finally:
+        llm_telemetry.record(CallTelemetry(
+            kind=HEDGE_TELEMETRY_KIND,
+            prompt_chars=len(prompt),
+            estimated_tokens=prompt_tokens,
+            context_records=context_records,
+            prompt_tokens=_usage_tokens(response, "prompt_token_count"),
+            total_tokens=_usage_total_tokens(response),
+            latency=time.monotonic() - started,
+            ok=ok,
+        ))
 
-        # タイムアウト設定でLLM呼び出し実行
-        response = await asyncio.wait_for(
-            generate_task, timeout=settings.ai_service.gemini_timeout_seconds
-        )
+
+async def _call_llm_hedged(
+    provider: LLMProvider,
+    prompt: str,
+    config: types.GenerateContentConfig,
+    estimated_tokens: int,
+    hedge_delay: float,
+    prompt_tokens: int = 0,
+    context_records: int = 0,
+) -> Any:
+    """ヘッジ付きLLM呼び出し
+
+    hedge_delay秒以内に応答が無い場合、待機なしでレート枠を確保できれば同一リクエストを
+    追加発行し、先に成功した応答を採用します。
+    reply_latencyには採用した応答ではなく元リクエスト自身の所要時間を記録します
+    （ヘッジの速い応答を記録すると分位点が下がり続け、ヘッジが常態化するため）。
+    そのためヘッジが先に成功しても元リクエストはキャンセルせず完了まで計測します
+    （executor上の同期呼び出しは中断できず、発行済みのRPMも戻らないため追加の負荷はありません）。
+    """
+    timeout = settings.ai_service.gemini_timeout_seconds
+    started = time.monotonic()
+    primary = asyncio.ensure_future(_call_llm(provider, prompt, config, timeout))
+
+    def _record_primary(task: "asyncio.Future[Any]") -> None:
+        _hedge_primaries.discard(task)
+        if not task.cancelled() and task.exception() is None:
+            reply_latency.record(time.monotonic() - started)
+
+    primary.add_done_callback(_record_primary)
+
+    done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+    if done:
+        return primary.result()
+
+    # ヘッジは枠を待機なしで確保できた場合のみ（RPM/TPMの上限を超えない）
+    if not rate_limiter.try_acquire("reply", estimated_tokens):
+        log_ok("supervisor", "system", "system", f"hedge_skipped:no_headroom:{hedge_delay:.2f}s")
+        return await primary
+
+    hedge = asyncio.ensure_future(_call_llm_hedge(
+        provider, prompt, config, max(timeout - hedge_delay, 0.001), prompt_tokens, context_records
+    ))
+    pending = {primary, hedge}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for finished in done:
+                if finished.exception() is None:
+                    winner = "primary" if finished is primary else "hedge"
+                    elapsed = time.monotonic() - started
+                    log_ok(
+                        "supervisor", "system", "system",
+                        f"hedge_fired:{winner}:{hedge_delay:.2f}s->{elapsed:.2f}s",
+                    )
+                    return finished.result()
+        # 両方失敗: 元リクエストの例外を送出
+        return primary.result()
+    finally:
+        if not hedge.done():
+            hedge.cancel()
+        if not primary.done():
+            # 所要時間の計測のため完了（またはタイムアウト）まで継続
+            _hedge_primaries.add(primary)
+
+
+async def _generate_once(
+    provider: LLMProvider,
+    kind: str,
+    prompt: str,
+    config: types.GenerateContentConfig,
+    timeout: float,
+    context_records: int,
+    wait_for_rate_limit: bool = True,
+) -> Dict[str, str]:
+    """1回分のLLM呼び出し（レート制御・ヘッジ・応答検証・JSON解析・計測記録）"""
+    # クライアント側レート制御（無料枠の上限超過を事前に回避）
+    prompt_tokens = estimate_tokens(prompt)
+    estimated_tokens = await _acquire_rate_limit(kind, prompt_tokens, wait_for_rate_limit)
+
+    started = time.monotonic()
+    response: Any = None
+    ok = False
+    try:
+        # Gemini 2.0 Flash で生成（reply遅延時はヘッジ発行）
+        hedge_delay = _hedge_delay(kind)
+        if hedge_delay is None:
+            response = await _call_llm(provider, prompt, config, timeout)
+            if kind == "reply":
+                reply_latency.record(time.monotonic() - started)
+        else:
+            # 元リクエスト自身の所要時間は_call_llm_hedged内で記録
+            response = await _call_llm_hedged(
+                provider, prompt, config, estimated_tokens, hedge_delay,
+                prompt_tokens, context_records,
+            )
+
+        rate_limiter.record_usage(estimated_tokens, _usage_total_tokens(response))
 
         # Fail-Fast: レスポンス検証
         if not response or not hasattr(response, "text"):
@@ -132,30 +973,400 @@ async def generate(
             raise ValueError("Empty response from Gemini API")
 
         # JSON解析
-        try:
-            result = json.loads(response.text)
-
-            # Fail-Fast: JSON構造検証
-            if not isinstance(result, dict):
-                raise ValueError("Response is not a JSON object")
-            if "speaker" not in result or "text" not in result:
-                raise ValueError("Response missing required fields: speaker, text")
-            if result["speaker"] not in ["spectra", "lynq", "paz"]:
-                raise ValueError(f"Invalid speaker: {result['speaker']}")
-            if not isinstance(result["text"], str):
-                raise ValueError("Response text must be a string")
-
-            # 6-2: kind=reportの場合の特別処理
-            if kind == "report":
-                # speaker強制: spectraに固定
-                result["speaker"] = "spectra"
-                # 文字数制限: 500文字以内に切り詰め
-                if len(result["text"]) > 500:
-                    result["text"] = result["text"][:500]
-
-            return result
-        except json.JSONDecodeError as e:
-            raise ValueError(f"JSON parsing failed: {e}") from e
+        result = _parse_result(kind, response.text)
+        ok = True
+        return result
 
     except Exception as e:
         raise ValueError(f"LLM generation failed: {e}") from e
+
+    finally:
+        llm_telemetry.record(CallTelemetry(
+            kind=kind,
+            prompt_chars=len(prompt),
+            estimated_tokens=prompt_tokens,
+            context_records=context_records,
+            prompt_tokens=_usage_tokens(response, "prompt_token_count"),
+            total_tokens=_usage_total_tokens(response),
+            latency=time.monotonic() - started,
+            ok=ok,
+        ))
+
+
+# --- 日報の分割要約（map-reduce） ---
+
+REPORT_PARTIAL_MAX_CHARS = 500
+
+# 中間要約の再分割の上限回数（超過・文字数が減らない場合はその時点の中間要約で最終集約）
+REPORT_REDUCE_MAX_ROUNDS = 3
+
+REPORT_MAP_HEAD = """あなたはDiscord Multi-Agent SystemのSpectraです。
+以下は本日の会話ログの一部です。日報作成のための中間要約を作成してください。
+
+**要件:**
+- 決定事項・進捗・課題・次のアクションを優先して抽出
+- """ + str(REPORT_PARTIAL_MAX_CHARS) + """文字以内
+- レスポンスは厳密なJSON形式: {"speaker": "spectra", "text": "中間要約"}
+
+**会話ログ（"""
+
+REPORT_PARTIALS_NOTE = "（本日の会話ログを時間順に分割要約したもの）\n"
+
+
+def needs_report_map_reduce(kind: str, context: str) -> bool:
+    """日報文脈が分割要約の対象か（REPORT_CHUNK_CHARS超過時）"""
+    chunk_chars = settings.ai_service.report_chunk_chars
+    return kind == "report" and chunk_chars > 0 and len(context) > chunk_chars
+
+
+def split_context_chunks(context: str, max_chars: int) -> List[str]:
+    """文脈をレコード（行）境界でmax_chars以下のチャンクに分割
+
+    1行がmax_charsを超える場合のみ行の途中で分割します。
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be positive")
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    for line in context.split("\n"):
+        while len(line) > max_chars:
+            if current:
+                chunks.append("\n".join(current))
+                current, current_len = [], 0
+            chunks.append(line[:max_chars])
+            line = line[max_chars:]
+        added = len(line) + (1 if current else 0)
+        if current and current_len + added > max_chars:
+            chunks.append("\n".join(current))
+            current, current_len = [], 0
+            added = len(line)
+        current.append(line)
+        current_len += added
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def build_report_map_prompt(chunk: str, index: int, total: int) -> str:
+    """分割要約（map）用プロンプト"""
+    return "".join((REPORT_MAP_HEAD, f"{index}/{total}）:**\n", chunk))
+
+
+async def _summarize_report_chunks(
+    provider: LLMProvider, chunks: List[str], deadline: float
+) -> List[str]:
+    """チャンクを同時実行数・締切付きで並行要約（失敗・締切超過分は除外し時系列順で返す）"""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max(1, settings.ai_service.report_map_concurrency))
+    timeout = settings.ai_service.gemini_timeout_seconds
+    config = _generation_config()
+
+    async def summarize(index: int, chunk: str) -> str:
+        async with semaphore:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError("report deadline exceeded")
+            prompt = build_report_map_prompt(chunk, index + 1, len(chunks))
+            result = await _generate_once(
+                provider, "report", prompt, config, min(timeout, remaining),
+                count_context_records(chunk),
+            )
+            return result["text"]
+
+    tasks = [asyncio.ensure_future(summarize(i, chunk)) for i, chunk in enumerate(chunks)]
+    done, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline - loop.time()))
+    for task in pending:
+        task.cancel()
+
+    partials: List[str] = []
+    failed = len(pending)
+    for task in tasks:
+        if task in done and task.exception() is None:
+            partials.append(task.result())
+        elif task in done:
+            failed += 1
+            log_err("supervisor", "system", "spectra", "report_map_chunk", "report", str(task.exception()))
+    if failed:
+        log_err(
+            "supervisor", "system", "spectra", "report_map_partial", "report",
+            f"{failed}/{len(chunks)} chunks skipped",
+        )
+    return partials
+
+
+async def _generate_report_map_reduce(
+    provider: LLMProvider,
+    channel: str,
+    task: str,
+    context: str,
+    limits: Dict[str, int],
+    persona: Dict[str, str],
+    report_config: Dict[str, Any],
+) -> Dict[str, str]:
+    """大規模な日報文脈の分割要約生成
+
+    文脈をREPORT_CHUNK_CHARS以下のチャンクに分割してレート枠内で並行要約し、
+    中間要約の連結が再びしきい値を超える場合は同様に繰り返します（最大
+    REPORT_REDUCE_MAX_ROUNDS回・文字数が減らない場合は打ち切り）。最後に通常の
+    reportプロンプトで500字のSpectra日報へ集約します。分割要約フェーズ全体は
+    REPORT_DEADLINE_SECONDSで打ち切るため、総所要時間はメッセージ量に依存せず
+    REPORT_DEADLINE_SECONDS + GEMINI_TIMEOUT_SECONDS 以内に収まります。
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.ai_service.report_deadline_seconds
+    chunk_chars = settings.ai_service.report_chunk_chars
+
+    level = context
+    previous_chars = math.inf
+    for _ in range(REPORT_REDUCE_MAX_ROUNDS):
+        if len(level) <= chunk_chars:
+            break
+        if len(level) >= previous_chars:
+            # 中間要約の連結が縮まない（チャンク長が短すぎる）: 再要約せず最終集約へ
+            log_err(
+                "supervisor", "system", "spectra", "report_reduce_no_progress", "report",
+                f"{len(level)}chars >= {previous_chars}chars",
+            )
+            break
+        previous_chars = len(level)
+        chunks = split_context_chunks(level, chunk_chars)
+        partials = await _summarize_report_chunks(provider, chunks, deadline)
+        if not partials:
+            raise ValueError(
+                f"LLM generation failed: report map phase produced no summaries ({len(chunks)} chunks)"
+            )
+        level = "\n".join(
+            f"[{i + 1}/{len(partials)}] {partial}" for i, partial in enumerate(partials)
+        )
+        log_ok(
+            "supervisor", "system", "spectra",
+            f"report_map:{len(chunks)}chunks->{len(partials)}partials:{len(level)}chars",
+        )
+    else:
+        if len(level) > chunk_chars:
+            log_err(
+                "supervisor", "system", "spectra", "report_reduce_rounds", "report",
+                f"{len(level)}chars after {REPORT_REDUCE_MAX_ROUNDS} rounds",
+            )
+
+    prompt = build_prompt(
+        "report", channel, task, REPORT_PARTIALS_NOTE + level, limits, persona, report_config
+    )
+    return await _generate_once(
+        provider, "report", prompt, _generation_config(),
+        settings.ai_service.gemini_timeout_seconds, count_context_records(level),
+    )
+
+
+async def generate(
+    kind: str,
+    channel: str,
+    task: str,
+    context: str,
+    limits: Dict[str, int],
+    persona: Dict[str, str],
+    report_config: Dict[str, Any],
+    context_records: Optional[int] = None,
+    wait_for_rate_limit: bool = True,
+) -> Dict[str, str]:
+    """LLM応答生成（Gemini 2.0 Flash）
+
+    context_records: 文脈のレコード数（計測用・省略時はcontextの行数）
+    wait_for_rate_limit: Falseの場合はレート枠を待機なしで確保（不足時はValueError・先行生成用）
+    """
+    # Fail-Fast: APIキー・入力パラメータ検証
+    _validate_request(kind, channel)
+
+    # LLMプロバイダ初期化（既定はGemini）
+    provider = _create_provider()
+
+    # 大規模な日報文脈は分割要約（単一呼び出しの入力上限・タイムアウト回避）
+    if needs_report_map_reduce(kind, context):
+        return await _generate_report_map_reduce(
+            provider, channel, task, context, limits, persona, report_config
+        )
+
+    # プロンプト構築（明示キャッシュ有効時はキャッシュ確保）
+    prompt, config = await _prepare_request(
+        provider, kind, channel, task, context, limits, persona, report_config
+    )
+
+    if context_records is None:
+        context_records = count_context_records(context)
+    return await _generate_once(
+        provider, kind, prompt, config, settings.ai_service.gemini_timeout_seconds,
+        context_records, wait_for_rate_limit,
+    )
+
+
+class StreamingJsonParser:
+    """{"speaker","text"} 応答JSONの逐次解析
+
+    チャンク単位で受け取ったJSONテキストを走査し、トップレベルの
+    speaker値が確定した時点と、オブジェクトが閉じた時点を検出します。
+    走査位置を保持するため、各チャンクは一度しか走査しません。
+    """
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._offset = 0  # これまでに走査した総文字数
+        self._text = ""  # 文字列値の切り出し用（走査済みテキスト）
+        self._pending_key: Optional[str] = None
+        self._expect_value = False
+        self.speaker: Optional[str] = None
+        self.is_complete = False
+
+    def feed(self, chunk: str) -> None:
+        """チャンクを追加して走査を進める"""
+        if self.is_complete or not chunk:
+            return
+        self._text += chunk
+        text = self._text
+        for i in range(self._offset, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._on_string(text[self._string_start:i])
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i + 1
+            elif ch == "{" or ch == "[":
+                self._depth += 1
+                self._expect_value = False
+            elif ch == "}" or ch == "]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.is_complete = True
+                    self._offset = i + 1
+                    self._text = text[: i + 1]
+                    return
+            elif ch == ":" and self._depth == 1:
+                self._expect_value = True
+            elif ch == "," and self._depth == 1:
+                self._pending_key = None
+                self._expect_value = False
+        self._offset = len(text)
+
+    def _on_string(self, raw: str) -> None:
+        """トップレベルのキー/文字列値の確定処理"""
+        if self._depth != 1:
+            return
+        if not self._expect_value:
+            self._pending_key = raw
+            return
+        if self._pending_key == "speaker" and self.speaker is None:
+            try:
+                self.speaker = json.loads(f'"{raw}"')
+            except json.JSONDecodeError:
+                self.speaker = raw
+        self._pending_key = None
+        self._expect_value = False
+
+    @property
+    def text(self) -> str:
+        """走査済みの応答テキスト（完了時はオブジェクト終端まで）"""
+        return self._text
+
+
+async def generate_stream(
+    kind: str,
+    channel: str,
+    task: str,
+    context: str,
+    limits: Dict[str, int],
+    persona: Dict[str, str],
+    report_config: Dict[str, Any],
+    on_speaker: Optional[SpeakerCallback] = None,
+    context_records: Optional[int] = None,
+) -> Dict[str, str]:
+    """LLM応答のストリーミング生成（Gemini 2.0 Flash）
+
+    generateと同じ入力・出力契約で、SDKのストリーミングAPIを用いて応答を
+    逐次解析します。speakerが確定した時点でon_speakerを呼び出し（Typing先行用）、
+    JSONオブジェクトが閉じた時点で残りのストリームを待たずに結果を返します。
+    """
+    # Fail-Fast: APIキー・入力パラメータ検証
+    _validate_request(kind, channel)
+
+    provider = _create_provider()
+
+    # 大規模な日報文脈は分割要約（speakerはspectra固定のため通知後に非ストリーミングで生成）
+    if needs_report_map_reduce(kind, context):
+        if on_speaker is not None:
+            on_speaker("spectra")
+        return await _generate_report_map_reduce(
+            provider, channel, task, context, limits, persona, report_config
+        )
+
+    prompt, config = await _prepare_request(
+        provider, kind, channel, task, context, limits, persona, report_config
+    )
+    prompt_tokens = estimate_tokens(prompt)
+    estimated_tokens = await _acquire_rate_limit(kind, prompt_tokens)
+    parser = StreamingJsonParser()
+    speaker_notified = False
+    usage_tokens: Any = None
+    usage_prompt_tokens: Optional[int] = None
+
+    # kind=reportはspeakerがspectra固定のため、最初のトークンを待たずに通知
+    if kind == "report" and on_speaker is not None:
+        on_speaker("spectra")
+        speaker_notified = True
+
+    async def _consume() -> None:
+        nonlocal speaker_notified, usage_tokens, usage_prompt_tokens
+        stream = await provider.stream(prompt, config)
+        async for chunk in stream:
+            usage_tokens = _usage_total_tokens(chunk) or usage_tokens
+            usage_prompt_tokens = _usage_tokens(chunk, "prompt_token_count") or usage_prompt_tokens
+            parser.feed(getattr(chunk, "text", None) or "")
+            if not speaker_notified and parser.speaker in VALID_SPEAKERS:
+                speaker_notified = True
+                if on_speaker is not None:
+                    on_speaker(parser.speaker)
+            if parser.is_complete:
+                break
+
+    started = time.monotonic()
+    ok = False
+    try:
+        await asyncio.wait_for(
+            _consume(), timeout=settings.ai_service.gemini_timeout_seconds
+        )
+        rate_limiter.record_usage(estimated_tokens, usage_tokens)
+
+        # Fail-Fast: レスポンス検証
+        if not parser.text:
+            raise ValueError("Empty response from Gemini API")
+
+        result = _parse_result(kind, parser.text)
+        ok = True
+        return result
+
+    except Exception as e:
+        raise ValueError(f"LLM generation failed: {e}") from e
+
+    finally:
+        llm_telemetry.record(CallTelemetry(
+            kind=kind,
+            prompt_chars=len(prompt),
+            estimated_tokens=prompt_tokens,
+            context_records=(
+                count_context_records(context) if context_records is None else context_records
+            ),
+            prompt_tokens=usage_prompt_tokens,
+            total_tokens=usage_tokens,
+            latency=time.monotonic() - started,
+            ok=ok,
+        ))
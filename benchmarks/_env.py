@@ -0,0 +1,27 @@
+"""ベンチマーク共通の実行環境（app.settings読み込み前にimportする）
+
+リポジトリルートをimportパスへ追加し、ベンチマーク用の環境変数を設定します。
+ログはリポジトリ外の一時ディレクトリへ出力します（logs/を汚さない）。
+設定済みの環境変数は上書きしません。
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+for _key, _value in {
+    "ENV": "dev", "TZ": "Asia/Tokyo",
+    "SPECTRA_TOKEN": "bench", "LYNQ_TOKEN": "bench", "PAZ_TOKEN": "bench",
+    "CHAN_COMMAND_CENTER": "1", "CHAN_CREATION": "2", "CHAN_DEVELOPMENT": "3", "CHAN_LOUNGE": "4",
+    "GUILD_ID": "1", "REDIS_URL": "redis://localhost:6379",
+    "GEMINI_API_KEY": "bench", "GEMINI_TIMEOUT_SECONDS": "30",
+    "TICK_INTERVAL_SEC_DEV": "15", "TICK_PROB_DEV": "1.0", "MAX_TEST_MINUTES": "5",
+    "TICK_INTERVAL_SEC_PROD": "300", "TICK_PROB_PROD": "0.33",
+    "STANDBY_START": "00:00", "PROCESSING_AT": "06:00", "FREE_START": "20:00",
+    "LIMIT_CC": "100", "LIMIT_CR": "200", "LIMIT_DEV": "200", "LIMIT_LO": "30",
+    "LOG_FILE": os.path.join(tempfile.gettempdir(), "discord-multi-agent-bench.log"),
+}.items():
+    os.environ.setdefault(_key, _value)
@@ -0,0 +1,63 @@
+"""build_prompt マイクロベンチマーク（事前コンパイル済みテンプレート vs 毎回構築）
+
+使い方:
+    python benchmarks/bench_build_prompt.py [メッセージ数] [反復回数]
+
+当日文脈が1万メッセージ規模の場合に、毎回の検証・dict repr()・f-string展開を
+行う従来経路（compile + render）と、事前コンパイル済みテンプレートへの
+task/context差し込みのみの経路を比較します。
+"""
+
+import sys
+import time
+
+# ベンチマーク用環境変数（app.settings読み込み前に設定）
+import _env  # noqa: F401
+
+from app.supervisor import compile_prompt_template, default_prompt_inputs, prompt_templates  # noqa: E402
+
+
+def _make_context(messages: int) -> str:
+    """日英混在の当日文脈を生成"""
+    agents = ("user", "spectra", "lynq", "paz")
+    return "\n".join(
+        f"{agents[i % 4]}: メッセージ{i} progress update for the task 実装を進めています"
+        for i in range(messages)
+    )
+
+
+def _bench(label: str, fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    per_call_us = elapsed / iterations * 1e6
+    print(f"{label:<28} {per_call_us:10.1f} µs/call")
+    return per_call_us
+
+
+def main() -> None:
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    context = _make_context(messages)
+    limits, persona, report_config = default_prompt_inputs()
+    task = "自然な会話を継続"
+    print(f"context: {messages} messages / {len(context):,} chars, iterations: {iterations}")
+
+    def uncached() -> str:
+        template = compile_prompt_template("reply", "3", limits, persona, report_config)
+        return template.render(task, context)
+
+    def cached() -> str:
+        template = prompt_templates.get("reply", "3", limits, persona, report_config)
+        return template.render(task, context)
+
+    assert uncached() == cached()
+    baseline = _bench("compile + render (per call)", uncached, iterations)
+    optimized = _bench("precompiled render", cached, iterations)
+    print(f"speedup: {baseline / optimized:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""イベントループ比較ベンチマーク（asyncio標準ループ / uvloop）
+
+使い方:
+    python benchmarks/bench_event_loop.py [リクエスト数] [同時実行数] [平均ms] [executorスレッド数]
+
+ローカルにFakeLLMServerを起動し、supervisor.generate（プロンプト構築・SDK・HTTP・JSON検証・
+既定executor上の同期生成呼び出し）を各イベントループ上で並行実行して、スループット・
+レイテンシ分位点・ループのスケジューリング遅延を計測します。
+uvloopが未導入の場合はasyncioのみ計測します（pip install uvloop で比較可能）。
+"""
+
+import asyncio
+import sys
+import time
+from dataclasses import replace
+
+# ベンチマーク用環境変数（app.settings読み込み前に設定）
+import _env  # noqa: F401
+
+from unittest.mock import patch  # noqa: E402
+
+from app import runtime, supervisor  # noqa: E402
+from app.fake_llm_server import FakeLLMConfig, FakeLLMServer  # noqa: E402
+
+
+def _percentile(samples: list, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+async def _sample_lag(lags: list, interval: float = 0.01) -> None:
+    """スケジューリング遅延の計測（キャンセルまで）"""
+    while True:
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _run(
+    loop_name: str, requests: int, concurrency: int, config: FakeLLMConfig, executor_workers: int
+) -> None:
+    executor = runtime.configure_default_executor(asyncio.get_running_loop(), executor_workers)
+    context = "\n".join(f"user: メッセージ{i} progress update" for i in range(200))
+    limits, persona, report_config = supervisor.default_prompt_inputs()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list = []
+    lags: list = []
+    errors = 0
+
+    async def one() -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await supervisor.generate(
+                    "reply", "3", "", context, limits, persona, report_config
+                )
+                latencies.append(time.perf_counter() - started)
+            except ValueError:
+                errors += 1
+
+    server = FakeLLMServer(config)
+    async with server as base_url:
+        bench_settings = replace(
+            supervisor.settings,
+            ai_service=replace(supervisor.settings.ai_service, base_url=base_url),
+        )
+        with patch("app.supervisor.settings", bench_settings), \
+             patch("app.supervisor.log_ok"):
+            sampler = asyncio.create_task(_sample_lag(lags))
+            started = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(requests)))
+            elapsed = time.perf_counter() - started
+            sampler.cancel()
+
+    print(f"[{loop_name}] executor: {executor._max_workers} threads, errors: {errors}")
+    print(f"[{loop_name}] throughput: {requests / elapsed:8.1f} req/s ({elapsed:.2f}s)")
+    if latencies:
+        for label, p in (("p50", 0.50), ("p99", 0.99)):
+            print(f"[{loop_name}] {label}: {_percentile(latencies, p) * 1000:8.1f} ms")
+    if lags:
+        print(f"[{loop_name}] loop lag p99: {_percentile(lags, 0.99) * 1000:8.2f} ms")
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 50.0
+    executor_workers = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    config = FakeLLMConfig(latency_ms=latency_ms, tokens_per_second=0, seed=1)
+    print(f"requests: {requests}, concurrency: {concurrency}, fake server: {config}")
+
+    for preference in ("asyncio", "uvloop"):
+        try:
+            loop_name, loop_factory = runtime.select_event_loop(preference)
+        except ValueError as e:
+            print(f"[{preference}] skipped: {e}")
+            continue
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(_run(loop_name, requests, concurrency, config, executor_workers))
+
+
+if __name__ == "__main__":
+    main()
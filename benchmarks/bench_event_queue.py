@@ -0,0 +1,83 @@
+"""EventQueue ディスパッチオーバーヘッドのマイクロベンチマーク
+
+使い方:
+    python benchmarks/bench_event_queue.py [イベント数]
+
+空ハンドラを用いて、EventQueueワーカーの
+1. 連続投入時の1イベントあたり処理コスト（enqueue→取り出し→実行→計測記録）
+2. アイドル時のウェイクアップ遅延（ワーカー待機中のenqueueからハンドラ開始まで）
+を計測します。
+"""
+
+import asyncio
+import sys
+import time
+
+# ベンチマーク用環境変数（app.settings読み込み前に設定）
+import _env  # noqa: F401
+
+from app.app import EventPriority, EventQueue, _percentile  # noqa: E402
+
+
+async def _bench_throughput(events: int) -> None:
+    queue = EventQueue()
+    done = asyncio.Event()
+    processed = 0
+
+    async def handler(seq: int) -> None:
+        nonlocal processed
+        processed += 1
+        if processed == events:
+            done.set()
+
+    priorities = tuple(EventPriority)
+    start = time.perf_counter()
+    for i in range(events):
+        # 引数を変えて待機中Tickの統合を避ける（全件を実行して計測）
+        await queue.enqueue(priorities[i % len(priorities)], handler, i)
+    worker = asyncio.create_task(queue.process_events())
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    worker.cancel()
+
+    print(f"{'back-to-back dispatch':<28} {elapsed / events * 1e6:10.2f} µs/event ({events / elapsed:,.0f} events/s)")
+    for name, stats in queue.metrics.snapshot().items():
+        print(
+            f"  {name:<6} processed={stats['processed']:<7} "
+            f"wait_p50={stats['wait_p50'] * 1e3:8.2f} ms service_p50={stats['service_p50'] * 1e6:6.2f} µs"
+        )
+
+
+async def _bench_wakeup(samples: int) -> None:
+    queue = EventQueue()
+    latencies: list = []
+    started = asyncio.Event()
+
+    async def handler(enqueued_at: float) -> None:
+        latencies.append(time.perf_counter() - enqueued_at)
+        started.set()
+
+    worker = asyncio.create_task(queue.process_events())
+    await asyncio.sleep(0)
+    for _ in range(samples):
+        started.clear()
+        await queue.enqueue(EventPriority.USER, handler, time.perf_counter())
+        await started.wait()
+        await asyncio.sleep(0)  # ワーカーを待機状態に戻す
+    worker.cancel()
+
+    print(
+        f"{'idle wakeup latency':<28} p50={_percentile(latencies, 0.5) * 1e6:8.2f} µs "
+        f"p99={_percentile(latencies, 0.99) * 1e6:8.2f} µs max={max(latencies) * 1e6:8.2f} µs"
+    )
+
+
+def main() -> None:
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"events: {events:,}")
+    asyncio.run(_bench_throughput(events))
+    asyncio.run(_bench_wakeup(min(events, 10_000)))
+
+
+if __name__ == "__main__":
+    main()
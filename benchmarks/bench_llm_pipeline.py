@@ -0,0 +1,87 @@
+"""LLM生成パイプラインのオフライン負荷ベンチマーク（Gemini互換フェイクサーバ使用）
+
+使い方:
+    python benchmarks/bench_llm_pipeline.py [リクエスト数] [同時実行数] [遅延分布] [平均ms]
+
+ローカルにFakeLLMServerを起動し、GEMINI_BASE_URLをそのサーバに向けた状態で
+supervisor.generate（プロンプト構築・レート制御・SDK・HTTP・JSON検証）を並行実行して、
+スループットとレイテンシ分位点を計測します。seed固定のため同一条件で再現可能です。
+"""
+
+import asyncio
+import sys
+import time
+from dataclasses import replace
+
+# ベンチマーク用環境変数（app.settings読み込み前に設定）
+import _env  # noqa: F401
+
+from unittest.mock import patch  # noqa: E402
+
+from app import supervisor  # noqa: E402
+from app.fake_llm_server import FakeLLMConfig, FakeLLMServer  # noqa: E402
+
+
+def _percentile(samples: list, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+async def _run(requests: int, concurrency: int, config: FakeLLMConfig) -> None:
+    context = "\n".join(f"user: メッセージ{i} progress update" for i in range(200))
+    limits, persona, report_config = supervisor.default_prompt_inputs()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list = []
+    errors = 0
+
+    async def one() -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await supervisor.generate(
+                    "reply", "3", "", context, limits, persona, report_config
+                )
+                latencies.append(time.perf_counter() - started)
+            except ValueError:
+                errors += 1
+
+    server = FakeLLMServer(config)
+    async with server as base_url:
+        bench_settings = replace(
+            supervisor.settings,
+            ai_service=replace(supervisor.settings.ai_service, base_url=base_url),
+        )
+        with patch("app.supervisor.settings", bench_settings), \
+             patch("app.supervisor.log_ok"):
+            started = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(requests)))
+            elapsed = time.perf_counter() - started
+
+    print(f"fake server: {config}")
+    print(f"requests: {requests}, concurrency: {concurrency}, errors: {errors}")
+    print(f"throughput: {requests / elapsed:8.1f} req/s ({elapsed:.2f}s)")
+    if latencies:
+        for label, p in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            print(f"{label}: {_percentile(latencies, p) * 1000:8.1f} ms")
+    print(f"server stats: {server.stats.to_dict()}")
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    latency = sys.argv[3] if len(sys.argv) > 3 else "lognormal"
+    latency_ms = float(sys.argv[4]) if len(sys.argv) > 4 else 300.0
+    config = FakeLLMConfig(
+        latency=latency,
+        latency_ms=latency_ms,
+        latency_spread_ms=latency_ms / 2,
+        error_rate=0.02,
+        tokens_per_second=400,
+        seed=1,
+    )
+    asyncio.run(_run(requests, concurrency, config))
+
+
+if __name__ == "__main__":
+    main()
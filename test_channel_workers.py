@@ -0,0 +1,242 @@
+"""チャンネル別ワーカーテスト（チャンネル間並行・チャンネル内順序・Slash最優先）"""
+
+import asyncio
+import os
+import time
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app
+from app import settings as settings_module
+
+
+async def _run_until_drained(queues: app.ChannelEventQueues, timeout: float = 1.0) -> None:
+    """全キューの投入済みイベント処理完了を待ってワーカーを停止"""
+    runner = asyncio.create_task(queues.process_events())
+    all_queues = [queues.slash_queue, *queues.queues.values()]
+    await asyncio.wait_for(asyncio.gather(*(q._queue.join() for q in all_queues)), timeout=timeout)
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+
+class TestChannelConcurrency:
+    """チャンネル間並行・チャンネル内順序のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_different_channels_run_concurrently(self):
+        """異なるチャンネルのイベントが並行処理されること"""
+        queues = app.ChannelEventQueues()
+
+        async def slow_reply():
+            await asyncio.sleep(0.05)
+
+        for name in app.CHANNEL_NAMES:
+            await queues.enqueue(name, app.EventPriority.USER, slow_reply)
+
+        start = time.monotonic()
+        await _run_until_drained(queues)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.05 * len(app.CHANNEL_NAMES) * 0.75
+
+    @pytest.mark.asyncio
+    async def test_order_is_kept_within_channel(self):
+        """同一チャンネル内は投入順に直列処理されること"""
+        queues = app.ChannelEventQueues()
+        order = []
+        active = 0
+        max_active = 0
+
+        async def reply(name):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.005)
+            order.append(name)
+            active -= 1
+
+        for i in range(5):
+            await queues.enqueue("development", app.EventPriority.USER, reply, f"msg{i}")
+
+        await _run_until_drained(queues)
+
+        assert order == [f"msg{i}" for i in range(5)]
+        assert max_active == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_partition_fails_fast(self):
+        """未知のチャンネル名はValueErrorとなること"""
+        queues = app.ChannelEventQueues()
+
+        async def reply():
+            pass
+
+        with pytest.raises(ValueError, match="Unknown channel partition"):
+            await queues.enqueue("random", app.EventPriority.USER, reply)
+
+
+class TestSlashPriority:
+    """Slashの全チャンネル最優先テスト"""
+
+    @pytest.mark.asyncio
+    async def test_slash_runs_alone_after_running_events(self):
+        """Slashは実行中イベントの完了後に単独実行され、その間は新規処理が開始されないこと"""
+        queues = app.ChannelEventQueues()
+        events = []
+
+        async def reply(name):
+            events.append(f"{name}_start")
+            await asyncio.sleep(0.03)
+            events.append(f"{name}_end")
+
+        async def slash():
+            events.append("slash_start")
+            await asyncio.sleep(0.02)
+            events.append("slash_end")
+
+        async def enqueue_later():
+            await asyncio.sleep(0.01)
+            await queues.enqueue("command-center", app.EventPriority.SLASH, slash)
+            await queues.enqueue("lounge", app.EventPriority.USER, reply, "lounge")
+
+        await queues.enqueue("development", app.EventPriority.USER, reply, "dev")
+        runner = asyncio.create_task(queues.process_events())
+        await enqueue_later()
+        await asyncio.sleep(0.15)
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+        assert events == [
+            "dev_start", "dev_end", "slash_start", "slash_end", "lounge_start", "lounge_end",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_slash_preempts_ticks_in_all_channels(self):
+        """Slash到着で他チャンネルの実行中Tickが中断されること"""
+        queues = app.ChannelEventQueues(
+            lambda name: app.EventQueue(preempt=(app.EventPriority.TICK,), requeue_preempted=False)
+        )
+        events = []
+
+        async def slow_tick():
+            events.append("tick_start")
+            await asyncio.sleep(0.5)
+            events.append("tick_end")
+
+        async def slash():
+            events.append("slash")
+
+        async def enqueue_slash_later():
+            await asyncio.sleep(0.01)
+            await queues.enqueue("command-center", app.EventPriority.SLASH, slash)
+
+        await queues.enqueue("lounge", app.EventPriority.TICK, slow_tick)
+        with patch("app.logger.log_ok"):
+            runner = asyncio.create_task(queues.process_events())
+            await enqueue_slash_later()
+            await asyncio.sleep(0.05)
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+        assert events == ["tick_start", "slash"]
+        assert queues.queues["lounge"].metrics.snapshot()["tick"]["preempted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_worker_failure_stops_all_workers(self):
+        """いずれかのワーカーの失敗でFail-Fast停止すること"""
+        queues = app.ChannelEventQueues()
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        await queues.enqueue("creation", app.EventPriority.USER, failing)
+
+        with pytest.raises(ValueError, match="Event processing failed: boom"):
+            await asyncio.wait_for(queues.process_events(), timeout=1.0)
+
+
+class TestDispatch:
+    """dispatch_eventの経路テスト"""
+
+    @pytest.mark.asyncio
+    async def test_dispatch_uses_channel_workers_when_enabled(self):
+        """チャンネル別ワーカー有効時はチャンネルのキューへ投入されること"""
+        queues = app.ChannelEventQueues()
+
+        async def reply():
+            pass
+
+        with patch("app.app.channel_event_queues", queues):
+            await app.dispatch_event("creation", app.EventPriority.USER, reply)
+            assert not app.event_pipeline_is_idle()
+
+        assert queues.queues["creation"].depth() == 1
+        assert queues.queues["lounge"].depth() == 0
+
+    @pytest.mark.asyncio
+    async def test_dispatch_uses_single_queue_by_default(self):
+        """既定では単一のevent_queueへ投入されること"""
+        queue = app.EventQueue()
+
+        async def reply():
+            pass
+
+        with patch("app.app.event_queue", queue):
+            await app.dispatch_event("creation", app.EventPriority.USER, reply)
+
+        assert queue.depth() == 1
+
+    @pytest.mark.asyncio
+    async def test_tick_goes_to_active_channel(self):
+        """Tickはactive_channelのキューへ投入されること"""
+        queues = app.ChannelEventQueues()
+
+        with patch("app.app.channel_event_queues", queues), \
+             patch("app.state.get_active_channel", return_value="development"):
+            await app.tick_scheduler._enqueue_tick_event()
+
+        assert queues.queues["development"].depth(app.EventPriority.TICK) == 1
+
+    def test_channel_workers_setting(self):
+        """QUEUE_CHANNEL_WORKERS有効時のみ生成されること"""
+        assert app._create_channel_event_queues() is None
+
+        enabled = replace(
+            settings_module.settings,
+            queue=replace(settings_module.settings.queue, channel_workers=True),
+        )
+        with patch("app.settings.settings", enabled):
+            queues = app._create_channel_event_queues()
+
+        assert set(queues.queues) == set(app.CHANNEL_NAMES) | {"unknown"}
@@ -0,0 +1,256 @@
+"""文脈プレフィックス明示キャッシュテスト（ローカルフェイクのキャッシュAPI使用）"""
+
+import asyncio
+import os
+import threading
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+from app import settings as settings_module
+from app import store, supervisor
+from app.supervisor import CACHED_CONTEXT_NOTE, ContextCacheManager
+
+
+class FakeCaches:
+    """Gemini caches APIのローカルフェイク"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.created = []
+        self.deleted = []
+        self.live = {}
+
+    def create(self, *, model, config):
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        name = f"cachedContents/{len(self.created) + 1}"
+        self.created.append(name)
+        self.live[name] = config.contents[0]
+        return SimpleNamespace(name=name)
+
+    def delete(self, *, name):
+        self.deleted.append(name)
+        self.live.pop(name, None)
+
+
+class FakeClock:
+    """単調時計のフェイク"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _manager(clock=None):
+    return ContextCacheManager(
+        min_chars=10, refresh_chars=20, ttl_seconds=100, clock=clock or FakeClock()
+    )
+
+
+class TestContextCacheManager:
+    """ContextCacheManagerのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_short_context_is_not_cached(self):
+        """最小文脈長未満ではキャッシュを作成しないこと"""
+        caches = FakeCaches()
+        manager = _manager()
+
+        name, tail = await manager.prepare(caches, "short")
+
+        assert name is None
+        assert tail == "short"
+        assert caches.created == []
+
+    @pytest.mark.asyncio
+    async def test_growing_context_reuses_cache_with_tail(self):
+        """キャッシュ済みプレフィックスで始まる文脈は末尾のみ返すこと"""
+        caches = FakeCaches()
+        manager = _manager()
+        prefix = "user: hello\nspectra: hi"
+
+        name, tail = await manager.prepare(caches, prefix)
+        assert name == "cachedContents/1"
+        assert tail == ""
+
+        name, tail = await manager.prepare(caches, prefix + "\nuser: next")
+        assert name == "cachedContents/1"
+        assert tail == "\nuser: next"
+        assert caches.created == ["cachedContents/1"]
+
+    @pytest.mark.asyncio
+    async def test_cache_refreshed_when_tail_exceeds_threshold(self):
+        """未キャッシュ末尾が閾値を超えたら再作成し、旧キャッシュを削除すること"""
+        caches = FakeCaches()
+        manager = _manager()
+        prefix = "user: hello\nspectra: hi"
+        await manager.prepare(caches, prefix)
+
+        longer = prefix + "\nuser: " + "x" * 30
+        name, tail = await manager.prepare(caches, longer)
+
+        assert name == "cachedContents/2"
+        assert tail == ""
+        assert caches.deleted == ["cachedContents/1"]
+        assert caches.live == {"cachedContents/2": longer}
+
+    @pytest.mark.asyncio
+    async def test_cache_refreshed_near_ttl_expiry(self):
+        """TTL満了が近いキャッシュは再作成されること"""
+        caches = FakeCaches()
+        clock = FakeClock()
+        manager = _manager(clock)
+        context = "user: hello\nspectra: hi"
+        await manager.prepare(caches, context)
+
+        clock.now = 95.0
+        name, _ = await manager.prepare(caches, context)
+
+        assert name == "cachedContents/2"
+
+    @pytest.mark.asyncio
+    async def test_prefix_mismatch_recreates_cache(self):
+        """文脈が入れ替わった場合は新しいキャッシュを作成すること"""
+        caches = FakeCaches()
+        manager = _manager()
+        await manager.prepare(caches, "user: hello\nspectra: hi")
+
+        name, tail = await manager.prepare(caches, "user: another day begins")
+
+        assert name == "cachedContents/2"
+        assert tail == ""
+        assert caches.deleted == ["cachedContents/1"]
+
+    @pytest.mark.asyncio
+    async def test_create_failure_falls_back_to_uncached(self):
+        """キャッシュ作成失敗時は全文脈で継続すること"""
+        manager = _manager()
+
+        with patch("app.supervisor.log_err") as mock_log_err:
+            name, tail = await manager.prepare(FakeCaches(fail=True), "user: hello\nspectra: hi")
+
+        assert name is None
+        assert tail == "user: hello\nspectra: hi"
+        mock_log_err.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_store_reset_invalidates_global_cache(self):
+        """store.reset()でグローバルキャッシュが削除されること"""
+        caches = FakeCaches()
+        await supervisor.context_cache.prepare(caches, "x" * supervisor.context_cache.min_chars)
+        assert supervisor.context_cache.cache_name is not None
+
+        mock_redis = MagicMock()
+        mock_redis.delete.return_value = 1
+        with patch("app.store._get_redis_connection", return_value=mock_redis):
+            store.reset()
+
+        assert supervisor.context_cache.cache_name is None
+        await supervisor.context_cache.wait_deletes()
+        assert caches.live == {}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_deletes_off_the_event_loop(self):
+        """invalidate()の削除はイベントループ外のスレッドで実行されること"""
+        threads = []
+
+        class RecordingCaches(FakeCaches):
+            def delete(self, *, name):
+                threads.append(threading.get_ident())
+                super().delete(name=name)
+
+        caches = RecordingCaches()
+        manager = _manager()
+        await manager.prepare(caches, "user: hello\nspectra: hi")
+
+        manager.invalidate()
+        await manager.wait_deletes()
+
+        assert caches.deleted == ["cachedContents/1"]
+        assert threads and threads[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_prepare_creates_single_cache(self):
+        """同時のprepareでもキャッシュ作成は1回で、作成済みキャッシュを共有すること"""
+        caches = FakeCaches()
+        manager = _manager()
+        context = "user: hello\nspectra: hi"
+
+        results = await asyncio.gather(*(manager.prepare(caches, context) for _ in range(5)))
+
+        assert caches.created == ["cachedContents/1"]
+        assert {name for name, _ in results} == {"cachedContents/1"}
+
+
+class TestGenerateWithContextCache:
+    """generateの明示キャッシュ連携テスト"""
+
+    @pytest.mark.asyncio
+    async def test_generate_sends_only_uncached_tail(self):
+        """キャッシュ有効時はcached_contentを指定し、末尾のみをプロンプトに含めること"""
+        caches = FakeCaches()
+        manager = _manager()
+        prefix = "user: 古い発言" * 5
+        await manager.prepare(caches, prefix)
+
+        cache_settings = replace(
+            settings_module.settings,
+            ai_service=replace(settings_module.settings.ai_service, context_cache=True),
+        )
+        mock_client = MagicMock()
+        mock_client.caches = caches
+        mock_client.models.generate_content.return_value = MagicMock(
+            text='{"speaker": "lynq", "text": "ok"}'
+        )
+
+        with patch("app.supervisor.settings", cache_settings), \
+             patch("app.supervisor.context_cache", manager), \
+             patch("google.genai.Client", return_value=mock_client):
+            await supervisor.generate(
+                kind="reply",
+                channel="development",
+                task="",
+                context=prefix + "\nuser: 新しい発言",
+                limits={"dev": 200},
+                persona={},
+                report_config={},
+            )
+
+        call_kwargs = mock_client.models.generate_content.call_args.kwargs
+        assert call_kwargs["config"].cached_content == "cachedContents/1"
+        assert CACHED_CONTEXT_NOTE + "\nuser: 新しい発言" in call_kwargs["contents"]
+        assert "古い発言" not in call_kwargs["contents"]
@@ -0,0 +1,194 @@
+"""期限駆動スケジューラテスト（次の切り替え時刻の算出・時計ずれ補正・遅延起床時の追いつき）"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app, state
+from app.state import Mode
+
+JST = ZoneInfo("Asia/Tokyo")
+
+
+def _jst(day: int, hour: int, minute: int = 0, second: int = 0) -> datetime:
+    return datetime(2025, 8, day, hour, minute, second, tzinfo=JST)
+
+
+@pytest.fixture(autouse=True)
+def preserve_state():
+    """テスト間でグローバルステートを共有しない"""
+    snapshot = state.export_state()
+    yield
+    state.import_state(snapshot)
+
+
+class FakeClock:
+    """壁時計とasyncio.sleepの代替（sleepで時刻を進める）
+
+    scale: 要求秒数に対して実際に進む割合（1未満で早い起床＝時計ずれ）
+    overshoot: 起床毎の追加遅延秒（ループ占有等による遅延起床）
+    """
+
+    def __init__(self, start: datetime, until: datetime, scale: float = 1.0, overshoot: float = 0.0):
+        self.now = start
+        self.until = until
+        self.scale = scale
+        self.overshoot = overshoot
+        self.scheduler = None
+        self.sleeps = []
+        self._real_sleep = asyncio.sleep
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.advance(seconds * self.scale + self.overshoot)
+        if self.now >= self.until:
+            self.scheduler.stop()
+        await self._real_sleep(0)
+
+
+async def _run_scheduler(clock: FakeClock, on_report=None):
+    """FakeClock上でModeTrackingSchedulerをuntilまで実行
+
+    Returns:
+        tuple: (スケジューラ, 日報呼び出し時刻一覧, モード更新履歴)
+    """
+    reports = []
+    modes = []
+    real_update_mode = state.update_mode
+
+    async def report():
+        reports.append(clock.now)
+        if on_report is not None:
+            on_report()
+
+    def record_mode(mode):
+        modes.append((clock.now, mode))
+        real_update_mode(mode)
+
+    with patch.object(state, "get_current_jst_time", side_effect=lambda: clock.now):
+        scheduler = app.ModeTrackingScheduler()
+        clock.scheduler = scheduler
+        with patch("app.app.on_report_0600", AsyncMock(side_effect=report)), \
+             patch.object(state, "update_mode", side_effect=record_mode), \
+             patch("asyncio.sleep", clock.sleep):
+            await scheduler.start()
+    return scheduler, reports, modes
+
+
+class TestNextTransition:
+    """state.next_transitionのテスト"""
+
+    @pytest.mark.parametrize("now, expected", [
+        (_jst(13, 0, 0), _jst(13, 6, 0)),
+        (_jst(13, 5, 59, 59), _jst(13, 6, 0)),
+        (_jst(13, 6, 0), _jst(13, 6, 1)),
+        (_jst(13, 6, 0, 30), _jst(13, 6, 1)),
+        (_jst(13, 6, 1), _jst(13, 20, 0)),
+        (_jst(13, 20, 0), _jst(14, 0, 0)),
+        (_jst(13, 23, 59, 59), _jst(14, 0, 0)),
+    ])
+    def test_next_boundary_of_mode_from_time(self, now, expected):
+        """次の境界がmode_from_timeの判定の切り替わりと一致すること"""
+        deadline = state.next_transition(now)
+
+        assert deadline == expected
+        assert state.mode_from_time(deadline) != state.mode_from_time(deadline - timedelta(seconds=1))
+
+
+class TestDeadlineScheduler:
+    """ModeTrackingSchedulerの期限駆動ループのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_full_day_runs_each_transition_once_with_few_wakeups(self):
+        """1日分で全モード遷移と日報1回を、1分間隔より大幅に少ない起床で実行すること"""
+        clock = FakeClock(_jst(13, 5, 0), until=_jst(14, 5, 0))
+
+        scheduler, reports, modes = await _run_scheduler(clock)
+
+        assert reports == [_jst(13, 6, 0)]
+        assert [entry for entry in modes if entry[0] > _jst(13, 5, 0)] == [
+            (_jst(13, 6, 0), Mode.PROCESSING),
+            (_jst(13, 6, 1), Mode.ACTIVE),
+            (_jst(13, 20, 0), Mode.FREE),
+            (_jst(14, 0, 0), Mode.STANDBY),
+        ]
+        assert scheduler.wakeups <= 30  # 1分間隔では1440回
+
+    @pytest.mark.asyncio
+    async def test_late_wakeup_still_runs_report_and_catches_up(self):
+        """06:00の分を過ぎて起床しても日報を実行し、現在のモードへ追いつくこと"""
+        clock = FakeClock(_jst(13, 5, 0), until=_jst(13, 8, 0), overshoot=90)
+
+        _, reports, modes = await _run_scheduler(clock)
+
+        assert len(reports) == 1
+        assert reports[0] > _jst(13, 6, 1)
+        assert (reports[0], Mode.ACTIVE) in modes
+        assert state.get_current_mode() == Mode.ACTIVE
+
+    @pytest.mark.asyncio
+    async def test_early_wakeup_from_clock_drift_does_not_fire_early(self):
+        """単調時計が速く起床が早まっても、壁時計で再計算して期限前には実行しないこと"""
+        clock = FakeClock(_jst(13, 5, 0), until=_jst(13, 7, 0), scale=0.9)
+
+        scheduler, reports, _ = await _run_scheduler(clock)
+
+        assert len(reports) == 1
+        assert _jst(13, 6, 0) <= reports[0] < _jst(13, 6, 1)
+        assert scheduler.wakeups > 2  # 残り時間の再待機
+
+    @pytest.mark.asyncio
+    async def test_report_overrun_moves_to_active_and_next_deadline(self):
+        """日報が06:01を超えて長引いてもACTIVEへ追従し、次の期限（FREE_START）へ進むこと"""
+        clock = FakeClock(_jst(13, 5, 0), until=_jst(13, 21, 0))
+
+        _, reports, modes = await _run_scheduler(clock, on_report=lambda: clock.advance(300))
+
+        assert reports == [_jst(13, 6, 0)]
+        assert (_jst(13, 6, 5), Mode.ACTIVE) in modes
+        assert (_jst(13, 20, 0), Mode.FREE) in modes
+
+    @pytest.mark.asyncio
+    async def test_startup_after_report_time_skips_only_that_day(self):
+        """06:00後の起動では当日分をバックフィルせず、翌日の06:00には実行すること"""
+        clock = FakeClock(_jst(13, 10, 0), until=_jst(14, 7, 0))
+
+        _, reports, _ = await _run_scheduler(clock)
+
+        assert reports == [_jst(14, 6, 0)]
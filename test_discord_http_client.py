@@ -0,0 +1,141 @@
+"""Discord REST共有クライアント（接続プール・keep-alive）のテスト"""
+
+import asyncio
+import os
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from aiohttp import web
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import discord as discord_module
+from app.discord import close_http_client, get_http_client, send, typing
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_client():
+    """テスト毎に共有クライアントの参照を破棄"""
+    discord_module._http_client = None
+    discord_module._http_client_loop = None
+    yield
+    discord_module._http_client = None
+    discord_module._http_client_loop = None
+
+
+async def _start_discord_stub():
+    """接続元ポートを記録するDiscord REST スタブ"""
+    peers = []
+
+    async def handle_typing(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.Response(status=204)
+
+    async def handle_messages(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({"id": f"msg_{len(peers)}"})
+
+    app = web.Application()
+    app.router.add_post("/channels/{channel_id}/typing", handle_typing)
+    app.router.add_post("/channels/{channel_id}/messages", handle_messages)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", peers
+
+
+class TestSharedHttpClient:
+    """共有クライアントのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_client_is_shared_across_calls(self):
+        """typing・sendで同一クライアントが再利用されること"""
+        mock_response = MagicMock(status_code=200)
+        mock_response.json.return_value = {"id": "msg_1"}
+
+        with patch("httpx.AsyncClient.post", return_value=mock_response):
+            client = get_http_client()
+            await typing(bot="spectra", channel_id="123")
+            await send(bot="lynq", channel_id="123", text="hello")
+
+        assert get_http_client() is client
+
+    @pytest.mark.asyncio
+    async def test_typing_and_send_reuse_one_connection(self):
+        """keep-aliveにより複数Botのtyping→sendが単一TCP接続で送信されること"""
+        runner, base_url, peers = await _start_discord_stub()
+        try:
+            with patch("app.discord.DISCORD_API_BASE", base_url):
+                for bot in ("spectra", "lynq", "paz"):
+                    assert await typing(bot=bot, channel_id="123") == 204
+                    assert await send(bot=bot, channel_id="123", text="hi")
+        finally:
+            await close_http_client()
+            await runner.cleanup()
+
+        assert len(peers) == 6
+        assert len(set(peers)) == 1
+
+    @pytest.mark.asyncio
+    async def test_close_then_recreate(self):
+        """close後の取得では新しいクライアントが生成されること"""
+        client = get_http_client()
+
+        await close_http_client()
+
+        assert client.is_closed
+        assert get_http_client() is not client
+
+    def test_client_is_recreated_for_new_event_loop(self):
+        """イベントループが変わった場合は新しいクライアントが生成されること"""
+
+        async def current_client():
+            return get_http_client()
+
+        first = asyncio.run(current_client())
+        second = asyncio.run(current_client())
+
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_http2_without_h2_fails_fast(self):
+        """h2未導入でDISCORD_HTTP2=trueの場合はValueErrorとなること"""
+        http2_settings = replace(
+            discord_module.settings,
+            discord=replace(discord_module.settings.discord, http2=True),
+        )
+
+        with patch("app.discord.settings", http2_settings), \
+             patch("importlib.util.find_spec", return_value=None):
+            with pytest.raises(ValueError, match="h2"):
+                get_http_client()
@@ -0,0 +1,226 @@
+"""Discord REST レート制限バケット管理のテスト"""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+from app.discord import DiscordRateLimiter, send
+
+
+class FakeTime:
+    """monotonic時計と待機の記録"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+def _response(status=200, headers=None, body=None):
+    return httpx.Response(status, headers=headers or {}, json=body if body is not None else {"id": "m"})
+
+
+def _limited(remaining, reset_after="1.0", limit="5"):
+    return {
+        "X-RateLimit-Limit": limit,
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset-After": reset_after,
+        "X-RateLimit-Bucket": "abc",
+    }
+
+
+def _sender(responses):
+    """順にレスポンスを返す送信関数と呼び出し回数"""
+    calls = []
+
+    async def send_request():
+        calls.append(1)
+        return responses[min(len(calls) - 1, len(responses) - 1)]
+
+    return send_request, calls
+
+
+@pytest.fixture
+def fake_time():
+    return FakeTime()
+
+
+@pytest.fixture
+def limiter(fake_time):
+    return DiscordRateLimiter(max_wait=30.0, max_retries=3, clock=fake_time.clock, sleep=fake_time.sleep)
+
+
+class TestBucketTracking:
+    """ヘッダによる事前待機のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_exhausted_bucket_delays_next_request(self, limiter, fake_time):
+        """残数0のバケットはリセットまで事前に待機すること"""
+        send_request, _ = _sender([_response(headers=_limited(0, reset_after="0.3"))])
+
+        with patch("app.discord.log_ok"):
+            await limiter.request("lynq", "messages", "1", send_request)
+            await limiter.request("lynq", "messages", "1", send_request)
+
+        assert fake_time.sleeps == [0.3]
+
+    @pytest.mark.asyncio
+    async def test_remaining_is_consumed_before_response(self, limiter, fake_time):
+        """同時送信では残数を応答前に消費し、枠を超える分は待機すること"""
+        in_flight = []
+
+        async def send_request():
+            in_flight.append(1)
+            await asyncio.sleep(0)  # 応答待ちの間に後続リクエストが割り込む
+            return _response(headers=_limited(0, reset_after="0.5"))
+
+        learn, _ = _sender([_response(headers=_limited(1, reset_after="0.5"))])
+        with patch("app.discord.log_ok"):
+            await limiter.request("paz", "messages", "1", learn)  # 残数1を学習
+            await asyncio.gather(
+                limiter.request("paz", "messages", "1", send_request),
+                limiter.request("paz", "messages", "1", send_request),
+            )
+
+        assert fake_time.sleeps == [0.5]
+        assert len(in_flight) == 2
+
+    @pytest.mark.asyncio
+    async def test_buckets_are_per_bot_and_channel(self, limiter, fake_time):
+        """他Bot・他チャンネルのバケットには影響しないこと"""
+        send_request, _ = _sender([_response(headers=_limited(0))])
+
+        with patch("app.discord.log_ok"):
+            await limiter.request("lynq", "messages", "1", send_request)
+            await limiter.request("paz", "messages", "1", send_request)
+            await limiter.request("lynq", "messages", "2", send_request)
+            await limiter.request("lynq", "typing", "1", send_request)
+
+        assert fake_time.sleeps == []
+        assert limiter.bucket("lynq", "messages", "1").bucket_id == "abc"
+
+
+class TestTooManyRequests:
+    """429応答のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honoured(self, limiter, fake_time):
+        """retry_afterだけ待機して再送し、成功レスポンスを返すこと"""
+        send_request, calls = _sender([
+            _response(429, body={"message": "rate limited", "retry_after": 0.25, "global": False}),
+            _response(200, body={"id": "ok"}),
+        ])
+
+        with patch("app.discord.log_ok"):
+            response = await limiter.request("spectra", "messages", "1", send_request)
+
+        assert response.status_code == 200
+        assert fake_time.sleeps == [0.25]
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_global_limit_pauses_all_routes_of_bot(self, limiter, fake_time):
+        """global制限は同一Botの全ルートを待機させ、他Botには影響しないこと"""
+        send_request, _ = _sender([
+            _response(429, headers={"X-RateLimit-Global": "true"}, body={"retry_after": 2.0, "global": True}),
+            _response(200),
+        ])
+        ok_request, _ = _sender([_response(200)])
+
+        with patch("app.discord.log_ok"):
+            await limiter.request("lynq", "messages", "1", send_request)
+            fake_time.now -= 1.0  # global解除前に別ルートを送信
+            await limiter.request("lynq", "typing", "9", ok_request)
+            await limiter.request("paz", "typing", "9", ok_request)
+
+        assert fake_time.sleeps == [2.0, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_wait_beyond_max_fails_fast(self, fake_time):
+        """待機がmax_waitを超える場合はValueErrorとなること"""
+        limiter = DiscordRateLimiter(max_wait=1.0, clock=fake_time.clock, sleep=fake_time.sleep)
+        send_request, _ = _sender([_response(429, body={"retry_after": 60.0})])
+
+        with patch("app.discord.log_ok"):
+            with pytest.raises(ValueError, match="rate limit wait too long"):
+                await limiter.request("lynq", "messages", "1", send_request)
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted_returns_429(self, fake_time):
+        """再送上限到達時は429レスポンスをそのまま返すこと"""
+        limiter = DiscordRateLimiter(max_retries=2, clock=fake_time.clock, sleep=fake_time.sleep)
+        send_request, calls = _sender([_response(429, body={"retry_after": 0.1})])
+
+        with patch("app.discord.log_ok"):
+            response = await limiter.request("lynq", "messages", "1", send_request)
+
+        assert response.status_code == 429
+        assert len(calls) == 3
+
+
+class TestSendWithRateLimit:
+    """sendのレート制限統合テスト"""
+
+    @pytest.mark.asyncio
+    async def test_send_queues_through_429_instead_of_failing(self, limiter, fake_time):
+        """sendが429で即座に失敗せず、待機後の再送でmessage_idを返すこと"""
+        responses = [
+            _response(429, body={"retry_after": 0.3}),
+            _response(200, body={"id": "message_1"}),
+        ]
+
+        with patch("app.discord.rate_limiter", limiter), \
+             patch("httpx.AsyncClient.post", side_effect=responses), \
+             patch("app.discord.log_ok"):
+            message_id = await send(bot="lynq", channel_id="123", text="hello")
+
+        assert message_id == "message_1"
+        assert fake_time.sleeps == [0.3]
+
+    @pytest.mark.asyncio
+    async def test_send_still_fails_on_persistent_429(self, fake_time):
+        """再送しても429の場合は従来通りValueErrorとなること"""
+        limiter = DiscordRateLimiter(max_retries=1, clock=fake_time.clock, sleep=fake_time.sleep)
+
+        with patch("app.discord.rate_limiter", limiter), \
+             patch("httpx.AsyncClient.post", return_value=_response(429, body={"retry_after": 0.1})), \
+             patch("app.discord.log_ok"):
+            with pytest.raises(ValueError, match="Discord API error: 429"):
+                await send(bot="lynq", channel_id="123", text="hello")
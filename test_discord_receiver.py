@@ -3,15 +3,18 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 import discord
+import httpx
+from app import discord as discord_module
 from app.discord import SpectraDiscordClient
+import app.app as app_module
 
 
 class TestDiscordReceiver:
     """Discord受信機能のテスト"""
 
     @pytest.mark.asyncio
-    async def test_on_message_calls_on_user(self):
-        """メッセージ受信時にapp.on_userが呼ばれること"""
+    async def test_on_message_enqueues_user_message(self):
+        """メッセージ受信時にapp.enqueue_user_messageが呼ばれること"""
         # Given: モックされたメッセージとクライアント
         mock_message = MagicMock()
         mock_message.author.bot = False
@@ -22,11 +25,11 @@ class TestDiscordReceiver:
         client = SpectraDiscordClient()
 
         # When: on_messageが呼ばれる
-        with patch("app.app.on_user") as mock_on_user:
+        with patch("app.app.enqueue_user_message") as mock_enqueue:
             await client.on_message(mock_message)
 
-        # Then: on_userが正しい引数で呼ばれる
-        mock_on_user.assert_called_once_with(
+        # Then: enqueue_user_messageが正しい引数で呼ばれる
+        mock_enqueue.assert_called_once_with(
             channel="123456789", text="テストメッセージ", user_id="user123"
         )
 
@@ -43,18 +46,77 @@ class TestDiscordReceiver:
                 {"name": "content", "value": "タスク内容"},
             ],
         }
-        mock_interaction.response.send_message = AsyncMock()
+        mock_interaction.application_id = 42
+        mock_interaction.token = "interaction-token"
+        mock_interaction.response.defer = AsyncMock()
 
         client = SpectraDiscordClient()
+        queued = []
+
+        async def fake_enqueue(priority, handler, *args, **kwargs):
+            queued.append((priority, handler, args, kwargs))
+            return True
 
         # When: スラッシュコマンドが呼ばれる
-        with patch("app.app.on_slash") as mock_on_slash:
+        with patch("app.app.on_slash") as mock_on_slash, \
+             patch("app.discord.edit_interaction_response", AsyncMock(return_value=True)) as mock_edit, \
+             patch("app.app.event_queue.enqueue", side_effect=fake_enqueue):
             await client.on_interaction(mock_interaction)
 
+            # Then: 即座にdeferされ、on_slashはキュー処理まで実行されない
+            mock_interaction.response.defer.assert_awaited_once_with(ephemeral=True, thinking=True)
+            mock_on_slash.assert_not_called()
+            assert len(queued) == 1
+            priority, handler, args, kwargs = queued[0]
+            assert priority == app_module.EventPriority.SLASH
+            # 永続化できるようシリアライズ可能な引数のみで投入される
+            assert handler is app_module.on_slash_interaction
+            assert args == ("development", "タスク内容", "42", "interaction-token")
+
+            # キューから実行されるとon_slash後に応答が編集される
+            await handler(*args, **kwargs)
+
         # Then: on_slashが正しい引数で呼ばれる
         mock_on_slash.assert_called_once_with(
             channel="development", content="タスク内容"
         )
+        mock_edit.assert_awaited_once_with("42", "interaction-token", "受け付けました")
+
+    @pytest.mark.asyncio
+    async def test_rejected_slash_command_edits_response(self):
+        """受け入れ上限で不受理の/taskは応答待ちのままにせず不受理を通知すること"""
+        mock_interaction = MagicMock()
+        mock_interaction.type = discord.InteractionType.application_command
+        mock_interaction.data = {"name": "task", "options": [{"name": "channel", "value": "creation"}]}
+        mock_interaction.application_id = 42
+        mock_interaction.token = "interaction-token"
+        mock_interaction.response.defer = AsyncMock()
+
+        client = SpectraDiscordClient()
+        with patch("app.app.dispatch_event", AsyncMock(return_value=False)), \
+             patch("app.discord.edit_interaction_response", AsyncMock(return_value=True)) as mock_edit:
+            await client.on_interaction(mock_interaction)
+
+        mock_edit.assert_awaited_once_with("42", "interaction-token", app_module.SLASH_DROPPED_MESSAGE)
+
+    @pytest.mark.asyncio
+    async def test_slash_followup_edit_failure_fails_fast(self):
+        """フォローアップ編集の失敗がValueErrorとして伝播し、トークン失効は記録のみとなること"""
+        http_client = MagicMock()
+        http_client.patch = AsyncMock(return_value=httpx.Response(500, text="error"))
+
+        with patch("app.discord.get_http_client", return_value=http_client):
+            with pytest.raises(ValueError, match="Failed to edit interaction response"):
+                await discord_module.edit_interaction_response("42", "token", "受け付けました")
+
+            http_client.patch = AsyncMock(return_value=httpx.Response(404, text="Unknown Webhook"))
+            with patch("app.discord.log_err") as mock_log_err:
+                edited = await discord_module.edit_interaction_response("42", "token", "受け付けました")
+
+        assert edited is False
+        mock_log_err.assert_called_once()
+        url = http_client.patch.await_args.args[0]
+        assert url.endswith("/webhooks/42/token/messages/@original")
 
     def test_client_initialization_with_intents(self):
         """Clientが正しいIntentで初期化されること"""
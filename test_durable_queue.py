@@ -0,0 +1,501 @@
+"""Redis永続キューテスト（記録・可視性期限・完了の一意性・再起動後の再開）"""
+
+import asyncio
+import os
+from dataclasses import replace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import redis as redis_module
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app
+from app import settings as settings_module
+from app import store
+from app.durable_queue import RELEASE_LEASE_SCRIPT, RENEW_LEASE_SCRIPT, DurableEventJournal
+
+
+class FakeRedis:
+    """ジャーナルが使用するコマンドのみを実装したインメモリRedis"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.zsets = {}
+        self.lists = {}
+        self.counters = {}
+        self.strings = {}
+        self.sets = {}
+        self.versions = {}  # キー毎の更新回数（WATCHの競合検出用）
+
+    def _touch(self, key):
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def set(self, key, value, nx=False, px=None):
+        # 有効期限は扱わない（期限切れはテスト側でdeleteして再現）
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        self._touch(key)
+        return True
+
+    def get(self, key):
+        return self.strings.get(key)
+
+    def delete(self, key):
+        self._touch(key)
+        return int(self.strings.pop(key, None) is not None)
+
+    def incr(self, key):
+        self.counters[key] = self.counters.get(key, 0) + 1
+        self._touch(key)
+        return self.counters[key]
+
+    def hset(self, key, field, value):
+        created = field not in self.hashes.setdefault(key, {})
+        self.hashes[key][field] = value
+        self._touch(key)
+        return int(created)
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hdel(self, key, field):
+        self._touch(key)
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+    def zadd(self, key, mapping):
+        zset = self.zsets.setdefault(key, {})
+        added = sum(1 for member in mapping if member not in zset)
+        zset.update(mapping)
+        self._touch(key)
+        return added
+
+    def zrem(self, key, member):
+        self._touch(key)
+        return int(self.zsets.get(key, {}).pop(member, None) is not None)
+
+    def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    def _sorted(self, key):
+        return sorted(self.zsets.get(key, {}).items(), key=lambda kv: (kv[1], kv[0]))
+
+    def zrange(self, key, start, end):
+        members = [member for member, _ in self._sorted(key)]
+        return members[start:] if end == -1 else members[start:end + 1]
+
+    def zrangebyscore(self, key, low, high):
+        low = float(low)
+        return [member for member, score in self._sorted(key) if low <= score <= high]
+
+    def zcount(self, key, low, high):
+        return len(self.zrangebyscore(key, low, high))
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+        self._touch(key)
+        return len(self.lists[key])
+
+    def ltrim(self, key, start, end):
+        values = self.lists.get(key, [])
+        self.lists[key] = values[start:] if end == -1 else values[start:end + 1]
+        self._touch(key)
+        return True
+
+    def blpop(self, keys, timeout=0):
+        # ブロックはしない（通知が無ければタイムアウト扱い）
+        for key in keys:
+            if self.lists.get(key):
+                self._touch(key)
+                return key, self.lists[key].pop(0)
+        return None
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def _release_lease(self, keys, args):
+        if self.get(keys[0]) == args[0]:
+            return self.delete(keys[0])
+        return 0
+
+    def _renew_lease(self, keys, args):
+        lease_key, inflight_key = keys
+        owner, _ttl_ms, event_id, deadline = args
+        if self.get(lease_key) != owner:
+            return 0
+        if event_id in self.zsets.get(inflight_key, {}):
+            self.zadd(inflight_key, {event_id: float(deadline)})
+        return 1
+
+    def _append_once(self, keys, args):
+        applied_key, messages_key = keys
+        key, record = args
+        if key in self.sets.setdefault(applied_key, set()):
+            return -1
+        self.sets[applied_key].add(key)
+        return self.rpush(messages_key, record)
+
+    def register_script(self, source):
+        """ジャーナル・ストアのLuaスクリプトを同等のPython実装で代替"""
+        scripts = {
+            RELEASE_LEASE_SCRIPT: self._release_lease,
+            RENEW_LEASE_SCRIPT: self._renew_lease,
+            store.APPEND_ONCE_SCRIPT: self._append_once,
+        }
+        fn = scripts[source]
+        return lambda keys=(), args=(): fn(list(keys), list(args))
+
+
+class FakePipeline:
+    """MULTI/EXECとWATCH（即時実行→multi以降はキューイング）を再現するパイプライン"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+        self.watched = {}
+        self.immediate = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.reset()
+
+    def __getattr__(self, name):
+        if self.immediate:
+            return getattr(self.redis, name)
+
+        def _queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return _queue
+
+    def watch(self, *keys):
+        self.watched = {key: self.redis.versions.get(key, 0) for key in keys}
+        self.immediate = True
+
+    def unwatch(self):
+        self.watched = {}
+        self.immediate = False
+
+    def multi(self):
+        self.immediate = False
+
+    def reset(self):
+        self.calls = []
+        self.watched = {}
+        self.immediate = False
+
+    def execute(self):
+        calls, watched = self.calls, self.watched
+        self.reset()
+        if any(self.redis.versions.get(key, 0) != version for key, version in watched.items()):
+            raise redis_module.WatchError("Watched variable changed.")
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in calls]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _journal(redis=None, clock=None, **kwargs):
+    redis = redis or FakeRedis()
+    return DurableEventJournal(
+        connection_factory=lambda: redis, clock=clock or FakeClock(), **kwargs
+    )
+
+
+class TestDurableEventJournal:
+    """DurableEventJournalのテスト"""
+
+    def test_claim_next_orders_by_priority_then_sequence(self):
+        """優先度→投入順に取得されること"""
+        journal = _journal()
+        journal.put(2, "on_user", ("c", "first", "u"), {})
+        journal.put(3, "on_tick", (), {})
+        journal.put(2, "on_user", ("c", "second", "u"), {})
+        journal.put(1, "on_slash", (), {"channel": "creation", "content": None})
+
+        handlers = []
+        while (event := journal.claim_next()) is not None:
+            handlers.append((event.handler, event.args))
+            journal.complete(event.event_id)
+
+        assert handlers == [
+            ("on_slash", ()),
+            ("on_user", ("c", "first", "u")),
+            ("on_user", ("c", "second", "u")),
+            ("on_tick", ()),
+        ]
+
+    def test_complete_is_exactly_once(self):
+        """完了記録は初回のみTrueとなり、完了後は再取得されないこと"""
+        journal = _journal()
+        event_id = journal.put(2, "on_user", ("c", "text", "u"), {})
+
+        assert journal.claim(event_id) is True
+        assert journal.complete(event_id) is True
+        assert journal.complete(event_id) is False
+        assert journal.claim(event_id) is False
+        assert journal.claim_next() is None
+
+    def test_expired_inflight_event_becomes_visible_again(self):
+        """可視性期限を過ぎた実行中イベントが再取得できること"""
+        clock = FakeClock()
+        journal = _journal(clock=clock, visibility_timeout=30.0)
+        journal.put(2, "on_user", ("c", "text", "u"), {})
+
+        first = journal.claim_next()
+        assert journal.claim_next() is None
+
+        clock.now += 31
+        second = journal.claim_next()
+
+        assert second.event_id == first.event_id
+        assert second.attempts == 2
+
+    def test_losing_claim_leaves_inflight_and_attempts_untouched(self):
+        """読み取り後に他コンシューマが取得した場合は取得失敗とし、実行中・実行回数を変更しないこと"""
+        redis = FakeRedis()
+        clock = FakeClock()
+        journal = _journal(redis=redis, clock=clock)
+        rival = _journal(redis=redis, clock=clock)
+        event_id = journal.put(2, "on_user", ("c", "text", "u"), {})
+        original_zscore = redis.zscore
+
+        def racing_zscore(key, member):
+            # 待機中の確認直後（EXEC前）に他コンシューマが同じイベントを取得
+            redis.zscore = original_zscore
+            score = original_zscore(key, member)
+            clock.now += 5
+            assert rival.claim(member) is True
+            return score
+
+        redis.zscore = racing_zscore
+
+        assert journal.claim(event_id) is False
+        inflight_before = redis.zsets[journal.inflight_key][event_id]
+
+        assert journal.claim(event_id) is False
+        assert redis.zsets[journal.inflight_key][event_id] == inflight_before
+        assert journal.recover()[0].attempts == 1
+
+    def test_release_lease_keeps_other_owners_lease(self):
+        """実行権の解放は自身が保持している場合のみ削除すること"""
+        redis = FakeRedis()
+        journal = _journal(redis=redis)
+
+        assert journal.acquire_lease("w1") is True
+        journal.release_lease("w2")
+        assert redis.get(journal.lease_key) == "w1"
+
+        journal.release_lease("w1")
+        assert redis.get(journal.lease_key) is None
+
+    def test_event_exceeding_max_attempts_goes_to_dead_letter(self):
+        """最大実行回数を超えたイベントはデッドレターへ移ること"""
+        redis = FakeRedis()
+        journal = _journal(redis=redis, max_attempts=1)
+        event_id = journal.put(2, "on_user", ("c", "poison", "u"), {})
+        journal.claim(event_id)
+
+        with patch("app.durable_queue.log_err") as mock_log_err:
+            assert journal.recover() == []
+
+        assert len(redis.lists[journal.dead_key]) == 1
+        mock_log_err.assert_called_once()
+
+    def test_non_serializable_arguments_fail_fast(self):
+        """JSON化できない引数はValueErrorとなること"""
+        journal = _journal()
+
+        with pytest.raises(ValueError, match="JSON serializable"):
+            journal.put(2, "on_user", (object(),), {})
+
+    def test_invalid_configuration_fails_fast(self):
+        """不正な可視性期限・最大実行回数はValueErrorとなること"""
+        with pytest.raises(ValueError, match="visibility_timeout"):
+            _journal(visibility_timeout=0)
+        with pytest.raises(ValueError, match="max_attempts"):
+            _journal(max_attempts=0)
+
+
+class TestDurableEventQueue:
+    """EventQueueの永続化連携テスト"""
+
+    @pytest.mark.asyncio
+    async def test_unfinished_events_resume_after_restart(self):
+        """停止時に未処理・実行中だったイベントが再起動後に順序通り実行されること"""
+        redis = FakeRedis()
+        calls = []
+
+        async def on_user(channel, text, user_id, typing_sent=False):
+            calls.append(text)
+            if text == "crash":
+                raise RuntimeError("boom")
+
+        handlers = {"on_user": on_user}
+
+        # 1回目のプロセス: 1件目の処理中にFail-Fast停止
+        first = app.EventQueue(journal=_journal(redis=redis), durable_handlers=handlers)
+        await first.enqueue(app.EventPriority.USER, on_user, "c", "crash", "u", typing_sent=True)
+        await first.enqueue(app.EventPriority.USER, on_user, "c", "waiting", "u", typing_sent=True)
+        with pytest.raises(ValueError, match="Event processing failed"):
+            await first.process_events()
+
+        # 2回目のプロセス: 復元して再開（crashは再実行・waitingは初回実行）
+        calls.clear()
+        on_user_ok = _recording_handler(calls)
+        second = app.EventQueue(journal=_journal(redis=redis), durable_handlers={"on_user": on_user_ok})
+
+        assert await second.restore() == 2
+        worker = asyncio.create_task(second.process_events())
+        await asyncio.wait_for(second._queue.join(), timeout=1.0)
+        worker.cancel()
+
+        assert calls == [("crash", True), ("waiting", True)]
+        assert redis.hashes.get(second._journal.events_key) == {}
+
+    @pytest.mark.asyncio
+    async def test_slash_interaction_resumes_and_edits_response_after_restart(self):
+        """/taskイベントが永続化され、再起動後にトークンで応答が編集されること"""
+        redis = FakeRedis()
+        first = app.EventQueue(journal=_journal(redis=redis), durable_handlers=app._durable_handlers())
+        await first.enqueue(
+            app.EventPriority.SLASH, app.on_slash_interaction, "development", "設計", "42", "token"
+        )
+
+        second = app.EventQueue(journal=_journal(redis=redis), durable_handlers=app._durable_handlers())
+        with patch("app.app.on_slash", AsyncMock()) as mock_on_slash, \
+             patch("app.discord.edit_interaction_response", AsyncMock(return_value=True)) as mock_edit:
+            assert await second.restore() == 1
+            worker = asyncio.create_task(second.process_events())
+            await asyncio.wait_for(second._queue.join(), timeout=1.0)
+            worker.cancel()
+
+        mock_on_slash.assert_awaited_once_with(channel="development", content="設計")
+        mock_edit.assert_awaited_once_with("42", "token", "受け付けました")
+
+    @pytest.mark.asyncio
+    async def test_replayed_user_event_does_not_append_twice(self):
+        """再実行された永続イベントはユーザー発言を重複して文脈へ追記しないこと"""
+        redis = FakeRedis()
+        handlers = app._durable_handlers()
+        first = app.EventQueue(journal=_journal(redis=redis), durable_handlers=handlers)
+        await first.enqueue(app.EventPriority.USER, app.on_user, "123456789012345678", "hello", "u", typing_sent=True)
+
+        with patch("app.store._get_redis_connection", return_value=redis), \
+             patch("app.app.common_sequence", AsyncMock(side_effect=[RuntimeError("boom"), None])) as mock_sequence:
+            # 1回目: 追記後の応答生成でFail-Fast停止（イベントは実行中のまま残る）
+            with pytest.raises(ValueError, match="Event processing failed"):
+                await first.process_events()
+
+            second = app.EventQueue(journal=_journal(redis=redis), durable_handlers=handlers)
+            assert await second.restore() == 1
+            worker = asyncio.create_task(second.process_events())
+            await asyncio.wait_for(second._queue.join(), timeout=1.0)
+            worker.cancel()
+
+        assert mock_sequence.await_count == 2
+        assert len(redis.lists[store.REDIS_KEY]) == 1
+
+    def test_append_without_durable_event_is_not_deduplicated(self):
+        """永続イベント外の追記は従来通り毎回追記されること"""
+        with patch("app.store.append") as mock_append, patch("app.store.append_once") as mock_append_once:
+            app.append_event_record("user", "lounge", "hi", "user")
+            app.append_event_record("user", "lounge", "hi", "user")
+
+        assert mock_append.call_count == 2
+        mock_append_once.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_only_registered_handlers_are_persisted(self):
+        """登録されていないハンドラ（Tick等）は記録されないこと"""
+        redis = FakeRedis()
+        journal = _journal(redis=redis)
+
+        async def on_user(*args, **kwargs):
+            pass
+
+        async def on_tick():
+            pass
+
+        queue = app.EventQueue(journal=journal, durable_handlers={"on_user": on_user})
+        await queue.enqueue(app.EventPriority.USER, on_user, "c", "text", "u")
+        await queue.enqueue(app.EventPriority.TICK, on_tick)
+
+        assert len(redis.hashes[journal.events_key]) == 1
+
+    @pytest.mark.asyncio
+    async def test_event_completed_elsewhere_is_not_run_twice(self):
+        """他プロセスで完了済みのイベントは実行されないこと"""
+        journal = _journal()
+        calls = []
+        on_user = _recording_handler(calls)
+        queue = app.EventQueue(journal=journal, durable_handlers={"on_user": on_user})
+
+        await queue.enqueue(app.EventPriority.USER, on_user, "c", "text", "u")
+        _, item = queue._queue._queue[0]
+        journal.claim(item.durable_id)
+        journal.complete(item.durable_id)
+
+        worker = asyncio.create_task(queue.process_events())
+        await asyncio.wait_for(queue._queue.join(), timeout=1.0)
+        worker.cancel()
+
+        assert calls == []
+        assert queue.depth(app.EventPriority.USER) == 0
+
+    def test_durable_setting_attaches_journal(self):
+        """QUEUE_DURABLE有効時はキュー名前空間付きのジャーナルが設定されること"""
+        durable = replace(
+            settings_module.settings,
+            queue=replace(settings_module.settings.queue, durable=True, max_attempts=5),
+        )
+        with patch("app.settings.settings", durable):
+            queue = app._create_event_queue("lounge")
+
+        assert queue._journal.namespace == "lounge"
+        assert queue._journal.max_attempts == 5
+        assert set(queue._durable_handlers) == {
+            "on_user", "on_user_burst", "on_slash", "on_slash_interaction",
+        }
+        assert app._create_event_queue()._journal is None
+
+
+def _recording_handler(calls):
+    async def on_user(channel, text, user_id, typing_sent=False):
+        calls.append((text, typing_sent))
+    return on_user
@@ -0,0 +1,239 @@
+"""EventQueue受け入れ制御テスト（待機上限・Tick統合・待機期限）"""
+
+import asyncio
+import os
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app
+from app import settings as settings_module
+
+
+async def _noop():
+    pass
+
+
+async def _drain(queue: app.EventQueue) -> None:
+    """ワーカーを起動し、投入済みイベントの処理完了を待って停止"""
+    worker = asyncio.create_task(queue.process_events())
+    await asyncio.wait_for(queue._queue.join(), timeout=1.0)
+    worker.cancel()
+
+
+class TestTickCoalescing:
+    """待機中Tickの統合テスト"""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_pending_ticks_are_merged(self):
+        """待機中の同一Tickは1件に統合されること"""
+        queue = app.EventQueue()
+        calls = []
+
+        async def on_tick():
+            calls.append("tick")
+
+        assert await queue.enqueue(app.EventPriority.TICK, on_tick) is True
+        assert await queue.enqueue(app.EventPriority.TICK, on_tick) is False
+        assert await queue.enqueue(app.EventPriority.TICK, on_tick) is False
+
+        assert queue.depth(app.EventPriority.TICK) == 1
+        await _drain(queue)
+
+        assert calls == ["tick"]
+        assert queue.metrics.snapshot()["tick"]["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_merged_tick_keeps_original_enqueue_time(self):
+        """統合しても待機期限の起点は最初の投入時刻のままであること"""
+        queue = app.EventQueue(deadlines={app.EventPriority.TICK: 0.03})
+        calls = []
+
+        async def on_tick():
+            calls.append("tick")
+
+        await queue.enqueue(app.EventPriority.TICK, on_tick)
+        await asyncio.sleep(0.02)
+        assert await queue.enqueue(app.EventPriority.TICK, on_tick) is False
+        await asyncio.sleep(0.02)
+
+        with patch("app.logger.log_ok"):
+            await _drain(queue)
+
+        assert calls == []
+        assert queue.metrics.snapshot()["tick"]["expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tick_can_be_enqueued_again_after_dequeue(self):
+        """取り出し後の新しいTickは統合されずに受け入れられること"""
+        queue = app.EventQueue()
+        calls = []
+
+        async def on_tick():
+            calls.append("tick")
+
+        await queue.enqueue(app.EventPriority.TICK, on_tick)
+        await _drain(queue)
+        assert await queue.enqueue(app.EventPriority.TICK, on_tick) is True
+        await _drain(queue)
+
+        assert calls == ["tick", "tick"]
+
+    @pytest.mark.asyncio
+    async def test_user_events_are_not_merged(self):
+        """USER優先度の同一イベントは統合されないこと"""
+        queue = app.EventQueue()
+
+        await queue.enqueue(app.EventPriority.USER, _noop)
+        await queue.enqueue(app.EventPriority.USER, _noop)
+
+        assert queue.depth(app.EventPriority.USER) == 2
+
+
+class TestDepthLimit:
+    """優先度別待機上限のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_events_over_max_depth_are_rejected(self):
+        """待機上限を超える投入は不受理となり、他の優先度には影響しないこと"""
+        queue = app.EventQueue(max_depth={app.EventPriority.USER: 2})
+
+        with patch("app.logger.log_ok") as mock_log_ok:
+            results = [await queue.enqueue(app.EventPriority.USER, _noop) for _ in range(3)]
+            assert await queue.enqueue(app.EventPriority.SLASH, _noop) is True
+
+        assert results == [True, True, False]
+        assert queue.depth(app.EventPriority.USER) == 2
+        assert queue.metrics.snapshot()["user"]["rejected"] == 1
+        mock_log_ok.assert_called_once_with("queue", "system", "system", "rejected:user:depth=2")
+
+    @pytest.mark.asyncio
+    async def test_zero_max_depth_is_unlimited(self):
+        """待機上限0は無制限であること"""
+        queue = app.EventQueue(max_depth={app.EventPriority.USER: 0})
+
+        for _ in range(10):
+            assert await queue.enqueue(app.EventPriority.USER, _noop) is True
+
+
+class TestDeadline:
+    """待機期限のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_stale_ticks_are_dropped_after_user_burst(self):
+        """ユーザー処理で待たされたTickは期限切れで実行されないこと"""
+        queue = app.EventQueue(deadlines={app.EventPriority.TICK: 0.02})
+        order = []
+
+        async def user_handler(name):
+            await asyncio.sleep(0.015)
+            order.append(name)
+
+        async def on_tick():
+            order.append("tick")
+
+        await queue.enqueue(app.EventPriority.TICK, on_tick)
+        for i in range(3):
+            await queue.enqueue(app.EventPriority.USER, user_handler, f"user{i}")
+
+        with patch("app.logger.log_ok"):
+            await _drain(queue)
+
+        assert order == ["user0", "user1", "user2"]
+        snapshot = queue.metrics.snapshot()
+        assert snapshot["tick"]["expired"] == 1
+        assert snapshot["tick"]["processed"] == 0
+        assert snapshot["tick"]["depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_event_with_waiting_user_is_notified(self):
+        """期限切れで破棄したイベントに通知関数があれば同じ引数で呼ばれること"""
+        notified = []
+
+        async def on_slash_interaction(*args):
+            raise AssertionError("expired event must not run")
+
+        async def notify(*args):
+            notified.append(args)
+
+        queue = app.EventQueue(
+            deadlines={app.EventPriority.SLASH: 0.01},
+            drop_notifiers={on_slash_interaction: notify},
+        )
+        await queue.enqueue(app.EventPriority.SLASH, on_slash_interaction, "development", None, "42", "token")
+        await asyncio.sleep(0.02)
+
+        with patch("app.logger.log_ok"):
+            await _drain(queue)
+
+        assert notified == [("development", None, "42", "token")]
+        assert queue.metrics.snapshot()["slash"]["expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fresh_events_run_within_deadline(self):
+        """期限内のイベントは実行されること"""
+        queue = app.EventQueue(deadlines={app.EventPriority.TICK: 1.0})
+        calls = []
+
+        async def on_tick():
+            calls.append("tick")
+
+        await queue.enqueue(app.EventPriority.TICK, on_tick)
+        await _drain(queue)
+
+        assert calls == ["tick"]
+
+
+class TestGlobalQueueSettings:
+    """settingsからの生成テスト"""
+
+    def test_create_event_queue_uses_queue_settings(self):
+        """QUEUE_*設定が待機上限・期限に反映されること"""
+        queue_settings = replace(
+            settings_module.settings,
+            queue=replace(settings_module.settings.queue, max_depth_tick=3, deadline_user_seconds=5.0),
+        )
+
+        with patch("app.settings.settings", queue_settings):
+            queue = app._create_event_queue()
+
+        assert queue._max_depth[app.EventPriority.TICK] == 3
+        assert queue._deadlines[app.EventPriority.USER] == 5.0
+        assert queue._deadlines[app.EventPriority.TICK] == 0.0
+
+    def test_admission_limits_are_opt_in(self):
+        """既定では待機上限・期限を設けない（0で無制限・期限なし）こと"""
+        config = settings_module.QueueConfig()
+
+        assert (config.max_depth_slash, config.max_depth_user, config.max_depth_tick) == (0, 0, 0)
+        assert (config.deadline_slash_seconds, config.deadline_user_seconds, config.deadline_tick_seconds) == (0, 0, 0)
@@ -0,0 +1,187 @@
+"""EventQueueワーカーテスト（イベント駆動・同一優先度FIFO・計測）"""
+
+import asyncio
+import os
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app
+
+
+async def _drain(queue: app.EventQueue) -> asyncio.Task:
+    """ワーカーを起動し、投入済みイベントの処理完了を待つ"""
+    worker = asyncio.create_task(queue.process_events())
+    await asyncio.wait_for(queue._queue.join(), timeout=1.0)
+    return worker
+
+
+class TestEventOrdering:
+    """処理順序のテスト"""
+
+    def test_event_item_orders_by_sequence_within_priority(self):
+        """同一優先度では投入番号の小さい方が先になること"""
+        first = app.EventItem(app.EventPriority.USER, print, (), {}, seq=1)
+        second = app.EventItem(app.EventPriority.USER, print, (), {}, seq=2)
+        slash = app.EventItem(app.EventPriority.SLASH, print, (), {}, seq=3)
+
+        assert first < second
+        assert not second < first
+        assert slash < first
+
+    @pytest.mark.asyncio
+    async def test_fifo_within_priority(self):
+        """同一優先度のイベントが投入順に処理されること"""
+        queue = app.EventQueue()
+        order = []
+
+        async def handler(name):
+            order.append(name)
+
+        for i in range(50):
+            await queue.enqueue(app.EventPriority.USER, handler, f"user{i}")
+        await queue.enqueue(app.EventPriority.SLASH, handler, "slash")
+
+        worker = await _drain(queue)
+        worker.cancel()
+
+        assert order == ["slash"] + [f"user{i}" for i in range(50)]
+
+
+class TestWorker:
+    """ワーカー動作のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_idle_worker_wakes_on_enqueue(self):
+        """待機中のワーカーが投入直後にイベントを処理すること"""
+        queue = app.EventQueue()
+        handled = asyncio.Event()
+
+        async def handler():
+            handled.set()
+
+        worker = asyncio.create_task(queue.process_events())
+        await asyncio.sleep(0.02)
+        assert queue.is_idle
+
+        await queue.enqueue(app.EventPriority.TICK, handler)
+        await asyncio.wait_for(handled.wait(), timeout=0.5)
+        worker.cancel()
+
+    @pytest.mark.asyncio
+    async def test_second_worker_is_rejected(self):
+        """ワーカーの重複起動がValueErrorとなること（直列実行保証）"""
+        queue = app.EventQueue()
+        worker = asyncio.create_task(queue.process_events())
+        await asyncio.sleep(0)
+
+        with pytest.raises(ValueError, match="already running"):
+            await queue.process_events()
+
+        worker.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await worker
+
+        # 停止後は再起動可能
+        restarted = asyncio.create_task(queue.process_events())
+        await asyncio.sleep(0)
+        assert not restarted.done()
+        restarted.cancel()
+
+
+class TestQueueMetrics:
+    """優先度別計測のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_depth_tracks_pending_events_per_priority(self):
+        """待機イベント数が優先度別に計測されること"""
+        queue = app.EventQueue()
+
+        async def handler():
+            pass
+
+        await queue.enqueue(app.EventPriority.USER, handler)
+        await queue.enqueue(app.EventPriority.USER, handler)
+        await queue.enqueue(app.EventPriority.TICK, handler)
+
+        assert queue.depth() == 3
+        assert queue.depth(app.EventPriority.USER) == 2
+        assert queue.depth(app.EventPriority.SLASH) == 0
+
+        worker = await _drain(queue)
+        worker.cancel()
+
+        assert queue.depth() == 0
+        snapshot = queue.metrics.snapshot()
+        assert snapshot["user"]["depth"] == 0
+        assert snapshot["user"]["enqueued"] == 2
+        assert snapshot["user"]["processed"] == 2
+        assert snapshot["tick"]["processed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_and_service_times_are_recorded(self):
+        """待ち時間と処理時間が優先度別に記録されること"""
+        queue = app.EventQueue()
+
+        async def slow_handler():
+            await asyncio.sleep(0.03)
+
+        async def quick_handler():
+            pass
+
+        await queue.enqueue(app.EventPriority.SLASH, slow_handler)
+        await queue.enqueue(app.EventPriority.TICK, quick_handler)
+
+        worker = await _drain(queue)
+        worker.cancel()
+
+        snapshot = queue.metrics.snapshot()
+        assert snapshot["slash"]["service_max"] >= 0.025
+        assert snapshot["tick"]["wait_max"] >= 0.025
+        assert snapshot["tick"]["service_max"] < 0.025
+        assert snapshot["user"]["processed"] == 0
+        assert snapshot["user"]["wait_p50"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_failed_event_is_not_counted_as_processed(self):
+        """ハンドラ失敗時はFail-Fastで停止し、処理済みに計上されないこと"""
+        queue = app.EventQueue()
+
+        async def failing_handler():
+            raise RuntimeError("boom")
+
+        await queue.enqueue(app.EventPriority.USER, failing_handler)
+
+        with pytest.raises(ValueError, match="Event processing failed: boom"):
+            await queue.process_events()
+
+        assert not queue.is_processing
+        assert queue.metrics.snapshot()["user"]["processed"] == 0
@@ -0,0 +1,222 @@
+"""reply生成のヘッジリクエストテスト（テールレイテンシ制御）"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+from app import settings as settings_module
+from app import supervisor
+from app.supervisor import LatencyTracker, RateLimiter
+
+GENERATE_PARAMS = {
+    "kind": "reply",
+    "channel": "123456789012345678",
+    "task": "",
+    "context": "user: hello",
+    "limits": {"cc": 100},
+    "persona": {},
+    "report_config": {},
+}
+
+
+def _hedge_settings(**overrides):
+    ai_service = replace(
+        settings_module.settings.ai_service,
+        hedge_reply=True,
+        hedge_percentile=0.95,
+        hedge_min_samples=5,
+        **overrides,
+    )
+    return replace(settings_module.settings, ai_service=ai_service)
+
+
+def _tracker(latency=0.02, samples=10):
+    tracker = LatencyTracker()
+    for _ in range(samples):
+        tracker.record(latency)
+    return tracker
+
+
+def _client(delays):
+    """呼び出し順に遅延と応答話者を返すフェイククライアント"""
+    calls = []
+    lock = threading.Lock()
+
+    def generate_content(**kwargs):
+        with lock:
+            index = len(calls)
+            calls.append(index)
+        delay, speaker = delays[index]
+        time.sleep(delay)
+        return MagicMock(text=f'{{"speaker": "{speaker}", "text": "attempt{index}"}}')
+
+    client = MagicMock()
+    client.models.generate_content.side_effect = generate_content
+    return client, calls
+
+
+class TestLatencyTracker:
+    """LatencyTrackerのテスト"""
+
+    def test_percentile_uses_nearest_rank(self):
+        """分位点がnearest-rankで算出されること"""
+        tracker = LatencyTracker()
+        for value in range(1, 101):
+            tracker.record(value / 100)
+
+        assert tracker.percentile(0.95) == pytest.approx(0.95)
+        assert tracker.percentile(0.5) == pytest.approx(0.5)
+
+    def test_empty_tracker_returns_none(self):
+        """サンプルが無い場合はNoneを返すこと"""
+        assert LatencyTracker().percentile(0.95) is None
+
+
+class TestHedgedGenerate:
+    """generateのヘッジ動作テスト"""
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_when_primary_is_slow(self):
+        """元リクエストが遅い場合、ヘッジの応答が採用されること"""
+        client, calls = _client([(0.5, "lynq"), (0.0, "paz")])
+
+        with patch("app.supervisor.settings", _hedge_settings()), \
+             patch("app.supervisor.reply_latency", _tracker()), \
+             patch("app.supervisor.log_ok") as mock_log_ok, \
+             patch("google.genai.Client", return_value=client):
+            started = time.monotonic()
+            result = await supervisor.generate(**GENERATE_PARAMS)
+            elapsed = time.monotonic() - started
+
+        assert result == {"speaker": "paz", "text": "attempt1"}
+        assert len(calls) == 2
+        assert elapsed < 0.4
+        logged = [call.args[3] for call in mock_log_ok.call_args_list]
+        assert any(summary.startswith("hedge_fired:hedge") for summary in logged)
+
+    @pytest.mark.asyncio
+    async def test_latency_sample_is_primary_elapsed_not_hedge_winner(self):
+        """ヘッジ採用時もreply_latencyには元リクエスト自身の所要時間が記録されること"""
+        client, _ = _client([(0.3, "lynq"), (0.0, "paz")])
+        tracker = _tracker()
+
+        with patch("app.supervisor.settings", _hedge_settings()), \
+             patch("app.supervisor.reply_latency", tracker), \
+             patch("app.supervisor.log_ok"), \
+             patch("google.genai.Client", return_value=client):
+            result = await supervisor.generate(**GENERATE_PARAMS)
+            assert result["speaker"] == "paz"
+            assert len(tracker) == 10  # 採用したヘッジの所要時間は記録しない
+
+            await asyncio.sleep(0.4)
+
+        assert len(tracker) == 11
+        assert tracker.percentile(1.0) >= 0.3
+
+    @pytest.mark.asyncio
+    async def test_hedge_reserves_rate_limit_and_is_recorded(self):
+        """ヘッジはレート枠を1リクエスト分消費し、reply_hedgeとして計測記録されること"""
+        client, _ = _client([(0.5, "lynq"), (0.0, "paz")])
+        limiter = RateLimiter(rpm_limit=10, tpm_limit=0, reserve_ratio=0.0)
+        telemetry = supervisor.LLMTelemetry()
+
+        with patch("app.supervisor.settings", _hedge_settings()), \
+             patch("app.supervisor.reply_latency", _tracker()), \
+             patch("app.supervisor.rate_limiter", limiter), \
+             patch("app.supervisor.llm_telemetry", telemetry), \
+             patch("app.supervisor.log_ok"), \
+             patch("google.genai.Client", return_value=client):
+            await supervisor.generate(**GENERATE_PARAMS)
+
+        assert limiter.headroom().requests == pytest.approx(8, abs=0.1)
+        kinds = sorted(entry.kind for entry in telemetry.recent())
+        assert kinds == ["reply", supervisor.HEDGE_TELEMETRY_KIND]
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_when_primary_is_fast(self):
+        """分位点以内に応答があればヘッジを発行しないこと"""
+        client, calls = _client([(0.0, "spectra")])
+
+        with patch("app.supervisor.settings", _hedge_settings()), \
+             patch("app.supervisor.reply_latency", _tracker(latency=0.5)), \
+             patch("google.genai.Client", return_value=client):
+            result = await supervisor.generate(**GENERATE_PARAMS)
+
+        assert result["speaker"] == "spectra"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_rate_headroom(self):
+        """レート枠に余裕が無い場合はヘッジせず元リクエストを待つこと"""
+        client, calls = _client([(0.1, "lynq"), (0.0, "paz")])
+        exhausted = RateLimiter(rpm_limit=1, tpm_limit=0, reserve_ratio=0.0)
+
+        with patch("app.supervisor.settings", _hedge_settings()), \
+             patch("app.supervisor.reply_latency", _tracker()), \
+             patch("app.supervisor.rate_limiter", exhausted), \
+             patch("app.supervisor.log_ok") as mock_log_ok, \
+             patch("google.genai.Client", return_value=client):
+            result = await supervisor.generate(**GENERATE_PARAMS)
+
+        assert result["speaker"] == "lynq"
+        assert len(calls) == 1
+        logged = [call.args[3] for call in mock_log_ok.call_args_list]
+        assert any(summary.startswith("hedge_skipped:no_headroom") for summary in logged)
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_for_auto_kind(self):
+        """kind=autoはヘッジ対象外であること"""
+        client, calls = _client([(0.1, "paz")])
+
+        with patch("app.supervisor.settings", _hedge_settings()), \
+             patch("app.supervisor.reply_latency", _tracker()), \
+             patch("google.genai.Client", return_value=client):
+            await supervisor.generate(**{**GENERATE_PARAMS, "kind": "auto"})
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_insufficient_samples_disable_hedge(self):
+        """サンプル数が不足している間はヘッジしないこと"""
+        client, calls = _client([(0.1, "paz")])
+
+        with patch("app.supervisor.settings", _hedge_settings()), \
+             patch("app.supervisor.reply_latency", _tracker(samples=2)), \
+             patch("google.genai.Client", return_value=client):
+            await supervisor.generate(**GENERATE_PARAMS)
+
+        assert len(calls) == 1
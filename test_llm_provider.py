@@ -0,0 +1,191 @@
+"""LLMプロバイダ抽象化とGemini互換フェイクサーバのテスト"""
+
+import os
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+from app import llm_provider, supervisor
+from app.fake_llm_server import FakeLLMConfig, FakeLLMServer
+from app.llm_provider import GeminiProvider, LLMProvider, create_provider, register_provider
+
+
+GENERATE_PARAMS = {
+    "kind": "reply",
+    "channel": "123456789012345678",
+    "task": "",
+    "context": "user: hello",
+    "limits": {"cc": 100},
+    "persona": {},
+    "report_config": {},
+}
+
+
+def _settings_for(**overrides):
+    """ai_service設定を上書きしたsettings"""
+    return replace(
+        supervisor.settings,
+        ai_service=replace(supervisor.settings.ai_service, **overrides),
+    )
+
+
+class TestProviderRegistry:
+    """プロバイダ登録・生成のテスト"""
+
+    def test_create_default_gemini_provider(self):
+        """既定名geminiでGeminiProviderが生成されること"""
+        with patch("google.genai.Client"):
+            provider = create_provider("gemini", "key")
+
+        assert isinstance(provider, GeminiProvider)
+
+    def test_unknown_provider_fails_fast(self):
+        """未登録名はValueErrorとなること"""
+        with pytest.raises(ValueError, match="Unknown LLM provider: nope"):
+            create_provider("nope", "key")
+
+    @pytest.mark.asyncio
+    async def test_generate_uses_registered_provider(self):
+        """LLM_PROVIDERで登録済みの独自プロバイダに差し替えられること"""
+        prompts = []
+
+        class EchoProvider(LLMProvider):
+            name = "echo"
+
+            async def generate(self, prompt, config):
+                prompts.append(prompt)
+                return SimpleNamespace(text='{"speaker": "paz", "text": "echo"}')
+
+            async def stream(self, prompt, config):
+                raise NotImplementedError
+
+        register_provider("echo", lambda api_key, base_url: EchoProvider())
+        try:
+            with patch("app.supervisor.settings", _settings_for(llm_provider="echo")):
+                result = await supervisor.generate(**GENERATE_PARAMS)
+        finally:
+            llm_provider._providers.pop("echo")
+
+        assert result == {"speaker": "paz", "text": "echo"}
+        assert "user: hello" in prompts[0]
+
+
+class TestFakeServerEndToEnd:
+    """フェイクサーバ経由の実SDK経路テスト"""
+
+    @pytest.mark.asyncio
+    async def test_generate_through_fake_server(self):
+        """GEMINI_BASE_URLをフェイクサーバに向けて生成できること"""
+        server = FakeLLMServer(FakeLLMConfig(latency_ms=0, seed=1))
+        async with server as base_url:
+            with patch("app.supervisor.settings", _settings_for(base_url=base_url)):
+                result = await supervisor.generate(**GENERATE_PARAMS)
+
+        assert result["speaker"] in supervisor.VALID_SPEAKERS
+        assert result["text"].startswith("フェイク応答")
+        assert server.stats.requests == 1
+        assert server.stats.prompt_tokens > 0
+
+    @pytest.mark.asyncio
+    async def test_generate_stream_through_fake_server(self):
+        """ストリーミング生成でもspeakerが先行通知されること"""
+        notified = []
+        server = FakeLLMServer(FakeLLMConfig(latency_ms=0, stream_chunk_tokens=2, seed=1))
+        async with server as base_url:
+            with patch("app.supervisor.settings", _settings_for(base_url=base_url)):
+                result = await supervisor.generate_stream(
+                    **GENERATE_PARAMS, on_speaker=notified.append
+                )
+
+        assert notified == [result["speaker"]]
+        assert server.stats.streams == 1
+
+    @pytest.mark.asyncio
+    async def test_injected_error_fails_fast(self):
+        """注入したHTTPエラーがLLM generation failedとなること"""
+        server = FakeLLMServer(FakeLLMConfig(latency_ms=0, error_rate=1.0, error_statuses=(503,)))
+        async with server as base_url:
+            with patch("app.supervisor.settings", _settings_for(base_url=base_url)):
+                with pytest.raises(ValueError, match="LLM generation failed: 503"):
+                    await supervisor.generate(**GENERATE_PARAMS)
+
+        assert server.stats.errors == 1
+
+    @pytest.mark.asyncio
+    async def test_malformed_response_fails_fast(self):
+        """不正JSON本文がJSON parsing failedとなること"""
+        server = FakeLLMServer(FakeLLMConfig(latency_ms=0, malformed_rate=1.0))
+        async with server as base_url:
+            with patch("app.supervisor.settings", _settings_for(base_url=base_url)):
+                with pytest.raises(ValueError, match="JSON parsing failed"):
+                    await supervisor.generate(**GENERATE_PARAMS)
+
+
+class TestFakeServerBehavior:
+    """フェイクサーバの挙動設定テスト"""
+
+    @pytest.mark.parametrize("latency", ["uniform", "normal", "lognormal", "exponential"])
+    def test_latency_is_deterministic_per_seed(self, latency):
+        """同一seedで同一のレイテンシ列となること"""
+        config = FakeLLMConfig(latency=latency, latency_ms=100, latency_spread_ms=50, seed=7)
+        first = FakeLLMServer(config)
+        second = FakeLLMServer(config)
+
+        samples = [first.sample_latency() for _ in range(20)]
+
+        assert samples == [second.sample_latency() for _ in range(20)]
+        assert all(sample >= 0 for sample in samples)
+
+    def test_constant_latency(self):
+        """constantは常に設定値となること"""
+        server = FakeLLMServer(FakeLLMConfig(latency_ms=250))
+
+        assert server.sample_latency() == pytest.approx(0.25)
+
+    def test_token_rate_simulation(self):
+        """出力トークン数/tokens_per_second秒の生成時間となること"""
+        server = FakeLLMServer(FakeLLMConfig(tokens_per_second=50))
+
+        assert server._token_delay(100) == pytest.approx(2.0)
+        assert FakeLLMServer(FakeLLMConfig())._token_delay(100) == 0.0
+
+    @pytest.mark.parametrize("overrides", [
+        {"latency": "pareto"},
+        {"error_rate": 1.5},
+        {"tokens_per_second": -1},
+        {"error_statuses": ()},
+    ])
+    def test_invalid_config_fails_fast(self, overrides):
+        """不正な設定はValueErrorとなること"""
+        with pytest.raises(ValueError):
+            FakeLLMConfig(**overrides)
@@ -0,0 +1,204 @@
+"""プロンプトサイズ推定とLLM呼び出し計測のテスト"""
+
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+from app import app, supervisor
+from app.supervisor import CallTelemetry, LLMTelemetry, estimate_tokens
+
+
+GENERATE_PARAMS = {
+    "kind": "reply",
+    "channel": "123456789012345678",
+    "task": "",
+    "context": "user: hello\nlynq: こんにちは\npaz: 了解",
+    "limits": {"cc": 100},
+    "persona": {},
+    "report_config": {},
+}
+
+
+def _mock_client(text='{"speaker": "paz", "text": "ok"}', prompt_tokens=321, total_tokens=400):
+    """usage_metadata付き応答を返すGeminiクライアント"""
+    client = MagicMock()
+    client.models.generate_content.return_value = SimpleNamespace(
+        text=text,
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=prompt_tokens, total_token_count=total_tokens
+        ),
+    )
+    return client
+
+
+class TestEstimateTokens:
+    """文字種ベースのトークン推定テスト"""
+
+    def test_empty_text(self):
+        """空文字列は1トークンとなること"""
+        assert estimate_tokens("") == 1
+
+    def test_english_is_about_four_chars_per_token(self):
+        """英文は約4文字/トークン（空白は数えない）となること"""
+        assert estimate_tokens("abcd" * 100) == 101
+        assert estimate_tokens("abcd " * 100) == 101
+
+    def test_japanese_character_classes(self):
+        """漢字は1文字1トークン、かなはより少なく推定されること"""
+        assert estimate_tokens("漢" * 100) == 101
+        assert estimate_tokens("か" * 100) == 61
+        assert estimate_tokens("カ" * 100) == 61
+
+    def test_mixed_text_sums_classes(self):
+        """日英・記号混在は文字種毎の合算となること"""
+        # "user"=1, ":"=1, "進捗"=2, "です"=1.2, "。"(U+3002)=0.6
+        assert estimate_tokens("user: 進捗です。") == 6
+
+    def test_large_context_is_fast(self):
+        """数百KBの文脈でも高速に推定できること"""
+        context = "\n".join(
+            f"user: メッセージ{i} progress update 実装を進めています" for i in range(10_000)
+        )
+
+        started = time.perf_counter()
+        estimate_tokens(context)
+
+        assert time.perf_counter() - started < 0.2
+
+
+class TestLLMTelemetry:
+    """計測記録のテスト"""
+
+    def test_snapshot_aggregates_and_estimate_ratio(self):
+        """集計値と実測/推定比が算出されること"""
+        telemetry = LLMTelemetry(window=10)
+        with patch("app.supervisor.log_ok"):
+            telemetry.record(CallTelemetry("reply", 1000, 200, 10, 300, 350, 0.5, True))
+            telemetry.record(CallTelemetry("auto", 3000, 600, 30, None, None, 1.0, False))
+            telemetry.record(CallTelemetry("auto", 2000, 200, 20, 100, 150, 0.7, True))
+
+        snapshot = telemetry.snapshot()
+
+        assert snapshot["calls"] == 3
+        assert snapshot["errors"] == 1
+        assert snapshot["prompt_chars_max"] == 3000
+        assert snapshot["context_records_max"] == 30
+        assert snapshot["estimate_ratio"] == pytest.approx(1.0)
+
+    def test_summary_fits_log_payload(self):
+        """大規模文脈でもログ要約が80字以内に収まること"""
+        entry = CallTelemetry("report", 1_500_000, 600_000, 100_000, 610_000, 611_000, 123.4, False)
+
+        assert len(entry.summary()) <= 80
+
+
+class TestGenerateTelemetry:
+    """generateでの計測記録テスト"""
+
+    @pytest.mark.asyncio
+    async def test_generate_records_prompt_size_and_usage(self):
+        """プロンプト文字数・推定値・レコード数・実使用量が記録されること"""
+        telemetry = LLMTelemetry()
+
+        with patch("google.genai.Client", return_value=_mock_client()), \
+             patch("app.supervisor.llm_telemetry", telemetry), \
+             patch("app.supervisor.log_ok") as mock_log_ok:
+            await supervisor.generate(**GENERATE_PARAMS, context_records=7)
+
+        entry = telemetry.recent()[0]
+        prompt = supervisor.build_prompt(
+            "reply", GENERATE_PARAMS["channel"], "", GENERATE_PARAMS["context"],
+            GENERATE_PARAMS["limits"], {}, {},
+        )
+        assert entry.kind == "reply"
+        assert entry.prompt_chars == len(prompt)
+        assert entry.estimated_tokens == estimate_tokens(prompt)
+        assert entry.context_records == 7
+        assert entry.prompt_tokens == 321
+        assert entry.total_tokens == 400
+        assert entry.ok is True
+        mock_log_ok.assert_any_call("supervisor", "system", "system", entry.summary())
+
+    @pytest.mark.asyncio
+    async def test_context_records_default_to_line_count(self):
+        """レコード数省略時は文脈の行数となること"""
+        telemetry = LLMTelemetry()
+
+        with patch("google.genai.Client", return_value=_mock_client()), \
+             patch("app.supervisor.llm_telemetry", telemetry), \
+             patch("app.supervisor.log_ok"):
+            await supervisor.generate(**GENERATE_PARAMS)
+
+        assert telemetry.recent()[0].context_records == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_call_is_recorded(self):
+        """生成失敗時もok=Falseで記録されること"""
+        telemetry = LLMTelemetry()
+
+        with patch("google.genai.Client", return_value=_mock_client(text="not json")), \
+             patch("app.supervisor.llm_telemetry", telemetry), \
+             patch("app.supervisor.log_ok"):
+            with pytest.raises(ValueError, match="LLM generation failed"):
+                await supervisor.generate(**GENERATE_PARAMS)
+
+        entry = telemetry.recent()[0]
+        assert entry.ok is False
+        assert entry.prompt_tokens == 321
+
+
+class TestCommonSequenceContextRecords:
+    """common_sequenceからのレコード数受け渡しテスト"""
+
+    @pytest.mark.asyncio
+    async def test_common_sequence_passes_record_count(self):
+        """Redis全文脈のレコード数がgenerateに渡されること"""
+        records = [{"agent": "user", "text": "a\nb"}, {"agent": "paz", "text": "c"}]
+
+        with patch("app.store.read_all", return_value=records), \
+             patch("app.supervisor.generate", return_value={"speaker": "paz", "text": "ok"}) as mock_generate, \
+             patch("app.discord.typing", return_value=204), \
+             patch("app.discord.send", return_value="msg_1"), \
+             patch("app.store.append"), \
+             patch("app.logger.log_ok"):
+            await app.common_sequence(
+                event_type="user_msg",
+                channel="development",
+                actor="user",
+                payload_summary="hello",
+                llm_kind="reply",
+                llm_channel="123456789012345678",
+            )
+
+        assert mock_generate.call_args.kwargs["context_records"] == 2
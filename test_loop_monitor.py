@@ -0,0 +1,151 @@
+"""イベントループ監視テスト（スケジューリング遅延・長時間占有のスタック記録）"""
+
+import asyncio
+import os
+import time
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app
+from app import settings as settings_module
+from app.loop_monitor import LoopMonitor, SlowCallback
+
+
+def _blocking_call(seconds):
+    """イベントループを同期的に占有する処理"""
+    time.sleep(seconds)
+
+
+async def _run_monitor(monitor, body):
+    """監視を起動してbodyを実行し、監視を停止"""
+    task = asyncio.create_task(monitor.start())
+    await asyncio.sleep(0.05)
+    try:
+        await body()
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+class TestLoopMonitor:
+    """LoopMonitorのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_recorded_with_stack(self):
+        """閾値以上ループを占有した処理が占有時間とスタック付きで記録されること"""
+        monitor = LoopMonitor(lag_interval=0.02, slow_callback=0.05)
+
+        async def body():
+            _blocking_call(0.3)
+            await asyncio.sleep(0.05)
+
+        with patch("app.loop_monitor.log_ok") as mock_log_ok:
+            await _run_monitor(monitor, body)
+
+        snapshot = monitor.snapshot()
+        assert snapshot["slow_callbacks_total"] >= 1
+        slow = max(snapshot["slow_callbacks"], key=lambda entry: entry["duration"])
+        assert slow["duration"] >= 0.2
+        assert "_blocking_call" in slow["stack"][0]
+        slow_logs = [
+            call for call in mock_log_ok.call_args_list if call.args[3].startswith("slow_callback:")
+        ]
+        assert slow_logs
+        assert any("_blocking_call" in call.kwargs["detail"] for call in slow_logs)
+
+    @pytest.mark.asyncio
+    async def test_scheduling_lag_is_measured_and_summarized(self):
+        """sleepの遅れが遅延として計測され、集計がログへ書き出されること"""
+        monitor = LoopMonitor(lag_interval=0.02, slow_callback=1.0, summary_interval=0.1)
+
+        async def body():
+            _blocking_call(0.15)
+            await asyncio.sleep(0.15)
+
+        with patch("app.loop_monitor.log_ok") as mock_log_ok:
+            await _run_monitor(monitor, body)
+
+        assert monitor.snapshot()["lag_max"] >= 0.1
+        assert monitor.slow_callbacks_total == 0
+        logged = [call.args[3] for call in mock_log_ok.call_args_list]
+        assert any(summary.startswith("loop_lag:n=") for summary in logged)
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_records_no_slow_callbacks(self):
+        """占有の無いループでは長時間占有が記録されないこと"""
+        monitor = LoopMonitor(lag_interval=0.02, slow_callback=0.2)
+
+        with patch("app.loop_monitor.log_ok"):
+            await _run_monitor(monitor, lambda: asyncio.sleep(0.2))
+
+        snapshot = monitor.snapshot()
+        assert snapshot["lag_samples"] > 0
+        assert snapshot["slow_callbacks_total"] == 0
+
+    @pytest.mark.asyncio
+    async def test_double_start_raises(self):
+        """二重起動はRuntimeErrorとなること"""
+        monitor = LoopMonitor(lag_interval=0.02)
+
+        async def body():
+            with pytest.raises(RuntimeError, match="already running"):
+                await monitor.start()
+
+        with patch("app.loop_monitor.log_ok"):
+            await _run_monitor(monitor, body)
+
+    def test_summary_and_validation(self):
+        """要約形式と不正な間隔のFail-Fast"""
+        entry = SlowCallback(0.25, ("store.py:87:read_all", "app.py:150:on_user"))
+        assert entry.summary() == "slow_callback:250ms:store.py:87:read_all"
+        assert entry.detail() == "store.py:87:read_all<app.py:150:on_user"
+        assert SlowCallback(0.25, ()).summary() == "slow_callback:250ms:-"
+        with pytest.raises(ValueError, match="must be positive"):
+            LoopMonitor(slow_callback=0)
+
+    def test_loop_monitor_follows_settings(self):
+        """LOOP_MONITOR無効時は生成されず、有効時は設定値で生成されること"""
+        logging_config = settings_module.settings.logging
+        disabled = replace(
+            settings_module.settings, logging=replace(logging_config, loop_monitor=False)
+        )
+        enabled = replace(
+            settings_module.settings,
+            logging=replace(logging_config, loop_monitor=True, loop_slow_callback_seconds=0.25),
+        )
+
+        with patch("app.settings.settings", disabled):
+            assert app._create_loop_monitor() is None
+        with patch("app.settings.settings", enabled):
+            assert app._create_loop_monitor().slow_callback == 0.25
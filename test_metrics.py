@@ -0,0 +1,211 @@
+"""メトリクステスト（レジストリのテキスト出力・HTTPエンドポイント・各モジュールの計測）"""
+
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app, metrics, store
+from app.discord import DiscordRateLimiter
+from app.metrics import MetricsRegistry, MetricsServer
+from app.supervisor import CallTelemetry, LLMTelemetry
+
+
+def _sample(text, line_prefix):
+    """出力から指定サンプルの値を取得（無い場合None）"""
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestMetricsRegistry:
+    """MetricsRegistryのテスト"""
+
+    def test_render_prometheus_text(self):
+        """Counter・Gauge・HistogramがPrometheusテキスト形式で出力されること"""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("route",))
+        depth = registry.gauge("depth", "Depth")
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+        requests.labels("send").inc()
+        requests.labels("send").inc(2)
+        depth.set(3)
+        latency.observe(0.1)
+        latency.observe(0.5)
+        latency.observe(5)
+
+        assert registry.render() == "\n".join([
+            "# HELP requests_total Requests",
+            "# TYPE requests_total counter",
+            'requests_total{route="send"} 3',
+            "# HELP depth Depth",
+            "# TYPE depth gauge",
+            "depth 3",
+            "# HELP latency_seconds Latency",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{le="0.1"} 1',
+            'latency_seconds_bucket{le="1"} 2',
+            'latency_seconds_bucket{le="+Inf"} 3',
+            "latency_seconds_sum 5.6",
+            "latency_seconds_count 3",
+        ]) + "\n"
+
+    def test_labelled_histogram_and_escaping(self):
+        """ラベル付きヒストグラムのle結合とラベル値のエスケープ"""
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(1.0,))
+        latency.labels('a"b').observe(0.5)
+
+        text = registry.render()
+
+        assert 'latency_seconds_bucket{route="a\\"b",le="1"} 1' in text
+        assert 'latency_seconds_count{route="a\\"b"} 1' in text
+
+    def test_collectors_run_before_render(self):
+        """取得時にコレクタが呼ばれること"""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("mode", "Mode", ("mode",))
+        registry.add_collector(lambda: gauge.labels("active").set(1))
+
+        assert 'mode{mode="active"} 1' in registry.render()
+
+    def test_misuse_fails_fast(self):
+        """ラベル数不一致・ラベル省略・重複登録はValueErrorとなること"""
+        registry = MetricsRegistry()
+        counter = registry.counter("events_total", "Events", ("priority",))
+
+        with pytest.raises(ValueError, match="expects labels"):
+            counter.labels("user", "extra")
+        with pytest.raises(ValueError, match="requires labels"):
+            counter.inc()
+        with pytest.raises(ValueError, match="already registered"):
+            registry.gauge("events_total", "Events")
+
+
+class TestMetricsServer:
+    """MetricsServerのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_serves_text_format(self):
+        """GET /metricsでテキスト形式の内容が返ること"""
+        registry = MetricsRegistry()
+        registry.counter("hits_total", "Hits").inc()
+        server = MetricsServer(registry)
+        url = await server.start()
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(url)
+        finally:
+            await server.stop()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "hits_total 1" in response.text
+
+
+class TestInstrumentation:
+    """各モジュールの計測テスト"""
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_events_and_mode_are_collected(self):
+        """キュー深さ・イベント累計・モードが取得時に反映されること"""
+        queue = app.EventQueue()
+
+        async def handler():
+            pass
+
+        with patch.object(app, "event_queue", queue), \
+             patch.object(app, "channel_event_queues", None), \
+             patch.object(app, "remote_event_worker", None):
+            await queue.enqueue(app.EventPriority.USER, handler)
+            await queue.enqueue(app.EventPriority.USER, handler)
+            text = metrics.registry.render()
+
+        assert _sample(text, 'bot_event_queue_depth{priority="user"}') == 2
+        assert _sample(text, 'bot_events_total{priority="user",outcome="enqueued"}') == 2
+        from app import state
+
+        assert _sample(text, f'bot_mode{{mode="{state.get_current_mode().value}"}}') == 1
+
+    def test_llm_telemetry_observes_latency(self):
+        """LLM呼び出しの計測がレイテンシヒストグラムへ記録されること"""
+        child = metrics.LLM_REQUEST_SECONDS.labels("reply", "ok")
+        before = child.count
+
+        with patch("app.supervisor.log_ok"):
+            LLMTelemetry().record(CallTelemetry(
+                kind="reply", prompt_chars=100, estimated_tokens=40, context_records=2,
+                prompt_tokens=None, total_tokens=None, latency=0.8, ok=True,
+            ))
+
+        assert child.count == before + 1
+
+    @pytest.mark.asyncio
+    async def test_discord_requests_observe_latency_and_rate_limits(self):
+        """Discord RESTのレイテンシとステータス、429回数が記録されること"""
+        limiter = DiscordRateLimiter(max_wait=5.0, max_retries=1, sleep=AsyncMock())
+        responses = [
+            httpx.Response(429, headers={"retry-after": "0"}, json={}),
+            httpx.Response(204),
+        ]
+        ok_child = metrics.DISCORD_REQUEST_SECONDS.labels("typing", 204)
+        limited_child = metrics.DISCORD_RATE_LIMITED_TOTAL.labels("typing")
+        before_ok, before_limited = ok_child.count, limited_child.value
+
+        with patch("app.discord.log_ok"):
+            await limiter.request("spectra", "typing", "1", AsyncMock(side_effect=responses))
+
+        assert ok_child.count == before_ok + 1
+        assert limited_child.value == before_limited + 1
+
+    def test_store_observes_redis_latency_and_context_length(self):
+        """文脈ストアのRedis呼び出し時間と文脈件数が記録されること"""
+        mock_redis = MagicMock()
+        mock_redis.lrange.return_value = [
+            '{"agent": "user", "channel": "lounge", "timestamp": "t", "text": "a"}',
+            '{"agent": "paz", "channel": "lounge", "timestamp": "t", "text": "b"}',
+        ]
+        mock_redis.rpush.return_value = 3
+        lrange_child = metrics.REDIS_COMMAND_SECONDS.labels("lrange")
+        before = lrange_child.count
+
+        with patch("app.store._get_redis_connection", return_value=mock_redis), \
+             patch("app.store.log_ok"):
+            store.read_all()
+            assert metrics.CONTEXT_RECORDS.labels().value == 2
+            store.append("user", "lounge", "c")
+
+        assert lrange_child.count == before + 1
+        assert metrics.CONTEXT_RECORDS.labels().value == 3
@@ -0,0 +1,452 @@
+"""gateway/workerプロセス分離テスト（Redisキュー経由の投入・区画リース・ステート受け渡し）"""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app
+from app import state
+from app.discord import SpectraDiscordClient
+from app.durable_queue import DurableEventJournal
+from test_durable_queue import FakeClock, FakeRedis
+
+
+@pytest.fixture(autouse=True)
+def preserve_state():
+    """テスト間でグローバルステートを共有しない"""
+    snapshot = state.export_state()
+    yield
+    state.import_state(snapshot)
+
+
+def _remote_journals(redis, clock=None):
+    """区画別Redisキュー（全区画で同一のフェイクRedisを共有）"""
+    options = {"clock": clock} if clock is not None else {}
+    return {
+        name: DurableEventJournal(
+            namespace=f"remote:{name}", connection_factory=lambda: redis, **options
+        )
+        for name in app.REMOTE_PARTITIONS
+    }
+
+
+class TestPublishRemoteEvent:
+    """gateway側のRedisキュー投入テスト"""
+
+    @pytest.mark.asyncio
+    async def test_events_are_routed_to_partitions_with_state(self):
+        """ユーザー発言はチャンネル区画、Slashは専用区画へ投入時のステート付きで記録されること"""
+        journals = _remote_journals(FakeRedis())
+        state.set_active_channel("development")
+
+        with patch.object(app, "remote_journals", journals):
+            await app.dispatch_event("lounge", app.EventPriority.USER, app.on_user, "c", "hello", "u")
+            await app.dispatch_event("command-center", app.EventPriority.SLASH, app.on_slash, "creation", None)
+
+        user_event = journals["lounge"].claim_next()
+        slash_event = journals["slash"].claim_next()
+        assert (user_event.handler, user_event.args) == ("on_user", ("c", "hello", "u"))
+        assert user_event.meta["state"]["active_channel"] == "development"
+        assert (slash_event.handler, slash_event.args) == ("on_slash", ("creation", None))
+        assert journals["command-center"].claim_next() is None
+
+    @pytest.mark.asyncio
+    async def test_unregistered_handler_fails_fast(self):
+        """workerへ受け渡せないハンドラはValueErrorとなること"""
+        async def local_only():
+            pass
+
+        with patch.object(app, "remote_journals", _remote_journals(FakeRedis())):
+            with pytest.raises(ValueError, match="cannot be dispatched"):
+                await app.dispatch_event("lounge", app.EventPriority.USER, local_only)
+
+    @pytest.mark.asyncio
+    async def test_tick_goes_to_active_channel_partition(self):
+        """Tickはgatewayのactive_channel区画へ投入されること"""
+        journals = _remote_journals(FakeRedis())
+        state.set_active_channel("creation")
+
+        with patch.object(app, "remote_journals", journals):
+            await app.tick_scheduler._enqueue_tick_event()
+
+        assert journals["creation"].claim_next().handler == "on_tick"
+
+    @pytest.mark.asyncio
+    async def test_gateway_slash_applies_state_and_acknowledges(self):
+        """gatewayのSlashはステートを即時更新し、worker投入後に応答を編集すること"""
+        journals = _remote_journals(FakeRedis())
+        interaction = MagicMock()
+        interaction.data = {
+            "name": "task",
+            "options": [{"name": "channel", "value": "development"}, {"name": "content", "value": "設計"}],
+        }
+        interaction.type = discord.InteractionType.application_command
+        interaction.response.defer = AsyncMock()
+        interaction.edit_original_response = AsyncMock()
+
+        with patch.object(app, "remote_journals", journals):
+            client = SpectraDiscordClient()
+            await client.on_interaction(interaction)
+
+        assert state.get_active_channel() == "development"
+        assert state.get_task().content == "設計"
+        assert journals["slash"].claim_next().args == ("development", "設計")
+        interaction.edit_original_response.assert_awaited_once_with(content="受け付けました")
+
+    @pytest.mark.asyncio
+    async def test_pending_tick_is_merged_and_depth_is_capped(self):
+        """gatewayでもTickは待機中の同一イベントへ統合され、優先度別の待機上限を超える投入は不受理となること"""
+        journals = _remote_journals(FakeRedis())
+        depth = {app.EventPriority.SLASH: 0, app.EventPriority.USER: 2, app.EventPriority.TICK: 0}
+
+        with patch.object(app, "remote_journals", journals), \
+             patch.object(app, "_queue_max_depth", return_value=depth), \
+             patch("app.logger.log_ok") as mock_log_ok:
+            assert await app.dispatch_event("lounge", app.EventPriority.TICK, app.on_tick) is True
+            assert await app.dispatch_event("lounge", app.EventPriority.TICK, app.on_tick) is False
+            user = [
+                await app.dispatch_event("lounge", app.EventPriority.USER, app.on_user, "c", text, "u")
+                for text in ("a", "b", "c")
+            ]
+            # 別区画は独立して判定
+            assert await app.dispatch_event("creation", app.EventPriority.USER, app.on_user, "c", "d", "u") is True
+
+        assert user == [True, True, False]
+        assert journals["lounge"].pending_count(app.EventPriority.TICK.value) == 1
+        assert journals["lounge"].pending_count(app.EventPriority.USER.value) == 2
+        mock_log_ok.assert_called_once_with("queue", "system", "system", "rejected:user:depth=2")
+
+    @pytest.mark.asyncio
+    async def test_gateway_report_is_published_to_worker(self):
+        """gatewayの日報はworkerへ投入され、生成・投稿・リセット後のステート遷移がgatewayへ取り込まれること"""
+        journals = _remote_journals(FakeRedis())
+        state.update_mode(state.Mode.PROCESSING)
+        state.set_active_channel("lounge")
+
+        with patch.object(app, "remote_journals", journals), \
+             patch.object(app, "_remote_state_version", 0), \
+             patch("app.app.common_sequence", AsyncMock()) as mock_sequence, \
+             patch("app.store.reset") as mock_reset:
+            await app.on_report_0600()
+
+            mock_sequence.assert_not_called()
+            mock_reset.assert_not_called()
+            assert state.get_current_mode() == state.Mode.PROCESSING
+
+            worker = app.RemoteEventWorker(journals, app._remote_handlers(), worker_id="w1")
+            assert await worker.run_once("slash") is True
+            assert state.get_current_mode() == state.Mode.ACTIVE
+
+            # gateway（別プロセス）のステートは投稿前のまま → 次の投入時に取り込む
+            state.update_mode(state.Mode.PROCESSING)
+            state.set_active_channel("lounge")
+            await app.dispatch_event("lounge", app.EventPriority.USER, app.on_user, "c", "hi", "u")
+
+        mock_sequence.assert_awaited_once()
+        assert mock_sequence.await_args.kwargs["event_type"] == "report"
+        mock_reset.assert_called_once()
+        assert state.get_current_mode() == state.Mode.ACTIVE
+        assert state.get_active_channel() == "command-center"
+        event = journals["lounge"].claim_next()
+        assert event.meta["state_version"] == worker._state_version == 1
+
+    @pytest.mark.asyncio
+    async def test_report_failure_does_not_transition_state(self):
+        """workerで日報投稿が失敗した場合はステート遷移を記録しないこと"""
+        journals = _remote_journals(FakeRedis())
+        state.update_mode(state.Mode.PROCESSING)
+
+        with patch.object(app, "remote_journals", journals), \
+             patch.object(app, "_remote_state_version", 0), \
+             patch("app.app.common_sequence", AsyncMock(side_effect=ValueError("send failed"))), \
+             patch("app.logger.log_err"):
+            await app.on_report_0600()
+            worker = app.RemoteEventWorker(journals, app._remote_handlers(), worker_id="w1")
+            with pytest.raises(SystemExit):
+                await worker.run_once("slash")
+
+        assert state.get_current_mode() == state.Mode.PROCESSING
+        assert journals["slash"].load_state() is None
+
+
+class TestRemoteEventWorker:
+    """worker側の取り出し・実行テスト"""
+
+    @pytest.mark.asyncio
+    async def test_worker_ignores_gateway_state_older_than_its_own_change(self):
+        """worker側のステート変更を取り込む前に投入されたイベントのステートでは巻き戻らないこと"""
+        journals = _remote_journals(FakeRedis())
+        seen = []
+
+        async def on_report_worker():
+            state.update_mode(state.Mode.ACTIVE)
+            state.set_active_channel("command-center")
+
+        async def on_user(channel, text, user_id, typing_sent=False):
+            seen.append(state.get_active_channel())
+
+        state.update_mode(state.Mode.PROCESSING)
+        state.set_active_channel("lounge")
+        with patch.object(app, "remote_journals", journals), \
+             patch.object(app, "_remote_state_version", 0):
+            await app.dispatch_event("command-center", app.EventPriority.SLASH, app.on_report_worker)
+            await app.dispatch_event("lounge", app.EventPriority.USER, app.on_user, "c", "hi", "u")
+
+            worker = app.RemoteEventWorker(
+                journals, {"on_report_worker": on_report_worker, "on_user": on_user}, worker_id="w1"
+            )
+            assert await worker.run_once("slash") is True
+            assert await worker.run_once("lounge") is True
+
+        assert seen == ["command-center"]
+        assert journals["slash"].load_state()[1]["mode"] == "active"
+
+    @pytest.mark.asyncio
+    async def test_worker_restores_state_and_completes_event(self):
+        """投入時のステートを復元して実行し、完了後は再取得されないこと"""
+        journals = _remote_journals(FakeRedis())
+        state.set_active_channel("lounge")
+        seen = []
+
+        async def on_user(channel, text, user_id, typing_sent=False):
+            seen.append((text, state.get_active_channel()))
+
+        with patch.object(app, "remote_journals", journals):
+            await app.dispatch_event("lounge", app.EventPriority.USER, app.on_user, "c", "hi", "u")
+        state.set_active_channel("command-center")
+
+        worker = app.RemoteEventWorker(journals, {"on_user": on_user}, worker_id="w1")
+        assert await worker.run_once("lounge") is True
+        assert await worker.run_once("lounge") is False
+
+        assert seen == [("hi", "lounge")]
+        assert worker.metrics.snapshot()["user"]["processed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_partition_is_consumed_by_one_worker_at_a_time(self):
+        """実行中の区画は他workerが取り出さず、別区画は並行して処理されること"""
+        redis = FakeRedis()
+        journals = _remote_journals(redis)
+        started = asyncio.Event()
+        release = asyncio.Event()
+        order = []
+
+        async def on_user(channel, text, user_id, typing_sent=False):
+            order.append(text)
+            if text == "first":
+                started.set()
+                await release.wait()
+
+        for text, channel in (("first", "lounge"), ("second", "lounge"), ("other", "creation")):
+            journals[channel].put(app.EventPriority.USER.value, "on_user", ("c", text, "u"), {})
+
+        first = app.RemoteEventWorker(journals, {"on_user": on_user}, worker_id="w1")
+        second = app.RemoteEventWorker(journals, {"on_user": on_user}, worker_id="w2")
+
+        running = asyncio.create_task(first.run_once("lounge"))
+        await started.wait()
+        assert await second.run_once("lounge") is False
+        assert await second.run_once("creation") is True
+
+        release.set()
+        await running
+        assert await second.run_once("lounge") is True
+        assert order == ["first", "other", "second"]
+
+    @pytest.mark.asyncio
+    async def test_idle_partition_waits_for_publish_notification(self):
+        """空の区画は通知を待機し、投入の通知で起きて実行すること"""
+        redis = FakeRedis()
+        journals = _remote_journals(redis)
+        seen = asyncio.Event()
+        waits = []
+
+        async def on_user(channel, text, user_id, typing_sent=False):
+            seen.set()
+
+        worker = app.RemoteEventWorker(
+            {"lounge": journals["lounge"]}, {"on_user": on_user}, worker_id="w1", poll_interval=0.01
+        )
+        original_wait = journals["lounge"].wait_for_event
+
+        def recording_wait(timeout):
+            waits.append(timeout)
+            return original_wait(timeout)
+
+        with patch.object(journals["lounge"], "wait_for_event", side_effect=recording_wait):
+            runner = asyncio.create_task(worker.process_events())
+            await asyncio.sleep(0.02)
+            journals["lounge"].put(app.EventPriority.USER.value, "on_user", ("c", "hi", "u"), {})
+            await asyncio.wait_for(seen.wait(), timeout=1.0)
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+        assert waits and all(timeout == 0.01 for timeout in waits)
+        assert len(redis.lists[journals["lounge"].notify_key]) <= 1  # 通知は1件に保たれる
+
+    @pytest.mark.asyncio
+    async def test_long_running_handler_renews_lease_and_visibility(self):
+        """可視性期限より長いハンドラの実行中は実行権・可視性期限が延長されること"""
+        redis = FakeRedis()
+        clock = FakeClock()
+        journal = DurableEventJournal(
+            namespace="remote:lounge", visibility_timeout=0.03,
+            connection_factory=lambda: redis, clock=clock,
+        )
+        event_id = journal.put(app.EventPriority.USER.value, "on_user", ("c", "slow", "u"), {})
+
+        async def slow(channel, text, user_id, typing_sent=False):
+            clock.now += 100
+            await asyncio.sleep(0.05)
+
+        worker = app.RemoteEventWorker({"lounge": journal}, {"on_user": slow}, worker_id="w1")
+        running = asyncio.create_task(worker.run_once("lounge"))
+        await asyncio.sleep(0.04)
+
+        assert redis.zsets[journal.inflight_key][event_id] == pytest.approx(clock.now + 0.03)
+        assert journal.requeue_expired() == 0
+
+        assert await running is True
+        assert redis.get(journal.lease_key) is None
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_reports_lost_lease(self):
+        """実行中に実行権を失った場合はハートビートがエラーを記録すること"""
+        redis = FakeRedis()
+        journal = DurableEventJournal(
+            namespace="remote:lounge", visibility_timeout=0.03, connection_factory=lambda: redis,
+        )
+        journal.put(app.EventPriority.USER.value, "on_user", ("c", "slow", "u"), {})
+
+        async def slow(channel, text, user_id, typing_sent=False):
+            redis.strings[journal.lease_key] = "w2"
+            await asyncio.sleep(0.03)
+
+        worker = app.RemoteEventWorker({"lounge": journal}, {"on_user": slow}, worker_id="w1")
+        with patch("app.logger.log_err") as mock_log_err:
+            await worker.run_once("lounge")
+
+        assert mock_log_err.call_args.args[3] == "lease_lost:remote:lounge"
+        assert redis.get(journal.lease_key) == "w2"
+
+    @pytest.mark.asyncio
+    async def test_failed_event_blocks_partition_until_retried(self):
+        """ハンドラ失敗時は区画の実行権を保持し、期限後に失敗イベントから再実行されること"""
+        redis = FakeRedis()
+        clock = FakeClock()
+        journals = _remote_journals(redis, clock=clock)
+        calls = []
+
+        async def failing(channel, text, user_id, typing_sent=False):
+            raise RuntimeError("boom")
+
+        async def recording(channel, text, user_id, typing_sent=False):
+            calls.append(text)
+
+        for text in ("first", "second"):
+            journals["lounge"].put(app.EventPriority.USER.value, "on_user", ("c", text, "u"), {})
+
+        crashed = app.RemoteEventWorker(journals, {"on_user": failing}, worker_id="w1")
+        with pytest.raises(ValueError, match="Event processing failed"):
+            await crashed.run_once("lounge")
+
+        survivor = app.RemoteEventWorker(journals, {"on_user": recording}, worker_id="w2")
+        assert await survivor.run_once("lounge") is False
+
+        # リース・可視性期限の経過を再現
+        clock.now += journals["lounge"].visibility_timeout + 1
+        redis.delete(journals["lounge"].lease_key)
+        assert await survivor.run_once("lounge") is True
+        assert await survivor.run_once("lounge") is True
+        assert calls == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_expired_event_is_dropped(self):
+        """待機期限を過ぎたイベントは実行せず破棄されること"""
+        journals = _remote_journals(FakeRedis())
+        on_tick = AsyncMock()
+        journals["lounge"].put(app.EventPriority.TICK.value, "on_tick", (), {})
+
+        worker = app.RemoteEventWorker(
+            journals, {"on_tick": on_tick}, deadlines={app.EventPriority.TICK: 60.0}, worker_id="w1"
+        )
+        with patch("time.time", return_value=journals["lounge"]._clock() + 120):
+            assert await worker.run_once("lounge") is True
+
+        on_tick.assert_not_called()
+        assert worker.metrics.snapshot()["tick"]["expired"] == 1
+        assert await worker.run_once("lounge") is False
+
+    @pytest.mark.asyncio
+    async def test_expired_slash_interaction_is_notified(self):
+        """期限切れで破棄した/taskはdefer応答が不受理に編集されること"""
+        journals = _remote_journals(FakeRedis())
+        journals["slash"].put(
+            app.EventPriority.SLASH.value, "on_slash_interaction", ("creation", None, "42", "token"), {}
+        )
+        worker = app.RemoteEventWorker(
+            journals, app._remote_handlers(), deadlines={app.EventPriority.SLASH: 10.0},
+            worker_id="w1", drop_notifiers=app._drop_notifiers(),
+        )
+
+        with patch("time.time", return_value=journals["slash"]._clock() + 60), \
+             patch("app.app.on_slash", AsyncMock()) as mock_on_slash, \
+             patch("app.discord.edit_interaction_response", AsyncMock(return_value=True)) as mock_edit:
+            assert await worker.run_once("slash") is True
+
+        mock_on_slash.assert_not_called()
+        mock_edit.assert_awaited_once_with("42", "token", app.SLASH_DROPPED_MESSAGE)
+
+
+class TestStateSnapshot:
+    """ステートのエクスポート・インポートテスト"""
+
+    def test_round_trip(self):
+        """export_stateの内容がimport_stateで復元されること"""
+        state.update_task(content="タスク", channel="creation")
+        state.set_active_channel("creation")
+        snapshot = state.export_state()
+
+        state.update_task(content="別", channel="development")
+        state.set_active_channel("lounge")
+        state.import_state(snapshot)
+
+        assert state.get_active_channel() == "creation"
+        assert state.get_task().content == "タスク"
+
+    def test_invalid_snapshot_fails_fast(self):
+        """不正なスナップショットはValueErrorとなること"""
+        with pytest.raises(ValueError, match="Invalid state snapshot"):
+            state.import_state({"mode": "unknown"})
@@ -0,0 +1,117 @@
+"""事前コンパイル済みプロンプトテンプレートテスト"""
+
+import os
+
+import pytest
+
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+from app import settings as settings_module
+from app.supervisor import (
+    PromptTemplateCache,
+    build_prompt,
+    compile_prompt_template,
+    default_prompt_inputs,
+)
+
+LIMITS = {"cc": 100, "cr": 200, "dev": 200, "lo": 30}
+
+
+class TestPromptTemplate:
+    """PromptTemplateのテスト"""
+
+    def test_render_splices_task_and_context(self):
+        """taskとcontextのみが差し込まれること"""
+        template = compile_prompt_template("reply", "development", LIMITS, {}, {})
+
+        prompt = template.render("タスク", "user: hello")
+
+        assert "- Task: タスク\n- Context: user: hello\n- Channel Limits:" in prompt
+        assert prompt.startswith(template.head)
+        assert prompt.endswith(template.tail)
+
+    def test_build_prompt_matches_compiled_template(self):
+        """build_promptの出力がテンプレート出力と一致すること"""
+        template = compile_prompt_template("auto", "lounge", LIMITS, {"p": "x"}, {"r": 1})
+
+        assert build_prompt("auto", "lounge", "t", "c", LIMITS, {"p": "x"}, {"r": 1}) == \
+            template.render("t", "c")
+
+    def test_compile_validates_kind(self):
+        """不正なkindはコンパイル時にValueErrorとなること"""
+        with pytest.raises(ValueError, match="Invalid kind"):
+            compile_prompt_template("unknown", "lounge", LIMITS, {}, {})
+
+        with pytest.raises(ValueError, match="Invalid kind"):
+            build_prompt("unknown", "lounge", "", "", LIMITS, {}, {})
+
+
+class TestPromptTemplateCache:
+    """PromptTemplateCacheのテスト"""
+
+    def test_cache_reuses_template_for_same_inputs(self):
+        """同じ(kind, channel)と設定値ではテンプレートを再利用すること"""
+        cache = PromptTemplateCache()
+
+        first = cache.get("reply", "123", LIMITS, {}, {})
+        second = cache.get("reply", "123", dict(LIMITS), {}, {})
+
+        assert first is second
+
+    def test_cache_recompiles_when_settings_change(self):
+        """設定値が変わった場合は再コンパイルすること"""
+        cache = PromptTemplateCache()
+        first = cache.get("reply", "123", LIMITS, {}, {})
+
+        second = cache.get("reply", "123", {**LIMITS, "cc": 50}, {}, {})
+
+        assert second is not first
+        assert "cc=50" in second.tail
+
+    def test_warm_compiles_every_kind_and_channel(self):
+        """warmで全kind×channelが事前コンパイルされること"""
+        cache = PromptTemplateCache()
+
+        count = cache.warm(["1", "2", "3", "4"], LIMITS, {}, {})
+
+        assert count == 12
+
+
+class TestDefaultPromptInputs:
+    """settings由来のプロンプト入力テスト"""
+
+    def test_default_inputs_reflect_channel_limits(self):
+        """limitsがsettingsのチャンネル制限と一致し、呼び出し間で共有されること"""
+        limits, persona, report_config = default_prompt_inputs()
+
+        assert limits["cc"] == settings_module.settings.channel_limits.limit_cc
+        assert limits["lo"] == settings_module.settings.channel_limits.limit_lo
+        assert report_config["max_chars"] == 500
+        assert default_prompt_inputs()[0] is limits
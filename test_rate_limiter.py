@@ -0,0 +1,219 @@
+"""Geminiクライアント側レート制御テスト（トークンバケット）"""
+
+import asyncio
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+from app import app, supervisor
+from app.supervisor import RateLimiter, estimate_tokens
+
+
+class FakeTime:
+    """時計とsleepのフェイク（sleepで時計を進める）"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+def _limiter(fake, rpm=6, tpm=6000, reserve=0.5):
+    return RateLimiter(rpm, tpm, reserve, clock=fake.clock, sleep=fake.sleep)
+
+
+class TestEstimateTokens:
+    """プロンプトサイズ推定のテスト"""
+
+    def test_estimate_is_positive_and_grows_with_length(self):
+        """推定トークン数は正で、文字数に応じて増えること"""
+        assert estimate_tokens("") >= 1
+        assert estimate_tokens("こんにちは" * 100) > estimate_tokens("hello")
+
+
+class TestRateLimiter:
+    """RateLimiterのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_acquire_within_quota_does_not_wait(self):
+        """枠内の呼び出しは待機しないこと"""
+        fake = FakeTime()
+        limiter = _limiter(fake)
+
+        waited = await limiter.acquire("reply", 100)
+
+        assert waited == 0.0
+        assert limiter.headroom().requests == 5
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_refill_when_rpm_exhausted(self):
+        """RPM枠を使い切ると補充まで待機すること"""
+        fake = FakeTime()
+        limiter = _limiter(fake)
+        for _ in range(6):
+            await limiter.acquire("reply", 10)
+
+        waited = await limiter.acquire("reply", 10)
+
+        assert waited == pytest.approx(10.0)  # 6 RPM = 10秒/リクエスト
+
+    @pytest.mark.asyncio
+    async def test_auto_keeps_reserve_for_high_priority(self):
+        """autoは予備枠を残すため、replyより先に待機すること"""
+        fake = FakeTime()
+        limiter = _limiter(fake)
+        for _ in range(3):
+            await limiter.acquire("reply", 10)
+
+        assert limiter.has_headroom("reply") is True
+        assert limiter.has_headroom("auto") is False
+
+        waited = await limiter.acquire("auto", 10)
+        assert waited > 0
+
+    @pytest.mark.asyncio
+    async def test_tpm_limits_large_prompts(self):
+        """推定トークン枠が不足する場合は待機すること"""
+        fake = FakeTime()
+        limiter = _limiter(fake, rpm=100, tpm=600)
+        await limiter.acquire("reply", 600)
+
+        waited = await limiter.acquire("reply", 300)
+
+        assert waited == pytest.approx(30.0)  # 600 TPM = 10トークン/秒
+
+    @pytest.mark.asyncio
+    async def test_record_usage_corrects_estimate(self):
+        """実使用量が推定より多い場合は枠を追加消費すること"""
+        fake = FakeTime()
+        limiter = _limiter(fake)
+        await limiter.acquire("reply", 100)
+
+        limiter.record_usage(100, 600)
+
+        assert limiter.headroom().tokens == pytest.approx(5400)
+
+    def test_zero_limits_disable_rate_control(self):
+        """上限0の場合は常に余裕ありとなること"""
+        limiter = RateLimiter(0, 0, 0.2)
+
+        assert limiter.has_headroom("auto", 10 ** 9) is True
+        assert limiter.headroom().request_ratio == 1.0
+
+    def test_try_acquire_reserves_only_with_headroom(self):
+        """try_acquireは余裕がある場合のみ消費し、不足時は何も消費しないこと"""
+        fake = FakeTime()
+        limiter = _limiter(fake, rpm=2, tpm=0)
+
+        assert limiter.try_acquire("reply", 100) is True
+        assert limiter.try_acquire("reply", 100) is True
+        assert limiter.try_acquire("reply", 100) is False
+        assert limiter.headroom().requests == pytest.approx(0)
+
+
+class TestRateLimiterIntegration:
+    """generate・TickSchedulerとの連携テスト"""
+
+    @pytest.mark.asyncio
+    async def test_generate_acquires_rate_limit_before_call(self):
+        """generateがGemini呼び出し前に枠を確保すること"""
+        mock_client = MagicMock()
+        mock_client.models.generate_content.return_value = MagicMock(
+            text='{"speaker": "paz", "text": "ok"}'
+        )
+        limiter = MagicMock()
+
+        async def fake_acquire(kind, estimated):
+            limiter.calls.append((kind, estimated))
+            return 0.0
+
+        limiter.calls = []
+        limiter.acquire = fake_acquire
+
+        with patch("app.supervisor.rate_limiter", limiter), \
+             patch("google.genai.Client", return_value=mock_client):
+            await supervisor.generate(
+                kind="auto", channel="lounge", task="", context="",
+                limits={"lo": 30}, persona={}, report_config={},
+            )
+
+        assert len(limiter.calls) == 1
+        kind, estimated = limiter.calls[0]
+        assert kind == "auto"
+        assert estimated > supervisor.MAX_OUTPUT_TOKENS
+
+    @pytest.mark.asyncio
+    async def test_generate_without_wait_fails_fast_when_no_headroom(self):
+        """wait_for_rate_limit=Falseでは待機せず、枠不足時は呼び出し前にValueErrorとなること"""
+        fake = FakeTime()
+        limiter = _limiter(fake)
+        for _ in range(3):
+            await limiter.acquire("reply", 10)
+        mock_client = MagicMock()
+
+        with patch("app.supervisor.rate_limiter", limiter), \
+             patch("google.genai.Client", return_value=mock_client):
+            with pytest.raises(ValueError, match="Rate limit headroom unavailable"):
+                await supervisor.generate(
+                    kind="auto", channel="lounge", task="", context="",
+                    limits={"lo": 30}, persona={}, report_config={},
+                    wait_for_rate_limit=False,
+                )
+
+        mock_client.models.generate_content.assert_not_called()
+        assert fake.sleeps == []
+        assert limiter.headroom().requests == pytest.approx(3)
+
+    @pytest.mark.asyncio
+    async def test_tick_scheduler_skips_tick_without_headroom(self):
+        """レート枠不足時はtickをキューに積まないこと"""
+        scheduler = app.TickScheduler()
+
+        with patch.object(scheduler, "should_execute_tick", return_value=True), \
+             patch.object(scheduler, "get_tick_interval", return_value=0.01), \
+             patch.object(scheduler, "get_max_runtime", return_value=None), \
+             patch("app.supervisor.rate_limiter.has_headroom", return_value=False), \
+             patch.object(scheduler, "_enqueue_tick_event") as mock_enqueue:
+            task = asyncio.create_task(scheduler.start())
+            await asyncio.sleep(0.05)
+            scheduler.stop()
+            await task
+
+        mock_enqueue.assert_not_called()
@@ -0,0 +1,245 @@
+"""日報の分割要約（map-reduce）生成テスト"""
+
+import asyncio
+import os
+import re
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+from app import llm_provider, supervisor
+from app.llm_provider import LLMProvider
+from app.supervisor import REPORT_MAP_HEAD, RateLimiter, split_context_chunks
+
+
+class ScriptedProvider(LLMProvider):
+    """map要約はチャンク番号入りの要約、reduceは日報を返すプロバイダ"""
+
+    name = "scripted"
+
+    def __init__(self, delays=None, failures=(), summary_chars=10):
+        self.delays = delays or {}
+        self.failures = set(failures)
+        self.summary_chars = summary_chars
+        self.map_prompts = []
+        self.reduce_prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt, config):
+        if not prompt.startswith(REPORT_MAP_HEAD):
+            self.reduce_prompts.append(prompt)
+            return SimpleNamespace(text='{"speaker": "lynq", "text": "' + "日" * 600 + '"}')
+
+        index = int(re.search(r"（(\d+)/\d+）", prompt).group(1))
+        self.map_prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(index, 0.01))
+            if index in self.failures:
+                raise RuntimeError(f"chunk {index} failed")
+            text = f"要約{index}".ljust(self.summary_chars, "。")
+            return SimpleNamespace(text='{"speaker": "spectra", "text": "' + text + '"}')
+        finally:
+            self.in_flight -= 1
+
+    async def stream(self, prompt, config):
+        raise NotImplementedError
+
+
+@pytest.fixture(autouse=True)
+def unlimited_rate_limiter(monkeypatch):
+    """環境変数のRPM/TPM上限に依存しないよう無制限のレート制御へ差し替え"""
+    monkeypatch.setattr(supervisor, "rate_limiter", RateLimiter(0, 0, 0.0))
+
+
+@pytest.fixture
+def scripted_provider():
+    """LLM_PROVIDER=scriptedで差し替え（テスト後に登録解除）"""
+    holder = {}
+    llm_provider.register_provider("scripted", lambda api_key, base_url: holder["provider"])
+    yield holder
+    llm_provider._providers.pop("scripted")
+
+
+def _settings_for(**overrides):
+    return replace(
+        supervisor.settings,
+        ai_service=replace(supervisor.settings.ai_service, llm_provider="scripted", **overrides),
+    )
+
+
+def _context(lines):
+    return "\n".join(f"user: メッセージ{i:03d}" for i in range(lines))
+
+
+async def _generate_report(context):
+    return await supervisor.generate(
+        kind="report",
+        channel="123456789012345678",
+        task="日報",
+        context=context,
+        limits={"cc": 100},
+        persona={},
+        report_config={"format": "daily", "max_chars": 500},
+    )
+
+
+class TestSplitContextChunks:
+    """文脈分割のテスト"""
+
+    def test_chunks_respect_limit_and_line_boundaries(self):
+        """各チャンクが上限以下かつ行境界で分割され、連結で元に戻ること"""
+        context = _context(50)
+
+        chunks = split_context_chunks(context, 100)
+
+        assert all(len(chunk) <= 100 for chunk in chunks)
+        assert "\n".join(chunks) == context
+        assert all(line.startswith("user: ") for chunk in chunks for line in chunk.split("\n"))
+
+    def test_oversized_line_is_split(self):
+        """上限を超える1行は文字数で分割されること"""
+        chunks = split_context_chunks("a" * 25 + "\nb", 10)
+
+        assert chunks == ["a" * 10, "a" * 10, "a" * 5 + "\nb"]
+
+
+class TestReportMapReduce:
+    """分割要約生成のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_small_context_uses_single_call(self, scripted_provider):
+        """しきい値以下の文脈は従来通り1回の呼び出しで生成されること"""
+        provider = scripted_provider["provider"] = ScriptedProvider()
+
+        with patch("app.supervisor.settings", _settings_for(report_chunk_chars=10_000)):
+            result = await _generate_report(_context(10))
+
+        assert provider.map_prompts == []
+        assert len(provider.reduce_prompts) == 1
+        assert result["speaker"] == "spectra"
+
+    @pytest.mark.asyncio
+    async def test_oversized_context_is_mapped_then_reduced_in_order(self, scripted_provider):
+        """チャンク毎に要約し、完了順に関わらず時系列順で最終日報に集約されること"""
+        provider = scripted_provider["provider"] = ScriptedProvider(delays={1: 0.05})
+        context = _context(50)
+        expected_chunks = len(split_context_chunks(context, 200))
+
+        with patch("app.supervisor.settings", _settings_for(report_chunk_chars=200)), \
+             patch("app.supervisor.log_ok"):
+            result = await _generate_report(context)
+
+        assert len(provider.map_prompts) == expected_chunks
+        reduce_prompt = provider.reduce_prompts[0]
+        positions = [reduce_prompt.index(f"要約{i}") for i in range(1, expected_chunks + 1)]
+        assert positions == sorted(positions)
+        assert "メッセージ000" not in reduce_prompt
+        assert result["speaker"] == "spectra"
+        assert len(result["text"]) == 500
+
+    @pytest.mark.asyncio
+    async def test_map_concurrency_is_bounded(self, scripted_provider):
+        """同時実行数がREPORT_MAP_CONCURRENCY以下であること"""
+        provider = scripted_provider["provider"] = ScriptedProvider()
+
+        with patch("app.supervisor.settings",
+                   _settings_for(report_chunk_chars=100, report_map_concurrency=2)), \
+             patch("app.supervisor.log_ok"):
+            await _generate_report(_context(50))
+
+        assert provider.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_and_late_chunks_are_skipped(self, scripted_provider):
+        """失敗・締切超過のチャンクを除外して日報を生成し、締切で打ち切られること"""
+        provider = scripted_provider["provider"] = ScriptedProvider(
+            delays={2: 5.0}, failures={3}
+        )
+
+        with patch("app.supervisor.settings",
+                   _settings_for(report_chunk_chars=200, report_deadline_seconds=1)), \
+             patch("app.supervisor.log_ok"), \
+             patch("app.supervisor.log_err") as mock_log_err:
+            started = asyncio.get_running_loop().time()
+            await _generate_report(_context(50))
+            elapsed = asyncio.get_running_loop().time() - started
+
+        reduce_prompt = provider.reduce_prompts[0]
+        assert "要約1" in reduce_prompt
+        assert "要約2" not in reduce_prompt
+        assert "要約3" not in reduce_prompt
+        assert elapsed < 2.0
+        assert any("2/" in str(c.args[-1]) for c in mock_log_err.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_all_chunks_failing_fails_fast(self, scripted_provider):
+        """全チャンク失敗時はLLM generation failedとなること"""
+        scripted_provider["provider"] = ScriptedProvider(failures=set(range(1, 100)))
+
+        with patch("app.supervisor.settings", _settings_for(report_chunk_chars=200)), \
+             patch("app.supervisor.log_err"):
+            with pytest.raises(ValueError, match="LLM generation failed: report map phase"):
+                await _generate_report(_context(50))
+
+    @pytest.mark.asyncio
+    async def test_partials_exceeding_limit_are_reduced_again(self, scripted_provider):
+        """中間要約の連結がしきい値を超える場合は再度分割要約されること"""
+        provider = scripted_provider["provider"] = ScriptedProvider(summary_chars=60)
+
+        with patch("app.supervisor.settings", _settings_for(report_chunk_chars=200)), \
+             patch("app.supervisor.log_ok") as mock_log_ok:
+            await _generate_report(_context(50))
+
+        map_rounds = [c for c in mock_log_ok.call_args_list if str(c.args[-1]).startswith("report_map:")]
+        assert len(map_rounds) >= 2
+        assert len(provider.reduce_prompts) == 1
+
+    @pytest.mark.asyncio
+    async def test_non_shrinking_partials_stop_and_reduce_once(self, scripted_provider):
+        """中間要約がチャンク長より長く縮まない場合は再要約を打ち切り、1回で最終集約すること"""
+        provider = scripted_provider["provider"] = ScriptedProvider(summary_chars=300)
+        context = _context(50)
+        expected_chunks = len(split_context_chunks(context, 200))
+
+        with patch("app.supervisor.settings", _settings_for(report_chunk_chars=200)), \
+             patch("app.supervisor.log_ok"), \
+             patch("app.supervisor.log_err") as mock_log_err:
+            result = await _generate_report(context)
+
+        assert len(provider.map_prompts) == expected_chunks
+        assert len(provider.reduce_prompts) == 1
+        assert result["speaker"] == "spectra"
+        assert any(c.args[3] == "report_reduce_no_progress" for c in mock_log_err.call_args_list)
@@ -0,0 +1,119 @@
+"""実行環境テスト（イベントループ選択・既定executor・選択結果の記録）"""
+
+import asyncio
+import os
+import sys
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import metrics, runtime
+
+
+class TestSelectEventLoop:
+    """select_event_loopのテスト"""
+
+    def test_asyncio_is_used_when_requested(self):
+        """asyncio指定では標準ループとなること"""
+        assert runtime.select_event_loop("asyncio") == ("asyncio", None)
+
+    def test_auto_falls_back_without_uvloop(self):
+        """uvloop未導入ならautoは標準ループとなること"""
+        with patch("importlib.util.find_spec", return_value=None):
+            assert runtime.select_event_loop("auto") == ("asyncio", None)
+
+    def test_auto_uses_uvloop_when_installed(self):
+        """uvloop導入済みならautoはuvloopのループ生成関数を返すこと"""
+        fake_uvloop = SimpleNamespace(new_event_loop=asyncio.new_event_loop)
+        with patch("importlib.util.find_spec", return_value=object()), \
+             patch.dict(sys.modules, {"uvloop": fake_uvloop}):
+            name, factory = runtime.select_event_loop("auto")
+
+        assert name == "uvloop"
+        assert factory is asyncio.new_event_loop
+
+    def test_required_uvloop_missing_fails_fast(self):
+        """uvloop指定でパッケージが無い場合・未知の指定はValueErrorとなること"""
+        with patch("importlib.util.find_spec", return_value=None):
+            with pytest.raises(ValueError, match="requires the 'uvloop' package"):
+                runtime.select_event_loop("uvloop")
+        with pytest.raises(ValueError, match="Unknown event loop"):
+            runtime.select_event_loop("trio")
+
+
+class TestDefaultExecutor:
+    """configure_default_executorのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_blocking_calls_run_on_named_bounded_executor(self):
+        """run_in_executor(None, ...)が上限付き・名前付きのスレッドで実行されること"""
+        loop = asyncio.get_running_loop()
+        executor = runtime.configure_default_executor(loop, 2)
+        try:
+            name = await loop.run_in_executor(None, lambda: threading.current_thread().name)
+        finally:
+            executor.shutdown(wait=True)
+
+        assert name.startswith(runtime.EXECUTOR_THREAD_PREFIX)
+        assert executor._max_workers == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_uses_standard_size_and_negative_fails(self):
+        """0は標準のスレッド数、負数はValueErrorとなること"""
+        loop = asyncio.get_running_loop()
+        executor = runtime.configure_default_executor(loop, 0)
+        executor.shutdown(wait=True)
+
+        assert executor._max_workers == runtime.default_executor_workers()
+        with pytest.raises(ValueError, match="non-negative"):
+            runtime.configure_default_executor(loop, -1)
+
+
+class TestRun:
+    """runのテスト"""
+
+    def test_run_configures_executor_and_records_choice(self):
+        """選択したループでmainを実行し、選択結果がログ・メトリクスへ記録されること"""
+        async def main():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, lambda: threading.current_thread().name)
+
+        with patch("app.runtime.log_ok") as mock_log_ok:
+            thread_name = runtime.run(main, "asyncio", executor_workers=3)
+
+        assert thread_name.startswith(runtime.EXECUTOR_THREAD_PREFIX)
+        mock_log_ok.assert_called_once_with(
+            "runtime", "system", "system", "runtime:loop=asyncio:executor=bot-blockingx3"
+        )
+        assert metrics.RUNTIME_INFO.labels("asyncio", 3).value == 1
@@ -0,0 +1,251 @@
+"""自発発言の先行生成テスト（アイドル時生成・文脈バージョンによる鮮度判定）"""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+from app import app, store
+from app.app import SpeculativeTickGenerator
+
+
+PREPARED = {"speaker": "paz", "text": "先行生成"}
+
+
+def _generator_with_prepared(active_channel="lounge"):
+    """指定チャンネル向けに先行生成済みのジェネレータ"""
+    generator = SpeculativeTickGenerator()
+    generator._prepared = app.PreparedTick(
+        key=generator._current_key(active_channel),
+        result=PREPARED,
+        created_at=time.monotonic(),
+    )
+    return generator
+
+
+class TestContextVersion:
+    """文脈バージョンのテスト"""
+
+    def test_append_and_reset_bump_version(self):
+        """append・resetで文脈バージョンが増加すること"""
+        with patch("app.store._get_redis_connection"), \
+             patch("app.store.log_ok"):
+            before = store.context_version()
+            store.append("paz", "lounge", "hi")
+            after_append = store.context_version()
+            store.reset()
+
+        assert after_append == before + 1
+        assert store.context_version() == after_append + 1
+
+
+class TestSpeculativeTake:
+    """take()の鮮度判定テスト"""
+
+    def test_take_returns_result_when_unchanged(self):
+        """文脈・チャンネル不変なら先行生成結果を返し、再取得はNoneであること"""
+        generator = _generator_with_prepared()
+
+        with patch("app.logger.log_ok"):
+            assert generator.take("lounge") == PREPARED
+            assert generator.take("lounge") is None
+        assert generator.hits == 1
+
+    def test_take_discards_after_context_change(self):
+        """生成後に文脈が変わった場合は破棄されること"""
+        generator = _generator_with_prepared()
+
+        store._bump_context_version()
+        with patch("app.logger.log_ok"):
+            assert generator.take("lounge") is None
+        assert generator.misses == 1
+
+    def test_take_discards_on_channel_change(self):
+        """active_channelが変わった場合は破棄されること"""
+        generator = _generator_with_prepared("lounge")
+
+        with patch("app.logger.log_ok"):
+            assert generator.take("development") is None
+
+    def test_take_discards_when_too_old(self):
+        """tick間隔の2倍を超えた先行生成は破棄されること"""
+        generator = _generator_with_prepared()
+        generator._prepared.created_at -= app.tick_scheduler.get_tick_interval() * 2 + 1
+
+        with patch("app.logger.log_ok"):
+            assert generator.take("lounge") is None
+
+
+class TestSpeculativePrepare:
+    """先行生成のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_prepare_once_generates_auto_for_active_channel(self):
+        """active_channel向けにkind=autoで生成し、takeで取り出せること"""
+        generator = SpeculativeTickGenerator()
+
+        with patch("app.state.get_active_channel", return_value="lounge"), \
+             patch("app.store.read_all", return_value=[]), \
+             patch("app.supervisor.generate", new=AsyncMock(return_value=PREPARED)) as mock_generate, \
+             patch("app.logger.log_ok"):
+            assert await generator.prepare_once() is True
+            taken = generator.take("lounge")
+
+        assert taken == PREPARED
+        kwargs = mock_generate.call_args.kwargs
+        assert kwargs["kind"] == "auto"
+        assert kwargs["channel"] == app.get_channel_id_from_name("lounge")
+        assert kwargs["wait_for_rate_limit"] is False
+
+    @pytest.mark.asyncio
+    async def test_prepared_result_discarded_if_context_changes_during_generation(self):
+        """生成中に文脈が追記された場合は破棄されること"""
+        generator = SpeculativeTickGenerator()
+
+        async def generate_with_interleaved_append(**kwargs):
+            store._bump_context_version()
+            return PREPARED
+
+        with patch("app.state.get_active_channel", return_value="lounge"), \
+             patch("app.store.read_all", return_value=[]), \
+             patch("app.supervisor.generate", side_effect=generate_with_interleaved_append), \
+             patch("app.logger.log_ok"):
+            await generator.prepare_once()
+            assert generator.take("lounge") is None
+
+    def test_needs_generation_false_when_queue_busy(self):
+        """EventQueue処理中は先行生成しないこと"""
+        generator = SpeculativeTickGenerator()
+
+        with patch.object(app.EventQueue, "is_idle", new=False):
+            assert generator.needs_generation() is False
+
+    def test_needs_generation_false_without_headroom(self):
+        """レート枠に余裕が無い場合は先行生成しないこと"""
+        generator = SpeculativeTickGenerator()
+
+        with patch.object(app.EventQueue, "is_idle", new=True), \
+             patch.object(app.tick_scheduler, "has_llm_headroom", return_value=False):
+            assert generator.needs_generation() is False
+
+
+class TestSpeculativeCancellation:
+    """生成中に実行系が使用中になった場合の中断テスト"""
+
+    @staticmethod
+    def _blocking_generate(started):
+        async def generate(**kwargs):
+            started.set()
+            await asyncio.Event().wait()
+        return generate
+
+    @pytest.mark.asyncio
+    async def test_dispatch_cancels_inflight_prepare(self):
+        """イベント投入時に実行中の先行生成が中断されること"""
+        generator = SpeculativeTickGenerator(idle_check_interval=60)
+        started = asyncio.Event()
+
+        with patch("app.app.speculative_tick_generator", generator), \
+             patch("app.state.get_active_channel", return_value="lounge"), \
+             patch("app.store.read_all", return_value=[]), \
+             patch("app.supervisor.generate", side_effect=self._blocking_generate(started)), \
+             patch.object(app.event_queue, "enqueue", new=AsyncMock(return_value=True)), \
+             patch("app.logger.log_ok") as mock_log_ok:
+            run = asyncio.create_task(generator._run_prepare())
+            await started.wait()
+            assert await app.dispatch_event("lounge", app.EventPriority.USER, AsyncMock()) is True
+            await asyncio.wait_for(run, timeout=1)
+
+        assert generator._prepared is None
+        assert generator._task is None
+        mock_log_ok.assert_any_call("auto_tick", "system", "system", "speculative_cancelled")
+
+    @pytest.mark.asyncio
+    async def test_busy_pipeline_cancels_inflight_prepare(self):
+        """生成中に実行系がアイドルでなくなった場合は中断されること"""
+        generator = SpeculativeTickGenerator(idle_check_interval=0.01)
+        started = asyncio.Event()
+
+        with patch("app.state.get_active_channel", return_value="lounge"), \
+             patch("app.store.read_all", return_value=[]), \
+             patch("app.supervisor.generate", side_effect=self._blocking_generate(started)), \
+             patch("app.app.event_pipeline_is_idle", return_value=False), \
+             patch("app.logger.log_ok"):
+            await asyncio.wait_for(generator._run_prepare(), timeout=1)
+
+        assert started.is_set()
+        assert generator._prepared is None
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_inflight_prepare(self):
+        """停止時に実行中の先行生成が中断されること"""
+        generator = SpeculativeTickGenerator(idle_check_interval=0.05)
+        started = asyncio.Event()
+
+        with patch.object(generator, "needs_generation", return_value=True), \
+             patch("app.state.get_active_channel", return_value="lounge"), \
+             patch("app.store.read_all", return_value=[]), \
+             patch("app.supervisor.generate", side_effect=self._blocking_generate(started)), \
+             patch("app.logger.log_ok"):
+            loop = asyncio.create_task(generator.start())
+            await started.wait()
+            generator.stop()
+            await asyncio.wait_for(loop, timeout=1)
+
+        assert generator.is_running is False
+        assert generator._prepared is None
+
+
+class TestOnTickUsesPrepared:
+    """on_tickでの先行生成利用テスト"""
+
+    @pytest.mark.asyncio
+    async def test_on_tick_posts_prepared_without_generation(self):
+        """先行生成が有効ならLLM呼び出し無しで投稿されること"""
+        generator = _generator_with_prepared("lounge")
+
+        with patch("app.app.speculative_tick_generator", generator), \
+             patch("app.state.get_active_channel", return_value="lounge"), \
+             patch("app.supervisor.generate") as mock_generate, \
+             patch("app.store.read_all") as mock_read_all, \
+             patch("app.discord.typing", return_value=204) as mock_typing, \
+             patch("app.discord.send", return_value="msg_1") as mock_send, \
+             patch("app.store.append"), \
+             patch("app.logger.log_ok"):
+            await app.on_tick()
+
+        mock_generate.assert_not_called()
+        mock_read_all.assert_not_called()
+        channel_id = app.get_channel_id_from_name("lounge")
+        mock_typing.assert_called_once_with("paz", channel_id)
+        mock_send.assert_called_once_with("paz", channel_id, "先行生成")
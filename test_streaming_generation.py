@@ -0,0 +1,250 @@
+"""ストリーミング生成テスト（speaker確定時点でのTyping先行）"""
+
+import asyncio
+import os
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+from app import app
+from app import settings as settings_module
+from app.supervisor import StreamingJsonParser, generate_stream
+
+
+def _fake_stream_client(chunks, delay=0.0):
+    """ストリーミングAPIのフェイククライアント（チャンク毎の受信記録付き）"""
+    received = []
+
+    async def _stream():
+        for chunk in chunks:
+            if delay:
+                await asyncio.sleep(delay)
+            received.append(chunk)
+            yield SimpleNamespace(text=chunk)
+
+    client = MagicMock()
+    client.aio.models.generate_content_stream = AsyncMock(return_value=_stream())
+    return client, received
+
+
+GENERATE_PARAMS = {
+    "kind": "reply",
+    "channel": "123456789012345678",
+    "task": "",
+    "context": "user: hello",
+    "limits": {"cc": 100},
+    "persona": {},
+    "report_config": {},
+}
+
+
+class TestStreamingJsonParser:
+    """逐次JSON解析のテスト"""
+
+    def test_parser_detects_speaker_before_object_closes(self):
+        """speaker値が確定した時点で取得でき、オブジェクトは未完了であること"""
+        parser = StreamingJsonParser()
+
+        parser.feed('{"speaker": "ly')
+        assert parser.speaker is None
+
+        parser.feed('nq", "text": "途中')
+        assert parser.speaker == "lynq"
+        assert parser.is_complete is False
+
+    def test_parser_completes_on_closing_brace(self):
+        """閉じ括弧で完了し、以降のチャンクは無視されること"""
+        parser = StreamingJsonParser()
+
+        parser.feed('{"speaker": "paz", "text": "a}b"}')
+        parser.feed("\n余分なデータ")
+
+        assert parser.is_complete is True
+        assert parser.text == '{"speaker": "paz", "text": "a}b"}'
+
+    def test_parser_ignores_escaped_quotes_and_nested_keys(self):
+        """エスケープされた引用符や本文中のspeaker文字列で誤判定しないこと"""
+        parser = StreamingJsonParser()
+
+        parser.feed('{"text": "\\"speaker\\": \\"paz\\"", "speaker": "spectra"}')
+
+        assert parser.speaker == "spectra"
+        assert parser.is_complete is True
+
+
+class TestGenerateStream:
+    """generate_streamのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_generate_stream_notifies_speaker_early(self):
+        """speaker確定時点でコールバックが呼ばれ、本文完了前であること"""
+        chunks = ['{"speaker": "', 'paz", ', '"text": "こんに', 'ちは"}']
+        client, received = _fake_stream_client(chunks)
+        notified = []
+
+        def on_speaker(speaker):
+            notified.append((speaker, len(received)))
+
+        with patch("google.genai.Client", return_value=client):
+            result = await generate_stream(**GENERATE_PARAMS, on_speaker=on_speaker)
+
+        assert result == {"speaker": "paz", "text": "こんにちは"}
+        assert notified == [("paz", 2)]
+
+    @pytest.mark.asyncio
+    async def test_generate_stream_returns_when_object_closes(self):
+        """オブジェクトが閉じた時点で残りのストリームを待たずに返すこと"""
+        chunks = ['{"speaker": "spectra", "text": "完了"}', "", "late"]
+        client, received = _fake_stream_client(chunks)
+
+        with patch("google.genai.Client", return_value=client):
+            result = await generate_stream(**GENERATE_PARAMS)
+
+        assert result["text"] == "完了"
+        assert received == ['{"speaker": "spectra", "text": "完了"}']
+
+    @pytest.mark.asyncio
+    async def test_generate_stream_report_notifies_spectra_immediately(self):
+        """kind=reportでは最初のチャンク前にspectraが通知されること"""
+        chunks = ['{"speaker": "lynq", "text": "日報"}']
+        client, received = _fake_stream_client(chunks)
+        notified = []
+
+        with patch("google.genai.Client", return_value=client):
+            result = await generate_stream(
+                **{**GENERATE_PARAMS, "kind": "report"},
+                on_speaker=lambda speaker: notified.append((speaker, len(received))),
+            )
+
+        assert notified == [("spectra", 0)]
+        assert result["speaker"] == "spectra"
+
+    @pytest.mark.asyncio
+    async def test_generate_stream_fails_fast_on_invalid_json(self):
+        """不正JSONでValueErrorが発生すること"""
+        client, _ = _fake_stream_client(['{"speaker": "paz", "text": '])
+
+        with patch("google.genai.Client", return_value=client):
+            with pytest.raises(ValueError, match="LLM generation failed"):
+                await generate_stream(**GENERATE_PARAMS)
+
+
+class TestCommonSequenceStreaming:
+    """common_sequenceのストリーミングモードテスト"""
+
+    @pytest.mark.asyncio
+    async def test_typing_starts_before_generation_finishes(self):
+        """ストリーミングモードではTypingが生成完了前に開始されること"""
+        events = []
+
+        async def fake_generate_stream(on_speaker, **kwargs):
+            on_speaker("lynq")
+            await asyncio.sleep(0.01)
+            events.append("generated")
+            return {"speaker": "lynq", "text": "応答"}
+
+        async def fake_typing(bot, channel_id):
+            events.append(f"typing:{bot}")
+            return 204
+
+        streaming_settings = replace(
+            settings_module.settings,
+            ai_service=replace(settings_module.settings.ai_service, streaming=True),
+        )
+
+        with patch("app.settings.settings", streaming_settings), \
+             patch("app.store.read_all", return_value=[]), \
+             patch("app.supervisor.generate_stream", side_effect=fake_generate_stream), \
+             patch("app.supervisor.generate") as mock_generate, \
+             patch("app.discord.typing", side_effect=fake_typing) as mock_typing, \
+             patch("app.discord.send", return_value="msg_1") as mock_send, \
+             patch("app.store.append"), \
+             patch("app.logger.log_ok"):
+            await app.common_sequence(
+                event_type="user_msg",
+                channel="development",
+                actor="user",
+                payload_summary="hello",
+                llm_kind="reply",
+                llm_channel="123456789012345678",
+            )
+
+        assert events == ["typing:lynq", "generated"]
+        mock_generate.assert_not_called()
+        mock_typing.assert_called_once_with("lynq", "123456789012345678")
+        mock_send.assert_called_once_with("lynq", "123456789012345678", "応答")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_generation_stops_early_typing(self):
+        """生成中に中断（キャンセル）された場合も先行送信中のTypingが停止されること"""
+        typing_started = asyncio.Event()
+        typing_cancelled = asyncio.Event()
+
+        async def fake_generate_stream(on_speaker, **kwargs):
+            on_speaker("lynq")
+            await asyncio.Event().wait()
+
+        async def fake_typing(bot, channel_id):
+            typing_started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                typing_cancelled.set()
+                raise
+
+        streaming_settings = replace(
+            settings_module.settings,
+            ai_service=replace(settings_module.settings.ai_service, streaming=True),
+        )
+
+        with patch("app.settings.settings", streaming_settings), \
+             patch("app.store.read_all", return_value=[]), \
+             patch("app.supervisor.generate_stream", side_effect=fake_generate_stream), \
+             patch("app.discord.typing", side_effect=fake_typing), \
+             patch("app.discord.send") as mock_send, \
+             patch("app.logger.log_ok"):
+            running = asyncio.create_task(app.common_sequence(
+                event_type="auto_tick",
+                channel="lounge",
+                actor="system",
+                payload_summary="tick",
+                llm_kind="auto",
+                llm_channel="123456789012345678",
+            ))
+            await asyncio.wait_for(typing_started.wait(), timeout=1.0)
+            running.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await running
+            await asyncio.wait_for(typing_cancelled.wait(), timeout=1.0)
+
+        mock_send.assert_not_called()
@@ -0,0 +1,263 @@
+"""実行中Tickの中断テスト（高優先度イベント到着時のプリエンプション）"""
+
+import asyncio
+import os
+from dataclasses import replace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app
+from app import settings as settings_module
+
+
+async def _run_until_drained(queue: app.EventQueue, timeout: float = 1.0) -> None:
+    """投入済みイベント（再投入分を含む）の処理完了を待ってワーカーを停止"""
+    worker = asyncio.create_task(queue.process_events())
+    await asyncio.wait_for(queue._queue.join(), timeout=timeout)
+    worker.cancel()
+
+
+def _preemptive_queue(requeue: bool = True) -> app.EventQueue:
+    return app.EventQueue(preempt=(app.EventPriority.TICK,), requeue_preempted=requeue)
+
+
+class TestTickPreemption:
+    """EventQueueの中断制御テスト"""
+
+    @pytest.mark.asyncio
+    async def test_user_event_preempts_running_tick_and_tick_is_requeued(self):
+        """USER到着で実行中Tickが中断され、USER処理後にTickが再実行されること"""
+        queue = _preemptive_queue()
+        events = []
+        attempts = 0
+
+        async def slow_tick():
+            nonlocal attempts
+            attempts += 1
+            events.append(f"tick_start{attempts}")
+            await asyncio.sleep(0.05)
+            events.append("tick_done")
+
+        async def user_handler():
+            events.append("user")
+
+        async def enqueue_user_later():
+            await asyncio.sleep(0.01)
+            await queue.enqueue(app.EventPriority.USER, user_handler)
+
+        await queue.enqueue(app.EventPriority.TICK, slow_tick)
+        with patch("app.logger.log_ok") as mock_log_ok:
+            await asyncio.gather(enqueue_user_later(), _run_until_drained(queue))
+
+        assert events == ["tick_start1", "user", "tick_start2", "tick_done"]
+        snapshot = queue.metrics.snapshot()
+        assert snapshot["tick"]["preempted"] == 1
+        assert snapshot["tick"]["processed"] == 1
+        assert snapshot["tick"]["depth"] == 0
+        mock_log_ok.assert_any_call("queue", "system", "system", "preempted:tick:requeued")
+
+    @pytest.mark.asyncio
+    async def test_preempted_tick_is_dropped_when_requeue_disabled(self):
+        """再投入無効時は中断したTickが破棄されること"""
+        queue = _preemptive_queue(requeue=False)
+        events = []
+
+        async def slow_tick():
+            events.append("tick_start")
+            await asyncio.sleep(0.05)
+            events.append("tick_done")
+
+        async def slash_handler():
+            events.append("slash")
+
+        async def enqueue_slash_later():
+            await asyncio.sleep(0.01)
+            await queue.enqueue(app.EventPriority.SLASH, slash_handler)
+
+        await queue.enqueue(app.EventPriority.TICK, slow_tick)
+        with patch("app.logger.log_ok"):
+            await asyncio.gather(enqueue_slash_later(), _run_until_drained(queue))
+
+        assert events == ["tick_start", "slash"]
+        assert queue.metrics.snapshot()["tick"]["processed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_tick_in_send_stage_is_not_preempted(self):
+        """送信段階に入ったTickは中断されず、完了後にUSERが処理されること"""
+        queue = _preemptive_queue()
+        events = []
+
+        async def tick_in_send_stage():
+            app.enter_non_preemptible_stage()
+            await asyncio.sleep(0.03)
+            events.append("tick_sent")
+
+        async def user_handler():
+            events.append("user")
+
+        async def enqueue_user_later():
+            await asyncio.sleep(0.01)
+            await queue.enqueue(app.EventPriority.USER, user_handler)
+
+        await queue.enqueue(app.EventPriority.TICK, tick_in_send_stage)
+        await asyncio.gather(enqueue_user_later(), _run_until_drained(queue))
+
+        assert events == ["tick_sent", "user"]
+        assert queue.metrics.snapshot()["tick"]["preempted"] == 0
+
+    @pytest.mark.asyncio
+    async def test_tick_does_not_preempt_tick(self):
+        """同一優先度のイベント到着では中断しないこと"""
+        queue = _preemptive_queue()
+        events = []
+
+        async def tick(name):
+            await asyncio.sleep(0.02)
+            events.append(name)
+
+        async def enqueue_tick_later():
+            await asyncio.sleep(0.005)
+            await queue.enqueue(app.EventPriority.TICK, tick, "second")
+
+        await queue.enqueue(app.EventPriority.TICK, tick, "first")
+        await asyncio.gather(enqueue_tick_later(), _run_until_drained(queue))
+
+        assert events == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_without_preemption_tick_runs_to_completion(self):
+        """中断対象外（既定のEventQueue）では従来通り直列に完了すること"""
+        queue = app.EventQueue()
+        events = []
+
+        async def slow_tick():
+            await asyncio.sleep(0.03)
+            events.append("tick_done")
+
+        async def user_handler():
+            events.append("user")
+
+        async def enqueue_user_later():
+            await asyncio.sleep(0.01)
+            await queue.enqueue(app.EventPriority.USER, user_handler)
+
+        await queue.enqueue(app.EventPriority.TICK, slow_tick)
+        await asyncio.gather(enqueue_user_later(), _run_until_drained(queue))
+
+        assert events == ["tick_done", "user"]
+
+    def test_enter_non_preemptible_stage_outside_queue_is_noop(self):
+        """EventQueue外での呼び出しは何もしないこと"""
+        app.enter_non_preemptible_stage()
+
+
+class TestCommonSequencePreemption:
+    """common_sequenceと中断制御の統合テスト"""
+
+    @pytest.mark.asyncio
+    async def test_tick_generation_is_cancelled_before_send(self):
+        """生成中のTickはUSER到着で中断され、Discord送信されないこと"""
+        queue = _preemptive_queue(requeue=False)
+        generation_cancelled = asyncio.Event()
+
+        async def slow_generate(**kwargs):
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                generation_cancelled.set()
+                raise
+            return {"speaker": "spectra", "text": "自発発言"}
+
+        async def tick_handler():
+            await app.common_sequence(
+                event_type="auto_tick",
+                channel="lounge",
+                actor="system",
+                payload_summary="auto_tick:lounge",
+                llm_kind="auto",
+                llm_channel="123456789012345678",
+            )
+
+        user_handled = asyncio.Event()
+
+        async def user_handler():
+            user_handled.set()
+
+        async def enqueue_user_later():
+            await asyncio.sleep(0.02)
+            await queue.enqueue(app.EventPriority.USER, user_handler)
+
+        mock_send = AsyncMock(return_value="msg_1")
+        with patch("app.store.read_all", return_value=[]), \
+             patch("app.supervisor.generate", side_effect=slow_generate), \
+             patch("app.discord.typing", new=AsyncMock(return_value=204)), \
+             patch("app.discord.send", new=mock_send), \
+             patch("app.store.append") as mock_append, \
+             patch("app.logger.log_ok"):
+            await queue.enqueue(app.EventPriority.TICK, tick_handler)
+            await asyncio.gather(enqueue_user_later(), _run_until_drained(queue))
+
+        assert generation_cancelled.is_set()
+        assert user_handled.is_set()
+        mock_send.assert_not_called()
+        mock_append.assert_not_called()
+
+
+class TestPreemptionSettings:
+    """QUEUE_TICK_PREEMPTION設定のテスト"""
+
+    @pytest.mark.parametrize(
+        "mode, preempt, requeue",
+        [
+            ("requeue", frozenset({app.EventPriority.TICK}), True),
+            ("drop", frozenset({app.EventPriority.TICK}), False),
+            ("off", frozenset(), False),
+        ],
+    )
+    def test_create_event_queue_applies_preemption_mode(self, mode, preempt, requeue):
+        """設定値に応じて中断対象・再投入が決まること"""
+        queue_settings = replace(
+            settings_module.settings,
+            queue=replace(settings_module.settings.queue, tick_preemption=mode),
+        )
+
+        with patch("app.settings.settings", queue_settings):
+            queue = app._create_event_queue()
+
+        assert queue._preempt == preempt
+        assert queue._requeue_preempted is requeue
+
+    def test_preemption_is_off_by_default(self):
+        """既定では実行中のTickを中断しないこと（QUEUE_TICK_PREEMPTIONで有効化）"""
+        assert settings_module.QueueConfig().tick_preemption == "off"
+        assert app._create_event_queue()._preempt == frozenset()
@@ -0,0 +1,180 @@
+"""Typingパイプライン化テスト（生成中のTyping維持とspeaker切り替え）"""
+
+import asyncio
+import os
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app
+from app import settings as settings_module
+
+CHANNEL = "123456789012345678"
+
+
+def _settings(pipeline=True, keepalive=8.0, streaming=False):
+    base = settings_module.settings
+    return replace(
+        base,
+        discord=replace(base.discord, typing_pipeline=pipeline, typing_keepalive_seconds=keepalive),
+        ai_service=replace(base.ai_service, streaming=streaming),
+    )
+
+
+async def _run_sequence(test_settings, events, generate=None, generate_stream=None, actor="user", kind="reply"):
+    async def fake_typing(bot, channel_id):
+        await asyncio.sleep(0)
+        events.append(f"typing:{bot}")
+        return 204
+
+    async def fake_send(bot, channel_id, text):
+        events.append(f"send:{bot}")
+        return "msg_1"
+
+    with patch("app.settings.settings", test_settings), \
+         patch("app.store.read_all", return_value=[]), \
+         patch("app.supervisor.generate", side_effect=generate), \
+         patch("app.supervisor.generate_stream", side_effect=generate_stream), \
+         patch("app.discord.typing", side_effect=fake_typing), \
+         patch("app.discord.send", side_effect=fake_send), \
+         patch("app.store.append"), \
+         patch("app.logger.log_ok"):
+        await app.common_sequence(
+            event_type="user_msg",
+            channel="development",
+            actor=actor,
+            payload_summary="hello",
+            llm_kind=kind,
+            llm_channel=CHANNEL,
+        )
+
+
+class TestProvisionalTypingBot:
+    """仮Typing Bot選択のテスト"""
+
+    def test_provisional_bot_selection(self):
+        """Bot起点はそのBot、ユーザー起点はspectra、reportは常にspectraであること"""
+        assert app.provisional_typing_bot("auto", "paz") == "paz"
+        assert app.provisional_typing_bot("reply", "user") == "spectra"
+        assert app.provisional_typing_bot("report", "lynq") == "spectra"
+
+
+class TestTypingPipeline:
+    """common_sequenceのTypingパイプラインテスト"""
+
+    @pytest.mark.asyncio
+    async def test_typing_starts_before_generation(self):
+        """生成完了前に仮Typingが表示され、speakerのTyping完了後に送信されること"""
+        events = []
+
+        async def fake_generate(**kwargs):
+            await asyncio.sleep(0.02)
+            events.append("generated")
+            return {"speaker": "lynq", "text": "応答"}
+
+        await _run_sequence(_settings(), events, generate=fake_generate)
+
+        assert events == ["typing:spectra", "generated", "typing:lynq", "send:lynq"]
+
+    @pytest.mark.asyncio
+    async def test_same_speaker_skips_duplicate_typing(self):
+        """仮Typingとspeakerが同じなら再送せずに送信へ進むこと"""
+        events = []
+
+        async def fake_generate(**kwargs):
+            await asyncio.sleep(0.01)
+            return {"speaker": "paz", "text": "応答"}
+
+        await _run_sequence(_settings(), events, generate=fake_generate, actor="paz", kind="auto")
+
+        assert events == ["typing:paz", "send:paz"]
+
+    @pytest.mark.asyncio
+    async def test_typing_is_kept_alive_during_long_generation(self):
+        """生成が再送間隔より長い場合はTypingが再送されること"""
+        events = []
+
+        async def fake_generate(**kwargs):
+            await asyncio.sleep(0.05)
+            return {"speaker": "spectra", "text": "応答"}
+
+        await _run_sequence(_settings(keepalive=0.01), events, generate=fake_generate)
+
+        assert events.count("typing:spectra") >= 3
+        assert events[-1] == "send:spectra"
+
+    @pytest.mark.asyncio
+    async def test_streaming_switches_typing_on_speaker(self):
+        """ストリーミング時はspeaker確定時点でTypingが切り替わること"""
+        events = []
+
+        async def fake_generate_stream(on_speaker, **kwargs):
+            await asyncio.sleep(0.01)
+            on_speaker("lynq")
+            await asyncio.sleep(0.01)
+            events.append("generated")
+            return {"speaker": "lynq", "text": "応答"}
+
+        await _run_sequence(_settings(streaming=True), events, generate_stream=fake_generate_stream)
+
+        assert events == ["typing:spectra", "typing:lynq", "generated", "send:lynq"]
+
+    @pytest.mark.asyncio
+    async def test_generation_error_stops_keepalive(self):
+        """生成エラー時はTyping維持が停止し、Fail-Fastで終了すること"""
+        events = []
+
+        async def fake_generate(**kwargs):
+            await asyncio.sleep(0.01)
+            raise ValueError("LLM generation failed: boom")
+
+        with patch("app.logger.log_err"), pytest.raises(SystemExit):
+            await _run_sequence(_settings(keepalive=0.005), events, generate=fake_generate)
+
+        count = len(events)
+        await asyncio.sleep(0.02)
+        assert len(events) == count
+        assert "send:spectra" not in events
+
+    @pytest.mark.asyncio
+    async def test_disabled_keeps_single_typing(self):
+        """無効時（既定）は生成後に一度だけTypingすること"""
+        events = []
+
+        async def fake_generate(**kwargs):
+            events.append("generated")
+            return {"speaker": "lynq", "text": "応答"}
+
+        await _run_sequence(_settings(pipeline=False), events, generate=fake_generate)
+
+        assert events == ["generated", "typing:lynq", "send:lynq"]
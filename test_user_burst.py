@@ -0,0 +1,189 @@
+"""ユーザー連投統合テスト（窓内のメッセージを1回の応答にまとめる）"""
+
+import asyncio
+import os
+from dataclasses import replace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app
+from app import settings as settings_module
+
+CHANNEL = "123456789012345678"
+OTHER_CHANNEL = "223456789012345678"
+
+
+class TestUserBurstCoalescing:
+    """enqueue_user_messageの連投統合テスト"""
+
+    @pytest.mark.asyncio
+    async def test_messages_within_window_become_one_event(self):
+        """窓内の連投が1件のon_user_burstイベントにまとまること"""
+        queue = app.EventQueue()
+        typing = AsyncMock(return_value=204)
+
+        with patch("app.app.event_queue", queue), \
+             patch("app.app.user_burst_coalescer", app.UserBurstCoalescer(0.03)), \
+             patch("app.discord.typing", new=typing):
+            await app.enqueue_user_message(CHANNEL, "あのさ", "user1")
+            await app.enqueue_user_message(CHANNEL, "質問があって", "user1")
+            await app.enqueue_user_message(CHANNEL, "いい？", "user1")
+
+            assert queue.depth() == 0
+            await asyncio.sleep(0.06)
+
+        assert queue.depth() == 1
+        priority_value, item = queue._queue.get_nowait()
+        assert item.priority == app.EventPriority.USER
+        assert item.handler is app.on_user_burst
+        assert item.args == (CHANNEL, ("あのさ", "質問があって", "いい？"), "user1")
+        typing.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_windows_are_per_channel(self):
+        """窓はチャンネル別に管理されること"""
+        queue = app.EventQueue()
+
+        with patch("app.app.event_queue", queue), \
+             patch("app.app.user_burst_coalescer", app.UserBurstCoalescer(0.02)), \
+             patch("app.discord.typing", new=AsyncMock(return_value=204)):
+            await app.enqueue_user_message(CHANNEL, "こんにちは", "user1")
+            await app.enqueue_user_message(OTHER_CHANNEL, "やあ", "user2")
+            await asyncio.sleep(0.05)
+
+        handled = sorted(queue._queue.get_nowait()[1].args for _ in range(2))
+        assert handled == [(CHANNEL, ("こんにちは",), "user1"), (OTHER_CHANNEL, ("やあ",), "user2")]
+
+    @pytest.mark.asyncio
+    async def test_message_after_window_starts_new_burst(self):
+        """窓の終了後のメッセージは新しい窓として扱われること"""
+        queue = app.EventQueue()
+        coalescer = app.UserBurstCoalescer(0.02)
+
+        with patch("app.app.event_queue", queue), \
+             patch("app.app.user_burst_coalescer", coalescer), \
+             patch("app.discord.typing", new=AsyncMock(return_value=204)):
+            await app.enqueue_user_message(CHANNEL, "一通目", "user1")
+            await asyncio.sleep(0.04)
+            await app.enqueue_user_message(CHANNEL, "二通目", "user1")
+            assert coalescer.pending(CHANNEL) == ("二通目",)
+            await coalescer.flush(CHANNEL)
+
+        assert queue.depth() == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_logged_and_fails_fast(self):
+        """窓終了時の投入失敗はlog_errで記録されSystemExitで停止すること"""
+        coalescer = app.UserBurstCoalescer(0.01)
+
+        with patch("app.app.dispatch_event", AsyncMock(side_effect=ValueError("redis down"))), \
+             patch("app.logger.log_err") as mock_log_err, \
+             patch("sys.exit") as mock_exit:
+            coalescer.add(CHANNEL, "こんにちは", "user1")
+            await asyncio.sleep(0.03)
+
+        mock_log_err.assert_called_once_with(
+            "user_msg", "system", "user", "user_burst_flush", "plan", "redis down"
+        )
+        mock_exit.assert_called_once_with(1)
+        assert not coalescer._tasks
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_pending_windows(self):
+        """終了時は待機中の窓終了タスクを停止し、投入しないこと"""
+        coalescer = app.UserBurstCoalescer(10.0)
+
+        with patch("app.app.dispatch_event", AsyncMock()) as mock_dispatch:
+            coalescer.add(CHANNEL, "こんにちは", "user1")
+            tasks = list(coalescer._tasks)
+            await coalescer.close()
+
+        assert all(task.cancelled() for task in tasks)
+        assert coalescer.pending(CHANNEL) == ()
+        mock_dispatch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_disabled_window_enqueues_each_message(self):
+        """窓0（既定）では従来通りメッセージ毎にon_userが投入されること"""
+        queue = app.EventQueue()
+
+        with patch("app.app.event_queue", queue), \
+             patch("app.app.user_burst_coalescer", app.UserBurstCoalescer(0.0)), \
+             patch("app.discord.typing", new=AsyncMock(return_value=204)):
+            await app.enqueue_user_message(CHANNEL, "一通目", "user1")
+            await app.enqueue_user_message(CHANNEL, "二通目", "user1")
+
+        assert queue.depth() == 2
+        assert queue._queue.get_nowait()[1].handler is app.on_user
+
+
+class TestOnUserBurst:
+    """on_user_burstのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_all_messages_stored_and_answered_once(self):
+        """全メッセージが受信順に格納され、応答は1回であること"""
+        call_order = []
+
+        async def mock_common_sequence(**kwargs):
+            call_order.append(("common_sequence", kwargs["payload_summary"]))
+
+        with patch("app.store.append", side_effect=lambda *a: call_order.append(a)), \
+             patch("app.app.common_sequence", side_effect=mock_common_sequence) as mock_seq:
+            await app.on_user_burst(CHANNEL, ("あのさ", "質問があって"), "user1")
+
+        channel_name = app.get_channel_name_from_id(CHANNEL)
+        assert call_order == [
+            ("user", channel_name, "あのさ"),
+            ("user", channel_name, "質問があって"),
+            ("common_sequence", "あのさ\n質問があって"),
+        ]
+        assert mock_seq.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_burst_fails_fast(self):
+        """空のメッセージ列はValueErrorとなること"""
+        with pytest.raises(ValueError, match="Message burst cannot be empty"):
+            await app.on_user_burst(CHANNEL, (), "user1")
+
+    def test_coalescer_uses_window_setting(self):
+        """USER_BURST_WINDOW_SECONDSが窓の長さに反映されること"""
+        burst_settings = replace(
+            settings_module.settings,
+            queue=replace(settings_module.settings.queue, user_burst_window_seconds=1.5),
+        )
+
+        with patch("app.settings.settings", burst_settings):
+            coalescer = app._create_user_burst_coalescer()
+
+        assert coalescer.window == 1.5
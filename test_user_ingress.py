@@ -0,0 +1,121 @@
+"""ユーザーメッセージ受信のキュー投入テスト（ゲートウェイ非ブロック化）"""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# テスト用環境変数設定（app.pyインポート前に設定）
+os.environ.setdefault("ENV", "dev")
+os.environ.setdefault("TZ", "Asia/Tokyo")
+os.environ.setdefault("SPECTRA_TOKEN", "test_token")
+os.environ.setdefault("LYNQ_TOKEN", "test_token")
+os.environ.setdefault("PAZ_TOKEN", "test_token")
+os.environ.setdefault("CHAN_COMMAND_CENTER", "123456789012345678")
+os.environ.setdefault("CHAN_CREATION", "123456789012345678")
+os.environ.setdefault("CHAN_DEVELOPMENT", "123456789012345678")
+os.environ.setdefault("CHAN_LOUNGE", "123456789012345678")
+os.environ.setdefault("GUILD_ID", "123456789012345678")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("GEMINI_API_KEY", "test_api_key")
+os.environ.setdefault("GEMINI_TIMEOUT_SECONDS", "30")
+os.environ.setdefault("TICK_INTERVAL_SEC_DEV", "15")
+os.environ.setdefault("TICK_PROB_DEV", "1.0")
+os.environ.setdefault("MAX_TEST_MINUTES", "5")
+os.environ.setdefault("TICK_INTERVAL_SEC_PROD", "300")
+os.environ.setdefault("TICK_PROB_PROD", "0.33")
+os.environ.setdefault("STANDBY_START", "00:00")
+os.environ.setdefault("PROCESSING_AT", "06:00")
+os.environ.setdefault("FREE_START", "20:00")
+os.environ.setdefault("LIMIT_CC", "100")
+os.environ.setdefault("LIMIT_CR", "200")
+os.environ.setdefault("LIMIT_DEV", "200")
+os.environ.setdefault("LIMIT_LO", "30")
+os.environ.setdefault("LOG_FILE", "logs/run.log")
+
+
+from app import app
+
+CHANNEL = "123456789012345678"
+
+
+class TestEnqueueUserMessage:
+    """enqueue_user_messageのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_enqueues_with_user_priority_without_processing(self):
+        """USER優先度で投入され、受信時点ではRedis・LLM処理を行わないこと"""
+        queue = app.EventQueue()
+
+        with patch("app.app.event_queue", queue), \
+             patch("app.discord.typing", new=AsyncMock(return_value=204)), \
+             patch("app.store.append") as mock_append, \
+             patch("app.app.common_sequence") as mock_common_sequence:
+            await app.enqueue_user_message(CHANNEL, "質問です", "user1")
+
+            mock_append.assert_not_called()
+            mock_common_sequence.assert_not_called()
+
+            priority_value, item = queue._queue.get_nowait()
+
+        assert item.priority == app.EventPriority.USER
+        assert item.handler is app.on_user
+        assert item.args == (CHANNEL, "質問です", "user1")
+        assert item.kwargs == {"typing_sent": True}
+
+    @pytest.mark.asyncio
+    async def test_typing_is_sent_at_ingress(self):
+        """受信時点で選定Bot名義のTypingが送信されること"""
+        queue = app.EventQueue()
+        typing = AsyncMock(return_value=204)
+
+        with patch("app.app.event_queue", queue), patch("app.discord.typing", new=typing):
+            await app.enqueue_user_message(CHANNEL, "質問です", "user1")
+            await asyncio.gather(*app._ingress_typing_tasks)
+
+        expected_bot = app.select_typing_bot(app.get_channel_name_from_id(CHANNEL), "質問です")
+        typing.assert_awaited_once_with(expected_bot, CHANNEL)
+
+    @pytest.mark.asyncio
+    async def test_queued_handler_skips_duplicate_typing(self):
+        """キューから実行されるon_userは受信時Typingを再送しないこと"""
+        call_order = []
+
+        async def mock_common_sequence(**kwargs):
+            call_order.append("common_sequence")
+
+        with patch("app.discord.typing", new=AsyncMock()) as mock_typing, \
+             patch("app.store.append", side_effect=lambda *a: call_order.append("store_append")), \
+             patch("app.app.common_sequence", side_effect=mock_common_sequence):
+            await app.on_user(CHANNEL, "質問です", "user1", typing_sent=True)
+
+        mock_typing.assert_not_called()
+        assert call_order == ["store_append", "common_sequence"]
+
+    @pytest.mark.asyncio
+    async def test_ingress_typing_failure_is_logged(self):
+        """受信時Typingの失敗は記録され、キュー投入は継続されること"""
+        queue = app.EventQueue()
+
+        with patch("app.app.event_queue", queue), \
+             patch("app.discord.typing", new=AsyncMock(side_effect=ValueError("typing failed"))), \
+             patch("app.logger.log_err") as mock_log_err:
+            await app.enqueue_user_message(CHANNEL, "質問です", "user1")
+            await asyncio.gather(*app._ingress_typing_tasks, return_exceptions=True)
+            await asyncio.sleep(0)
+
+        assert queue._queue.qsize() == 1
+        mock_log_err.assert_called_once()
+        assert mock_log_err.call_args.args[4] == "typing"
+
+    @pytest.mark.asyncio
+    async def test_invalid_message_fails_fast(self):
+        """必須パラメータ欠落時はキュー投入前にValueErrorとなること"""
+        queue = app.EventQueue()
+
+        with patch("app.app.event_queue", queue):
+            with pytest.raises(ValueError, match="Message text cannot be empty"):
+                await app.enqueue_user_message(CHANNEL, "", "user1")
+
+        assert queue._queue.empty()